@@ -3,31 +3,24 @@
 # #####################################################################
 
 # 标准库导入
-import os
-import sys
+import threading
 from pathlib import Path
-import ttkbootstrap as ttk
-from ttkbootstrap.constants import *
-import tkinter.font as tkFont
-import webbrowser
-import json
-from tkinter import messagebox
+from tkinter import filedialog, messagebox
 from typing import Optional
 
-import markdown
-from tkhtmlview import HTMLScrolledText
-import toml
-
+import ttkbootstrap as ttk
+from ttkbootstrap.constants import *
 
 # 从项目模块导入
-from constants import APP_VERSION, FORMAT_DEFINITIONS
+# 注意：markdown、tkhtmlview、tomllib 以及各对话框模块只在首次使用时才导入，
+# 以缩短启动时间（对 PyInstaller --onefile 打包的程序尤为明显）
+from constants import APP_VERSION, FORMAT_DEFINITIONS, LIVE_CONVERT_DELAY_MS
 from ui.main_window import MainWindowUI
 from ui.custom_widgets import EditorWithLineNumbers
-from ui.dialogs.find_replace import FindReplaceDialog
-from ui.dialogs.go_to_line import GoToLineDialog
-from ui.dialogs import about_dialog, help_dialog
-from core import conversion, syntax
-from utils import file_io, settings
+from core import conversion, incremental, syntax
+from utils import documents, file_io, settings, snapshot_cache
+from utils.memprof import note_entries, profiler as memory_profiler
+from utils.tracing import span, tracer
 
 # #####################################################################
 # 2. 主应用程序类
@@ -52,6 +45,27 @@ class GPTDictConverter:
         self.current_file_path: Optional[str] = None
         self.last_directory: str = self.settings.get("last_directory", str(Path.home()))
         
+        # 最近一次解析结果 (输入内容, 格式键, 条目列表)，内容未变时可直接复用
+        self._parsed_snapshot: Optional[tuple] = None
+        self.snapshot_cache = snapshot_cache.SnapshotCache(
+            max_bytes=int(self.settings.get("cache_max_mb", 256)) * 1024 * 1024
+        )
+        
+        # 词库数据库在首次使用时才打开
+        self.glossary_store = None
+        # 快速跳转的条目索引在首次打开面板时才建立
+        self.quick_open_index = None
+        
+        # 输出格式为二进制时，保存输出使用的字节数据
+        self.output_binary: Optional[bytes] = None
+        
+        # 编辑输入内容时在后台增量转换，只重新解析和序列化被修改的条目
+        self.live_converter = incremental.IncrementalConverter()
+        self._live_convert_job = None
+        self._live_convert_running = False
+        # 输入内容每修改一次加一，用于丢弃过期的转换结果
+        self._input_generation = 0
+        
         # 初始化查找替换历史
         self.find_history = []
         self.replace_history = []
@@ -70,9 +84,27 @@ class GPTDictConverter:
         # 设置编辑器功能和拖放
         self.syntax_handler.setup_editor_features()
         self.file_handler.setup_dnd()
+        self.input_text.add_change_listener(self._on_input_edited)
+
+        # 多文档标签页，共用一组编辑器；未激活的文档按内存预算压缩
+        self.documents = documents.DocumentManager(
+            self, self.tab_bar, int(self.settings.get("tab_memory_mb", settings.DEFAULT_SETTINGS["tab_memory_mb"]))
+        )
+
+        # 每次操作结束后在状态栏显示各阶段耗时
+        tracer.add_listener(self._on_operation_timed)
 
     def convert(self):
         """执行格式转换。"""
+        # 完整转换的结果已是最新，无需再实时转换
+        if self._live_convert_job:
+            self.root.after_cancel(self._live_convert_job)
+            self._live_convert_job = None
+        with span("转换"):
+            self._convert()
+
+    def _convert(self):
+        self.output_binary = None
         try:
             input_content = self.input_text.get_content()
             if not input_content.strip():
@@ -84,30 +116,42 @@ class GPTDictConverter:
             output_format_display = self.output_format.get()
             
             if input_format_display == "自动检测":
-                detected_format = conversion.detect_format(input_content)
+                with span("检测格式"):
+                    detected_format = self.input_text.model.detected_format
                 if not detected_format:
                     raise ValueError("无法自动检测输入内容的格式。")
                 self.input_format.set(detected_format)
                 input_format_display = detected_format
 
-            if input_format_display == output_format_display:
-                output_content = conversion.reformat_content(input_content, input_format_display)
+            input_key = conversion.get_format_key(input_format_display, display_name=True)
+            output_key = conversion.get_format_key(output_format_display, display_name=True)
+            if not input_key or not output_key:
+                raise ValueError("无效的格式选择。")
+
+            # 输入输出格式相同时，解析后再按同一格式输出，即可完成格式化
+            data = self.parse_input_entries(input_content, input_key)
+            with span("序列化"):
+                note_entries(len(data))
+                if conversion.is_binary_format(output_key):
+                    # 二进制格式无法在文本框中编辑，输出框仅显示预览，保存时写入二进制数据
+                    self.output_binary = conversion.serialize_binary(data, output_key)
+                    output_content = self._binary_output_preview(data, output_key)
+                else:
+                    output_content = conversion.format_output(data, output_key)
+            if input_key == output_key:
                 status_msg = f"格式化完成: {input_format_display}"
             else:
-                input_key = conversion.get_format_key(input_format_display, display_name=True)
-                output_key = conversion.get_format_key(output_format_display, display_name=True)
-                if not input_key or not output_key:
-                    raise ValueError("无效的格式选择。")
-                
-                data = conversion.parse_input(input_content, input_key)
-                output_content = conversion.format_output(data, output_key)
                 status_msg = f"转换完成: {input_format_display} → {output_format_display}"
 
-            self.output_text.set_content(output_content, reset_modified_flag=True)
-            self.syntax_handler.update_all_highlights(self.output_text)
+            # 只替换输出中变化的行，格式不变时重新转换通常只改动少数几行
+            with span("写入控件"):
+                changed_ranges = self.output_text.patch_content(output_content)
+            with span("语法高亮"):
+                self.syntax_handler.highlight_line_ranges(self.output_text, changed_ranges)
             self.status_var.set(status_msg)
 
-        except (ValueError, json.JSONDecodeError, toml.TomlDecodeError) as e:
+        # json.JSONDecodeError 与 tomllib.TOMLDecodeError 均为 ValueError 的子类
+        except ValueError as e:
             messagebox.showerror("处理失败", str(e))
             self.status_var.set(f"处理失败: {e}")
             self.output_text.clear() # 转换失败时清空输出
@@ -116,6 +160,100 @@ class GPTDictConverter:
             self.status_var.set("发生未知错误")
             self.output_text.clear() # 转换失败时清空输出
 
+    def _binary_output_preview(self, data: conversion.DictData, format_key: str) -> str:
+        """生成二进制输出在输出框中显示的只读预览文本。"""
+        lines = [
+            f"# {FORMAT_DEFINITIONS[format_key]['name']} (只读预览)",
+            f"# 条目数: {len(data)}，大小: {len(self.output_binary)} 字节",
+            "# 点击“保存输出”即可写入二进制文件。以下按原始顺序列出条目：",
+            "",
+        ]
+        lines.append(conversion.format_output(data, "GalTransl_TSV"))
+        return "\n".join(lines)
+
+    def parse_input_entries(self, content: str, format_key: str) -> conversion.DictData:
+        """
+        解析输入内容，并复用与之相同内容的上一次解析结果。
+        若内容正是当前打开且未修改的文件，解析结果还会写入磁盘快照缓存。
+
+        Args:
+            content: 输入框的文本内容。
+            format_key: 内容的格式键名。
+
+        Returns:
+            解析得到的条目列表。
+        """
+        snapshot = self._parsed_snapshot
+        if snapshot and snapshot[1] == format_key and snapshot[0] == content:
+            return snapshot[2]
+
+        with span("解析"):
+            data = conversion.parse_input(content, format_key)
+            note_entries(len(data))
+        self.set_parsed_snapshot(content, format_key, data)
+        self.file_handler.cache_parsed_file(content, format_key, data)
+        return data
+
+    def set_parsed_snapshot(self, content: str, format_key: str, data: conversion.DictData):
+        """记录某段输入内容的解析结果，供后续操作复用。"""
+        self._parsed_snapshot = (content, format_key, data)
+
+    def resolve_input_format_key(self) -> Optional[str]:
+        """返回输入内容的格式键名。输入格式为“自动检测”时根据内容检测，失败时返回None。"""
+        format_name = self.input_format.get()
+        if format_name == "自动检测":
+            format_name = self.input_text.model.detected_format
+            if not format_name:
+                return None
+        return conversion.get_format_key(format_name, display_name=True)
+
+    def load_entries_to_input(self, entries: conversion.DictData, format_key: str):
+        """
+        将条目按指定格式写入输入框，作为一份新的未保存内容。
+
+        Args:
+            entries: 字典条目列表。
+            format_key: 输入框使用的文本格式键名。
+        """
+        content = conversion.format_output(entries, format_key)
+        self.input_text.set_content(content)
+        self.input_format.set(FORMAT_DEFINITIONS[format_key]["name"])
+        self.current_file_path = None
+        self.set_parsed_snapshot(content, format_key, entries)
+        self.root.title(f"GPT字典编辑转换器   {self.APP_VERSION}")
+        self.syntax_handler.update_all_highlights(self.input_text)
+        self.auto_convert()
+
+    def replace_input_entries(self, entries: conversion.DictData, format_key: str):
+        """
+        用新的条目列表替换输入框的内容，保留当前文件路径，并可作为一步撤销。
+
+        Args:
+            entries: 字典条目列表。
+            format_key: 输入框使用的文本格式键名。
+        """
+        content = conversion.format_output(entries, format_key)
+        self.input_text.edit_separator()
+        changed_ranges = self.input_text.patch_content(content, reset_modified_flag=False)
+        self.input_text.edit_separator()
+        self.set_parsed_snapshot(content, format_key, entries)
+        self.syntax_handler.highlight_line_ranges(self.input_text, changed_ranges)
+        self.auto_convert()
+
+    def get_glossary_store(self):
+        """返回词库数据库，首次调用时才打开。"""
+        if self.glossary_store is None:
+            from core.glossary_store import GlossaryStore
+            self.glossary_store = GlossaryStore(self.settings.get("glossary_db", settings.DEFAULT_SETTINGS["glossary_db"]))
+        return self.glossary_store
+
+    def get_quick_open_index(self):
+        """返回快速跳转面板使用的条目索引，首次调用时才创建。"""
+        if self.quick_open_index is None:
+            from utils.quick_open import QuickOpenIndex
+            self.quick_open_index = QuickOpenIndex(self)
+        return self.quick_open_index
+
     def auto_convert(self, event=None):
         if self.auto_convert_var.get():
             self.convert()
@@ -124,6 +262,8 @@ class GPTDictConverter:
         self.input_text.clear()
         self.output_text.clear()
         self.current_file_path = None
+        self._parsed_snapshot = None
+        self.output_binary = None
         self.input_format.set("自动检测")
         self.status_var.set("已清空")
         self.root.title(f"GPT字典编辑转换器   {self.APP_VERSION}")
@@ -133,11 +273,14 @@ class GPTDictConverter:
         if not output_content:
             self.status_var.set("输出内容为空，无法传递。")
             return
+        if self.output_binary is not None:
+            self.status_var.set("二进制格式的输出只能保存为文件，无法传至输入栏。")
+            return
         
-        self.input_text.set_content(output_content)
+        changed_ranges = self.input_text.patch_content(output_content)
         self.input_format.set(self.output_format.get())
         self.current_file_path = None
-        self.syntax_handler.update_all_highlights(self.input_text)
+        self.syntax_handler.highlight_line_ranges(self.input_text, changed_ranges)
         self.status_var.set("已将输出传至输入，并同步格式。")
 
     def copy_input(self):
@@ -158,9 +301,23 @@ class GPTDictConverter:
         else:
             self.status_var.set("输出内容为空")
 
+    def new_tab(self, event=None):
+        """新建一个空白标签页。"""
+        self.documents.new_document()
+        return "break"
+
+    def close_tab(self, event=None):
+        """关闭当前标签页。"""
+        self.documents.close_active()
+        return "break"
+
     def ask_quit(self):
         """退出前确认并保存设置。"""
-        if self.input_text.is_modified_flag:
+        modified = self.documents.modified_documents()
+        if len(modified) > 1:
+            if not messagebox.askyesno("退出确认", f"有 {len(modified)} 个标签页的内容已被修改但未保存，确定要退出吗？"):
+                return
+        elif modified:
             if not messagebox.askyesno("退出确认", "输入内容已被修改但未保存，确定要退出吗？"):
                 return
 
@@ -169,23 +326,225 @@ class GPTDictConverter:
             "geometry": self.root.winfo_geometry(),
             "last_directory": self.last_directory,
             "auto_convert": self.auto_convert_var.get(),
+            "cache_max_mb": self.settings.get("cache_max_mb", 256),
+            "watch_file": self.watch_file_var.get(),
+            "tab_memory_mb": self.settings.get("tab_memory_mb", settings.DEFAULT_SETTINGS["tab_memory_mb"]),
+            "glossary_db": self.settings.get("glossary_db", settings.DEFAULT_SETTINGS["glossary_db"]),
         }
         settings.save_settings(current_settings)
+
+        self.snapshot_cache.flush()
+        if self.glossary_store is not None:
+            self.glossary_store.close()
         
         self.root.destroy()
 
     def _show_find_replace_dialog(self, event=None):
+        from ui.dialogs.find_replace import FindReplaceDialog
         FindReplaceDialog(self.root, self.input_text, app_instance=self)
         return "break"
     
     def _show_goto_line_dialog(self, event=None):
+        from ui.dialogs.go_to_line import GoToLineDialog
         GoToLineDialog(self.root, app_instance=self)
         return "break"
 
+    def show_quick_open_dialog(self, event=None):
+        """显示快速跳转面板。"""
+        from ui.dialogs.quick_open import QuickOpenDialog
+        QuickOpenDialog(self.root, app_instance=self)
+        return "break"
+
+    def show_problems_dialog(self):
+        """显示输入内容的校验问题列表。"""
+        from ui.dialogs.problems_dialog import ProblemsDialog
+        ProblemsDialog(self.root, app_instance=self)
+
+    def show_glossary_store_dialog(self):
+        """显示词库数据库对话框。"""
+        from ui.dialogs.glossary_store_dialog import GlossaryStoreDialog
+        GlossaryStoreDialog(self.root, app_instance=self)
+
+    def show_apply_preview_dialog(self):
+        """显示应用字典预览对话框。"""
+        from ui.dialogs.apply_preview import ApplyPreviewDialog
+        ApplyPreviewDialog(self.root, app_instance=self)
+
+    def show_coverage_dialog(self):
+        """显示覆盖率统计对话框。"""
+        from ui.dialogs.coverage_dialog import CoverageDialog
+        CoverageDialog(self.root, app_instance=self)
+
+    def show_project_search_dialog(self):
+        """显示在目录中查找与替换对话框。"""
+        from ui.dialogs.project_search_dialog import ProjectSearchDialog
+        ProjectSearchDialog(self.root, app_instance=self)
+
+    def show_shadow_analysis_dialog(self):
+        """显示遮蔽分析对话框。"""
+        from ui.dialogs.shadow_dialog import ShadowAnalysisDialog
+        ShadowAnalysisDialog(self.root, app_instance=self)
+
+    def show_variant_dialog(self):
+        """显示变体重复检查对话框。"""
+        from ui.dialogs.variant_dialog import VariantDialog
+        VariantDialog(self.root, app_instance=self)
+
+    def show_stats_dialog(self):
+        """显示字典统计面板。"""
+        from ui.dialogs.stats_dialog import StatsDialog
+        StatsDialog(self.root, app_instance=self)
+
+    def show_transform_dialog(self):
+        """显示排序与去重对话框。"""
+        from ui.dialogs.transform_dialog import TransformDialog
+        TransformDialog(self.root, app_instance=self)
+
     def show_about_dialog(self):
         """显示关于对话框。"""
+        from ui.dialogs import about_dialog
         about_dialog.show_about_dialog(self.root, self.APP_VERSION)
     
     def show_help_dialog(self):
         """显示帮助对话框。"""
-        help_dialog.show_help_dialog(self.root)
\ No newline at end of file
+        from ui.dialogs import help_dialog
+        help_dialog.show_help_dialog(self.root)
+
+    def report_startup_time(self, elapsed_ms: float):
+        """在状态栏显示从进程启动到主窗口首次绘制完成的耗时。"""
+        self.status_var.set(f"就绪 (启动耗时 {elapsed_ms:.0f}ms)")
+        self.perf_var.set(f"启动 {elapsed_ms:.1f}ms")
+
+    # -------------------------------------------------------------
+    # 实时转换
+    # -------------------------------------------------------------
+    def _on_input_edited(self, start_line, old_count, new_count):
+        """输入内容被修改后，延迟一段时间再在后台转换，连续输入时只转换一次。"""
+        self._input_generation += 1
+        if not self.auto_convert_var.get():
+            return
+        if self._live_convert_job:
+            self.root.after_cancel(self._live_convert_job)
+        self._live_convert_job = self.root.after(LIVE_CONVERT_DELAY_MS, self._start_live_convert)
+
+    def _start_live_convert(self):
+        """在后台线程中增量转换当前输入内容。"""
+        self._live_convert_job = None
+        if self._live_convert_running:
+            # 上一次转换尚未完成，稍后再试
+            self._live_convert_job = self.root.after(LIVE_CONVERT_DELAY_MS, self._start_live_convert)
+            return
+
+        content = self.input_text.get_content()
+        if not content.strip():
+            self.output_text.clear()
+            self.output_binary = None
+            return
+        input_key = self.resolve_input_format_key()
+        output_key = conversion.get_format_key(self.output_format.get(), display_name=True)
+        if not input_key or not output_key or conversion.is_binary_format(output_key):
+            # 无法识别格式，或二进制输出需要整体序列化，留给手动转换
+            return
+
+        old_output = self.output_text.get_content()
+        generation = self._input_generation
+        job = {}
+
+        def worker():
+            try:
+                with span("实时转换"):
+                    job["result"] = self.live_converter.update(content, input_key, output_key, old_output)
+            except Exception as e:
+                job["error"] = e
+
+        self._live_convert_running = True
+        threading.Thread(target=worker, daemon=True).start()
+        self.root.after(50, lambda: self._poll_live_convert(job, content, input_key, old_output, generation))
+
+    def _poll_live_convert(self, job: dict, content: str, input_key: str, old_output: str, generation: int):
+        """等待后台转换完成，然后只把输出中变化的行写入输出框。"""
+        if not job:
+            self.root.after(50, lambda: self._poll_live_convert(job, content, input_key, old_output, generation))
+            return
+        self._live_convert_running = False
+        # 转换期间输入又被修改，或输出已被其他操作替换，结果作废（新的修改会再次触发转换）
+        if generation != self._input_generation or self.output_text.get_content() != old_output:
+            return
+        if "error" in job:
+            # 输入过程中内容暂时无效是常态，只在状态栏提示，不弹出对话框
+            self.status_var.set(f"实时转换失败: {job['error']}")
+            return
+
+        result = job["result"]
+        with span("更新输出"):
+            changed_ranges = self.output_text.apply_line_hunks(result.hunks)
+            self.output_text.edit_reset()
+            self.output_text.is_modified_flag = False
+            self.syntax_handler.highlight_line_ranges(self.output_text, changed_ranges)
+        self.output_binary = None
+        self.set_parsed_snapshot(content, input_key, result.entries)
+        if result.full_parse:
+            self.status_var.set(f"实时转换完成: {len(result.entries)} 个条目")
+        else:
+            self.status_var.set(f"实时转换完成: 重新解析 {result.reparsed} 条记录，输出更新 {len(result.hunks)} 处")
+
+    # -------------------------------------------------------------
+    # 性能追踪
+    # -------------------------------------------------------------
+    def _on_operation_timed(self, operation: dict):
+        """在状态栏右侧显示最近一次操作的分阶段耗时。"""
+        # 计时结果可能来自后台线程，只有主线程可以安全地更新Tk变量
+        if threading.current_thread() is threading.main_thread():
+            text = tracer.format_last()
+            # 内存报告在计时结果之前生成，此时最新的报告即对应这次操作
+            report = memory_profiler.last_report
+            if memory_profiler.enabled and report and report.operation.name == operation["name"]:
+                text += "  " + memory_profiler.format_summary(report)
+            self.perf_var.set(text)
+
+    def toggle_trace(self):
+        """开启或关闭性能追踪记录。"""
+        tracer.trace_enabled = self.trace_var.get()
+        if tracer.trace_enabled:
+            self.status_var.set("性能追踪已开启")
+        else:
+            self.status_var.set(f"性能追踪已关闭，已记录 {tracer.event_count} 个事件")
+
+    def export_trace(self):
+        """将性能追踪记录导出为 Chrome trace-event JSON 文件。"""
+        if not tracer.event_count:
+            messagebox.showinfo("提示", "暂无追踪记录。请先在“调试”菜单中开启性能追踪。")
+            return
+        save_path = filedialog.asksaveasfilename(
+            title="导出性能追踪",
+            initialdir=self.last_directory,
+            initialfile="gptdict_trace.json",
+            defaultextension=".json",
+            filetypes=[("Chrome Trace JSON", "*.json"), ("所有文件", "*.*")]
+        )
+        if not save_path:
+            return
+        try:
+            tracer.export_chrome_trace(save_path)
+            self.status_var.set(f"已导出 {tracer.event_count} 个追踪事件: {Path(save_path).name}")
+        except OSError as e:
+            messagebox.showerror("错误", f"导出追踪失败: {e}")
+
+    def clear_trace(self):
+        """清空性能追踪记录。"""
+        tracer.clear_trace()
+        self.status_var.set("已清空性能追踪记录")
+
+    def toggle_memory_profile(self):
+        """开启或关闭内存分析。开启期间所有内存分配都会变慢。"""
+        if self.memory_profile_var.get():
+            memory_profiler.start()
+            self.status_var.set("内存分析已开启，之后的每个操作会记录各阶段的峰值与保留内存")
+        else:
+            memory_profiler.stop()
+            self.status_var.set(f"内存分析已关闭，共 {len(memory_profiler.reports)} 个报告")
+
+    def show_memory_report_dialog(self):
+        """显示内存报告对话框。"""
+        from ui.dialogs.memory_dialog import MemoryReportDialog
+        MemoryReportDialog(self.root, app_instance=self)
\ No newline at end of file
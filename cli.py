@@ -0,0 +1,371 @@
+"""
+GPT字典编辑转换器的命令行入口，无需图形界面即可批量处理字典文件。
+
+用法示例:
+    python cli.py transform in.txt -o out.json --to AiNiee_JSON --sort org --dedupe nfkc --trim
+    python cli.py selfcheck --budget-ms 100
+    python cli.py serve --port 8765
+    python cli.py bulk chars/ -o out/ --to AiNiee_JSON --concurrency 32 --workers 4
+    python cli.py bench-parse huge.txt --workers 8
+    python cli.py memprofile huge.txt --to AiNiee_JSON -o out.json
+"""
+
+# #####################################################################
+# 1. 依赖检查与导入
+# #####################################################################
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import time
+
+from constants import FORMAT_DEFINITIONS
+from core import conversion, transform
+
+# 在新的解释器中导入 core 包并报告耗时与已加载的 GUI 模块
+_IMPORT_PROBE = """
+import sys, time
+t0 = time.perf_counter()
+import core
+elapsed = (time.perf_counter() - t0) * 1000
+gui = sorted(m for m in sys.modules if m.split(".")[0] in ("tkinter", "_tkinter", "ttkbootstrap", "tkinterdnd2"))
+print(elapsed)
+print(" ".join(gui))
+"""
+# selfcheck 默认允许的 core 包导入耗时（毫秒）
+IMPORT_BUDGET_MS = 100
+
+# #####################################################################
+# 2. 子命令
+# #####################################################################
+def cmd_transform(args) -> int:
+    """排序、去重、去除空白并转换格式。"""
+    input_key = args.input_format or conversion.detect_file_format(args.input)
+    output_key = args.output_format or input_key
+    options = transform.TransformOptions(
+        sort=args.sort, reverse=args.reverse, dedupe=args.dedupe, trim=args.trim
+    )
+    count = transform.transform_file(args.input, args.output, input_key, output_key, options, run_size=args.run_size)
+    print(f"已写入 {count} 个条目: {args.output} ({FORMAT_DEFINITIONS[output_key]['name']})")
+    return 0
+
+
+def _probe_import() -> tuple:
+    """在新的解释器中导入 core 包，返回 (耗时毫秒, 已加载的 GUI 模块列表)。"""
+    result = subprocess.run(
+        [sys.executable, "-c", _IMPORT_PROBE], cwd=os.path.dirname(os.path.abspath(__file__)),
+        capture_output=True, text=True, check=True
+    )
+    lines = result.stdout.splitlines()
+    return float(lines[0]), lines[1].split() if len(lines) > 1 else []
+
+
+def cmd_selfcheck(args) -> int:
+    """检查 core 包不依赖 GUI 库、导入耗时在预算之内，并且各格式可以往返转换。"""
+    import core
+    failures = 0
+
+    if getattr(sys, "frozen", False):
+        print("跳过导入检查: 打包后的程序无法启动新的解释器")
+    else:
+        # 取多次中的最小值，排除磁盘缓存等偶然因素
+        probes = [_probe_import() for _ in range(args.repeat)]
+        elapsed = min(p[0] for p in probes)
+        gui = probes[0][1]
+        if gui:
+            failures += 1
+            print(f"失败 导入 core 时加载了 GUI 模块: {', '.join(gui)}")
+        else:
+            print("通过 导入 core 不加载任何 GUI 模块")
+        status = "通过" if elapsed <= args.budget_ms else "失败"
+        failures += status == "失败"
+        print(f"{status} 导入 core 耗时 {elapsed:.1f}ms (预算 {args.budget_ms}ms)")
+
+    sample = [
+        {'org': 'アリス', 'rep': '爱丽丝', 'note': '角色名'},
+        {'org': 'a "quoted"\\path', 'rep': "it's", 'note': ''},
+        {'org': '全角　空格', 'rep': 'x', 'note': '#不是注释'},
+        # 同一输出中混用单引号与双引号字符串，且含有方括号：第三方 toml 库会丢失这样的条目
+        {'org': '[[gptDict]] {a, b}', 'rep': 'say "hi"', 'note': "it's \\"},
+    ]
+    for key in core.formats():
+        try:
+            if conversion.is_binary_format(key):
+                result = conversion.parse_binary(conversion.serialize_binary(sample, key), key)
+            else:
+                result = core.loads(core.dumps(sample, key), key)
+            ok = result == sample
+            if ok:
+                detail = ""
+            elif len(result) != len(sample):
+                detail = f"（往返后有 {len(result)} 个条目，应为 {len(sample)} 个）"
+            else:
+                i = next(i for i, (a, b) in enumerate(zip(result, sample)) if a != b)
+                detail = f"（第 {i + 1} 个条目往返后为 {result[i]!r}，应为 {sample[i]!r}）"
+        except Exception as e:
+            ok, detail = False, f"（{type(e).__name__}: {e}）"
+        failures += not ok
+        print(f"{'通过' if ok else '失败'} {key} 往返转换{detail}")
+
+    try:
+        asyncio.run(_check_service(sample))
+        print("通过 本地转换服务")
+    except Exception as e:
+        failures += 1
+        print(f"失败 本地转换服务（{type(e).__name__}: {e}）")
+
+    print("自检通过" if not failures else f"自检失败: {failures} 项")
+    return 0 if not failures else 1
+
+
+async def _check_service(sample: list):
+    """在本进程中启动转换服务，并通过客户端检查各操作与批量请求的结果。"""
+    from core import service
+    text = conversion.format_output(sample, "GalTransl_TSV")
+    # 阈值为 1 个字符，使请求经过进程池
+    svc = service.ConversionService(workers=1, pool_threshold=1)
+    await svc.start(service.DEFAULT_HOST, 0)
+    try:
+        async with service.ServiceClient(*svc.address) as client:
+            detected = await client.call("detect", content=text)
+            if detected["format"] != "GalTransl_TSV":
+                raise AssertionError(f"detect 返回 {detected['format']}")
+            results = await client.batch([
+                {"op": "convert", "content": text, "to": "AiNiee_JSON"},
+                {"op": "validate", "content": text},
+                {"op": "convert", "content": text, "to": "未知格式"},
+            ])
+            if not results[0]["ok"] or conversion.parse_input(results[0]["result"]["output"], "AiNiee_JSON") != sample:
+                raise AssertionError("convert 结果与原条目不一致")
+            if not results[1]["ok"] or results[1]["result"]["count"] != len(sample):
+                raise AssertionError("validate 结果不正确")
+            if results[2]["ok"]:
+                raise AssertionError("未知格式没有返回错误")
+            stats = (await client.call("ping"))["stats"]
+            if not stats["pooled"]:
+                raise AssertionError("请求没有经过进程池")
+    finally:
+        await svc.close()
+
+
+def cmd_bulk(args) -> int:
+    """并发转换目录中的大量小字典文件，并报告每秒处理的文件数。"""
+    from core import bulk
+    jobs = bulk.plan_jobs(args.inputs, args.output_format, args.output, args.layout)
+    if not jobs:
+        print("没有找到字典文件")
+        return 0
+
+    # 只在终端中显示覆盖式的进度
+    show_progress = not args.quiet and sys.stderr.isatty()
+    last_report = [0.0]
+
+    def progress(done, total):
+        now = time.perf_counter()
+        if now - last_report[0] >= 1 or done == total:
+            last_report[0] = now
+            print(f"\r{done}/{total}", end="", file=sys.stderr, flush=True)
+
+    report = asyncio.run(bulk.convert_jobs(
+        jobs, args.output_format, args.input_format, concurrency=args.concurrency, workers=args.workers,
+        batch_size=args.batch_size, max_pending_writes=args.max_pending_writes,
+        on_progress=progress if show_progress else None
+    ))
+    if show_progress:
+        print(file=sys.stderr)
+    for path, error in report.failures[:args.max_errors]:
+        print(f"失败 {path}: {error}", file=sys.stderr)
+    if len(report.failures) > args.max_errors:
+        print(f"……另有 {len(report.failures) - args.max_errors} 个文件失败", file=sys.stderr)
+    print(f"已转换 {report.converted}/{report.files} 个文件，共 {report.entries} 个条目，"
+          f"耗时 {report.elapsed:.2f}s（{report.files_per_second:.0f} 个文件/秒）")
+    return 0 if not report.failures else 1
+
+
+def cmd_bench_parse(args) -> int:
+    """比较单进程解析与分块并行解析同一个大文件的耗时，并检查两者结果一致。"""
+    from core import chunked
+    input_key = args.input_format or conversion.detect_file_format(args.input)
+    if input_key not in chunked.PARALLEL_FORMATS:
+        print(f"错误: 分块并行解析只支持 {', '.join(chunked.PARALLEL_FORMATS)}", file=sys.stderr)
+        return 1
+    size_mb = os.path.getsize(args.input) / (1024 * 1024)
+    workers = args.workers or os.cpu_count() or 1
+    chunk_size = int(args.chunk_size * 1024 * 1024)
+
+    def best_of(parse):
+        times = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            result = parse()
+            times.append(time.perf_counter() - start)
+        return result, min(times)
+
+    serial, serial_time = best_of(lambda: chunked.parse_file(args.input, input_key, workers=1))
+    print(f"单进程: {len(serial)} 个条目，{serial_time:.2f}s（{size_mb / serial_time:.1f} MB/s）")
+    parallel, parallel_time = best_of(lambda: chunked.parse_file(
+        args.input, input_key, workers=workers, chunk_size=chunk_size, min_size=0))
+    print(f"{workers} 个进程: {len(parallel)} 个条目，{parallel_time:.2f}s（{size_mb / parallel_time:.1f} MB/s），"
+          f"加速 {serial_time / parallel_time:.2f} 倍")
+    if parallel != serial:
+        print("失败 并行解析的结果与单进程解析不一致", file=sys.stderr)
+        return 1
+    print("通过 并行解析的结果与单进程解析一致")
+    return 0
+
+
+def cmd_memprofile(args) -> int:
+    """以内存分析模式转换一个文件，报告各阶段的峰值与保留内存、每个条目的字节数和主要分配位置。"""
+    from core import lint
+    from utils.memprof import note_entries, profiler
+    from utils.tracing import span
+
+    profiler.start()
+    try:
+        with span("转换文件"):
+            with span("读取文件"):
+                with open(args.input, 'rb') as f:
+                    raw = f.read()
+            with span("检测格式"):
+                input_key = args.input_format or conversion.detect_binary_format(raw[:16])
+                if not (input_key and conversion.is_binary_format(input_key)):
+                    content = raw.decode('utf-8-sig')
+                    if input_key is None:
+                        detected = conversion.detect_format(content)
+                        input_key = conversion.get_format_key(detected, display_name=True) if detected else None
+                        if input_key is None:
+                            raise ValueError(f"无法自动检测文件格式: {args.input}")
+                del raw
+            output_key = args.output_format or input_key
+            with span("解析"):
+                if conversion.is_binary_format(input_key):
+                    with open(args.input, 'rb') as f:
+                        entries = conversion.parse_binary(f.read(), input_key)
+                else:
+                    entries = conversion.parse_input(content, input_key)
+                note_entries(len(entries))
+            if not conversion.is_binary_format(input_key):
+                # 图形界面中高亮前会先校验输入内容，命令行中用校验代替高亮
+                with span("校验"):
+                    linter = lint.IncrementalLinter(input_key)
+                    linter.reset(content)
+                    errors, warnings = linter.totals()
+                del linter, content
+            with span("序列化"):
+                note_entries(len(entries))
+                if conversion.is_binary_format(output_key):
+                    output = conversion.serialize_binary(entries, output_key)
+                else:
+                    output = conversion.format_output(entries, output_key)
+            if args.output:
+                with span("写入文件"):
+                    if isinstance(output, bytes):
+                        with open(args.output, 'wb') as f:
+                            f.write(output)
+                    else:
+                        with open(args.output, 'w', encoding='utf-8') as f:
+                            f.write(output)
+            del output
+        print(profiler.format_report(profiler.last_report))
+        if args.top > 0:
+            print(profiler.format_sites(profiler.top_sites(args.top)))
+    finally:
+        profiler.stop()
+    return 0
+
+
+def cmd_serve(args) -> int:
+    """启动本地转换服务，直到按下 Ctrl+C。"""
+    from core import service
+
+    def ready(address):
+        print(f"转换服务已启动: {address[0]}:{address[1]}（按 Ctrl+C 停止）", flush=True)
+
+    service.serve(args.host, args.port, args.workers, on_ready=ready)
+    return 0
+
+
+# #####################################################################
+# 3. 参数解析
+# #####################################################################
+def build_parser() -> argparse.ArgumentParser:
+    format_keys = list(FORMAT_DEFINITIONS)
+    parser = argparse.ArgumentParser(prog="cli.py", description="GPT字典编辑转换器 命令行工具")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    p = subparsers.add_parser("transform", help="排序、去重、去除空白并转换字典格式")
+    p.add_argument("input", help="输入字典文件")
+    p.add_argument("-o", "--output", required=True, help="输出文件，可以与输入文件相同")
+    p.add_argument("--from", dest="input_format", choices=format_keys, help="输入格式，默认自动检测")
+    p.add_argument("--to", dest="output_format", choices=format_keys, help="输出格式，默认与输入相同")
+    p.add_argument("--sort", choices=list(transform.SORT_KEYS),
+                   help="排序规则: org=按原文, length=按原文长度, nfkc=按规范化原文, locale=按系统区域设置")
+    p.add_argument("--reverse", action="store_true", help="降序排列")
+    p.add_argument("--dedupe", choices=list(transform.DEDUPE_KEYS),
+                   help="按原文去重（保留首个）: exact=完全相同, nfkc=忽略全半角与大小写差异, kana=另忽略平假名与片假名的差异")
+    p.add_argument("--trim", action="store_true", help="去除各字段首尾的空白字符")
+    p.add_argument("--run-size", type=int, default=transform.DEFAULT_RUN_SIZE,
+                   help="内存中最多同时保存的条目数，超出后使用外部排序 (默认: %(default)s)")
+    p.set_defaults(func=cmd_transform)
+
+    p = subparsers.add_parser("selfcheck", help="检查核心库的导入耗时、GUI 依赖和各格式的往返转换")
+    p.add_argument("--budget-ms", type=float, default=IMPORT_BUDGET_MS,
+                   help="导入 core 包允许的最长耗时（毫秒，默认: %(default)s）")
+    p.add_argument("--repeat", type=int, default=3, help="导入测量的次数，取最小值 (默认: %(default)s)")
+    p.set_defaults(func=cmd_selfcheck)
+
+    p = subparsers.add_parser("bulk", help="并发转换大量小字典文件")
+    p.add_argument("inputs", nargs="+", help="输入文件或目录（递归查找其中的字典文件）")
+    p.add_argument("-o", "--output", help="输出目录（--layout beside 时不需要）")
+    p.add_argument("--from", dest="input_format", choices=format_keys, help="输入格式，默认逐个文件自动检测")
+    p.add_argument("--to", dest="output_format", choices=format_keys, required=True, help="输出格式")
+    p.add_argument("--layout", choices=["mirror", "flat", "beside"], default="mirror",
+                   help="输出布局: mirror=保留输入目录结构, flat=全部放在输出目录下, beside=写在输入文件旁边 (默认: %(default)s)")
+    p.add_argument("--concurrency", type=int, default=32, help="同时进行的读取数与写入数 (默认: %(default)s)")
+    p.add_argument("--workers", type=int, help="解析与格式化的进程数，默认为 CPU 核心数；0 表示不使用进程池")
+    p.add_argument("--batch-size", type=int, default=64, help="每个进程池任务处理的文件数 (默认: %(default)s)")
+    p.add_argument("--max-pending-writes", type=int, default=256,
+                   help="已转换但尚未写入的文件数上限 (默认: %(default)s)")
+    p.add_argument("--max-errors", type=int, default=20, help="最多列出的失败文件数 (默认: %(default)s)")
+    p.add_argument("-q", "--quiet", action="store_true", help="不显示进度")
+    p.set_defaults(func=cmd_bulk)
+
+    p = subparsers.add_parser("bench-parse", help="比较大 TSV / CLI TOML 文件的单进程解析与分块并行解析")
+    p.add_argument("input", help="输入字典文件")
+    p.add_argument("--from", dest="input_format", choices=format_keys, help="输入格式，默认自动检测")
+    p.add_argument("--workers", type=int, help="并行解析的进程数，默认为 CPU 核心数")
+    p.add_argument("--chunk-size", type=float, default=16, help="每块的目标大小（MB，默认: %(default)s）")
+    p.add_argument("--repeat", type=int, default=1, help="每种方式的测量次数，取最小值 (默认: %(default)s)")
+    p.set_defaults(func=cmd_bench_parse)
+
+    p = subparsers.add_parser("memprofile", help="以内存分析模式转换文件，报告各阶段的内存占用")
+    p.add_argument("input", help="输入字典文件")
+    p.add_argument("-o", "--output", help="输出文件，省略时只转换不写入")
+    p.add_argument("--from", dest="input_format", choices=format_keys, help="输入格式，默认自动检测")
+    p.add_argument("--to", dest="output_format", choices=format_keys, help="输出格式，默认与输入相同")
+    p.add_argument("--top", type=int, default=10, help="列出的分配位置数，0 表示不统计 (默认: %(default)s)")
+    p.set_defaults(func=cmd_memprofile)
+
+    p = subparsers.add_parser("serve", help="启动常驻的本地转换服务（逐行 JSON 协议）")
+    p.add_argument("--host", default="127.0.0.1", help="监听地址 (默认: %(default)s)")
+    p.add_argument("--port", type=int, default=8765, help="监听端口 (默认: %(default)s)")
+    p.add_argument("--workers", type=int, help="处理较大请求的进程数，默认为 CPU 核心数")
+    p.set_defaults(func=cmd_serve)
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    transform.use_system_collation()
+    try:
+        return args.func(args)
+    except (OSError, ValueError) as e:
+        print(f"错误: {e}", file=sys.stderr)
+        return 1
+
+# #####################################################################
+# 4. 脚本执行入口
+# #####################################################################
+if __name__ == "__main__":
+    sys.exit(main())
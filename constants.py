@@ -18,6 +18,12 @@ APP_VERSION = "v1.3.3"
 # 语法高亮延迟时间（毫秒），用于防止在快速输入时频繁重绘
 HIGHLIGHT_DELAY_MS = 250
 
+# 检查当前打开的文件是否被外部程序修改的间隔（毫秒）
+FILE_WATCH_INTERVAL_MS = 1000
+
+# 停止输入多久之后（毫秒）在后台实时转换
+LIVE_CONVERT_DELAY_MS = 400
+
 
 # #####################################################################
 # 3. UI相关常量
@@ -42,6 +48,7 @@ EDITOR_STYLE = {
 
 # 统一管理所有支持的字典格式定义
 # 每个格式都包含一个用户友好的名称和一个默认文件扩展名
+# 标记了 "binary" 的格式以字节形式读写，不能在文本编辑器中直接编辑
 FORMAT_DEFINITIONS = {
     "AiNiee_JSON": {
         "name": "AiNiee/LinguaGacha JSON格式",
@@ -59,4 +66,9 @@ FORMAT_DEFINITIONS = {
         "name": "GalTransl TSV格式",
         "ext": ".txt"
     },
+    "GDX_Binary": {
+        "name": "GDX 索引二进制格式",
+        "ext": ".gdx",
+        "binary": True
+    },
 }
\ No newline at end of file
@@ -1,2 +1,13 @@
-# This file can be empty.
-# It marks the 'core' directory as a Python package.
\ No newline at end of file
+"""
+字典格式转换的核心逻辑，不依赖任何 GUI 库。
+
+包级别导出 core.api 中的读写接口，供其他 Python 程序直接嵌入使用，
+例如 core.load(path)、core.dump(entries, path, fmt)、core.iter_entries(path) 与 core.detect(path)。
+"""
+
+from core.api import (
+    DictData, DictEntry, detect, detect_text, dump, dumps, formats, iter_entries, load, loads, resolve_format,
+)
+
+__all__ = ["DictEntry", "DictData", "formats", "resolve_format", "detect", "detect_text",
+           "load", "loads", "iter_entries", "dump", "dumps"]
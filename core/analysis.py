@@ -0,0 +1,71 @@
+"""
+该模块提供字典条目之间的遮蔽（包含关系）分析。
+当一个条目的 org 是另一个条目 org 的子串时，按顺序逐条替换的工具会先替换短的 org，
+导致长的 org 再也无法匹配。本模块利用 core.matcher 的字典树在近线性时间内找出所有这样的条目对。
+"""
+
+from typing import List, NamedTuple
+
+from core.conversion import DictData
+from core.matcher import KeywordTrie
+
+
+class ShadowPair(NamedTuple):
+    """
+    一对存在包含关系的条目。
+
+    Attributes:
+        outer: org 较长（包含另一方）的条目在列表中的位置。
+        inner: org 较短（被包含）的条目在列表中的位置。
+        shadowed: inner 排在 outer 之前时为 True，此时顺序替换会使 outer 失效。
+    """
+    outer: int
+    inner: int
+    shadowed: bool
+
+
+def find_shadow_pairs(entries: DictData) -> List[ShadowPair]:
+    """
+    找出所有 org 互相包含的条目对。
+
+    所有不同的 org 构建为一棵字典树，再从每个 org 的每个位置出发沿字典树向下匹配，
+    途经的每个关键字结尾都意味着一个被包含的 org。耗时与所有 org 的总长度、
+    匹配深度及结果数量成正比，而不是条目数的平方。
+
+    Args:
+        entries: 字典条目列表。org 相同的条目只以首次出现的条目参与比较。
+
+    Returns:
+        按 outer、inner 顺序排列的 ShadowPair 列表。
+    """
+    first_index = {}
+    for i, item in enumerate(entries):
+        if item['org']:
+            first_index.setdefault(item['org'], i)
+    keys = list(first_index)
+    if len(keys) < 2:
+        return []
+
+    trie = KeywordTrie(keys)
+    pairs = set()
+    for key_index, key in enumerate(keys):
+        for _, _, inner_key in trie.iter_within(key):
+            pairs.add((key_index, inner_key))
+
+    result = []
+    for outer_key, inner_key in pairs:
+        outer = first_index[keys[outer_key]]
+        inner = first_index[keys[inner_key]]
+        result.append(ShadowPair(outer, inner, inner < outer))
+    result.sort()
+    return result
+
+
+def sort_by_org_length(entries: DictData) -> DictData:
+    """
+    按 org 长度从长到短稳定排序，使较长的 org 总是先于它所包含的较短 org 被替换。
+
+    Returns:
+        排序后的新列表；org 长度相同的条目保持原有顺序。
+    """
+    return sorted(entries, key=lambda item: len(item['org']), reverse=True)
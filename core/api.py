@@ -0,0 +1,170 @@
+"""
+该模块提供供其他 Python 程序嵌入使用的字典读写接口。
+
+它只依赖标准库与 core.conversion，不会导入任何 GUI 库（tkinter、ttkbootstrap、tkinterdnd2），
+导入耗时在 cli.py selfcheck 中检查。这些函数同时从 core 包中导出:
+
+    import core
+    entries = core.load("dict.json")
+    core.dump(entries, "dict.toml", "GPPGUI_TOML")
+
+格式可以使用键名（如 "GalTransl_TSV"）或界面上的显示名称。
+"""
+
+import os
+from typing import Iterator, List, Optional
+
+from constants import FORMAT_DEFINITIONS
+from core import conversion
+from core.conversion import DictData, DictEntry
+
+__all__ = ["DictEntry", "DictData", "formats", "resolve_format", "detect", "detect_text",
+           "load", "loads", "iter_entries", "dump", "dumps"]
+
+
+def resolve_format(fmt: str) -> str:
+    """
+    将格式键名或显示名称转换为键名。
+
+    Raises:
+        ValueError: 如果格式未知。
+    """
+    key = conversion.get_format_key(fmt) or conversion.get_format_key(fmt, display_name=True)
+    if not key:
+        raise ValueError(f"未知的字典格式: {fmt}（可用格式: {', '.join(FORMAT_DEFINITIONS)}）")
+    return key
+
+
+def formats() -> List[str]:
+    """返回所有支持的格式键名。"""
+    return list(FORMAT_DEFINITIONS)
+
+
+def detect(path: str) -> str:
+    """
+    检测字典文件的格式。
+
+    Returns:
+        格式键名。
+
+    Raises:
+        OSError: 如果文件无法读取。
+        ValueError: 如果无法识别文件格式。
+    """
+    return conversion.detect_file_format(path)
+
+
+def detect_text(content: str) -> Optional[str]:
+    """检测文本内容的格式，返回格式键名；无法识别时返回 None。"""
+    name = conversion.detect_format(content)
+    return conversion.get_format_key(name, display_name=True) if name else None
+
+
+def loads(content: str, fmt: Optional[str] = None) -> DictData:
+    """
+    解析文本内容。
+
+    Args:
+        content: 字典文本。
+        fmt: 格式，默认自动检测。
+
+    Raises:
+        ValueError: 如果无法识别格式或解析失败。
+    """
+    if fmt is None:
+        key = detect_text(content)
+        if key is None:
+            raise ValueError("无法自动检测内容的格式。")
+    else:
+        key = resolve_format(fmt)
+    return conversion.parse_input(content, key)
+
+
+def iter_entries(path: str, fmt: Optional[str] = None) -> Iterator[DictEntry]:
+    """
+    逐个读取字典文件中的条目。GalTransl TSV 文件逐行流式读取，其他格式整体解析后逐个产出。
+
+    Args:
+        path: 字典文件路径。
+        fmt: 格式，默认自动检测。
+
+    Raises:
+        OSError: 如果文件无法读取。
+        ValueError: 如果无法识别格式或解析失败。
+    """
+    from core.transform import iter_read_entries
+    key = resolve_format(fmt) if fmt is not None else detect(path)
+    return iter_read_entries(path, key)
+
+
+def load(path: str, fmt: Optional[str] = None, parallel: bool = False) -> DictData:
+    """
+    读取整个字典文件。
+
+    Args:
+        path: 字典文件路径，支持文本格式与二进制格式。
+        fmt: 格式，默认自动检测。
+        parallel: 为 True 时，GalTransl TSV 与 GPP CLI TOML 大文件分块后在多个进程中并行解析
+            （见 core.chunked），结果与单进程解析相同。
+
+    Raises:
+        OSError: 如果文件无法读取。
+        ValueError: 如果无法识别格式或解析失败。
+    """
+    if parallel:
+        from core import chunked
+        key = resolve_format(fmt) if fmt is not None else detect(path)
+        if key in chunked.PARALLEL_FORMATS:
+            return chunked.parse_file(path, key)
+        return list(iter_entries(path, key))
+    return list(iter_entries(path, fmt))
+
+
+def dumps(entries: DictData, fmt: str) -> str:
+    """
+    将条目格式化为文本。
+
+    Raises:
+        ValueError: 如果格式无效或为二进制格式。
+    """
+    return conversion.format_output(entries, resolve_format(fmt))
+
+
+def dump(entries: DictData, path: str, fmt: Optional[str] = None):
+    """
+    将条目写入字典文件。先写入临时文件再替换，写入失败不会破坏原文件。
+
+    Args:
+        entries: 字典条目列表。
+        path: 输出文件路径。
+        fmt: 格式，默认根据扩展名选择（.json、.toml、.txt 与 .gdx 分别对应 AiNiee JSON、
+            GPP GUI TOML、GalTransl TSV 与 GDX 二进制格式）。
+
+    Raises:
+        OSError: 如果文件无法写入。
+        ValueError: 如果格式无效或无法根据扩展名确定格式。
+    """
+    if fmt is None:
+        ext = os.path.splitext(path)[1].lower()
+        key = next((k for k, v in FORMAT_DEFINITIONS.items() if v["ext"] == ext), None)
+        if key is None:
+            raise ValueError(f"无法根据扩展名确定输出格式: {path}")
+    else:
+        key = resolve_format(fmt)
+
+    tmp_path = path + ".tmp"
+    try:
+        if conversion.is_binary_format(key):
+            with open(tmp_path, 'wb') as f:
+                f.write(conversion.serialize_binary(entries, key))
+        else:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                for chunk in conversion.iter_format_output(entries, key):
+                    f.write(chunk)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
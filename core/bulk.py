@@ -0,0 +1,345 @@
+"""
+该模块提供大量小字典文件的批量格式转换。
+
+对于成千上万个只有几条条目的字典（如按角色拆分的字典），打开和关闭文件的开销远大于解析本身，
+因此转换按流水线方式进行:
+
+    读取（线程池，多个文件同时读取） -> 解析与格式化（进程池，每次处理一批文件）
+        -> 写入（线程池，等待写入的文件数有上限）
+
+各阶段由 asyncio 协调，通过有界队列相连：写入跟不上时会暂停读取，内存占用与文件总数无关。
+"""
+
+import asyncio
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+from constants import FORMAT_DEFINITIONS
+from core import conversion
+
+# 输出文件的目录布局
+LAYOUT_MIRROR = "mirror"
+LAYOUT_FLAT = "flat"
+LAYOUT_BESIDE = "beside"
+LAYOUTS = (LAYOUT_MIRROR, LAYOUT_FLAT, LAYOUT_BESIDE)
+
+# 同时进行的读取/写入数
+DEFAULT_CONCURRENCY = 32
+# 每个进程池任务处理的文件数，批量提交可以摊薄进程间通信的开销
+DEFAULT_BATCH_SIZE = 64
+# 已转换但尚未写入的文件数上限
+DEFAULT_MAX_PENDING_WRITES = 256
+
+
+class BulkJob(NamedTuple):
+    """一个待转换的文件。"""
+    source: str
+    target: str
+
+
+class BulkReport(NamedTuple):
+    """
+    批量转换的结果。
+
+    Attributes:
+        files: 待转换的文件数。
+        converted: 成功写入的文件数。
+        entries: 写入的条目总数。
+        failures: 失败的 (文件路径, 错误信息) 列表。
+        elapsed: 总耗时（秒）。
+    """
+    files: int
+    converted: int
+    entries: int
+    failures: List[Tuple[str, str]]
+    elapsed: float
+
+    @property
+    def files_per_second(self) -> float:
+        return self.files / self.elapsed if self.elapsed > 0 else 0.0
+
+
+def _path_key(path: str) -> str:
+    return os.path.normcase(os.path.abspath(path))
+
+
+def iter_dictionary_files(paths: Iterable[str], exclude_dir: Optional[str] = None) -> Iterable[Tuple[str, str]]:
+    """
+    展开输入路径：目录递归查找其中所有支持的字典文件，文件原样保留。
+
+    Args:
+        paths: 输入文件或目录。
+        exclude_dir: 递归查找时跳过的子目录，如位于输入目录中的输出目录。
+
+    Returns:
+        (文件路径, 该文件所在的输入根目录) 的迭代器，按路径排序。
+    """
+    extensions = tuple({v["ext"] for v in FORMAT_DEFINITIONS.values()})
+    excluded = _path_key(exclude_dir) if exclude_dir else None
+    for path in paths:
+        if not os.path.isdir(path):
+            yield path, os.path.dirname(path)
+            continue
+        for root, dirs, files in os.walk(path):
+            dirs[:] = sorted(d for d in dirs if _path_key(os.path.join(root, d)) != excluded)
+            for name in sorted(files):
+                if name.lower().endswith(extensions):
+                    yield os.path.join(root, name), path
+
+
+def plan_jobs(paths: Iterable[str], output_key: str, output_dir: Optional[str] = None,
+              layout: str = LAYOUT_MIRROR) -> List[BulkJob]:
+    """
+    根据输出布局确定每个文件的输出路径，输出文件的扩展名与输出格式一致。
+
+    Args:
+        paths: 输入文件或目录。
+        output_key: 输出格式的键名。
+        output_dir: 输出目录；layout 为 LAYOUT_BESIDE 时忽略。
+        layout: LAYOUT_MIRROR 在输出目录中保留输入目录的结构；LAYOUT_FLAT 将所有文件放在输出目录下；
+            LAYOUT_BESIDE 将输出文件写在输入文件旁边。
+
+    输出目录位于输入目录中时不会查找其中的文件，以免把上次的输出当作输入。
+    输出路径就是输入文件本身时（如 LAYOUT_BESIDE 下扩展名与输出格式相同的文件，
+    包括上次转换的输出），跳过该文件，不会覆盖原文件。
+
+    Raises:
+        ValueError: 如果布局无效、缺少输出目录，或多个输入文件对应同一个输出路径。
+    """
+    if layout not in LAYOUTS:
+        raise ValueError(f"不支持的输出布局: {layout}")
+    if layout != LAYOUT_BESIDE and not output_dir:
+        raise ValueError("需要指定输出目录")
+    ext = FORMAT_DEFINITIONS[output_key]["ext"]
+
+    jobs = []
+    sources = {}
+    for path, root in iter_dictionary_files(paths, None if layout == LAYOUT_BESIDE else output_dir):
+        stem = os.path.splitext(os.path.basename(path))[0] + ext
+        if layout == LAYOUT_BESIDE:
+            target = os.path.join(os.path.dirname(path), stem)
+        elif layout == LAYOUT_FLAT:
+            target = os.path.join(output_dir, stem)
+        else:
+            relative_dir = os.path.dirname(os.path.relpath(path, root))
+            target = os.path.join(output_dir, relative_dir, stem)
+        key = _path_key(target)
+        if key == _path_key(path):
+            continue
+        if key in sources:
+            raise ValueError(f"多个输入文件对应同一个输出文件 {target}: {sources[key]}, {path}")
+        sources[key] = path
+        jobs.append(BulkJob(path, target))
+    return jobs
+
+
+# -------------------------------------------------------------
+# 各阶段的处理函数（在线程池或工作进程中执行）
+# -------------------------------------------------------------
+def _read(path: str) -> bytes:
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def convert_data(data: bytes, input_key: Optional[str], output_key: str) -> Tuple[object, int]:
+    """
+    转换一个文件的内容。
+
+    Args:
+        data: 文件的原始字节。
+        input_key: 输入格式，None 表示自动检测。
+        output_key: 输出格式。
+
+    Returns:
+        (输出内容, 条目数)；文本格式的输出为 str，二进制格式为 bytes。
+
+    Raises:
+        ValueError: 如果无法识别格式或解析失败。
+    """
+    key = input_key or conversion.detect_binary_format(data[:16])
+    if key and conversion.is_binary_format(key):
+        entries = conversion.parse_binary(data, key)
+    else:
+        content = data.decode('utf-8-sig')
+        if key is None:
+            detected = conversion.detect_format(content)
+            key = conversion.get_format_key(detected, display_name=True) if detected else None
+            if key is None:
+                raise ValueError("无法自动检测文件格式")
+        entries = conversion.parse_input(content, key)
+    if conversion.is_binary_format(output_key):
+        return conversion.serialize_binary(entries, output_key), len(entries)
+    return conversion.format_output(entries, output_key), len(entries)
+
+
+def _convert_batch(items: Sequence[bytes], input_key: Optional[str], output_key: str) -> list:
+    """转换一批文件的内容，返回每个文件的 (是否成功, 输出内容或错误信息, 条目数)。"""
+    results = []
+    for data in items:
+        try:
+            output, count = convert_data(data, input_key, output_key)
+            results.append((True, output, count))
+        except (ValueError, UnicodeDecodeError, ImportError) as e:
+            results.append((False, str(e) or type(e).__name__, 0))
+    return results
+
+
+def _write(path: str, output):
+    """先写入临时文件再替换，写入失败不会留下只写了一半的文件。"""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = path + ".tmp"
+    try:
+        if isinstance(output, bytes):
+            with open(tmp_path, 'wb') as f:
+                f.write(output)
+        else:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(output)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+# -------------------------------------------------------------
+# 流水线
+# -------------------------------------------------------------
+async def convert_jobs(jobs: Sequence[BulkJob], output_key: str, input_key: Optional[str] = None,
+                       concurrency: int = DEFAULT_CONCURRENCY, workers: Optional[int] = None,
+                       batch_size: int = DEFAULT_BATCH_SIZE,
+                       max_pending_writes: int = DEFAULT_MAX_PENDING_WRITES,
+                       on_progress: Optional[Callable[[int, int], None]] = None) -> BulkReport:
+    """
+    以流水线方式转换多个文件。单个文件失败不影响其他文件。
+
+    Args:
+        jobs: plan_jobs 返回的任务列表。
+        output_key: 输出格式的键名。
+        input_key: 输入格式的键名，None 表示逐个文件自动检测。
+        concurrency: 同时进行的读取数与写入数。
+        workers: 解析与格式化的进程数，默认为 CPU 核心数；为 0 时在线程池中处理。
+        batch_size: 每个进程池任务处理的文件数。
+        max_pending_writes: 已转换但尚未写入的文件数上限，达到上限时暂停读取与转换。
+        on_progress: 每完成一个文件（无论成功与否）时调用，参数为 (已完成数, 总数)。
+    """
+    start = time.perf_counter()
+    total = len(jobs)
+    concurrency = max(1, concurrency)
+    batch_size = max(1, batch_size)
+    workers = (os.cpu_count() or 1) if workers is None else workers
+    workers = min(workers, -(-total // batch_size))
+    loop = asyncio.get_running_loop()
+
+    io_pool = ThreadPoolExecutor(max_workers=concurrency * 2, thread_name_prefix="bulk-io")
+    cpu_pool = ProcessPoolExecutor(max_workers=workers) if workers > 0 else io_pool
+    converters = max(1, workers) * 2
+
+    # 各阶段之间的有界队列，None 表示上游已结束
+    read_queue: asyncio.Queue = asyncio.Queue(maxsize=batch_size * converters)
+    write_queue: asyncio.Queue = asyncio.Queue(maxsize=max(1, max_pending_writes))
+    pending = iter(jobs)
+    failures: List[Tuple[str, str]] = []
+    counts = {"done": 0, "converted": 0, "entries": 0}
+
+    def finish(job: BulkJob, error: Optional[str] = None, entries: int = 0):
+        counts["done"] += 1
+        if error is None:
+            counts["converted"] += 1
+            counts["entries"] += entries
+        else:
+            failures.append((job.source, error))
+        if on_progress:
+            on_progress(counts["done"], total)
+
+    async def reader():
+        # 多个 reader 从同一个迭代器中依次取出任务
+        for job in pending:
+            try:
+                data = await loop.run_in_executor(io_pool, _read, job.source)
+            except OSError as e:
+                finish(job, str(e))
+                continue
+            await read_queue.put((job, data))
+
+    async def converter():
+        while True:
+            item = await read_queue.get()
+            if item is None:
+                # 把结束标记放回去，留给其他 converter
+                read_queue.put_nowait(None)
+                return
+            batch = [item]
+            while len(batch) < batch_size and not read_queue.empty():
+                item = read_queue.get_nowait()
+                if item is None:
+                    read_queue.put_nowait(None)
+                    break
+                batch.append(item)
+            payload = [data for _, data in batch]
+            try:
+                results = await loop.run_in_executor(cpu_pool, _convert_batch, payload, input_key, output_key)
+            except Exception as e:
+                results = [(False, f"{type(e).__name__}: {e}", 0)] * len(batch)
+            for (job, _), (ok, output, count) in zip(batch, results):
+                if ok:
+                    await write_queue.put((job, output, count))
+                else:
+                    finish(job, output)
+
+    async def writer():
+        while True:
+            item = await write_queue.get()
+            if item is None:
+                return
+            job, output, count = item
+            try:
+                await loop.run_in_executor(io_pool, _write, job.target, output)
+            except OSError as e:
+                finish(job, str(e))
+            else:
+                finish(job, entries=count)
+
+    try:
+        writers = [asyncio.ensure_future(writer()) for _ in range(concurrency)]
+        converter_tasks = [asyncio.ensure_future(converter()) for _ in range(converters)]
+        await asyncio.gather(*(reader() for _ in range(concurrency)))
+        await read_queue.put(None)
+        await asyncio.gather(*converter_tasks)
+        for _ in writers:
+            await write_queue.put(None)
+        await asyncio.gather(*writers)
+    finally:
+        if cpu_pool is not io_pool:
+            cpu_pool.shutdown(cancel_futures=True)
+        io_pool.shutdown()
+
+    return BulkReport(total, counts["converted"], counts["entries"], failures, time.perf_counter() - start)
+
+
+def bulk_convert(paths: Iterable[str], output_key: str, output_dir: Optional[str] = None,
+                 layout: str = LAYOUT_MIRROR, input_key: Optional[str] = None, **kwargs) -> BulkReport:
+    """
+    批量转换文件或目录中的所有字典文件。
+
+    Args:
+        paths: 输入文件或目录。
+        output_key: 输出格式的键名。
+        output_dir: 输出目录。
+        layout: 输出布局（见 plan_jobs）。
+        input_key: 输入格式的键名，None 表示逐个文件自动检测。
+        **kwargs: 传给 convert_jobs 的并发参数。
+
+    Raises:
+        ValueError: 如果布局无效或输出路径冲突。
+    """
+    jobs = plan_jobs(paths, output_key, output_dir, layout)
+    if not jobs:
+        return BulkReport(0, 0, 0, [], 0.0)
+    return asyncio.run(convert_jobs(jobs, output_key, input_key, **kwargs))
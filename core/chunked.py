@@ -0,0 +1,155 @@
+"""
+该模块提供超大 GalTransl TSV 与 GPP CLI TOML 文件的分块并行解析。
+
+这两种格式都由互不依赖的记录组成：TSV 的每一行，CLI TOML 中以独占一行的 [[gptDict]] 开始的每个表。
+文件以内存映射方式打开，在目标大小附近向后找到最近的记录边界切分为若干块；
+各工作进程自行映射同一个文件并只解码和解析分到的字节范围，父进程无需读取或传递文件内容，
+最后按块的顺序拼接结果，与 conversion.parse_input 的结果完全一致。
+
+工作进程把每块的全部字段连接为一个字符串返回，进程间传输只需复制一次内存，
+比逐个序列化字典或字符串快得多；父进程拆分后重建条目。
+"""
+
+import mmap
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator, List, Optional, Tuple, Union
+
+from core import conversion
+from core.conversion import DictData, DictEntry
+from utils.tracing import span
+
+# 支持分块并行解析的格式
+PARALLEL_FORMATS = ("GalTransl_TSV", "GPPCLI_TOML")
+# 每块的目标大小（字节）
+DEFAULT_CHUNK_SIZE = 16 * 1024 * 1024
+# 小于该大小的文件直接在当前进程中解析，启动进程池的开销大于并行带来的收益
+MIN_PARALLEL_SIZE = 8 * 1024 * 1024
+
+# 工作进程返回结果时连接各字段的分隔符
+_FIELD_SEP = "\x00"
+
+# 与 core.incremental 的记录规则一致：[[gptDict]] 独占一行时才是新记录的开始
+_CLI_TOML_RECORD_RE = re.compile(rb'^[ \t]*\[\[gptDict\]\][ \t]*\r?$', re.MULTILINE)
+
+
+def chunk_bounds(buf, format_key: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> List[Tuple[int, int]]:
+    """
+    将文件内容按记录边界切分为大小约为 chunk_size 的若干块。
+
+    Args:
+        buf: 文件内容（bytes 或 mmap）。
+        format_key: 格式键名，必须是 PARALLEL_FORMATS 之一。
+        chunk_size: 每块的目标大小（字节）。
+
+    Returns:
+        按顺序排列的 (起始偏移, 结束偏移) 列表，首尾相接并覆盖整个文件。
+
+    Raises:
+        ValueError: 如果格式不支持分块解析。
+    """
+    if format_key not in PARALLEL_FORMATS:
+        raise ValueError(f"该格式不支持分块并行解析: {format_key}")
+    size = len(buf)
+    chunk_size = max(1, chunk_size)
+    bounds = []
+    start = 0
+    while start < size:
+        target = start + chunk_size
+        if target >= size:
+            end = size
+        elif format_key == "GalTransl_TSV":
+            # 换行符之后一定是新的一行，也一定是 UTF-8 字符的边界
+            newline = buf.find(b"\n", target)
+            end = size if newline < 0 else newline + 1
+        else:
+            # 从目标位置所在行的下一行开始查找记录的起始行
+            newline = buf.find(b"\n", target)
+            match = _CLI_TOML_RECORD_RE.search(buf, newline + 1) if newline >= 0 else None
+            end = match.start() if match else size
+        bounds.append((start, end))
+        start = end
+    return bounds
+
+
+# -------------------------------------------------------------
+# 工作进程
+# -------------------------------------------------------------
+def _parse_range(path: str, start: int, end: int, format_key: str) -> Union[str, List[str]]:
+    """
+    解析文件中的一段字节，返回以 _FIELD_SEP 连接的 org, rep, note, org, ... 字符串；
+    字段中含有分隔符时返回字段列表。
+    """
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        text = mm[start:end].decode('utf-8')
+    flat = []
+    for item in conversion.parse_input(text, format_key):
+        flat += (item['org'], item['rep'], item['note'])
+    joined = _FIELD_SEP.join(flat)
+    if flat and joined.count(_FIELD_SEP) != len(flat) - 1:
+        return flat
+    return joined
+
+
+def _unpack(result: Union[str, List[str]]) -> Iterator[DictEntry]:
+    it = iter(result.split(_FIELD_SEP) if isinstance(result, str) else result)
+    return ({'org': org, 'rep': rep, 'note': note} for org, rep, note in zip(it, it, it))
+
+
+# -------------------------------------------------------------
+# 公共接口
+# -------------------------------------------------------------
+def _parse_serial(path: str, format_key: str) -> DictData:
+    with open(path, 'r', encoding='utf-8-sig') as f:
+        return conversion.parse_input(f.read(), format_key)
+
+
+def parse_file(path: str, format_key: str, workers: Optional[int] = None,
+               chunk_size: int = DEFAULT_CHUNK_SIZE, min_size: int = MIN_PARALLEL_SIZE) -> DictData:
+    """
+    分块并行解析 TSV 或 CLI TOML 字典文件，结果与 conversion.parse_input 相同。
+
+    CLI TOML 的某一块无法单独解析时（如多行字符串中有独占一行的 [[gptDict]]），
+    退回到对整个文件的单进程解析，保证结果与错误信息都与单进程解析一致。
+
+    Args:
+        path: 字典文件路径。
+        format_key: 格式键名，必须是 PARALLEL_FORMATS 之一。
+        workers: 工作进程数，默认为 CPU 核心数。为 1、文件小于 min_size 或只有一块时在当前进程中解析。
+        chunk_size: 每块的目标大小（字节）。
+        min_size: 启用并行解析的最小文件大小（字节）。
+
+    Returns:
+        解析得到的条目列表。
+
+    Raises:
+        OSError: 如果文件无法读取。
+        ValueError: 如果格式不支持分块解析，或文件内容无法解析。
+    """
+    if format_key not in PARALLEL_FORMATS:
+        raise ValueError(f"该格式不支持分块并行解析: {format_key}")
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1 or os.path.getsize(path) < max(1, min_size):
+        return _parse_serial(path, format_key)
+
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        bounds = chunk_bounds(mm, format_key, chunk_size)
+    if len(bounds) <= 1:
+        return _parse_serial(path, format_key)
+
+    data: DictData = []
+    with span("分块并行解析"):
+        with ProcessPoolExecutor(max_workers=min(workers, len(bounds))) as pool:
+            futures = [pool.submit(_parse_range, path, start, end, format_key) for start, end in bounds]
+            try:
+                # 按块的顺序合并；合并前面的块时，后面的块仍在其他进程中解析
+                for future in futures:
+                    data.extend(_unpack(future.result()))
+            except ValueError:
+                for future in futures:
+                    future.cancel()
+                data = None
+    if data is None:
+        return _parse_serial(path, format_key)
+    return data
@@ -5,16 +5,26 @@
 
 import json
 import re
-from typing import List, Dict, Optional
-import toml
+from typing import Dict, Iterable, Iterator, List, Optional
 
 # 从项目模块导入常量
 from constants import FORMAT_DEFINITIONS
+from utils.tracing import span
 
 # 定义标准化的内部数据结构类型别名
 DictEntry = Dict[str, str]
 DictData = List[DictEntry]
 
+def _toml():
+    """
+    按需导入 TOML 解析模块。
+    只有在真正解析 TOML 内容时才需要它，延迟导入可以缩短程序启动时间。
+    使用标准库的 tomllib：第三方 toml 库在同一个数组中混用单引号与双引号字符串，
+    或字符串中含有方括号、反斜杠时，会不报错地丢失条目。
+    """
+    import tomllib
+    return tomllib
+
 def get_format_key(name: str, display_name: bool = False) -> Optional[str]:
     """
     根据格式的显示名称或内部键名查找其内部键名。
@@ -34,6 +44,53 @@ def get_format_key(name: str, display_name: bool = False) -> Optional[str]:
     
     return name if name in FORMAT_DEFINITIONS else None
 
+def is_binary_format(format_key: Optional[str]) -> bool:
+    """判断给定格式是否为二进制格式。"""
+    return bool(FORMAT_DEFINITIONS.get(format_key, {}).get("binary"))
+
+def text_format_names() -> List[str]:
+    """返回所有可以在文本编辑器中编辑的格式的显示名称。"""
+    return [v["name"] for v in FORMAT_DEFINITIONS.values() if not v.get("binary")]
+
+def detect_binary_format(head: bytes) -> Optional[str]:
+    """
+    根据文件开头的字节检测二进制格式。
+
+    Args:
+        head: 文件开头的若干字节。
+
+    Returns:
+        如果是已知的二进制格式，返回其格式键名，否则返回None。
+    """
+    from core import gdx
+    if gdx.is_gdx(head):
+        return "GDX_Binary"
+    return None
+
+def parse_binary(data: bytes, format_key: str) -> DictData:
+    """
+    将二进制格式的数据解析为标准的内部数据结构。
+
+    Raises:
+        ValueError: 如果格式键无效或数据已损坏。
+    """
+    if format_key == "GDX_Binary":
+        from core import gdx
+        return gdx.loads(data)
+    raise ValueError(f"不支持的二进制输入格式: {format_key}")
+
+def serialize_binary(data: DictData, format_key: str) -> bytes:
+    """
+    将标准的内部数据结构编码为二进制格式。
+
+    Raises:
+        ValueError: 如果格式键无效。
+    """
+    if format_key == "GDX_Binary":
+        from core import gdx
+        return gdx.dumps(data)
+    raise ValueError(f"不支持的二进制输出格式: {format_key}")
+
 def detect_format(content: str) -> Optional[str]:
     """
     根据文件内容自动检测其格式。
@@ -51,12 +108,13 @@ def detect_format(content: str) -> Optional[str]:
     # 1. 优先判断 TOML 格式
     # 检查 TOML 特有的关键字和结构
     if 'gptDict' in content or '[[gptDict]]' in content or content.startswith('gptDict'):
+        toml = _toml()
         try:
             toml.loads(content)
             if '[[gptDict]]' in content:
                 return FORMAT_DEFINITIONS["GPPCLI_TOML"]["name"]
             return FORMAT_DEFINITIONS["GPPGUI_TOML"]["name"]
-        except toml.TomlDecodeError:
+        except toml.TOMLDecodeError:
             # 即使关键字匹配，如果解析失败，也不将其识别为 TOML
             pass
             
@@ -86,6 +144,56 @@ def detect_format(content: str) -> Optional[str]:
             
     return None
 
+def detect_file_format(path: str) -> str:
+    """
+    检测字典文件的格式键名，同时支持二进制格式和文本格式。
+
+    Args:
+        path: 字典文件路径。
+
+    Returns:
+        文件的格式键名。
+
+    Raises:
+        ValueError: 如果无法识别文件格式。
+    """
+    with open(path, 'rb') as f:
+        binary_key = detect_binary_format(f.read(16))
+    if binary_key:
+        return binary_key
+    with open(path, 'r', encoding='utf-8-sig') as f:
+        detected = detect_format(f.read())
+    format_key = get_format_key(detected, display_name=True) if detected else None
+    if not format_key:
+        raise ValueError(f"无法自动检测文件格式: {path}")
+    return format_key
+
+# TSV 字段分隔符：制表符，或两侧均为非空白字符的四个空格
+_TSV_SPLIT_RE = re.compile(r'\t|(?<=\S) {4}(?=\S)')
+
+def iter_parse_tsv(lines: Iterable[str]) -> Iterator[DictEntry]:
+    """
+    逐行解析 GalTransl TSV 格式，适合对大文件进行流式处理。
+
+    Args:
+        lines: 文本行的可迭代对象（如打开的文件对象）。
+
+    Yields:
+        每个有效行对应的字典条目。
+    """
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith(('//', '#')):
+            continue
+        # 使用正则表达式分割，以处理制表符或四个空格
+        parts = _TSV_SPLIT_RE.split(line, maxsplit=2)
+        if len(parts) >= 2:
+            yield {
+                'org': parts[0].strip(),
+                'rep': parts[1].strip(),
+                'note': parts[2].strip() if len(parts) > 2 else ''
+            }
+
 def parse_input(content: str, format_key: str) -> DictData:
     """
     将给定格式的文本内容解析为标准的内部数据结构。
@@ -112,32 +220,136 @@ def parse_input(content: str, format_key: str) -> DictData:
         for item in json_data:
             data.append({'org': item.get('src', ''), 'rep': item.get('dst', ''), 'note': item.get('info', '')})
     elif format_key == "GPPGUI_TOML":
-        toml_data = toml.loads(content)
+        toml_data = _toml().loads(content)
         for item in toml_data.get('gptDict', []):
             data.append({'org': item.get('org', ''), 'rep': item.get('rep', ''), 'note': item.get('note', '')})
     elif format_key == "GPPCLI_TOML":
-        toml_data = toml.loads(content)
+        toml_data = _toml().loads(content)
         for item in toml_data.get('gptDict', []):
             data.append({'org': item.get('searchStr', ''), 'rep': item.get('replaceStr', ''), 'note': item.get('note', '')})
     elif format_key == "GalTransl_TSV":
-        for line in content.splitlines():
-            line = line.strip()
-            if not line or line.startswith(('//', '#')):
-                continue
-            # 使用正则表达式分割，以处理制表符或四个空格
-            parts = re.split(r'\t|(?<=\S) {4}(?=\S)', line, maxsplit=2)
-            if len(parts) >= 2:
-                entry = {
-                    'org': parts[0].strip(),
-                    'rep': parts[1].strip(),
-                    'note': parts[2].strip() if len(parts) > 2 else ''
-                }
-                data.append(entry)
+        data.extend(iter_parse_tsv(content.splitlines()))
+    elif is_binary_format(format_key):
+        raise ValueError(f"二进制格式无法从文本解析: {format_key}")
     else:
         raise ValueError(f"不支持的输入格式: {format_key}")
         
     return data
 
+# 各文本格式的整体布局: (开头, 条目分隔符, 结尾, 无条目时的完整输出)
+_OUTPUT_LAYOUTS = {
+    "AiNiee_JSON": ("[\n", ",\n", "\n]", "[]"),
+    "GPPGUI_TOML": ("gptDict = [\n", "\n", "\n]", "gptDict = [\n]"),
+    "GPPCLI_TOML": ("", "\n\n", "", ""),
+    "GalTransl_TSV": ("", "\n", "", ""),
+}
+
+def _toml_string(text: str) -> str:
+    """
+    将文本编码为 TOML 字符串。
+    优先使用单引号字面量字符串；字面量字符串不支持任何转义，
+    因此文本中含有单引号或控制字符（包括 DEL）时改用双引号基本字符串。
+    json.dumps 的转义都是合法的 TOML 转义，但它不转义 DEL，需要另外处理。
+    """
+    if "'" in text or "\x7f" in text or any(ch < " " and ch != "\t" for ch in text):
+        return json.dumps(text, ensure_ascii=False).replace("\x7f", "\\u007f")
+    return f"'{text}'"
+
+def format_entry(item: DictEntry, format_key: str) -> str:
+    """
+    将单个条目格式化为指定格式中对应的文本片段（不含条目之间的分隔符）。
+
+    Args:
+        item: 字典条目。
+        format_key: 目标输出格式的键名。
+
+    Returns:
+        该条目的文本。
+    """
+    if format_key == "AiNiee_JSON":
+        obj = {'src': item['org'], 'dst': item['rep'], 'info': item['note']}
+        # 与整体 json.dumps(indent=2) 的结果保持一致：数组元素整体缩进两格
+        return "  " + json.dumps(obj, ensure_ascii=False, indent=2).replace("\n", "\n  ")
+
+    elif format_key == "GPPGUI_TOML":
+        string = _toml_string
+        return f"\t{{ org = {string(item['org'])}, rep = {string(item['rep'])}, note = {string(item['note'])} }},"
+
+    elif format_key == "GPPCLI_TOML":
+        string = _toml_string
+        return (
+            f"[[gptDict]]\n"
+            f"note = {string(item['note'])}\n"
+            f"replaceStr = {string(item['rep'])}\n"
+            f"searchStr = {string(item['org'])}"
+        )
+
+    elif format_key == "GalTransl_TSV":
+        line = f"{item['org']}\t{item['rep']}"
+        if item['note']:
+            line += f"\t{item['note']}"
+        return line
+
+    elif is_binary_format(format_key):
+        raise ValueError(f"二进制格式无法输出为文本: {format_key}")
+    else:
+        raise ValueError(f"不支持的输出格式: {format_key}")
+
+def iter_format_output(data: Iterable[DictEntry], format_key: str, chunk_size: int = 1000) -> Iterator[str]:
+    """
+    以流式方式格式化条目，逐块产出输出文本。
+    所有块依次拼接后与 format_output 的结果完全相同，适合直接写入文件。
+
+    Args:
+        data: 字典条目的可迭代对象，可以是生成器。
+        format_key: 目标输出格式的键名。
+        chunk_size: 每块包含的条目数。
+
+    Yields:
+        输出文本的片段。
+
+    Raises:
+        ValueError: 如果目标格式键无效。
+    """
+    layout = _OUTPUT_LAYOUTS.get(format_key)
+    if layout is None:
+        # 交由 format_entry 给出具体的错误信息
+        format_entry({'org': '', 'rep': '', 'note': ''}, format_key)
+    header, sep, footer, empty = layout
+
+    started = False
+    chunk = []
+    for item in data:
+        chunk.append(format_entry(item, format_key))
+        if len(chunk) >= chunk_size:
+            yield (sep if started else header) + sep.join(chunk)
+            started = True
+            chunk = []
+    if chunk:
+        yield (sep if started else header) + sep.join(chunk)
+        started = True
+    yield footer if started else empty
+
+def join_entry_texts(texts: List[str], format_key: str) -> str:
+    """
+    按格式的整体布局拼接已由 format_entry 格式化的条目文本。
+    结果与对相应条目调用 format_output 完全相同。
+
+    Args:
+        texts: 各条目的文本片段。
+        format_key: 目标输出格式的键名。
+
+    Raises:
+        ValueError: 如果目标格式键无效。
+    """
+    layout = _OUTPUT_LAYOUTS.get(format_key)
+    if layout is None:
+        format_entry({'org': '', 'rep': '', 'note': ''}, format_key)
+    header, sep, footer, empty = layout
+    if not texts:
+        return empty
+    return header + sep.join(texts) + footer
+
 def format_output(data: DictData, format_key: str) -> str:
     """
     将标准的内部数据结构格式化为指定格式的文本字符串。
@@ -152,43 +364,7 @@ def format_output(data: DictData, format_key: str) -> str:
     Raises:
         ValueError: 如果目标格式键无效。
     """
-    # TOML中单引号需要转义
-    escape = lambda text: text.replace("'", "''")
-
-    if format_key == "AiNiee_JSON":
-        json_data = [{'src': item['org'], 'dst': item['rep'], 'info': item['note']} for item in data]
-        return json.dumps(json_data, ensure_ascii=False, indent=2)
-    
-    elif format_key == "GPPGUI_TOML":
-        lines = ["gptDict = ["]
-        for item in data:
-            lines.append(f"\t{{ org = '{escape(item['org'])}', rep = '{escape(item['rep'])}', note = '{escape(item['note'])}' }},")
-        lines.append("]")
-        return "\n".join(lines)
-        
-    elif format_key == "GPPCLI_TOML":
-        entries = []
-        for item in data:
-            entry_str = (
-                f"[[gptDict]]\n"
-                f"note = '{escape(item['note'])}'\n"
-                f"replaceStr = '{escape(item['rep'])}'\n"
-                f"searchStr = '{escape(item['org'])}'"
-            )
-            entries.append(entry_str)
-        return "\n\n".join(entries)
-        
-    elif format_key == "GalTransl_TSV":
-        lines = []
-        for item in data:
-            line = f"{item['org']}\t{item['rep']}"
-            if item['note']:
-                line += f"\t{item['note']}"
-            lines.append(line)
-        return "\n".join(lines)
-        
-    else:
-        raise ValueError(f"不支持的输出格式: {format_key}")
+    return "".join(iter_format_output(data, format_key))
 
 def reformat_content(content: str, format_display_name: str) -> str:
     """
@@ -208,5 +384,7 @@ def reformat_content(content: str, format_display_name: str) -> str:
 
     # 解析和重新格式化的过程可以去除格式上的不一致（如多余的空格）
     # 并保留所有数据
-    data = parse_input(content, format_key)
-    return format_output(data, format_key)
\ No newline at end of file
+    with span("解析"):
+        data = parse_input(content, format_key)
+    with span("序列化"):
+        return format_output(data, format_key)
\ No newline at end of file
@@ -0,0 +1,157 @@
+"""
+该模块提供字典在游戏脚本语料中的覆盖率统计。
+它使用 core.matcher 的多模式匹配一次扫描统计所有 org 的出现次数，
+并把脚本文件分配到进程池中并行处理，最后合并各文件的计数。
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Callable, Dict, List, Optional, Sequence
+
+from core.conversion import DictData
+from core.matcher import KeywordTrie
+from core.scripts import read_script_file
+
+# 注入到备注中的出现次数文本
+COUNT_NOTE_TEMPLATE = "出现 {count} 次"
+
+
+class CoverageResult:
+    """
+    覆盖率统计结果。
+
+    Attributes:
+        counts: 每个条目的 org 在所有脚本中出现的总次数（允许重叠），与条目列表一一对应。
+        file_counts: 每个条目的 org 出现过的脚本文件数。
+        files_scanned: 成功扫描的文件数。
+        chars_scanned: 扫描的总字符数。
+        errors: 读取或统计失败的文件及其错误信息 [(路径, 错误信息)]。
+    """
+    def __init__(self, entry_count: int):
+        self.counts: List[int] = [0] * entry_count
+        self.file_counts: List[int] = [0] * entry_count
+        self.files_scanned = 0
+        self.chars_scanned = 0
+        self.errors: List[tuple] = []
+
+    @property
+    def hit_entries(self) -> int:
+        """至少出现一次的条目数。"""
+        return sum(1 for c in self.counts if c)
+
+
+# -------------------------------------------------------------
+# 工作进程
+# -------------------------------------------------------------
+# 工作进程中的字典树，每个进程只在初始化时构建一次
+_worker_trie: Optional[KeywordTrie] = None
+
+def _init_worker(orgs: List[str]):
+    global _worker_trie
+    _worker_trie = KeywordTrie(orgs)
+
+def _count_file(path: str, trie: Optional[KeywordTrie] = None) -> tuple:
+    """统计单个文件中各关键字的出现次数，返回 (路径, 字符数, {关键字位置: 次数}, 错误信息)。"""
+    try:
+        text = read_script_file(path)
+    except OSError as e:
+        return path, 0, {}, str(e)
+    try:
+        return path, len(text), (trie or _worker_trie).count_all(text), None
+    except Exception as e:
+        # 单个文件统计失败（如内存不足）只记为该文件的错误，不影响其他文件
+        return path, 0, {}, f"{type(e).__name__}: {e}"
+
+
+# -------------------------------------------------------------
+# 公共接口
+# -------------------------------------------------------------
+def count_coverage(entries: DictData, paths: Sequence[str], workers: Optional[int] = None,
+                   progress: Optional[Callable[[int, int], None]] = None,
+                   cancelled: Optional[Callable[[], bool]] = None) -> CoverageResult:
+    """
+    统计每个条目的 org 在一组脚本文件中的出现次数。
+
+    Args:
+        entries: 字典条目列表。org 相同的条目会得到相同的计数。
+        paths: 脚本文件路径列表。
+        workers: 工作进程数，默认为 CPU 核心数。为 1 或只有一个文件时在当前进程中执行。
+        progress: 可选的回调函数，每处理完一个文件调用一次，参数为 (已完成文件数, 总文件数)。
+        cancelled: 可选的函数，返回 True 时停止提交剩余文件并尽快返回已合并的结果。
+
+    Returns:
+        CoverageResult 统计结果。
+    """
+    orgs = [item['org'] for item in entries]
+    result = CoverageResult(len(entries))
+    if not paths or not entries:
+        return result
+
+    # 关键字位置 -> 所有 org 相同的条目位置
+    trie_positions: Dict[int, List[int]] = {}
+    first_index: Dict[str, int] = {}
+    for i, org in enumerate(orgs):
+        if org:
+            trie_positions.setdefault(first_index.setdefault(org, i), []).append(i)
+
+    def merge(path: str, chars: int, counts: dict, error: Optional[str]):
+        if error is not None:
+            result.errors.append((path, error))
+            return
+        result.files_scanned += 1
+        result.chars_scanned += chars
+        for key_index, n in counts.items():
+            for i in trie_positions[key_index]:
+                result.counts[i] += n
+                result.file_counts[i] += 1
+
+    workers = min(workers or os.cpu_count() or 1, len(paths))
+    done = 0
+    if workers <= 1:
+        trie = KeywordTrie(orgs)
+        for path in paths:
+            if cancelled and cancelled():
+                break
+            merge(*_count_file(path, trie))
+            done += 1
+            if progress:
+                progress(done, len(paths))
+        return result
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(orgs,)) as pool:
+        futures = {pool.submit(_count_file, path): path for path in paths}
+        for future in as_completed(futures):
+            try:
+                file_result = future.result()
+            except Exception as e:
+                # 工作进程异常退出（BrokenProcessPool）等：记为该文件的错误，继续合并其他文件
+                file_result = (futures[future], 0, {}, f"{type(e).__name__}: {e}")
+            merge(*file_result)
+            done += 1
+            if progress:
+                progress(done, len(paths))
+            if cancelled and cancelled():
+                for f in futures:
+                    f.cancel()
+                break
+    return result
+
+
+def annotate_entries(entries: DictData, counts: Sequence[int], template: str = COUNT_NOTE_TEMPLATE) -> DictData:
+    """
+    将出现次数写入每个条目的备注开头，便于以任意输出格式导出。
+
+    Args:
+        entries: 字典条目列表。
+        counts: 与条目一一对应的出现次数。
+        template: 次数文本的模板，可使用 {count} 占位符。
+
+    Returns:
+        新的条目列表，原列表不会被修改。
+    """
+    annotated = []
+    for item, count in zip(entries, counts):
+        label = template.format(count=count)
+        note = f"{label} {item['note']}" if item['note'] else label
+        annotated.append({'org': item['org'], 'rep': item['rep'], 'note': note})
+    return annotated
@@ -0,0 +1,254 @@
+"""
+该模块实现了快速跳转面板使用的条目模糊查找索引。
+
+索引对每个条目的 org/rep/note（NFKC 规范化并忽略大小写后）建立二元组（相邻两个字符）倒排表，
+并记录条目所在记录的起始行号。中日文术语大多只有两三个字，二元组比三元组更适合。
+
+查找时先用查询中最少见的几个二元组取得候选条目，再逐个计算匹配程度：
+包含整个查询的条目优先，其次是包含大部分二元组的条目（容忍个别错字）。
+
+内容修改后，索引与增量转换一样只重新解析被修改的记录；被删除的条目先标记为失效，
+失效条目过多时才整体压缩倒排表。
+"""
+
+import heapq
+import math
+from array import array
+from collections import defaultdict
+from itertools import islice
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from core.conversion import DictEntry
+from core.incremental import RECORD_FORMATS, split_changed_records
+from core.transform import fold_key
+
+# 至少包含查询中这一比例的二元组才算模糊匹配
+FUZZY_RATIO = 0.6
+# 单次查找最多逐个检查的候选条目数
+MAX_CANDIDATES = 20_000
+# 字段权重：原文 > 译文 > 备注
+_FIELD_WEIGHTS = (3.0, 2.0, 1.0)
+
+
+class FuzzyMatch(NamedTuple):
+    """一个查找结果，line 为条目所在记录的起始行号（从 1 开始）。"""
+    line: int
+    org: str
+    rep: str
+    note: str
+    score: float
+
+
+class _Record:
+    """输入内容中的一条记录及其包含的条目编号。"""
+    __slots__ = ("start", "ids")
+
+    def __init__(self, start: int, ids: List[int]):
+        self.start = start
+        self.ids = ids
+
+
+def _bigrams(text: str) -> set:
+    return {text[i:i + 2] for i in range(len(text) - 1)}
+
+
+def _new_posting() -> array:
+    return array('I')
+
+
+class FuzzyIndex:
+    """
+    条目的二元组倒排索引。不是线程安全的，update 与 search 不能同时调用。
+
+    用法:
+        index = FuzzyIndex()
+        index.update(content.split("\\n"), "GalTransl_TSV")
+        for match in index.search("アリス"):
+            ...
+    """
+    def __init__(self):
+        self.input_key: Optional[str] = None
+        self._lines: List[str] = []
+        self._records: List[_Record] = []
+        # 各记录的起始行号，与 _records 一一对应
+        self._starts: List[int] = []
+        # 以下列表按条目编号索引；已删除的条目为 None
+        # 字段分开保存为 (org, rep, note)，字段中可以包含任意字符
+        self._texts: List[Optional[Tuple[str, str, str]]] = []
+        self._folded: List[Optional[Tuple[str, ...]]] = []
+        self._owners: List[Optional[_Record]] = []
+        self._postings: Dict[str, array] = defaultdict(_new_posting)
+        self._live = 0
+
+    def __len__(self) -> int:
+        return self._live
+
+    # -------------------------------------------------------------
+    # 索引维护
+    # -------------------------------------------------------------
+    def reset(self):
+        """清空索引。"""
+        self.__init__()
+
+    def update(self, lines: List[str], input_key: str) -> int:
+        """
+        用输入内容的新版本更新索引，只重新解析与修改范围相交的记录。
+
+        Args:
+            lines: 输入内容按换行符拆分的各行。
+            input_key: 输入格式的键名。
+
+        Returns:
+            重新解析的记录数。
+
+        Raises:
+            ValueError: 如果格式不支持建立索引（如二进制格式）。
+        """
+        record_format = RECORD_FORMATS.get(input_key)
+        if record_format is None:
+            raise ValueError(f"不支持为该格式建立索引: {input_key}")
+        if input_key != self.input_key:
+            self.reset()
+            self.input_key = input_key
+        if lines and lines[0].startswith('\ufeff'):
+            lines = [lines[0][1:]] + lines[1:]
+
+        change = split_changed_records(self._lines, lines, self._starts, record_format.is_record_start)
+        if change is None:
+            return 0
+        first, tail = change.first, change.tail
+
+        for record in self._records[first:tail]:
+            self._remove(record.ids)
+        new_records = []
+        for start, text in zip(change.new_starts, change.iter_texts(lines)):
+            record = _Record(start, [])
+            # 无法单独解析的记录（如正在编辑的半行）不包含条目，修好后会再次解析
+            entries, _ = record_format.parse(text)
+            record.ids = self._add(entries, record)
+            new_records.append(record)
+        if change.delta:
+            for record in self._records[tail:]:
+                record.start += change.delta
+
+        self._starts = change.splice_starts(self._starts)
+        self._records = self._records[:first] + new_records + self._records[tail:]
+        self._lines = lines
+        # 失效条目超过一半时压缩倒排表，摊销后每次修改的开销与修改量成正比
+        if len(self._texts) - self._live > max(self._live, 10_000):
+            self._compact()
+        return len(new_records)
+
+    def _add(self, entries: Iterable[DictEntry], record: _Record) -> List[int]:
+        ids = []
+        postings = self._postings
+        texts, folded_texts, owners = self._texts, self._folded, self._owners
+        for item in entries:
+            entry_id = len(texts)
+            fields = (item['org'], item['rep'], item['note'])
+            # 多数文本规范化后不变，共用同一个字符串对象
+            folded = tuple(f if g == f else g for f, g in zip(fields, map(fold_key, fields)))
+            texts.append(fields)
+            folded_texts.append(fields if folded == fields else folded)
+            owners.append(record)
+            # 按字段分别取二元组，不会跨越字段边界
+            for gram in {f[i:i + 2] for f in folded for i in range(len(f) - 1)}:
+                postings[gram].append(entry_id)
+            ids.append(entry_id)
+        self._live += len(ids)
+        return ids
+
+    def _remove(self, ids: Iterable[int]):
+        for entry_id in ids:
+            self._texts[entry_id] = None
+            self._folded[entry_id] = None
+            self._owners[entry_id] = None
+            self._live -= 1
+
+    def _compact(self):
+        """重新编号有效条目并重建倒排表。"""
+        records = self._records
+        texts = self._texts
+        self._texts, self._folded, self._owners = [], [], []
+        self._postings = defaultdict(_new_posting)
+        self._live = 0
+        for record in records:
+            entries = [dict(zip(('org', 'rep', 'note'), texts[entry_id])) for entry_id in record.ids]
+            record.ids = self._add(entries, record)
+
+    # -------------------------------------------------------------
+    # 查找
+    # -------------------------------------------------------------
+    def search(self, query: str, limit: int = 50) -> List[FuzzyMatch]:
+        """
+        查找与 query 匹配的条目，按匹配程度从高到低排列。
+
+        query 按空白拆分为多个词，每个词都必须出现在某个字段中（允许少量错字）。
+        整词匹配优于模糊匹配，前缀匹配与完全相等优于一般包含，原文中的匹配优于译文和备注。
+
+        Args:
+            query: 查询文本。
+            limit: 最多返回的结果数。
+        """
+        terms = sorted({t for t in fold_key(query).split() if t}, key=len, reverse=True)
+        if not terms or not self._live:
+            return []
+        gram_sets = [_bigrams(t) for t in terms]
+
+        scored = []
+        for entry_id in self._candidates(terms[0], gram_sets[0]):
+            fields = self._folded[entry_id]
+            total = 0.0
+            for term, grams in zip(terms, gram_sets):
+                score = self._term_score(term, grams, fields)
+                if score is None:
+                    break
+                total += score
+            else:
+                scored.append((total, -len(fields[0]), -self._owners[entry_id].start, entry_id))
+
+        results = []
+        for total, _, _, entry_id in heapq.nlargest(limit, scored):
+            org, rep, note = self._texts[entry_id]
+            results.append(FuzzyMatch(self._owners[entry_id].start + 1, org, rep, note, total))
+        return results
+
+    def _candidates(self, term: str, grams: set) -> Iterable[int]:
+        """返回可能与 term 匹配的条目编号。"""
+        if not grams:
+            # 单个字符无法使用二元组，直接扫描
+            matches = (i for i, fields in enumerate(self._folded)
+                       if fields is not None and any(term in f for f in fields))
+            return list(islice(matches, MAX_CANDIDATES))
+
+        # 查找时不能用下标访问，否则会为不存在的二元组创建空的倒排表
+        postings = sorted((self._postings.get(g, ()) for g in grams), key=len)
+        # 若条目包含 n 个二元组中的至少 k 个，它必然出现在最少见的 n - k + 1 个倒排表之一中
+        required = max(1, math.ceil(len(grams) * FUZZY_RATIO))
+        candidates = set()
+        for posting in postings[:len(grams) - required + 1]:
+            candidates.update(posting)
+            if len(candidates) >= MAX_CANDIDATES:
+                break
+        folded = self._folded
+        return [i for i in candidates if folded[i] is not None]
+
+    @staticmethod
+    def _term_score(term: str, grams: set, fields: Tuple[str, ...]) -> Optional[float]:
+        """计算一个词与条目各字段的匹配得分，不匹配时返回 None。"""
+        required = max(1, math.ceil(len(grams) * FUZZY_RATIO))
+        best = None
+        for field, weight in zip(fields, _FIELD_WEIGHTS):
+            if term in field:
+                score = 2.0 + field.startswith(term) + (field == term)
+            elif grams:
+                matched = sum(g in field for g in grams)
+                if matched < required:
+                    continue
+                score = matched / len(grams)
+            else:
+                continue
+            score *= weight
+            if best is None or score > best:
+                best = score
+        return best
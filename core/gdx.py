@@ -0,0 +1,237 @@
+"""
+该模块实现 GDX 索引二进制字典格式的读写。
+GDX 文件包含字符串表、按 org 排序的索引和偏移表，可以通过内存映射直接读取，
+支持 O(log n) 的按键查找和流式遍历，而无需把整个字典加载到内存。
+"""
+
+import mmap
+import struct
+import sys
+from array import array
+from typing import Dict, Iterator, Optional
+
+from core.conversion import DictData, DictEntry
+
+# 文件布局 (小端序):
+#   头部:     magic(4s) version(H) reserved(H) count(I) records_off(Q) index_off(Q) strings_off(Q)
+#   偏移表:   count 条记录，每条 6 个 uint32: org/rep/note 在字符串表中的 (字节偏移, 字节长度)，保持原始条目顺序
+#   排序索引: count 个 uint32 记录号，按 org 的 UTF-8 字节序排列（与 Unicode 码点顺序一致）
+#   字符串表: 去重后的 UTF-8 字符串，首尾相连
+MAGIC = b"GDX1"
+VERSION = 1
+_HEADER = struct.Struct("<4sHHIQQQ")
+_FIELDS_PER_RECORD = 6
+
+
+def _to_little_endian(values: array) -> array:
+    if sys.byteorder != "little":
+        values.byteswap()
+    return values
+
+
+def dumps(entries: DictData) -> bytes:
+    """
+    将条目列表编码为 GDX 二进制数据。
+
+    Args:
+        entries: 包含 org/rep/note 的条目列表。
+
+    Returns:
+        GDX 格式的字节串。
+    """
+    strings = bytearray()
+    interned: Dict[str, tuple] = {}
+
+    def intern(text: str) -> tuple:
+        # 相同的字符串只在字符串表中保存一次
+        ref = interned.get(text)
+        if ref is None:
+            encoded = text.encode("utf-8")
+            ref = interned[text] = (len(strings), len(encoded))
+            strings.extend(encoded)
+        return ref
+
+    records = array('I')
+    org_keys = []
+    for item in entries:
+        org_ref = intern(item['org'])
+        records.extend(org_ref)
+        records.extend(intern(item['rep']))
+        records.extend(intern(item['note']))
+        org_keys.append(item['org'].encode("utf-8"))
+
+    # 稳定排序，相同 org 的条目保持原始先后顺序
+    index = array('I', sorted(range(len(entries)), key=org_keys.__getitem__))
+
+    records_off = _HEADER.size
+    index_off = records_off + len(records) * records.itemsize
+    strings_off = index_off + len(index) * index.itemsize
+    header = _HEADER.pack(MAGIC, VERSION, 0, len(entries), records_off, index_off, strings_off)
+    return b"".join([
+        header,
+        _to_little_endian(records).tobytes(),
+        _to_little_endian(index).tobytes(),
+        bytes(strings),
+    ])
+
+
+def write(entries: DictData, path: str):
+    """将条目列表写入 GDX 文件。"""
+    with open(path, "wb") as f:
+        f.write(dumps(entries))
+
+
+def is_gdx(head: bytes) -> bool:
+    """根据文件开头的字节判断是否为 GDX 文件。"""
+    return head[:len(MAGIC)] == MAGIC
+
+
+class GdxReader:
+    """
+    GDX 文件的只读访问器。
+    字段在访问时才从缓冲区中解码，可以直接在内存映射上工作。
+    """
+    def __init__(self, buffer):
+        """
+        初始化读取器。
+
+        Args:
+            buffer: 包含 GDX 数据的 bytes 或 mmap 对象。
+
+        Raises:
+            ValueError: 如果数据不是有效的 GDX 格式。
+        """
+        if len(buffer) < _HEADER.size:
+            raise ValueError("GDX 数据不完整")
+        magic, version, _, count, records_off, index_off, strings_off = _HEADER.unpack_from(buffer, 0)
+        if magic != MAGIC:
+            raise ValueError("不是有效的 GDX 文件")
+        if version != VERSION:
+            raise ValueError(f"不支持的 GDX 版本: {version}")
+        # 偏移表、排序索引与字符串表都必须完整地位于数据之内，否则后续的视图会越界或静默截断
+        size = len(buffer)
+        tables = ((records_off, count * _FIELDS_PER_RECORD * 4), (index_off, count * 4), (strings_off, 0))
+        if any(offset < _HEADER.size or offset + length > size for offset, length in tables):
+            raise ValueError("GDX 数据不完整")
+
+        self._buffer = buffer
+        self._mmap: Optional[mmap.mmap] = None
+        self._file = None
+        self._count = count
+        self._strings_off = strings_off
+        self._records = self._uint32_view(records_off, count * _FIELDS_PER_RECORD)
+        self._index = self._uint32_view(index_off, count)
+
+    @classmethod
+    def open(cls, path: str) -> "GdxReader":
+        """以内存映射方式打开 GDX 文件。"""
+        f = open(path, "rb")
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # 空文件无法映射
+            f.close()
+            raise ValueError("不是有效的 GDX 文件")
+        try:
+            reader = cls(mm)
+        except ValueError:
+            mm.close()
+            f.close()
+            raise
+        reader._mmap, reader._file = mm, f
+        return reader
+
+    def _uint32_view(self, offset: int, length: int):
+        """返回缓冲区中一段 uint32 数组的视图。小端平台上不复制数据。"""
+        raw = memoryview(self._buffer)[offset:offset + length * 4]
+        if sys.byteorder == "little":
+            return raw.cast('I')
+        values = array('I', raw.tobytes())
+        values.byteswap()
+        return values
+
+    def close(self):
+        """释放内存映射和文件句柄。"""
+        # 必须先释放所有指向 mmap 的 memoryview，否则 mmap 无法关闭
+        for view in (self._records, self._index):
+            if isinstance(view, memoryview):
+                view.release()
+        if self._mmap is not None:
+            self._mmap.close()
+            self._file.close()
+            self._mmap = self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self) -> int:
+        return self._count
+
+    # -------------------------------------------------------------
+    # 记录访问
+    # -------------------------------------------------------------
+    def _field_bytes(self, offset: int, length: int) -> bytes:
+        start = self._strings_off + offset
+        if start + length > len(self._buffer):
+            raise ValueError("GDX 数据不完整")
+        return self._buffer[start:start + length]
+
+    def _org_bytes(self, record_id: int) -> bytes:
+        base = record_id * _FIELDS_PER_RECORD
+        return self._field_bytes(self._records[base], self._records[base + 1])
+
+    def entry(self, record_id: int) -> DictEntry:
+        """按原始顺序中的位置读取一个条目。"""
+        r = self._records
+        base = record_id * _FIELDS_PER_RECORD
+        return {
+            'org': self._field_bytes(r[base], r[base + 1]).decode("utf-8"),
+            'rep': self._field_bytes(r[base + 2], r[base + 3]).decode("utf-8"),
+            'note': self._field_bytes(r[base + 4], r[base + 5]).decode("utf-8"),
+        }
+
+    def __iter__(self) -> Iterator[DictEntry]:
+        """按原始顺序流式遍历所有条目。"""
+        for record_id in range(self._count):
+            yield self.entry(record_id)
+
+    def iter_sorted(self) -> Iterator[DictEntry]:
+        """按 org 排序的顺序流式遍历所有条目。"""
+        for record_id in self._index:
+            yield self.entry(record_id)
+
+    def lookup(self, org: str) -> DictData:
+        """
+        使用排序索引进行二分查找，返回 org 完全相同的所有条目。
+
+        Args:
+            org: 要查找的原文。
+
+        Returns:
+            匹配的条目列表（按原始顺序），未找到时为空列表。
+        """
+        key = org.encode("utf-8")
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._org_bytes(self._index[mid]) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        result = []
+        while lo < self._count and self._org_bytes(self._index[lo]) == key:
+            result.append(self.entry(self._index[lo]))
+            lo += 1
+        return result
+
+
+def loads(data: bytes) -> DictData:
+    """将 GDX 二进制数据完整解码为条目列表。"""
+    reader = GdxReader(data)
+    try:
+        return list(reader)
+    finally:
+        reader.close()
@@ -0,0 +1,254 @@
+"""
+该模块提供基于 SQLite 的词库存储后端。
+它可以把任意支持格式的字典导入本地数据库，并提供按原文的索引查找、
+全文检索、分页查询，以及以流式方式导出回任意格式的功能，
+适合处理无法整体放入编辑器的大型合并词库。
+"""
+
+import sqlite3
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional
+
+from core import conversion
+from core.conversion import DictData, DictEntry
+
+# 每批写入数据库的条目数
+IMPORT_BATCH_SIZE = 10000
+# 全文检索使用 trigram 分词，查询词至少需要 3 个字符
+FTS_MIN_QUERY_LENGTH = 3
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    id INTEGER PRIMARY KEY,
+    org TEXT NOT NULL,
+    rep TEXT NOT NULL,
+    note TEXT NOT NULL,
+    source TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS idx_entries_org ON entries(org);
+CREATE INDEX IF NOT EXISTS idx_entries_source ON entries(source);
+"""
+
+# 全文索引使用外部内容表，并通过触发器与 entries 保持同步
+_FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS entries_fts USING fts5(
+    org, rep, note, content='entries', content_rowid='id', tokenize='{tokenizer}'
+);
+CREATE TRIGGER IF NOT EXISTS entries_ai AFTER INSERT ON entries BEGIN
+    INSERT INTO entries_fts(rowid, org, rep, note) VALUES (new.id, new.org, new.rep, new.note);
+END;
+CREATE TRIGGER IF NOT EXISTS entries_ad AFTER DELETE ON entries BEGIN
+    INSERT INTO entries_fts(entries_fts, rowid, org, rep, note) VALUES ('delete', old.id, old.org, old.rep, old.note);
+END;
+CREATE TRIGGER IF NOT EXISTS entries_au AFTER UPDATE ON entries BEGIN
+    INSERT INTO entries_fts(entries_fts, rowid, org, rep, note) VALUES ('delete', old.id, old.org, old.rep, old.note);
+    INSERT INTO entries_fts(rowid, org, rep, note) VALUES (new.id, new.org, new.rep, new.note);
+END;
+"""
+
+
+class GlossaryStore:
+    """
+    一个 SQLite 词库数据库。
+    条目保存在 entries 表中，org 上建有索引；若 SQLite 支持 FTS5，
+    还会建立覆盖 org/rep/note 的全文检索表。
+    """
+    def __init__(self, db_path: str):
+        """
+        打开（必要时创建）词库数据库。
+
+        Args:
+            db_path: 数据库文件路径，可以使用 ":memory:"。
+        """
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path)
+        self.conn.executescript(_SCHEMA)
+        self.has_fts = self._init_fts()
+        self.conn.commit()
+
+    def _init_fts(self) -> bool:
+        """尝试创建全文检索表。优先使用适合中日文的 trigram 分词器。"""
+        for tokenizer in ("trigram", "unicode61"):
+            try:
+                self.conn.executescript(_FTS_SCHEMA.format(tokenizer=tokenizer))
+                return True
+            except sqlite3.OperationalError:
+                continue
+        # 当前 SQLite 未编译 FTS5，检索时退回 LIKE 查询
+        return False
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # -------------------------------------------------------------
+    # 导入
+    # -------------------------------------------------------------
+    def import_entries(self, entries: Iterable[DictEntry], source: str = "") -> int:
+        """
+        分批导入条目。
+
+        Args:
+            entries: 字典条目的可迭代对象，可以是生成器。
+            source: 条目来源（通常为文件路径），用于按来源删除或筛选。
+
+        Returns:
+            导入的条目数。
+        """
+        total = 0
+        batch = []
+        with self.conn:
+            for item in entries:
+                batch.append((item['org'], item['rep'], item['note'], source))
+                if len(batch) >= IMPORT_BATCH_SIZE:
+                    self.conn.executemany("INSERT INTO entries(org, rep, note, source) VALUES (?, ?, ?, ?)", batch)
+                    total += len(batch)
+                    batch = []
+            if batch:
+                self.conn.executemany("INSERT INTO entries(org, rep, note, source) VALUES (?, ?, ?, ?)", batch)
+                total += len(batch)
+        return total
+
+    def import_file(self, path: str, format_key: Optional[str] = None) -> int:
+        """
+        导入一个字典文件。TSV 文件按行流式读取，其他格式整体解析后导入。
+
+        Args:
+            path: 字典文件路径。
+            format_key: 文件的格式键名，为 None 时自动检测。
+
+        Returns:
+            导入的条目数。
+
+        Raises:
+            ValueError: 如果无法确定文件格式或解析失败。
+        """
+        with open(path, 'rb') as f:
+            binary_key = conversion.detect_binary_format(f.read(16))
+        if binary_key:
+            with open(path, 'rb') as f:
+                return self.import_entries(conversion.parse_binary(f.read(), binary_key), source=path)
+
+        if format_key is None:
+            with open(path, 'r', encoding='utf-8-sig') as f:
+                content = f.read()
+            detected = conversion.detect_format(content)
+            format_key = conversion.get_format_key(detected, display_name=True) if detected else None
+            if not format_key:
+                raise ValueError(f"无法自动检测文件格式: {Path(path).name}")
+            return self.import_entries(conversion.parse_input(content, format_key), source=path)
+
+        if format_key == "GalTransl_TSV":
+            with open(path, 'r', encoding='utf-8-sig') as f:
+                return self.import_entries(conversion.iter_parse_tsv(f), source=path)
+
+        with open(path, 'r', encoding='utf-8-sig') as f:
+            return self.import_entries(conversion.parse_input(f.read(), format_key), source=path)
+
+    def delete_source(self, source: str) -> int:
+        """删除来自指定来源的所有条目，返回删除的条目数。"""
+        with self.conn:
+            return self.conn.execute("DELETE FROM entries WHERE source = ?", (source,)).rowcount
+
+    def clear(self):
+        """删除所有条目。"""
+        with self.conn:
+            self.conn.execute("DELETE FROM entries")
+
+    # -------------------------------------------------------------
+    # 查询
+    # -------------------------------------------------------------
+    def _filter(self, query: Optional[str]) -> tuple:
+        """根据检索词生成 (FROM/WHERE 子句, 参数)。"""
+        if not query:
+            return "FROM entries e WHERE 1", []
+        if self.has_fts and len(query) >= FTS_MIN_QUERY_LENGTH:
+            # 作为短语检索，双引号需要转义
+            phrase = '"' + query.replace('"', '""') + '"'
+            return "FROM entries_fts f JOIN entries e ON e.id = f.rowid WHERE entries_fts MATCH ?", [phrase]
+        # 检索词过短或不支持全文检索时，退回 LIKE 查询
+        pattern = "%" + query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+        return (
+            "FROM entries e WHERE (e.org LIKE ? ESCAPE '\\' OR e.rep LIKE ? ESCAPE '\\' OR e.note LIKE ? ESCAPE '\\')",
+            [pattern, pattern, pattern],
+        )
+
+    def count(self, query: Optional[str] = None) -> int:
+        """返回满足检索条件的条目数。"""
+        clause, params = self._filter(query)
+        return self.conn.execute(f"SELECT COUNT(*) {clause}", params).fetchone()[0]
+
+    def page(self, query: Optional[str] = None, after_id: int = 0, limit: int = 100) -> List[dict]:
+        """
+        按 id 顺序分页查询。使用键集分页，翻到任意深度的代价都相同。
+
+        Args:
+            query: 检索词，为空时返回全部条目。
+            after_id: 上一页最后一个条目的 id，首页为 0。
+            limit: 每页条目数。
+
+        Returns:
+            包含 id/org/rep/note 的条目列表。
+        """
+        clause, params = self._filter(query)
+        rows = self.conn.execute(
+            f"SELECT e.id, e.org, e.rep, e.note {clause} AND e.id > ? ORDER BY e.id LIMIT ?",
+            params + [after_id, limit],
+        ).fetchall()
+        return [{'id': r[0], 'org': r[1], 'rep': r[2], 'note': r[3]} for r in rows]
+
+    def lookup(self, org: str) -> DictData:
+        """通过 org 索引精确查找条目。"""
+        rows = self.conn.execute("SELECT org, rep, note FROM entries WHERE org = ? ORDER BY id", (org,)).fetchall()
+        return [{'org': r[0], 'rep': r[1], 'note': r[2]} for r in rows]
+
+    def iter_entries(self, query: Optional[str] = None, batch_size: int = 5000) -> Iterator[DictEntry]:
+        """按 id 顺序流式遍历满足条件的所有条目。"""
+        after_id = 0
+        while True:
+            rows = self.page(query, after_id, batch_size)
+            if not rows:
+                return
+            for row in rows:
+                yield {'org': row['org'], 'rep': row['rep'], 'note': row['note']}
+            after_id = rows[-1]['id']
+
+    # -------------------------------------------------------------
+    # 导出
+    # -------------------------------------------------------------
+    def export(self, path: str, format_key: str, query: Optional[str] = None) -> int:
+        """
+        将满足条件的条目导出为指定格式的文件。文本格式以流式方式写入。
+
+        Args:
+            path: 输出文件路径。
+            format_key: 输出格式的键名。
+            query: 检索词，为空时导出全部条目。
+
+        Returns:
+            导出的条目数。
+        """
+        exported = 0
+
+        def counted(entries):
+            nonlocal exported
+            for item in entries:
+                exported += 1
+                yield item
+
+        if conversion.is_binary_format(format_key):
+            # 二进制格式需要构建完整的排序索引，无法流式写入
+            data = list(self.iter_entries(query))
+            with open(path, 'wb') as f:
+                f.write(conversion.serialize_binary(data, format_key))
+            return len(data)
+
+        with open(path, 'w', encoding='utf-8') as f:
+            for chunk in conversion.iter_format_output(counted(self.iter_entries(query)), format_key):
+                f.write(chunk)
+        return exported
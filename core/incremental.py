@@ -0,0 +1,309 @@
+"""
+该模块实现了编辑时的增量转换。
+
+输入内容按格式被切分为若干“记录”：TSV 与 GPP GUI TOML 的每一行，JSON 中以行首 "{" 开始的每个对象，
+GPP CLI TOML 中的每个 [[gptDict]] 表，以及它们之前的文件头。记录的边界只取决于该行本身，
+因此修改后只需比较新旧内容的公共前后缀，找到被修改的行，
+再对与之相交的少数记录重新切分、解析和序列化，其余记录按位置直接复用。
+
+每条记录解析时还会得到一个“类别”字符（如 JSON 对象之后是否有逗号），
+所有记录的类别拼成的字符串必须符合该格式的整体结构；否则（如 JSON 中嵌套了对象、
+TOML 中缺少逗号）退回到对整个内容的完整解析，保证结果与完整转换一致。
+"""
+
+import re
+from bisect import bisect_right
+from itertools import chain
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from core import conversion, textdiff
+from core.conversion import DictData
+
+# 记录类别
+KIND_HEADER = "H"    # 文件头（如 JSON 的 "["）
+KIND_ENTRY = "C"     # 条目，且其后有合法的分隔符
+KIND_LAST = "E"      # 最后一个条目（JSON 中包含数组的结束括号）
+KIND_BLANK = "B"     # 空行或注释
+KIND_FOOTER = "F"    # 文件尾（如 GPP GUI TOML 的 "]"）
+KIND_INVALID = "X"   # 无法单独解析
+
+# JSON 字符串不能包含换行，因此行首的 "{" 一定是新对象的开始
+# CLI TOML 的记录以 [[gptDict]] 独占一行开始（MULTILINE 使 $ 匹配记录第一行的行尾）
+_JSON_RECORD_RE = re.compile(r'[ \t]*\{')
+_CLI_TOML_RECORD_RE = re.compile(r'[ \t]*\[\[gptDict\]\][ \t]*$', re.MULTILINE)
+_GUI_TOML_HEADER_RE = re.compile(r'[ \t]*gptDict[ \t]*=[ \t]*\[[ \t\r]*$')
+_CONTROL_CHAR_RE = re.compile(r'[\x00-\x08\x0a-\x1f\x7f]')
+_PARSE_ERRORS = (ValueError, TypeError, AttributeError)
+# JSON 与 TOML 中的空白字符；str.strip() 还会去除全角空格等字符，两种格式都不允许它们出现在值以外
+_WHITESPACE = " \t\r\n"
+# 原文为 NUL 字符的表，作为 GUI TOML 单行记录之后的哨兵
+_GUI_TOML_SENTINEL = '{ org = "\\u0000" }'
+
+
+class ConversionUpdate(NamedTuple):
+    """
+    一次增量转换的结果。
+
+    Attributes:
+        entries: 解析得到的全部条目。
+        output: 完整的输出文本。
+        hunks: 把旧输出变为新输出的替换块列表。
+        reparsed: 本次重新解析的记录数。
+        full_parse: 是否退回了完整解析。
+    """
+    entries: DictData
+    output: str
+    hunks: List[textdiff.LineHunk]
+    reparsed: int
+    full_parse: bool
+
+
+def _is_blank_or_comment(line: str) -> bool:
+    stripped = line.strip(_WHITESPACE)
+    # TOML 注释中不能含有制表符以外的控制字符
+    return not stripped or (stripped.startswith("#") and not _CONTROL_CHAR_RE.search(stripped))
+
+
+# -------------------------------------------------------------
+# 记录解析
+# 每个函数返回 (条目列表, 记录类别)
+# -------------------------------------------------------------
+def _parse_tsv_record(text: str) -> Tuple[DictData, str]:
+    # 与 parse_input 相同，按 splitlines 切分（一行中可能含有其他换行字符）
+    return list(conversion.iter_parse_tsv(text.splitlines())), KIND_ENTRY
+
+
+def _parse_json_record(text: str) -> Tuple[DictData, str]:
+    body = text.rstrip(_WHITESPACE)
+    if not body.lstrip(_WHITESPACE).startswith("{"):
+        return [], KIND_HEADER if body.strip(_WHITESPACE) == "[" else KIND_INVALID
+    if body.endswith(","):
+        kind = KIND_ENTRY
+    elif body.endswith("]") and not body[:-1].rstrip(_WHITESPACE).endswith(","):
+        kind = KIND_LAST
+    else:
+        return [], KIND_INVALID
+    try:
+        return conversion.parse_input(f"[{body[:-1]}]", "AiNiee_JSON"), kind
+    except _PARSE_ERRORS:
+        return [], KIND_INVALID
+
+
+def _parse_gui_toml_record(text: str) -> Tuple[DictData, str]:
+    if _is_blank_or_comment(text):
+        return [], KIND_BLANK
+    if _GUI_TOML_HEADER_RE.match(text):
+        return [], KIND_HEADER
+    if text.strip(_WHITESPACE) == "]":
+        return [], KIND_FOOTER
+    # 逗号可能出现在行尾注释中，无法按文本判断；
+    # 在其后追加一个哨兵表，只有该行真正以逗号结束时才能解析成功。
+    # 解析结果不以哨兵结束时（解析器丢失了条目），不能信任该结果
+    try:
+        entries = conversion.parse_input(f"gptDict = [\n{text}\n{_GUI_TOML_SENTINEL}]", "GPPGUI_TOML")
+        if not entries or entries[-1]['org'] != "\x00":
+            return [], KIND_INVALID
+        entries.pop()
+        return entries, KIND_ENTRY
+    except _PARSE_ERRORS:
+        pass
+    try:
+        return conversion.parse_input(f"gptDict = [\n{text}\n]", "GPPGUI_TOML"), KIND_LAST
+    except _PARSE_ERRORS:
+        return [], KIND_INVALID
+
+
+def _parse_cli_toml_record(text: str) -> Tuple[DictData, str]:
+    if not _CLI_TOML_RECORD_RE.match(text):
+        is_header = all(_is_blank_or_comment(line) for line in text.split("\n"))
+        return [], KIND_HEADER if is_header else KIND_INVALID
+    try:
+        return conversion.parse_input(text, "GPPCLI_TOML"), KIND_ENTRY
+    except _PARSE_ERRORS:
+        return [], KIND_INVALID
+
+
+class RecordFormat(NamedTuple):
+    """
+    一种输入格式的记录规则。
+
+    Attributes:
+        is_record_start: 判断某一行是否开始一条新记录；为 None 表示每行都是一条记录。
+        parse: 记录解析函数。
+        structure: 所有记录类别拼成的字符串必须完全匹配的正则表达式；为 None 表示不检查。
+    """
+    is_record_start: Optional[Callable[[str], object]]
+    parse: Callable[[str], Tuple[DictData, str]]
+    structure: Optional[re.Pattern]
+
+
+RECORD_FORMATS: Dict[str, RecordFormat] = {
+    "GalTransl_TSV": RecordFormat(None, _parse_tsv_record, None),
+    "AiNiee_JSON": RecordFormat(_JSON_RECORD_RE.match, _parse_json_record, re.compile(r"HC*E")),
+    "GPPGUI_TOML": RecordFormat(None, _parse_gui_toml_record, re.compile(r"B*H[BC]*(?:EB*)?FB*")),
+    "GPPCLI_TOML": RecordFormat(_CLI_TOML_RECORD_RE.match, _parse_cli_toml_record, re.compile(r"H?C+")),
+}
+
+
+class RecordChange(NamedTuple):
+    """
+    一次修改影响的记录范围，由 split_changed_records 计算。
+
+    Attributes:
+        first: 第一条需要重新解析的旧记录的序号。
+        tail: 修改之后第一条可以直接复用的旧记录的序号。
+        new_starts: 替换 first 到 tail 之间旧记录的新记录在新内容中的起始行号。
+        region_end: 新记录所占行范围的结束行号（不含）。
+        delta: 修改前后的行数之差。
+    """
+    first: int
+    tail: int
+    new_starts: List[int]
+    region_end: int
+    delta: int
+
+    def iter_texts(self, lines: List[str]) -> Iterator[str]:
+        """依次返回每条新记录的文本。"""
+        bounds = self.new_starts + [self.region_end]
+        for i in range(len(self.new_starts)):
+            yield "\n".join(lines[bounds[i]:bounds[i + 1]])
+
+    def splice_starts(self, starts: List[int]) -> List[int]:
+        """返回修改后全部记录的起始行号。"""
+        # 行内修改（行数不变）时后面记录的起始行号不变，无需逐个平移
+        shifted = starts[self.tail:] if self.delta == 0 else [s + self.delta for s in starts[self.tail:]]
+        return starts[:self.first] + self.new_starts + shifted
+
+
+def split_changed_records(old_lines: List[str], lines: List[str], starts: List[int],
+                          is_record_start: Optional[Callable[[str], object]]) -> Optional[RecordChange]:
+    """
+    比较新旧内容的公共前后缀，找出需要重新切分的记录。
+
+    Args:
+        old_lines: 修改前的各行。
+        lines: 修改后的各行。
+        starts: 修改前各记录的起始行号。
+        is_record_start: 判断某一行是否开始一条新记录；为 None 表示每行都是一条记录。
+
+    Returns:
+        RecordChange 对象；内容没有变化时返回 None。
+    """
+    old_count, new_count = len(old_lines), len(lines)
+    prefix = textdiff.common_prefix(old_lines, lines)
+    if prefix == old_count == new_count:
+        return None
+    suffix = textdiff.common_suffix(old_lines, lines, min(old_count, new_count) - prefix)
+    old_end = old_count - suffix
+    delta = new_count - old_count
+
+    if starts:
+        # 修改处的前一行也要包含在内：被修改的行是否开始新记录，决定了上一条记录在哪里结束
+        first = bisect_right(starts, max(prefix - 1, 0)) - 1
+        if old_end >= old_count:
+            tail = len(starts)
+        else:
+            # 未修改的后缀中，第一条完整的记录及其之后的记录可以直接复用
+            tail = bisect_right(starts, old_end)
+            if starts[tail - 1] == old_end:
+                tail -= 1
+    else:
+        first = tail = 0
+    region_start = starts[first] if starts else 0
+    region_end = starts[tail] + delta if tail < len(starts) else new_count
+
+    if is_record_start is None:
+        new_starts = list(range(region_start, region_end))
+    else:
+        new_starts = [region_start] + [i for i in range(region_start + 1, region_end) if is_record_start(lines[i])]
+    return RecordChange(first, tail, new_starts, region_end, delta)
+
+
+class IncrementalConverter:
+    """
+    按记录缓存解析与序列化结果的转换器。
+    不是线程安全的，同一时间只能在一个线程中调用 update。
+    """
+    def __init__(self):
+        self.input_key: Optional[str] = None
+        self.output_key: Optional[str] = None
+        self._lines: List[str] = []
+        # 以下列表按记录一一对应：起始行号、条目列表、各条目的输出文本、类别
+        self._starts: List[int] = []
+        self._entries: List[DictData] = []
+        self._texts: List[List[str]] = []
+        self._kinds: List[str] = []
+
+    def reset(self):
+        """丢弃所有缓存的记录，下次转换时重新解析全部内容。"""
+        self.input_key = None
+        self._lines = []
+        self._starts, self._entries, self._texts, self._kinds = [], [], [], []
+
+    def update(self, content: str, input_key: str, output_key: str, old_output: str) -> ConversionUpdate:
+        """
+        转换输入内容，并计算相对于旧输出的替换块。
+
+        Args:
+            content: 输入的文本内容。
+            input_key: 输入格式的键名。
+            output_key: 输出格式的键名，必须是文本格式。
+            old_output: 输出框当前的内容。
+
+        Returns:
+            ConversionUpdate 对象。
+
+        Raises:
+            ValueError: 如果输入内容无法解析或格式键无效。
+        """
+        record_format = RECORD_FORMATS.get(input_key)
+        if content.startswith('\ufeff'):
+            content = content[1:]
+        reparsed = 0
+        full_parse = record_format is None or not content.strip()
+
+        if not full_parse:
+            if input_key != self.input_key:
+                self.reset()
+                self.input_key = input_key
+            if output_key != self.output_key:
+                self._texts = [[conversion.format_entry(item, output_key) for item in entries]
+                               for entries in self._entries]
+            self.output_key = output_key
+            reparsed = self._update_records(content.split("\n"), record_format, output_key)
+            structure = record_format.structure
+            full_parse = structure is not None and not structure.fullmatch("".join(self._kinds))
+
+        if full_parse:
+            # 交由完整解析得到准确的结果或错误信息
+            entries = conversion.parse_input(content, input_key)
+            texts = [conversion.format_entry(item, output_key) for item in entries]
+            reparsed = len(entries)
+        else:
+            entries = list(chain.from_iterable(self._entries))
+            texts = list(chain.from_iterable(self._texts))
+
+        output = conversion.join_entry_texts(texts, output_key)
+        hunks = textdiff.diff_lines(old_output.split("\n"), output.split("\n"))
+        return ConversionUpdate(entries, output, hunks, reparsed, full_parse)
+
+    def _update_records(self, lines: List[str], record_format: RecordFormat, output_key: str) -> int:
+        """用新的行列表更新记录，只重新解析与修改范围相交的记录，返回重新解析的记录数。"""
+        change = split_changed_records(self._lines, lines, self._starts, record_format.is_record_start)
+        if change is None:
+            return 0
+        first, tail = change.first, change.tail
+
+        new_entries, new_texts, new_kinds = [], [], []
+        for text in change.iter_texts(lines):
+            entries, kind = record_format.parse(text)
+            new_entries.append(entries)
+            new_texts.append([conversion.format_entry(item, output_key) for item in entries])
+            new_kinds.append(kind)
+
+        self._starts = change.splice_starts(self._starts)
+        self._entries = self._entries[:first] + new_entries + self._entries[tail:]
+        self._texts = self._texts[:first] + new_texts + self._texts[tail:]
+        self._kinds = self._kinds[:first] + new_kinds + self._kinds[tail:]
+        self._lines = lines
+        return len(change.new_starts)
@@ -0,0 +1,411 @@
+"""
+该模块提供字典内容的逐行校验（lint）功能。
+每种格式的校验器都是一个“可从任意行恢复”的解析器：给定某行开头的解析状态，
+即可独立地校验这一行并得到下一行开头的状态。IncrementalLinter 记录每行开头的状态，
+编辑后只需从被修改的行开始重新校验，直到某行结尾的状态与修改前一致为止，
+因此每次按键的开销与文档大小无关。
+"""
+
+import re
+from typing import Iterator, List, NamedTuple, Optional, Tuple
+
+from core.conversion import _TSV_SPLIT_RE
+
+ERROR = "error"
+WARNING = "warning"
+
+
+class Diagnostic(NamedTuple):
+    """
+    一条校验结果。
+
+    Attributes:
+        start: 问题在行内的起始列。
+        end: 问题在行内的结束列。
+        severity: ERROR 或 WARNING。
+        message: 问题描述。
+    """
+    start: int
+    end: int
+    severity: str
+    message: str
+
+
+# #####################################################################
+# 各格式的行校验器
+# #####################################################################
+class LineLinter:
+    """
+    行校验器的基类。子类实现 lint_line，状态必须是可以比较相等的不可变值。
+    """
+    initial_state = None
+
+    def lint_line(self, line: str, state) -> Tuple[List[Diagnostic], object]:
+        """
+        校验一行。
+
+        Args:
+            line: 行内容（不含换行符）。
+            state: 该行开头的解析状态。
+
+        Returns:
+            (该行的校验结果列表, 下一行开头的解析状态)
+        """
+        return [], state
+
+    def finish(self, state, last_line: str) -> List[Diagnostic]:
+        """根据文档结尾的解析状态给出文档级问题（如括号未闭合），报告在最后一行。"""
+        return []
+
+
+class TsvLinter(LineLinter):
+    """GalTransl TSV 格式：每行独立，无跨行状态。"""
+
+    def lint_line(self, line, state):
+        stripped = line.strip()
+        if not stripped or stripped.startswith(('//', '#')):
+            return [], state
+        lead = len(line) - len(line.lstrip())
+        end = lead + len(stripped)
+
+        delimiters = list(_TSV_SPLIT_RE.finditer(stripped))
+        if not delimiters:
+            if "\t" in line[:lead]:
+                return [Diagnostic(0, end, ERROR, "原文为空")], state
+            return [Diagnostic(lead, end, ERROR, "缺少分隔符（制表符或四个空格），该行会被忽略")], state
+
+        diagnostics = []
+        kinds = {m.group() == "\t" for m in delimiters}
+        if len(kinds) > 1:
+            diagnostics.append(Diagnostic(lead, end, WARNING, "同一行中混用了制表符和四个空格作为分隔符"))
+        if len(delimiters) > 2:
+            extra = delimiters[2]
+            diagnostics.append(Diagnostic(lead + extra.start(), lead + extra.end(), WARNING,
+                                          "备注中包含分隔符，该分隔符之后的内容将并入备注"))
+        return diagnostics, state
+
+
+# TOML/JSON 扫描时识别的简单记号
+_BARE_KEY_RE = re.compile(r'[A-Za-z0-9_-]+')
+# 字符串之后（可有空白）紧跟 = 或 . 时，该字符串是带引号的键或点分键的一段
+_KEY_FOLLOWS_RE = re.compile(r'[ \t]*[=.]')
+# = 之后不带引号的值（布尔值、数字、日期等）
+_BARE_VALUE_RE = re.compile(r'[A-Za-z0-9_.:+-]+')
+_JSON_LITERAL_RE = re.compile(r'-?\d+(?:\.\d+)?(?:[eE][+-]?\d+)?|true|false|null')
+_OPENERS = {"]": "[", "}": "{"}
+
+
+class TomlLinter(LineLinter):
+    """
+    GPP TOML 格式（GUI 与 CLI 两种写法）。
+    状态为 (括号深度, 未闭合的多行字符串定界符或 None, 上一个键是否为原文键且等待其值)。
+    """
+    initial_state = (0, None, False)
+
+    def __init__(self, org_key: str):
+        self.org_key = org_key
+
+    def lint_line(self, line, state):
+        depth, multiline, expect_org = state
+        diagnostics = []
+        i, n = 0, len(line)
+        if multiline:
+            close = line.find(multiline)
+            if close == -1:
+                return diagnostics, state
+            i = close + 3
+            multiline = None
+
+        # 当前键的各段（点分键如 a."b".c 有多段），遇到 = 时与原文键比较
+        key_parts = []
+        # 是否位于 = 之后、值之前，此时的字符串与记号是值而不是键
+        in_value = False
+        while i < n:
+            ch = line[i]
+            if ch in " \t":
+                i += 1
+            elif ch == ",":
+                key_parts = []
+                in_value = False
+                i += 1
+            elif ch == "#":
+                break
+            elif line.startswith(("'''", '"""'), i):
+                delim = line[i:i + 3]
+                close = line.find(delim, i + 3)
+                if close == -1:
+                    return diagnostics, (depth, delim, False)
+                if expect_org and close == i + 3:
+                    diagnostics.append(Diagnostic(i, close + 3, ERROR, "原文为空"))
+                expect_org = in_value = False
+                i = close + 3
+            elif ch == "'":
+                close = line.find("'", i + 1)
+                if close == -1:
+                    diagnostics.append(Diagnostic(i, n, ERROR, "字符串未闭合"))
+                    return diagnostics, (depth, None, False)
+                if not in_value and _KEY_FOLLOWS_RE.match(line, close + 1):
+                    key_parts.append(line[i + 1:close])
+                    i = close + 1
+                    continue
+                if expect_org and close == i + 1:
+                    diagnostics.append(Diagnostic(i, close + 1, ERROR, "原文为空"))
+                expect_org = in_value = False
+                i = close + 1
+                if i < n and line[i] == "'":
+                    # 单引号字符串（字面量字符串）不支持任何转义，'' 并不表示一个单引号
+                    end = line.find("'", i + 1)
+                    end = n if end == -1 else end + 1
+                    diagnostics.append(Diagnostic(i - 1, end, ERROR,
+                                                  "单引号字符串中不能包含单引号，请改用双引号字符串"))
+                    return diagnostics, (depth, None, False)
+            elif ch == '"':
+                j = i + 1
+                while j < n and line[j] != '"':
+                    j += 2 if line[j] == "\\" else 1
+                if j >= n:
+                    diagnostics.append(Diagnostic(i, n, ERROR, "字符串未闭合"))
+                    return diagnostics, (depth, None, False)
+                if not in_value and _KEY_FOLLOWS_RE.match(line, j + 1):
+                    key_parts.append(line[i + 1:j])
+                    i = j + 1
+                    continue
+                if expect_org and j == i + 1:
+                    diagnostics.append(Diagnostic(i, j + 1, ERROR, "原文为空"))
+                expect_org = in_value = False
+                i = j + 1
+            elif ch in "[{":
+                depth += 1
+                key_parts = []
+                in_value = False
+                i += 1
+            elif ch in "]}":
+                if depth == 0:
+                    diagnostics.append(Diagnostic(i, i + 1, ERROR, "多余的右括号"))
+                else:
+                    depth -= 1
+                i += 1
+            elif ch == "=":
+                expect_org = key_parts == [self.org_key]
+                key_parts = []
+                in_value = True
+                i += 1
+            elif ch == "." and key_parts:
+                i += 1
+            else:
+                m = (_BARE_VALUE_RE if in_value else _BARE_KEY_RE).match(line, i)
+                if not m:
+                    diagnostics.append(Diagnostic(i, i + 1, ERROR, f"无法识别的字符 {ch!r}"))
+                    i += 1
+                    continue
+                if in_value:
+                    expect_org = in_value = False
+                else:
+                    key_parts.append(m.group())
+                i = m.end()
+        return diagnostics, (depth, multiline, expect_org)
+
+    def finish(self, state, last_line):
+        depth, multiline, _ = state
+        if multiline:
+            return [Diagnostic(0, len(last_line), ERROR, f"多行字符串 {multiline} 未闭合")]
+        if depth > 0:
+            return [Diagnostic(0, len(last_line), ERROR, "括号未闭合")]
+        return []
+
+
+class JsonLinter(LineLinter):
+    """
+    AiNiee JSON 格式。JSON 字符串不能跨行，因此只需记录括号栈等少量状态。
+    状态为 (未闭合括号组成的字符串, 是否需要逗号分隔, 上一个逗号的位置是否悬空, 是否正等待 src 的值)。
+    """
+    initial_state = ("", False, False, False)
+
+    def lint_line(self, line, state):
+        stack, expect_sep, after_comma, expect_src = state
+        diagnostics = []
+        i, n = 0, len(line)
+        last_string = None
+
+        def value_start(pos, end):
+            nonlocal expect_sep, after_comma
+            if expect_sep:
+                diagnostics.append(Diagnostic(pos, end, ERROR, "缺少逗号"))
+            expect_sep = True
+            after_comma = False
+
+        while i < n:
+            ch = line[i]
+            if ch in " \t\r":
+                i += 1
+            elif ch == '"':
+                j = i + 1
+                while j < n and line[j] != '"':
+                    j += 2 if line[j] == "\\" else 1
+                if j >= n:
+                    diagnostics.append(Diagnostic(i, n, ERROR, "字符串未闭合（JSON 字符串不能跨行）"))
+                    return diagnostics, (stack, True, False, False)
+                value_start(i, j + 1)
+                if expect_src:
+                    if j == i + 1:
+                        diagnostics.append(Diagnostic(i, j + 1, ERROR, "原文 (src) 为空"))
+                    expect_src = False
+                    last_string = None
+                else:
+                    last_string = line[i + 1:j]
+                i = j + 1
+            elif ch == ":":
+                if last_string is None and not expect_sep:
+                    diagnostics.append(Diagnostic(i, i + 1, ERROR, "冒号前缺少键名"))
+                expect_src = last_string == "src"
+                last_string = None
+                expect_sep = False
+                i += 1
+            elif ch == ",":
+                if not expect_sep:
+                    diagnostics.append(Diagnostic(i, i + 1, ERROR, "多余的逗号"))
+                expect_sep = False
+                after_comma = True
+                last_string = None
+                i += 1
+            elif ch in "[{":
+                value_start(i, i + 1)
+                stack += ch
+                expect_sep = False
+                last_string = None
+                i += 1
+            elif ch in "]}":
+                if not stack or stack[-1] != _OPENERS[ch]:
+                    diagnostics.append(Diagnostic(i, i + 1, ERROR, "括号不匹配"))
+                else:
+                    stack = stack[:-1]
+                if after_comma:
+                    diagnostics.append(Diagnostic(i, i + 1, ERROR, "右括号前多余的逗号"))
+                expect_sep = True
+                after_comma = False
+                last_string = None
+                i += 1
+            else:
+                m = _JSON_LITERAL_RE.match(line, i)
+                if not m:
+                    diagnostics.append(Diagnostic(i, i + 1, ERROR, f"无法识别的字符 {ch!r}"))
+                    return diagnostics, (stack, expect_sep, False, False)
+                value_start(i, m.end())
+                expect_src = False
+                last_string = None
+                i = m.end()
+        return diagnostics, (stack, expect_sep, after_comma, expect_src)
+
+    def finish(self, state, last_line):
+        if state[0]:
+            return [Diagnostic(0, len(last_line), ERROR, "括号未闭合")]
+        return []
+
+
+def get_line_linter(format_key: Optional[str]) -> LineLinter:
+    """返回指定格式的行校验器；未知格式返回不报告任何问题的校验器。"""
+    if format_key == "GalTransl_TSV":
+        return TsvLinter()
+    if format_key == "GPPGUI_TOML":
+        return TomlLinter("org")
+    if format_key == "GPPCLI_TOML":
+        return TomlLinter("searchStr")
+    if format_key == "AiNiee_JSON":
+        return JsonLinter()
+    return LineLinter()
+
+
+# #####################################################################
+# 增量校验
+# #####################################################################
+class IncrementalLinter:
+    """
+    保存文档每一行的校验结果和行首解析状态，支持按行范围增量更新。
+    行号均从 0 开始。
+    """
+    def __init__(self, format_key: Optional[str] = None):
+        self.format_key = format_key
+        self.linter = get_line_linter(format_key)
+        self.lines: List[str] = [""]
+        # states[i] 为第 i 行开头的状态，states[len(lines)] 为文档结尾的状态
+        self.states: list = [self.linter.initial_state, self.linter.initial_state]
+        self.diagnostics: List[List[Diagnostic]] = [[]]
+        self.error_count = 0
+        self.warning_count = 0
+
+    def _count(self, diagnostics: List[Diagnostic], sign: int):
+        for d in diagnostics:
+            if d.severity == ERROR:
+                self.error_count += sign
+            else:
+                self.warning_count += sign
+
+    def reset(self, text: str):
+        """丢弃所有记录，完整校验整个文档。"""
+        self.lines = [""]
+        self.states = [self.linter.initial_state, self.linter.initial_state]
+        self.diagnostics = [[]]
+        self.error_count = self.warning_count = 0
+        self.update(0, 1, text.split("\n"))
+
+    def update(self, start: int, old_count: int, new_lines: List[str]) -> Tuple[int, int]:
+        """
+        用 new_lines 替换从 start 开始的 old_count 行，并重新校验受影响的行。
+
+        Args:
+            start: 被替换的第一行。
+            old_count: 被替换的行数。
+            new_lines: 替换后的行内容。
+
+        Returns:
+            重新校验过的行范围 (起始行, 结束行)，不含结束行。
+        """
+        for old in self.diagnostics[start:start + old_count]:
+            self._count(old, -1)
+        self.lines[start:start + old_count] = new_lines
+        self.diagnostics[start:start + old_count] = [[] for _ in new_lines]
+        # 保留被替换范围之后第一行的旧行首状态，重新校验到那里时用它判断能否提前结束
+        if new_lines:
+            self.states[start + 1:start + old_count] = [None] * (len(new_lines) - 1)
+            if not old_count:
+                self.states.insert(start + len(new_lines), self.states[start])
+        else:
+            del self.states[start + 1:start + old_count + 1]
+
+        lint_line = self.linter.lint_line
+        changed_end = start + len(new_lines)
+        i = start
+        while i < len(self.lines):
+            diagnostics, state = lint_line(self.lines[i], self.states[i])
+            self._count(self.diagnostics[i], -1)
+            self.diagnostics[i] = diagnostics
+            self._count(diagnostics, 1)
+            i += 1
+            # 修改范围之后，一旦行首状态与修改前相同，后续各行的结果也必然不变
+            if i >= changed_end and self.states[i] == state:
+                break
+            self.states[i] = state
+        return start, i
+
+    def end_diagnostics(self) -> List[Diagnostic]:
+        """文档级问题，报告在最后一行。"""
+        return self.linter.finish(self.states[-1], self.lines[-1])
+
+    def iter_diagnostics(self) -> Iterator[Tuple[int, Diagnostic]]:
+        """按行号顺序遍历所有校验结果，产出 (行号, 校验结果)。"""
+        for i, diagnostics in enumerate(self.diagnostics):
+            for d in diagnostics:
+                yield i, d
+        last = len(self.lines) - 1
+        for d in self.end_diagnostics():
+            yield last, d
+
+    def totals(self) -> Tuple[int, int]:
+        """返回 (错误数, 警告数)，包括文档级问题。"""
+        errors, warnings = self.error_count, self.warning_count
+        for d in self.end_diagnostics():
+            if d.severity == ERROR:
+                errors += 1
+            else:
+                warnings += 1
+        return errors, warnings
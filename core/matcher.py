@@ -0,0 +1,329 @@
+"""
+该模块提供多模式字符串匹配功能。
+它把所有关键字组织成一棵字典树 (trie)，再将字典树编译为一个正则表达式，
+从而由 C 实现的正则引擎在一次线性扫描中完成所有关键字的匹配，
+避免对每个条目分别执行 str.replace 带来的 O(条目数 × 文本长度) 开销。
+"""
+
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from core.conversion import DictData
+
+# 字典树中标记“此处为一个关键字结尾”的键
+_END = ""
+# 多选结构中直接列出的最大分支数，超过后按首字符范围二分
+_MAX_BRANCHES = 8
+# 并行应用字典时每个分块的大致字符数
+PARALLEL_CHUNK_CHARS = 4_000_000
+
+
+class KeywordTrie:
+    """
+    一组关键字的字典树及其编译得到的正则表达式。
+
+    正则表达式与字典树结构相同，每个分支后的可选后缀都是贪婪的，
+    因此在每个位置总是优先匹配最长的关键字（最左最长匹配）。
+    """
+    def __init__(self, keywords: Iterable[str]):
+        """
+        构建字典树。
+
+        Args:
+            keywords: 关键字序列。空字符串会被忽略；重复的关键字以首次出现的位置为准。
+        """
+        self.root: dict = {}
+        # 关键字 -> 在输入序列中首次出现的位置
+        self.index: Dict[str, int] = {}
+        for i, keyword in enumerate(keywords):
+            if not keyword or keyword in self.index:
+                continue
+            self.index[keyword] = i
+            node = self.root
+            for ch in keyword:
+                node = node.setdefault(ch, {})
+            node[_END] = True
+
+        self._pattern: Optional[str] = None
+        self._regex = None
+        self._overlap_regex = None
+
+    # 关键字很多时生成和编译正则表达式的耗时相当可观，因此都在首次使用时才进行
+    @property
+    def pattern(self) -> str:
+        """由字典树生成的正则表达式源码；没有关键字时为空字符串。"""
+        if self._pattern is None:
+            self._pattern = self._node_pattern(self.root) if self.index else ""
+        return self._pattern
+
+    @staticmethod
+    def _compile(pattern: str) -> Optional[re.Pattern]:
+        """
+        编译正则表达式；嵌套过深无法编译时返回 None。
+        许多关键字共用很长的前缀（如 "a"、"aa"、"aaa"……）时，多选结构会嵌套数百层，
+        超出 re 模块编译器的递归深度，此时改为直接沿字典树扫描。
+        """
+        try:
+            return re.compile(pattern)
+        except (RecursionError, re.error):
+            return None
+
+    @property
+    def regex(self) -> Optional[re.Pattern]:
+        """按最左最长规则匹配互不重叠关键字的正则表达式；无法编译时为 None。"""
+        if self._regex is None:
+            # 没有关键字时使用一个永不匹配的表达式
+            self._regex = self._compile(self.pattern or r"(?!)") or False
+        return self._regex or None
+
+    @property
+    def overlap_regex(self) -> Optional[re.Pattern]:
+        """零宽先行断言版本，用于在每个位置查找最长匹配（允许相互重叠）；无法编译时为 None。"""
+        if self._overlap_regex is None:
+            self._overlap_regex = self._compile(f"(?=({self.pattern}))" if self.pattern else r"(?!)") or False
+        return self._overlap_regex or None
+
+    def _longest_at(self, text: str, start: int) -> int:
+        """沿字典树查找从 start 开始的最长关键字，返回其结束位置；没有匹配时返回 -1。"""
+        node, longest = self.root, -1
+        for end in range(start, len(text)):
+            node = node.get(text[end])
+            if node is None:
+                break
+            if _END in node:
+                longest = end + 1
+        return longest
+
+    def _scan_longest(self, text: str, overlap: bool) -> Iterator[Tuple[int, int]]:
+        """
+        不使用正则表达式、直接沿字典树查找各位置的最长匹配，结果与 regex/overlap_regex 相同。
+        耗时与文本长度乘以匹配长度成正比，只在正则表达式无法编译时使用。
+        """
+        root, pos, n = self.root, 0, len(text)
+        while pos < n:
+            end = self._longest_at(text, pos) if text[pos] in root else -1
+            if end < 0:
+                pos += 1
+                continue
+            yield pos, end
+            pos = pos + 1 if overlap else end
+
+    def iter_within(self, key: str) -> Iterator[Tuple[int, int, int]]:
+        """
+        查找出现在 key 内部的所有关键字（包括重叠的匹配，但不包括 key 自身整体）。
+        直接沿字典树逐字符匹配，不需要编译正则表达式，适合对大量短文本逐一查询。
+
+        Yields:
+            (起始位置, 结束位置, 关键字在输入序列中的位置)
+        """
+        root, index, n = self.root, self.index, len(key)
+        for start in range(n):
+            node = root
+            for end in range(start, n):
+                node = node.get(key[end])
+                if node is None:
+                    break
+                if _END in node and (start or end + 1 < n):
+                    yield start, end + 1, index[key[start:end + 1]]
+
+    @classmethod
+    def _node_pattern(cls, root: dict) -> str:
+        """
+        将一个字典树节点（不含其自身字符）转换为正则表达式片段。
+        按后序遍历用显式的栈处理各节点，关键字再长也不会超出 Python 的递归深度。
+        """
+        patterns: Dict[int, str] = {}
+        stack = [(root, False)]
+        while stack:
+            node, children_done = stack.pop()
+            if not children_done:
+                stack.append((node, True))
+                stack.extend((node[ch], False) for ch in node if ch != _END)
+                continue
+            items = [(ch, patterns.pop(id(node[ch]))) for ch in sorted(k for k in node if k != _END)]
+            patterns[id(node)] = cls._join_node(node, items)
+        return patterns[id(root)]
+
+    @classmethod
+    def _join_node(cls, node: dict, items: List[Tuple[str, str]]) -> str:
+        """由子节点的正则表达式片段组合出节点的片段。"""
+        if not items:
+            return ""
+        if len(items) == 1 and _END not in node:
+            ch, suffix = items[0]
+            return re.escape(ch) + suffix
+        alternation = cls._alternation(items)
+        # 当前节点本身是关键字结尾时，后续部分可选：在末尾追加一个空分支，
+        # 引擎会先尝试更长的关键字。写成 (?:...|) 而不是 (?:...)?，
+        # 可避免正则引擎为可选组创建重复计数上下文的开销
+        return "(?:" + alternation + "|)" if _END in node else "(?:" + alternation + ")"
+
+    @classmethod
+    def _alternation(cls, items: List[Tuple[str, str]]) -> str:
+        """
+        将按首字符排序的分支列表转换为多选结构。
+
+        正则引擎会逐个尝试多选结构中的分支，分支很多时每个位置的代价都很高。
+        因此分支较多时按首字符范围二分，用零宽断言 (?=[范围]) 选择一半，
+        使每个位置只需 O(log 分支数) 次字符集判断。
+        """
+        if len(items) > _MAX_BRANCHES:
+            mid = len(items) // 2
+            left, right = items[:mid], items[mid:]
+            left_range = re.escape(left[0][0]) + "-" + re.escape(left[-1][0])
+            right_range = re.escape(right[0][0]) + "-" + re.escape(right[-1][0])
+            # 两侧都加上范围断言：左半部分匹配失败回溯时，右半部分只需一次判断即可放弃
+            return f"(?=[{left_range}])(?:{cls._alternation(left)})|(?=[{right_range}])(?:{cls._alternation(right)})"
+
+        branches = [re.escape(ch) + suffix for ch, suffix in items if suffix]
+        single_chars = [ch for ch, suffix in items if not suffix]
+        if len(single_chars) == 1:
+            branches.append(re.escape(single_chars[0]))
+        elif single_chars:
+            # 多个单字符分支合并为字符类，正则引擎可以一次判断
+            branches.append("[" + "".join(re.escape(c) for c in single_chars) + "]")
+        return "|".join(branches)
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def finditer(self, text: str) -> Iterator[Tuple[int, int, int]]:
+        """
+        从左到右查找互不重叠的最长匹配。
+
+        Yields:
+            (起始位置, 结束位置, 关键字在输入序列中的位置)
+        """
+        index = self.index
+        if self.regex is None:
+            for start, end in self._scan_longest(text, overlap=False):
+                yield start, end, index[text[start:end]]
+            return
+        for m in self.regex.finditer(text):
+            yield m.start(), m.end(), index[m.group()]
+
+    def iter_all(self, text: str) -> Iterator[Tuple[int, int, int]]:
+        """
+        查找所有关键字的全部出现位置，包括相互重叠和相互包含的匹配。
+
+        在每个位置，正则表达式只给出最长的匹配；其余在该位置出现的关键字
+        必然是这个最长匹配的前缀，只需沿字典树走一遍即可全部找出。
+
+        Yields:
+            (起始位置, 结束位置, 关键字在输入序列中的位置)
+        """
+        index = self.index
+        if self.overlap_regex is None:
+            matches = ((start, text[start:end]) for start, end in self._scan_longest(text, overlap=True))
+        else:
+            matches = ((m.start(), m.group(1)) for m in self.overlap_regex.finditer(text))
+        for start, longest in matches:
+            node = self.root
+            for offset, ch in enumerate(longest, 1):
+                node = node[ch]
+                if _END in node:
+                    yield start, start + offset, index[longest[:offset]]
+
+    def count_all(self, text: str) -> Dict[int, int]:
+        """统计每个关键字在文本中出现的次数（允许重叠），返回 {关键字位置: 次数}。"""
+        counts: Dict[int, int] = {}
+        for _, _, i in self.iter_all(text):
+            counts[i] = counts.get(i, 0) + 1
+        return counts
+
+
+def apply_entries(text: str, entries: DictData, trie: KeywordTrie | None = None) -> Tuple[str, List[Tuple[int, int, int]]]:
+    """
+    将字典条目作为 org→rep 替换规则应用到文本上。
+    在每个位置优先替换最长的 org，替换结果不会被再次替换。
+
+    Args:
+        text: 要处理的文本（如游戏脚本）。
+        entries: 字典条目列表。
+        trie: 可选的、由 entries 中各条目的 org 预先构建的字典树，用于重复应用时复用。
+
+    Returns:
+        (替换后的文本, 命中列表)。命中列表中每项为
+        (替换后文本中的起始位置, 结束位置, 条目在 entries 中的位置)。
+    """
+    if trie is None:
+        trie = KeywordTrie(item['org'] for item in entries)
+
+    parts = []
+    hits = []
+    pos = 0
+    out_len = 0
+    for start, end, i in trie.finditer(text):
+        rep = entries[i]['rep']
+        parts.append(text[pos:start])
+        out_len += start - pos
+        parts.append(rep)
+        hits.append((out_len, out_len + len(rep), i))
+        out_len += len(rep)
+        pos = end
+    parts.append(text[pos:])
+    return "".join(parts), hits
+
+
+# -------------------------------------------------------------
+# 多进程并行应用
+# -------------------------------------------------------------
+# 工作进程中的条目与字典树，每个进程只在初始化时构建一次
+_worker_entries: DictData = []
+_worker_trie: Optional[KeywordTrie] = None
+
+def _init_apply_worker(entries: DictData):
+    global _worker_entries, _worker_trie
+    _worker_entries = entries
+    _worker_trie = KeywordTrie(item['org'] for item in entries)
+
+def _apply_chunk(chunk: str):
+    return apply_entries(chunk, _worker_entries, _worker_trie)
+
+def split_at_newlines(text: str, chunk_chars: int) -> List[str]:
+    """将文本按大致长度切分为若干块，切分点总是位于换行符之后。"""
+    chunks = []
+    pos = 0
+    while pos < len(text):
+        cut = text.find("\n", pos + chunk_chars)
+        end = len(text) if cut == -1 else cut + 1
+        chunks.append(text[pos:end])
+        pos = end
+    return chunks
+
+def apply_entries_parallel(text: str, entries: DictData, workers: Optional[int] = None,
+                           chunk_chars: int = PARALLEL_CHUNK_CHARS) -> Tuple[str, List[Tuple[int, int, int]]]:
+    """
+    与 apply_entries 相同，但将长文本按行切分后交给进程池并行处理。
+    若有 org 包含换行符，按行切分可能截断匹配，此时退回单进程处理。
+
+    Args:
+        text: 要处理的文本。
+        entries: 字典条目列表。
+        workers: 工作进程数，默认为 CPU 核心数。
+        chunk_chars: 每个分块的大致字符数。
+
+    Returns:
+        与 apply_entries 相同的 (替换后的文本, 命中列表)。
+    """
+    chunks = split_at_newlines(text, chunk_chars)
+    if len(chunks) < 2 or any("\n" in item['org'] for item in entries):
+        return apply_entries(text, entries)
+
+    workers = min(workers or os.cpu_count() or 1, len(chunks))
+    parts = []
+    hits = []
+    offset = 0
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_apply_worker, initargs=(entries,)) as pool:
+            for chunk_text, chunk_hits in pool.map(_apply_chunk, chunks):
+                parts.append(chunk_text)
+                hits.extend((start + offset, end + offset, i) for start, end, i in chunk_hits)
+                offset += len(chunk_text)
+    except BrokenProcessPool:
+        # 工作进程异常退出（如内存不足被系统终止）时，退回单进程处理
+        return apply_entries(text, entries)
+    return "".join(parts), hits
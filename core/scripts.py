@@ -0,0 +1,50 @@
+"""
+该模块提供游戏脚本文件的读取与遍历功能。
+游戏脚本的编码并不统一，读取时会依次尝试几种常见编码。
+"""
+
+import os
+from typing import Iterable, Iterator, List
+
+# 游戏脚本常见的编码，依次尝试
+SCRIPT_ENCODINGS = ("utf-8-sig", "cp932", "gb18030")
+# 扫描脚本目录时默认包含的扩展名
+DEFAULT_SCRIPT_EXTENSIONS = (".txt", ".ks", ".json", ".scn", ".csv", ".ast", ".nut")
+
+
+def read_script_file(path: str) -> str:
+    """依次尝试常见编码读取脚本文件，均失败时以 UTF-8 读取并替换无法解码的字节。"""
+    with open(path, "rb") as f:
+        raw = f.read()
+    for encoding in SCRIPT_ENCODINGS:
+        try:
+            return raw.decode(encoding)
+        except UnicodeDecodeError:
+            continue
+    return raw.decode("utf-8", errors="replace")
+
+
+def parse_extensions(text: str) -> List[str]:
+    """将形如 “.txt; ks, .json” 的扩展名列表解析为小写且带点的扩展名列表。"""
+    extensions = []
+    for part in text.replace(",", ";").split(";"):
+        part = part.strip().lower()
+        if part:
+            extensions.append(part if part.startswith(".") else "." + part)
+    return extensions
+
+
+def iter_script_files(directory: str, extensions: Iterable[str] = DEFAULT_SCRIPT_EXTENSIONS) -> Iterator[str]:
+    """
+    递归遍历目录下的脚本文件，按路径排序输出。
+
+    Args:
+        directory: 脚本所在目录。
+        extensions: 要包含的扩展名（小写且带点）；为空时包含所有文件。
+    """
+    extensions = tuple(ext.lower() for ext in extensions)
+    for root, dirs, files in os.walk(directory):
+        dirs.sort()
+        for name in sorted(files):
+            if not extensions or name.lower().endswith(extensions):
+                yield os.path.join(root, name)
@@ -0,0 +1,281 @@
+"""
+该模块提供在整个目录的字典文件中查找与替换的功能。
+查找选项（普通文本/正则表达式、区分大小写）与查找替换对话框一致，
+文件被分配到进程池中并行处理，每处理完一个文件就立即返回其结果。
+替换时先写入临时文件，再整体替换原文件，中途出错不会留下只写了一半的文件。
+"""
+
+import codecs
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Callable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from core.scripts import SCRIPT_ENCODINGS
+
+# 目录查找时默认包含的字典文件扩展名
+DICTIONARY_EXTENSIONS = (".json", ".toml", ".txt")
+# 每个文件最多返回的匹配位置数，超出部分只计入次数
+MAX_MATCHES_PER_FILE = 1000
+# 匹配所在行的预览文本最大长度
+PREVIEW_CHARS = 200
+
+
+class SearchOptions(NamedTuple):
+    """
+    查找与替换选项。
+
+    Attributes:
+        find: 查找内容。
+        replace: 替换内容；正则模式下可使用 $1 或 \\1 引用捕获组。
+        regex: 是否为正则表达式（启用多行模式）。
+        case: 是否区分大小写。
+    """
+    find: str
+    replace: str = ""
+    regex: bool = False
+    case: bool = False
+
+
+class SearchMatch(NamedTuple):
+    """一个匹配位置，行号和列号从 1 开始。"""
+    line: int
+    col: int
+    preview: str
+
+
+class FileResult(NamedTuple):
+    """
+    单个文件的查找或替换结果。
+
+    Attributes:
+        path: 文件路径。
+        count: 匹配（或已替换）的次数。
+        matches: 匹配位置列表，最多 MAX_MATCHES_PER_FILE 个；替换时为空列表。
+        error: 读取或写入失败时的错误信息，否则为 None。
+    """
+    path: str
+    count: int
+    matches: List[SearchMatch]
+    error: Optional[str]
+
+
+def compile_pattern(options: SearchOptions) -> re.Pattern:
+    """
+    按查找替换对话框的规则编译查找内容。
+
+    Raises:
+        re.error: 如果正则表达式无效。
+    """
+    if options.regex:
+        flags = re.MULTILINE
+        pattern = options.find
+    else:
+        flags = 0
+        pattern = re.escape(options.find)
+    if not options.case:
+        flags |= re.IGNORECASE
+    return re.compile(pattern, flags)
+
+
+def python_style_repl(repl: str) -> str:
+    """将替换字符串从VS Code风格($1)转换为Python风格(\\1)。"""
+    return re.sub(r'\$(\d+)', r'\\\1', repl)
+
+
+def read_text_file(path: str) -> Tuple[str, str]:
+    """
+    依次尝试常见编码读取文本文件。
+
+    Returns:
+        (文本内容, 写回时应使用的编码)；带 BOM 的 UTF-8 文件写回时保留 BOM。
+
+    Raises:
+        OSError: 如果文件无法读取。
+        UnicodeDecodeError: 如果所有编码均无法解码。
+    """
+    with open(path, "rb") as f:
+        raw = f.read()
+    error = None
+    for encoding in SCRIPT_ENCODINGS:
+        try:
+            text = raw.decode(encoding)
+        except UnicodeDecodeError as e:
+            error = error or e
+            continue
+        if encoding == "utf-8-sig" and not raw.startswith(codecs.BOM_UTF8):
+            encoding = "utf-8"
+        return text, encoding
+    raise error
+
+
+def write_text_atomic(path: str, text: str, encoding: str):
+    """先写入同目录下的临时文件，再整体替换原文件，并保留原文件的权限。"""
+    tmp_path = path + ".tmp"
+    try:
+        # newline="" 保证原文中的换行符按原样写回
+        with open(tmp_path, "w", encoding=encoding, newline="") as f:
+            f.write(text)
+        try:
+            os.chmod(tmp_path, os.stat(path).st_mode & 0o7777)
+        except OSError:
+            pass
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+# -------------------------------------------------------------
+# 单个文件
+# -------------------------------------------------------------
+def search_text(text: str, pattern: re.Pattern, limit: int = MAX_MATCHES_PER_FILE) -> Tuple[int, List[SearchMatch]]:
+    """
+    在文本中查找所有匹配。
+
+    Returns:
+        (匹配次数, 前 limit 个匹配位置)。
+    """
+    count = 0
+    matches = []
+    line, line_start, scanned = 1, 0, 0
+    for m in pattern.finditer(text):
+        count += 1
+        if len(matches) >= limit:
+            continue
+        # 只统计上一个匹配到本匹配之间的换行，总耗时与文本长度成正比
+        start = m.start()
+        newlines = text.count("\n", scanned, start)
+        if newlines:
+            line += newlines
+            line_start = text.rfind("\n", scanned, start) + 1
+        scanned = start
+        line_end = text.find("\n", start)
+        preview = text[line_start:line_end if line_end != -1 else len(text)]
+        matches.append(SearchMatch(line, start - line_start + 1, preview[:PREVIEW_CHARS].strip()))
+    return count, matches
+
+
+def search_file(path: str, pattern: re.Pattern) -> FileResult:
+    """在单个文件中查找。"""
+    try:
+        text, _ = read_text_file(path)
+    except (OSError, UnicodeDecodeError) as e:
+        return FileResult(path, 0, [], str(e))
+    count, matches = search_text(text, pattern)
+    return FileResult(path, count, matches, None)
+
+
+def replace_file(path: str, pattern: re.Pattern, options: SearchOptions, dry_run: bool = False) -> FileResult:
+    """
+    替换单个文件中的所有匹配。没有匹配的文件不会被改写。
+
+    Args:
+        path: 文件路径。
+        pattern: compile_pattern 编译得到的正则表达式。
+        options: 查找与替换选项。
+        dry_run: 为 True 时只统计会被替换的次数，不写入文件。
+    """
+    try:
+        text, encoding = read_text_file(path)
+        if options.regex:
+            new_text, count = pattern.subn(python_style_repl(options.replace), text)
+        else:
+            # 普通模式下替换文本按原样插入
+            new_text, count = pattern.subn(lambda m: options.replace, text)
+        if count and not dry_run:
+            write_text_atomic(path, new_text, encoding)
+    except (OSError, UnicodeError, re.error, IndexError) as e:
+        return FileResult(path, 0, [], str(e))
+    return FileResult(path, count, [], None)
+
+
+# -------------------------------------------------------------
+# 工作进程
+# -------------------------------------------------------------
+# 工作进程中的查找选项与编译后的正则表达式，每个进程只在初始化时编译一次
+_worker_options: Optional[SearchOptions] = None
+_worker_pattern: Optional[re.Pattern] = None
+
+def _init_worker(options: SearchOptions):
+    global _worker_options, _worker_pattern
+    _worker_options = options
+    _worker_pattern = compile_pattern(options)
+
+def _search_worker(path: str) -> FileResult:
+    return search_file(path, _worker_pattern)
+
+def _replace_worker(path: str, dry_run: bool) -> FileResult:
+    return replace_file(path, _worker_pattern, _worker_options, dry_run)
+
+
+def _run(paths: Sequence[str], options: SearchOptions, task: Callable, args: tuple,
+         workers: Optional[int], cancelled: Optional[Callable[[], bool]]) -> Iterator[FileResult]:
+    workers = min(workers or os.cpu_count() or 1, len(paths))
+    if workers <= 1:
+        _init_worker(options)
+        for path in paths:
+            if cancelled and cancelled():
+                return
+            yield task(path, *args)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(options,)) as pool:
+        futures = [pool.submit(task, path, *args) for path in paths]
+        try:
+            for future in as_completed(futures):
+                yield future.result()
+                if cancelled and cancelled():
+                    break
+        finally:
+            # 中止或调用方不再迭代时，取消尚未开始的文件
+            for f in futures:
+                f.cancel()
+
+
+def iter_search(paths: Sequence[str], options: SearchOptions, workers: Optional[int] = None,
+                cancelled: Optional[Callable[[], bool]] = None) -> Iterator[FileResult]:
+    """
+    在多个文件中并行查找，按完成顺序逐个返回每个文件的结果（包括没有匹配的文件）。
+
+    Args:
+        paths: 文件路径列表。
+        options: 查找选项。
+        workers: 进程数，默认为 CPU 核心数。
+        cancelled: 返回 True 时在处理完当前文件后停止。
+
+    Raises:
+        re.error: 如果正则表达式无效。
+    """
+    compile_pattern(options)
+    return _run(paths, options, _search_worker, (), workers, cancelled)
+
+
+def iter_replace(paths: Sequence[str], options: SearchOptions, dry_run: bool = False,
+                 workers: Optional[int] = None,
+                 cancelled: Optional[Callable[[], bool]] = None) -> Iterator[FileResult]:
+    """
+    在多个文件中并行替换，按完成顺序逐个返回每个文件的替换次数。
+
+    Args:
+        paths: 文件路径列表。
+        options: 查找与替换选项。
+        dry_run: 为 True 时只统计每个文件会被替换的次数，不写入文件。
+        workers: 进程数，默认为 CPU 核心数。
+        cancelled: 返回 True 时在处理完当前文件后停止。
+
+    Raises:
+        re.error: 如果正则表达式或替换字符串无效。
+    """
+    pattern = compile_pattern(options)
+    if options.regex:
+        # 提前检查替换字符串中的组引用，避免每个文件都报告同样的错误
+        try:
+            pattern.sub(python_style_repl(options.replace), "")
+        except IndexError as e:
+            # 未知的命名组引用抛出的是 IndexError
+            raise re.error(str(e)) from None
+    return _run(paths, options, _replace_worker, (dry_run,), workers, cancelled)
@@ -0,0 +1,346 @@
+"""
+该模块实现了一个常驻的本地转换服务，供需要频繁转换字典的其他工具调用，
+省去每次调用时启动解释器和导入 tomllib 等模块的开销。
+
+协议为 TCP 上的逐行 JSON：客户端每行发送一个请求对象，服务按顺序每行返回一个响应对象。
+
+    请求: {"id": 1, "op": "convert", "content": "...", "from": "GalTransl_TSV", "to": "AiNiee_JSON"}
+    响应: {"id": 1, "ok": true, "result": {"format": "GalTransl_TSV", "count": 2, "output": "..."}}
+    失败: {"id": 1, "ok": false, "error": "..."}
+
+支持的操作:
+    convert   转换内容。from 省略时自动检测；输出为二进制格式时 output 为 base64 字符串。
+    detect    检测内容的格式。
+    validate  解析并逐行校验内容，返回错误数、警告数和前若干条问题。
+    batch     {"op": "batch", "requests": [...]}，并发处理多个请求，按顺序返回 results 列表。
+    ping      返回服务的统计信息。
+
+较大的请求在进程池中处理，不会阻塞其他连接；相同内容的重复请求直接返回缓存的结果。
+服务只监听本机地址，不做任何身份验证。
+"""
+
+import asyncio
+import base64
+import hashlib
+import json
+import os
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
+
+from constants import FORMAT_DEFINITIONS
+from core import api, conversion, lint
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+# 内容超过此字符数的请求交给进程池处理，较小的请求直接处理更快
+POOL_THRESHOLD_CHARS = 64 * 1024
+# validate 最多返回的问题数
+MAX_DIAGNOSTICS = 1000
+# 缓存的结果数
+RESULT_CACHE_SIZE = 64
+# 单行请求的最大字节数
+MAX_REQUEST_BYTES = 512 * 1024 * 1024
+
+
+class ServiceError(Exception):
+    """服务返回了失败的响应。"""
+
+
+# -------------------------------------------------------------
+# 请求处理（在服务进程或工作进程中执行）
+# -------------------------------------------------------------
+def _input_format(content: str, fmt: Optional[str]) -> str:
+    if fmt:
+        return api.resolve_format(fmt)
+    key = api.detect_text(content)
+    if key is None:
+        raise ValueError("无法自动检测内容的格式。")
+    return key
+
+
+def _op_convert(request: dict) -> dict:
+    content = request["content"]
+    input_key = _input_format(content, request.get("from"))
+    output_key = api.resolve_format(request["to"])
+    entries = conversion.parse_input(content, input_key)
+    if conversion.is_binary_format(output_key):
+        output = base64.b64encode(conversion.serialize_binary(entries, output_key)).decode("ascii")
+    else:
+        output = conversion.format_output(entries, output_key)
+    return {"format": input_key, "count": len(entries), "output": output}
+
+
+def _op_detect(request: dict) -> dict:
+    return {"format": api.detect_text(request["content"])}
+
+
+def _op_validate(request: dict) -> dict:
+    content = request["content"]
+    input_key = _input_format(content, request.get("from"))
+    linter = lint.IncrementalLinter(input_key)
+    linter.reset(content[1:] if content.startswith('\ufeff') else content)
+    errors, warnings = linter.totals()
+    diagnostics = []
+    for line, d in linter.iter_diagnostics():
+        if len(diagnostics) >= MAX_DIAGNOSTICS:
+            break
+        diagnostics.append([line + 1, d.start + 1, d.severity, d.message])
+    try:
+        count, parse_error = len(conversion.parse_input(content, input_key)), None
+    except ValueError as e:
+        count, parse_error = None, str(e)
+    return {"format": input_key, "errors": errors, "warnings": warnings, "diagnostics": diagnostics,
+            "count": count, "parse_error": parse_error}
+
+
+_HANDLERS = {"convert": _op_convert, "detect": _op_detect, "validate": _op_validate}
+
+
+def handle_request(request: dict) -> dict:
+    """
+    处理单个请求，返回结果对象。
+
+    Raises:
+        ValueError: 如果请求无效或内容无法解析。
+        KeyError: 如果缺少必需的字段。
+    """
+    handler = _HANDLERS.get(request.get("op"))
+    if handler is None:
+        raise ValueError(f"未知的操作: {request.get('op')}")
+    return handler(request)
+
+
+def _warm_up():
+    """预先导入按需加载的模块（如 tomllib），使第一个请求不必承担导入开销。"""
+    for key in FORMAT_DEFINITIONS:
+        if not conversion.is_binary_format(key):
+            try:
+                conversion.parse_input(conversion.format_output([{'org': 'a', 'rep': 'b', 'note': ''}], key), key)
+            except (ImportError, ValueError):
+                pass
+
+
+# -------------------------------------------------------------
+# 服务端
+# -------------------------------------------------------------
+class ConversionService:
+    """
+    转换服务。
+
+    用法:
+        service = ConversionService()
+        server = await service.start(host, port)
+        ...
+        await service.close()
+    """
+    def __init__(self, workers: Optional[int] = None, pool_threshold: int = POOL_THRESHOLD_CHARS):
+        """
+        Args:
+            workers: 进程池的进程数，默认为 CPU 核心数；为 0 时不使用进程池。
+            pool_threshold: 内容达到此字符数的请求交给进程池处理。
+        """
+        self.workers = (os.cpu_count() or 1) if workers is None else workers
+        self.pool_threshold = pool_threshold
+        self.pool: Optional[ProcessPoolExecutor] = None
+        self.server: Optional[asyncio.AbstractServer] = None
+        self.stats = {"requests": 0, "pooled": 0, "cache_hits": 0, "errors": 0}
+        self._cache: "OrderedDict[tuple, dict]" = OrderedDict()
+        # 当前连接的处理任务及其写入端，关闭服务时先断开所有连接
+        self._clients: Dict[asyncio.Task, asyncio.StreamWriter] = {}
+
+    async def start(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> asyncio.AbstractServer:
+        """启动进程池并开始监听。port 为 0 时由系统分配端口。"""
+        _warm_up()
+        if self.workers > 0:
+            self.pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_warm_up)
+        self.server = await asyncio.start_server(self._on_client, host, port, limit=MAX_REQUEST_BYTES)
+        return self.server
+
+    @property
+    def address(self) -> tuple:
+        """实际监听的 (地址, 端口)。"""
+        return self.server.sockets[0].getsockname()[:2]
+
+    async def close(self):
+        """停止监听并关闭进程池。"""
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+            self.server = None
+        for writer in self._clients.values():
+            writer.close()
+        await asyncio.gather(*self._clients, return_exceptions=True)
+        if self.pool is not None:
+            self.pool.shutdown(cancel_futures=True)
+            self.pool = None
+
+    async def _on_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        task = asyncio.current_task()
+        self._clients[task] = writer
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except (asyncio.LimitOverrunError, ValueError):
+                    response = {"id": None, "ok": False, "error": "请求过大"}
+                    writer.write((json.dumps(response, ensure_ascii=False) + "\n").encode("utf-8"))
+                    break
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                    if not isinstance(request, dict):
+                        raise ValueError("请求必须是 JSON 对象")
+                except ValueError as e:
+                    response = {"id": None, "ok": False, "error": f"无效的请求: {e}"}
+                else:
+                    response = await self.dispatch(request)
+                writer.write((json.dumps(response, ensure_ascii=False) + "\n").encode("utf-8"))
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            del self._clients[task]
+            writer.close()
+
+    async def dispatch(self, request: dict) -> dict:
+        """处理一个请求（包括 batch 请求），返回响应对象。"""
+        if request.get("op") == "batch":
+            requests = request.get("requests")
+            if not isinstance(requests, list):
+                return {"id": request.get("id"), "ok": False, "error": "batch 请求需要 requests 列表"}
+            results = await asyncio.gather(*(self._run(r if isinstance(r, dict) else {}) for r in requests))
+            return {"id": request.get("id"), "ok": True, "results": results}
+        return await self._run(request)
+
+    async def _run(self, request: dict) -> dict:
+        self.stats["requests"] += 1
+        try:
+            result = await self._execute(request)
+        except Exception as e:
+            self.stats["errors"] += 1
+            return {"id": request.get("id"), "ok": False, "error": str(e) or type(e).__name__}
+        return {"id": request.get("id"), "ok": True, "result": result}
+
+    async def _execute(self, request: dict) -> dict:
+        if request.get("op") == "ping":
+            return {"pong": True, "workers": self.workers, "stats": dict(self.stats)}
+        if request.get("op") not in _HANDLERS:
+            raise ValueError(f"未知的操作: {request.get('op')}")
+        content = request.get("content")
+        if not isinstance(content, str):
+            raise ValueError("请求需要 content 字符串")
+
+        digest = hashlib.blake2b(content.encode("utf-8", errors="surrogatepass"), digest_size=16).digest()
+        cache_key = (request.get("op"), request.get("from"), request.get("to"), digest)
+        cached = self._cache.get(cache_key)
+        if cached is not None:
+            self._cache.move_to_end(cache_key)
+            self.stats["cache_hits"] += 1
+            return cached
+
+        if self.pool is not None and len(content) >= self.pool_threshold:
+            self.stats["pooled"] += 1
+            result = await asyncio.get_running_loop().run_in_executor(self.pool, handle_request, request)
+        else:
+            result = handle_request(request)
+
+        self._cache[cache_key] = result
+        if len(self._cache) > RESULT_CACHE_SIZE:
+            self._cache.popitem(last=False)
+        return result
+
+
+def serve(host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, workers: Optional[int] = None, on_ready=None):
+    """
+    启动服务并一直运行，直到被中断。
+
+    Args:
+        host: 监听地址。
+        port: 监听端口。
+        workers: 进程池的进程数。
+        on_ready: 开始监听后调用的函数，参数为实际的 (地址, 端口)。
+    """
+    async def main():
+        service = ConversionService(workers)
+        server = await service.start(host, port)
+        if on_ready:
+            on_ready(service.address)
+        try:
+            await server.serve_forever()
+        finally:
+            await service.close()
+
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
+
+
+# -------------------------------------------------------------
+# 客户端
+# -------------------------------------------------------------
+class ServiceClient:
+    """
+    转换服务的异步客户端。
+
+    用法:
+        async with ServiceClient(port=port) as client:
+            result = await client.call("convert", content=text, to="AiNiee_JSON")
+    """
+    def __init__(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT):
+        self.host = host
+        self.port = port
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._next_id = 0
+        # 同一连接上的请求按顺序收发
+        self._lock = asyncio.Lock()
+
+    async def connect(self):
+        self._reader, self._writer = await asyncio.open_connection(self.host, self.port, limit=MAX_REQUEST_BYTES)
+
+    async def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            await self._writer.wait_closed()
+            self._writer = None
+
+    async def __aenter__(self):
+        await self.connect()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def request(self, request: dict) -> dict:
+        """发送一个请求对象，返回原始的响应对象。"""
+        async with self._lock:
+            self._next_id += 1
+            request = dict(request, id=self._next_id)
+            self._writer.write((json.dumps(request, ensure_ascii=False) + "\n").encode("utf-8"))
+            await self._writer.drain()
+            line = await self._reader.readline()
+        if not line:
+            raise ConnectionError("服务已关闭连接")
+        return json.loads(line)
+
+    async def call(self, op: str, **fields) -> dict:
+        """
+        执行一个操作并返回其结果。
+
+        Raises:
+            ServiceError: 如果服务返回失败。
+        """
+        response = await self.request(dict(fields, op=op))
+        if not response.get("ok"):
+            raise ServiceError(response.get("error"))
+        return response["result"]
+
+    async def batch(self, requests: List[Dict]) -> List[Dict]:
+        """在一个请求中并发执行多个操作，返回与之一一对应的响应对象（各自包含 ok 字段）。"""
+        response = await self.request({"op": "batch", "requests": requests})
+        if not response.get("ok"):
+            raise ServiceError(response.get("error"))
+        return response["results"]
@@ -0,0 +1,197 @@
+"""
+该模块维护正在编辑的字典的统计数据：条目数、重复原文数、空备注比例，以及原文/译文的长度分布。
+
+统计与快速跳转的索引一样按记录增量更新：内容修改后只重新解析与修改范围相交的记录，
+先从各项计数中减去旧记录的条目，再加上新记录的条目，其余记录无需重新扫描。
+长度分布保存在定长的计数数组中；安装了 NumPy 时，一次增减大量条目（如首次统计或粘贴）
+使用 numpy.bincount 批量计数，否则逐个累加，两种方式的结果相同。
+"""
+
+from array import array
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+from core.conversion import DictData
+from core.incremental import RECORD_FORMATS, split_changed_records
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# 长度分布的桶数：长度 0 到 MAX_LENGTH_BUCKET - 1 各占一个桶，更长的归入最后一个桶
+MAX_LENGTH_BUCKET = 32
+# 一次增减的条目数达到该值时才使用 NumPy 批量计数，条目较少时逐个累加更快
+NUMPY_BATCH_MIN = 512
+
+
+class StatsSummary(NamedTuple):
+    """
+    统计结果的快照。
+
+    Attributes:
+        entries: 条目数。
+        duplicates: 原文与前面某个条目相同的条目数（去重后会被删除的条目数）。
+        duplicate_orgs: 出现不止一次的原文数。
+        empty_notes: 备注为空的条目数。
+        org_chars: 所有原文的总字符数。
+        rep_chars: 所有译文的总字符数。
+        org_lengths: 原文长度分布，第 i 项为长度为 i 的条目数，最后一项包括所有更长的条目。
+        rep_lengths: 译文长度分布。
+    """
+    entries: int
+    duplicates: int
+    duplicate_orgs: int
+    empty_notes: int
+    org_chars: int
+    rep_chars: int
+    org_lengths: List[int]
+    rep_lengths: List[int]
+
+    @property
+    def empty_note_ratio(self) -> float:
+        return self.empty_notes / self.entries if self.entries else 0.0
+
+    @property
+    def mean_org_length(self) -> float:
+        return self.org_chars / self.entries if self.entries else 0.0
+
+    @property
+    def mean_rep_length(self) -> float:
+        return self.rep_chars / self.entries if self.entries else 0.0
+
+
+class _Histogram:
+    """定长的计数数组，有 NumPy 时用 numpy 数组，否则用 array('q')。"""
+    __slots__ = ("counts",)
+
+    def __init__(self):
+        self.counts = np.zeros(MAX_LENGTH_BUCKET, dtype=np.int64) if np is not None else array('q', bytes(8 * MAX_LENGTH_BUCKET))
+
+    def add(self, lengths: List[int], sign: int):
+        """按长度列表增加（sign 为 1）或减少（sign 为 -1）计数。"""
+        counts = self.counts
+        if np is not None and len(lengths) >= NUMPY_BATCH_MIN:
+            buckets = np.minimum(np.asarray(lengths, dtype=np.int64), MAX_LENGTH_BUCKET - 1)
+            counts += sign * np.bincount(buckets, minlength=MAX_LENGTH_BUCKET)
+            return
+        last = MAX_LENGTH_BUCKET - 1
+        for n in lengths:
+            counts[n if n < last else last] += sign
+
+    def to_list(self) -> List[int]:
+        return [int(c) for c in self.counts]
+
+
+class DictionaryStats:
+    """
+    按记录增量维护的字典统计。不是线程安全的。
+
+    用法:
+        stats = DictionaryStats()
+        stats.update(content.split("\\n"), "GalTransl_TSV")
+        print(stats.summary().duplicates)
+    """
+    def __init__(self):
+        self.input_key: Optional[str] = None
+        self._lines: List[str] = []
+        # 各记录的起始行号与条目，一一对应
+        self._starts: List[int] = []
+        self._records: List[DictData] = []
+
+        self.entries = 0
+        self.duplicates = 0
+        self.duplicate_orgs = 0
+        self.empty_notes = 0
+        self.org_chars = 0
+        self.rep_chars = 0
+        self._org_counts: Dict[str, int] = {}
+        self._org_lengths = _Histogram()
+        self._rep_lengths = _Histogram()
+
+    def reset(self):
+        """清空统计。"""
+        self.__init__()
+
+    def update(self, lines: List[str], input_key: str) -> int:
+        """
+        用输入内容的新版本更新统计，只重新解析与修改范围相交的记录。
+
+        Args:
+            lines: 输入内容按换行符拆分的各行。不会被修改，调用方之后也不能修改它。
+            input_key: 输入格式的键名。
+
+        Returns:
+            重新解析的记录数。
+
+        Raises:
+            ValueError: 如果格式不支持增量统计（如二进制格式）。
+        """
+        record_format = RECORD_FORMATS.get(input_key)
+        if record_format is None:
+            raise ValueError(f"不支持统计该格式: {input_key}")
+        if input_key != self.input_key:
+            self.reset()
+            self.input_key = input_key
+        if lines and lines[0].startswith('\ufeff'):
+            lines = [lines[0][1:]] + lines[1:]
+
+        change = split_changed_records(self._lines, lines, self._starts, record_format.is_record_start)
+        if change is None:
+            return 0
+        first, tail = change.first, change.tail
+
+        removed = self._records[first:tail]
+        added = []
+        for text in change.iter_texts(lines):
+            # 无法单独解析的记录（如正在编辑的半行）不计入统计，修好后会再次解析
+            entries, _ = record_format.parse(text)
+            added.append(entries)
+        self._apply(removed, -1)
+        self._apply(added, 1)
+
+        # 原地替换切片，行内修改时只需改动几个元素，不必复制整个列表
+        if change.delta == 0 and len(added) == tail - first:
+            self._starts[first:tail] = change.new_starts
+        else:
+            self._starts = change.splice_starts(self._starts)
+        self._records[first:tail] = added
+        self._lines = lines
+        return len(added)
+
+    def _apply(self, records: Iterable[DictData], sign: int):
+        """把若干记录的条目计入（sign 为 1）或移出（sign 为 -1）统计。"""
+        org_counts = self._org_counts
+        org_lengths, rep_lengths = [], []
+        empty_notes = 0
+        for entries in records:
+            for item in entries:
+                org = item['org']
+                count = org_counts.get(org, 0)
+                if sign > 0:
+                    org_counts[org] = count + 1
+                    if count:
+                        self.duplicates += 1
+                        self.duplicate_orgs += count == 1
+                else:
+                    if count > 1:
+                        org_counts[org] = count - 1
+                        self.duplicates -= 1
+                        self.duplicate_orgs -= count == 2
+                    else:
+                        del org_counts[org]
+                org_lengths.append(len(org))
+                rep_lengths.append(len(item['rep']))
+                empty_notes += not item['note']
+        self.entries += sign * len(org_lengths)
+        self.empty_notes += sign * empty_notes
+        self.org_chars += sign * sum(org_lengths)
+        self.rep_chars += sign * sum(rep_lengths)
+        self._org_lengths.add(org_lengths, sign)
+        self._rep_lengths.add(rep_lengths, sign)
+
+    def summary(self) -> StatsSummary:
+        """返回当前统计结果的快照。"""
+        return StatsSummary(
+            self.entries, self.duplicates, self.duplicate_orgs, self.empty_notes,
+            self.org_chars, self.rep_chars, self._org_lengths.to_list(), self._rep_lengths.to_list(),
+        )
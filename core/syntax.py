@@ -8,7 +8,13 @@ from tkinterdnd2 import DND_FILES # 导入DND_FILES以备将来使用
 from ui.custom_widgets import EditorWithLineNumbers
 from constants import HIGHLIGHT_DELAY_MS
 # 导入 conversion 模块以使用其辅助函数
-from core import conversion
+from core import conversion, lint
+from utils.tracing import span
+
+# 语法高亮使用的标签
+SYNTAX_TAGS = ("key", "string", "punc", "comment", "tsv_tab", "tsv_space_delimiter", "number", "boolean_null")
+# 校验结果对应的编辑器标签
+LINT_TAGS = {lint.ERROR: "lint_error", lint.WARNING: "lint_warning"}
 
 class SyntaxHandler:
     """
@@ -23,6 +29,14 @@ class SyntaxHandler:
         """
         self.app = app_instance
         self.highlight_job_id: str | None = None
+        # 各编辑器最近一次整体语法高亮所用的格式，局部高亮时格式不同则需整体重新高亮
+        self._highlighted_formats = {}
+
+        # 输入框内容的增量校验器，格式在每次语法高亮时确定
+        self.linter = lint.IncrementalLinter()
+        self.lint_summary_job: str | None = None
+        # 校验结果汇总更新后调用的回调，如问题列表对话框
+        self.lint_listeners = []
 
     def setup_editor_features(self):
         """
@@ -42,6 +56,8 @@ class SyntaxHandler:
             "found": {"background": "#FFD700"},  # 查找对话框使用
             "found_current": {"background": "#ff9800"},  # 查找对话框使用
             "goto_line": {"background": "#FFFACD"},  # 跳转对话框使用
+            "lint_error": {"background": "#FFD9D9", "underline": True},  # 校验错误
+            "lint_warning": {"background": "#FFF0C2"},  # 校验警告
         }
         
         widgets = [self.app.input_text, self.app.output_text]
@@ -58,6 +74,7 @@ class SyntaxHandler:
 
         # 只对输入框绑定修改和注释相关的事件
         self.app.input_text.text.bind("<KeyRelease>", self.on_text_change)
+        self.app.input_text.add_change_listener(self.on_input_lines_changed)
         self.app.input_text.text.bind("<Control-slash>", self.toggle_comment)
         
         # 绑定输入格式下拉框的变更事件
@@ -78,6 +95,19 @@ class SyntaxHandler:
             HIGHLIGHT_DELAY_MS, lambda: self.update_all_highlights(widget)
         )
         
+    def on_input_lines_changed(self, start_line, old_count, new_count):
+        """输入框内容修改后，只重新校验受影响的行。"""
+        widget = self.app.input_text
+        if start_line is None:
+            # 撤销/重做等无法得知修改范围的操作，整体重新校验
+            self.linter.reset(widget.get_content())
+            self._retag_lint_lines(0, len(self.linter.lines))
+        else:
+            new_lines = widget.get(f"{start_line}.0", f"{start_line + new_count - 1}.end").split("\n")
+            first, end = self.linter.update(start_line - 1, old_count, new_lines)
+            self._retag_lint_lines(first, end)
+        self._schedule_lint_summary()
+
     def on_selection_change(self, event=None):
         """处理文本选择事件，高亮显示重复项。"""
         if not event: return
@@ -97,9 +127,63 @@ class SyntaxHandler:
             self.app.current_file_path = None
             self.app.status_var.set("输入格式已更改，文件关联已重置。")
             self.app.root.title(f"GPT字典编辑转换器   {self.app.APP_VERSION}")
+            self.app.documents.update_active_label()
 
         self.update_all_highlights(self.app.input_text)
 
+    # -------------------------------------------------------------
+    # 增量校验
+    # -------------------------------------------------------------
+    def set_lint_format(self, format_key: str | None):
+        """切换校验所用的格式；格式改变时整体重新校验输入框内容。"""
+        if format_key == self.linter.format_key:
+            return
+        with span("校验"):
+            self.linter = lint.IncrementalLinter(format_key)
+            self.linter.reset(self.app.input_text.get_content())
+            self._retag_lint_lines(0, len(self.linter.lines))
+        self._schedule_lint_summary()
+
+    def _retag_lint_lines(self, first: int, end: int):
+        """重新标记第 first 行到第 end 行（从 0 开始，不含 end）的校验结果。"""
+        widget = self.app.input_text
+        for tag in LINT_TAGS.values():
+            widget.tag_remove(tag, f"{first + 1}.0", f"{end + 1}.0")
+        last = len(self.linter.lines) - 1
+        ranges = {tag: [] for tag in LINT_TAGS.values()}
+        for i in range(first, min(end, last + 1)):
+            diagnostics = self.linter.diagnostics[i]
+            if i == last:
+                diagnostics = diagnostics + self.linter.end_diagnostics()
+            for d in diagnostics:
+                # 空范围（如行尾）至少标记一个字符，使问题可见
+                ranges[LINT_TAGS[d.severity]].extend((f"{i + 1}.{d.start}", f"{i + 1}.{max(d.end, d.start + 1)}"))
+        for tag, indices in ranges.items():
+            if indices:
+                widget.tag_add(tag, *indices)
+
+    def _schedule_lint_summary(self):
+        if self.lint_summary_job:
+            self.app.root.after_cancel(self.lint_summary_job)
+        self.lint_summary_job = self.app.root.after(HIGHLIGHT_DELAY_MS, self._update_lint_summary)
+
+    def _update_lint_summary(self):
+        """在状态栏显示问题数量，并通知问题列表等监听者。"""
+        self.lint_summary_job = None
+        # 文档级问题（如括号未闭合）报告在最后一行，它可能随任意位置的修改而变化
+        last = len(self.linter.lines) - 1
+        self._retag_lint_lines(last, last + 1)
+
+        errors, warnings = self.linter.totals()
+        if self.linter.format_key is None:
+            self.app.lint_var.set("")
+        elif errors or warnings:
+            self.app.lint_var.set(f"错误 {errors} · 警告 {warnings}")
+        else:
+            self.app.lint_var.set("无问题")
+        for callback in list(self.lint_listeners):
+            callback()
+
     # -------------------------------------------------------------
     # 语法高亮核心逻辑
     # -------------------------------------------------------------
@@ -110,16 +194,19 @@ class SyntaxHandler:
         Args:
             widget: 目标 EditorWithLineNumbers 实例。
         """
-        self._apply_syntax_highlighting(widget)
-        self._highlight_duplicates_on_selection(widget)
+        with span("高亮"):
+            with span("语法高亮"):
+                self._apply_syntax_highlighting(widget)
+            with span("重复项高亮"):
+                self._highlight_duplicates_on_selection(widget)
 
     def _get_active_format_key(self, widget: EditorWithLineNumbers) -> str | None:
         """根据编辑器和当前UI状态确定其内容的格式键。"""
-        content = widget.get_content()
         if widget == self.app.input_text:
             format_name = self.app.input_format.get()
             if format_name == "自动检测":
-                detected_display_name = conversion.detect_format(content)
+                # 检测结果按内容版本缓存，高亮、转换与保存共用同一次检测
+                detected_display_name = widget.model.detected_format
                 return conversion.get_format_key(detected_display_name, display_name=True) if detected_display_name else None
             return conversion.get_format_key(format_name, display_name=True)
         else: # output_text
@@ -128,15 +215,38 @@ class SyntaxHandler:
     def _apply_syntax_highlighting(self, widget: EditorWithLineNumbers):
         """对指定的编辑器应用语法高亮。"""
         # 清除旧的语法标签
-        all_tags = ["key", "string", "punc", "comment", "tsv_tab", "tsv_space_delimiter", "number", "boolean_null"]
-        for tag in all_tags:
+        for tag in SYNTAX_TAGS:
             widget.tag_remove(tag, "1.0", tk.END)
         
         format_key = self._get_active_format_key(widget)
+        self._highlighted_formats[str(widget)] = format_key
+        if widget == self.app.input_text:
+            self.set_lint_format(format_key)
         if not format_key: return
         
-        content = widget.get_content()
-        
+        self._tag_syntax_tokens(widget, format_key, widget.get_content(), "1.0")
+
+    def highlight_line_ranges(self, widget: EditorWithLineNumbers, ranges):
+        """
+        只对指定的行重新应用语法高亮，其余部分的标签保持不变。
+
+        Args:
+            widget: 目标 EditorWithLineNumbers 实例。
+            ranges: (起始行, 结束行) 的列表，行号从 1 开始且包含结束行。
+        """
+        format_key = self._get_active_format_key(widget)
+        widget_key = str(widget)
+        if widget_key not in self._highlighted_formats or self._highlighted_formats[widget_key] != format_key:
+            self._apply_syntax_highlighting(widget)
+            return
+        for first, last in ranges:
+            for tag in SYNTAX_TAGS:
+                widget.tag_remove(tag, f"{first}.0", f"{last}.end")
+            if format_key:
+                self._tag_syntax_tokens(widget, format_key, widget.get(f"{first}.0", f"{last}.end"), f"{first}.0")
+
+    def _tag_syntax_tokens(self, widget: EditorWithLineNumbers, format_key: str, content: str, base_index: str):
+        """对 content 中的词法单元添加标签，content 在编辑器中从 base_index 开始。"""
         # 定义不同格式的词法规则
         token_specs = {
             'BASE': [
@@ -176,7 +286,7 @@ class SyntaxHandler:
         # 遍历所有匹配项并应用标签
         for mo in re.finditer(tok_regex, content, re.MULTILINE):
             kind = mo.lastgroup
-            start, end = f"1.0 + {mo.start()} chars", f"1.0 + {mo.end()} chars"
+            start, end = f"{base_index} + {mo.start()} chars", f"{base_index} + {mo.end()} chars"
             
             tag_map = {
                 'KEY': 'key', 'STRING': 'string', 'PUNC': 'punc', 'COMMENT': 'comment',
@@ -0,0 +1,259 @@
+"""
+该模块提供按行比较两段文本的功能，得到把旧内容变为新内容所需的最少替换块，
+用于在文件被外部程序修改后只更新编辑器中发生变化的部分。
+"""
+
+import difflib
+from typing import Callable, List, NamedTuple, Optional, Sequence, Tuple
+
+# 去除公共前后缀后，中间部分不超过此行数时才用 SequenceMatcher 逐行比较。
+# 其耗时约与行数和替换块数之积成正比：每隔几行就有修改时，2000 行约需 0.3 秒，
+# 20000 行则需数分钟，因此上限不能太大
+MAX_MATCHER_LINES = 2000
+# 超出上限时，若新旧行数相同则逐行对位比较；得到的替换块超过此数时整体作为一个替换块，
+# 以限制对编辑器的操作次数
+MAX_ALIGNED_HUNKS = 2000
+
+
+class LineHunk(NamedTuple):
+    """
+    一个替换块：将旧内容从 start 行开始的 old_count 行替换为 new_lines。
+    行号从 0 开始，均相对于旧内容。
+    """
+    start: int
+    old_count: int
+    new_lines: List[str]
+
+
+def common_prefix(a: List[str], b: List[str]) -> int:
+    """
+    返回两个列表公共前缀的长度。
+    以倍增的块长度比较切片（比较在 C 层完成），遇到不同时再减半，
+    大文件只改动少数几行时比逐行比较快得多。
+    """
+    limit = min(len(a), len(b))
+    i, step = 0, 1
+    while i < limit:
+        j = min(i + step, limit)
+        if a[i:j] == b[i:j]:
+            i = j
+            step *= 2
+        elif step == 1:
+            break
+        else:
+            step //= 2
+    return i
+
+
+def common_suffix(a: List[str], b: List[str], limit: int) -> int:
+    """返回两个列表公共后缀的长度，最多为 limit。"""
+    len_a, len_b = len(a), len(b)
+    i, step = 0, 1
+    while i < limit:
+        j = min(i + step, limit)
+        if a[len_a - j:len_a - i] == b[len_b - j:len_b - i]:
+            i = j
+            step *= 2
+        elif step == 1:
+            break
+        else:
+            step //= 2
+    return i
+
+
+def diff_lines(old_lines: List[str], new_lines: List[str],
+               max_matcher_lines: int = MAX_MATCHER_LINES) -> List[LineHunk]:
+    """
+    计算把 old_lines 变为 new_lines 的替换块列表。
+
+    先去除公共前缀与后缀；外部工具重新生成文件时通常只改动了少数几处，
+    此时剩余部分很小，再用 SequenceMatcher 找出其中未变化的行。
+    剩余部分超过 max_matcher_lines 行时（如全部替换修改了整个文件），
+    新旧行数相同则逐行对位比较，否则整体作为一个替换块，耗时都只与行数成正比。
+
+    Args:
+        old_lines: 旧内容的行列表。
+        new_lines: 新内容的行列表。
+        max_matcher_lines: 用 SequenceMatcher 比较的行数上限。
+
+    Returns:
+        按 start 升序排列、互不重叠的替换块列表；内容相同时为空列表。
+    """
+    old_len, new_len = len(old_lines), len(new_lines)
+    prefix = common_prefix(old_lines, new_lines)
+    suffix = common_suffix(old_lines, new_lines, min(old_len, new_len) - prefix)
+
+    old_mid = old_lines[prefix:old_len - suffix]
+    new_mid = new_lines[prefix:new_len - suffix]
+    if not old_mid and not new_mid:
+        return []
+    if not old_mid or not new_mid:
+        return [LineHunk(prefix, len(old_mid), new_mid)]
+    if max(len(old_mid), len(new_mid)) > max_matcher_lines:
+        if len(old_mid) == len(new_mid):
+            hunks = _aligned_hunks(old_mid, new_mid, prefix)
+            if hunks is not None:
+                return hunks
+        return [LineHunk(prefix, len(old_mid), new_mid)]
+
+    # JSON 等格式中有大量相同的行（如 "  {"），autojunk 将这些常见行视为无意义的行，
+    # 不以它们为锚点匹配，可大大减少比较次数；结果仍然正确，只是替换块可能略大
+    matcher = difflib.SequenceMatcher(None, old_mid, new_mid, autojunk=True)
+    return [
+        LineHunk(prefix + i1, i2 - i1, new_mid[j1:j2])
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes()
+        if tag != "equal"
+    ]
+
+
+def _aligned_hunks(old_mid: List[str], new_mid: List[str], offset: int) -> Optional[List[LineHunk]]:
+    """逐行对位比较行数相同的两段内容，返回连续不同的行组成的替换块；块数超过上限时返回 None。"""
+    hunks: List[LineHunk] = []
+    start = None
+    for i, (old, new) in enumerate(zip(old_mid, new_mid)):
+        if old != new:
+            if start is None:
+                start = i
+        elif start is not None:
+            hunks.append(LineHunk(offset + start, i - start, new_mid[start:i]))
+            if len(hunks) > MAX_ALIGNED_HUNKS:
+                return None
+            start = None
+    if start is not None:
+        hunks.append(LineHunk(offset + start, len(old_mid) - start, new_mid[start:]))
+    return hunks if len(hunks) <= MAX_ALIGNED_HUNKS else None
+
+
+def apply_hunks(lines: List[str], hunks: List[LineHunk]) -> List[str]:
+    """
+    将替换块应用到行列表上，返回新的行列表。
+
+    Args:
+        lines: 旧内容的行列表。
+        hunks: diff_lines 返回的替换块列表。
+    """
+    result = list(lines)
+    # 从后往前替换，前面的行号不受影响
+    for hunk in reversed(hunks):
+        result[hunk.start:hunk.start + hunk.old_count] = hunk.new_lines
+    return result
+
+
+def map_line(line: int, hunks: List[LineHunk]) -> int:
+    """
+    返回旧内容中的某一行在应用替换块后所在的行号（从 0 开始）。
+    位于被替换区域内的行映射到新内容中相同偏移的行，但不超出该区域的新内容。
+
+    Args:
+        line: 旧内容中的行号。
+        hunks: diff_lines 返回的替换块列表。
+    """
+    offset = 0
+    for hunk in hunks:
+        if line < hunk.start:
+            break
+        if line < hunk.start + hunk.old_count:
+            return hunk.start + offset + min(line - hunk.start, max(len(hunk.new_lines) - 1, 0))
+        offset += len(hunk.new_lines) - hunk.old_count
+    return line + offset
+
+
+def edit_line_range(args: Sequence[str], line_of: Callable[[str], int],
+                    last_line: int) -> Optional[Tuple[int, int]]:
+    """
+    计算 Text 控件的 insert/delete/replace 命令在执行前所影响的首行与末行。
+
+    Args:
+        args: 命令及其参数，如 ("delete", "insert-1c")。
+        line_of: 将 Tk 索引换算为命令执行前所在行号（从 1 开始）的函数。
+        last_line: 命令执行前的最后一行的行号。
+
+    Returns:
+        (首行, 末行)，行号从 1 开始；一次删除多个范围时无法确定，返回 None。
+    """
+    operation = args[0]
+    first = min(line_of(args[1]), last_line)
+    if operation == "insert":
+        return first, first
+    if operation == "delete" and len(args) == 2:
+        # 删除单个字符：该字符是换行符时（如行首退格），下一行也会并入本行
+        return first, min(line_of(f"{args[1]} +1c"), last_line)
+    if len(args) >= 3 and (operation == "replace" or len(args) == 3):
+        return first, min(line_of(args[2]), last_line)
+    return None
+
+
+class SpanEdit(NamedTuple):
+    """一个区间替换：将字符偏移 [start, end) 的文本替换为 text。"""
+    start: int
+    end: int
+    text: str
+
+
+# 合并区间替换时，允许两个区间之间相隔的最大字符数；
+# 合并多保存的间隔文本与编辑器为每个区间单独记录撤销的开销相当
+MERGE_GAP_CHARS = 64
+# 合并后希望保留的最大区间数，超出时继续合并间隔最小的相邻区间，以减少对编辑器的操作次数
+MAX_SPAN_EDITS = 2000
+# 继续合并时，因此多保存的间隔文本最多为修改量（删除与插入的字符数之和）的多少倍
+MAX_EXTRA_RATIO = 1.0
+
+
+def coalesce_edits(content: str, edits: List[SpanEdit], max_gap: int = MERGE_GAP_CHARS,
+                   max_edits: int = MAX_SPAN_EDITS, max_extra_ratio: float = MAX_EXTRA_RATIO) -> List[SpanEdit]:
+    """
+    合并相距很近的区间替换，减少对编辑器的操作次数。
+    两个区间之间的原文被并入合并后的替换文本，因此合并后的结果与逐个替换完全相同。
+
+    合并后的区间越大，撤销记录保存的原文与替换文本就越多，因此合并的代价受到限制：
+    先合并间隔不超过 max_gap 的区间；结果仍多于 max_edits 个时，按间隔从小到大继续合并，
+    直到区间数不超过 max_edits，或多保存的间隔文本将超过修改量的 max_extra_ratio 倍为止。
+    多保存的文本因此不超过 2 × max_gap × 原区间数 + max_extra_ratio × 修改量，
+    与修改量成正比，而与文档大小无关；代价是匹配处既多又分散时，
+    区间数可能超过 max_edits，对编辑器的操作次数相应增加。
+
+    Args:
+        content: 原文。
+        edits: 按 start 升序排列、互不重叠的区间替换列表。
+        max_gap: 两个区间之间最多相隔多少字符时直接合并。
+        max_edits: 希望保留的最大区间数。
+        max_extra_ratio: 继续合并时多保存的间隔文本与修改量之比的上限。
+
+    Returns:
+        合并后的区间替换列表。
+    """
+    merged = _merge(content, edits, [edits[i].start - edits[i - 1].end <= max_gap for i in range(1, len(edits))])
+    excess = len(merged) - max_edits
+    if excess <= 0:
+        return merged
+
+    # 每合并一个间隔，间隔中的原文会同时出现在删除和插入的文本中
+    budget = max_extra_ratio * sum(edit.end - edit.start + len(edit.text) for edit in edits)
+    gaps = sorted(range(1, len(merged)), key=lambda i: merged[i].start - merged[i - 1].end)
+    joins = [False] * (len(merged) - 1)
+    for i in gaps[:excess]:
+        cost = 2 * (merged[i].start - merged[i - 1].end)
+        if cost > budget:
+            break
+        budget -= cost
+        joins[i - 1] = True
+    return _merge(content, merged, joins)
+
+
+def _merge(content: str, edits: List[SpanEdit], joins: List[bool]) -> List[SpanEdit]:
+    """合并区间替换：joins[i] 为 True 时，第 i + 1 个区间并入前一个区间。"""
+    merged: List[SpanEdit] = []
+    pieces: List[str] = []
+    start = end = None
+    for i, edit in enumerate(edits):
+        if start is not None and joins[i - 1]:
+            pieces.append(content[end:edit.start])
+        else:
+            if start is not None:
+                merged.append(SpanEdit(start, end, "".join(pieces)))
+            start, pieces = edit.start, []
+        pieces.append(edit.text)
+        end = edit.end
+    if start is not None:
+        merged.append(SpanEdit(start, end, "".join(pieces)))
+    return merged
@@ -0,0 +1,346 @@
+"""
+该模块提供位于 parse_input 与 format_output 之间的条目变换流水线：
+去除首尾空白、按完全相同或规范化后的原文去重，以及按多种规则排序。
+条目数较少时在内存中完成；超过设定的内存上限时，改用基于临时文件的外部归并排序，
+内存占用与输入大小无关。
+"""
+
+import heapq
+import locale
+import os
+import pickle
+import tempfile
+from itertools import islice
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from core import conversion
+from core.conversion import DictData, DictEntry
+from core.normalize import normalize_key
+
+# 内存中最多同时保存的条目数，超出后分批排序并写入临时文件
+DEFAULT_RUN_SIZE = 200_000
+
+# 去重方式
+DEDUPE_EXACT = "exact"
+DEDUPE_FOLDED = "nfkc"
+DEDUPE_KANA = "kana"
+
+
+def fold_key(text: str) -> str:
+    """
+    返回用于比较的规范化文本：NFKC 规范化（统一全角/半角字母数字与半角片假名）后再忽略大小写。
+    """
+    return normalize_key(text)
+
+
+def use_system_collation():
+    """
+    将进程的排序规则 (LC_COLLATE) 设置为系统区域设置，供 "locale" 排序使用。
+
+    区域设置对整个进程生效，因此本模块不会自行修改，由程序入口在启动时调用一次；
+    未调用时 "locale" 排序使用 C 区域设置，即按码位排序。
+    """
+    try:
+        locale.setlocale(locale.LC_COLLATE, "")
+    except locale.Error:
+        pass
+
+
+def _locale_key(item: DictEntry) -> str:
+    return locale.strxfrm(item['org'])
+
+
+# 排序规则名称 -> 从条目计算排序键的函数
+SORT_KEYS: Dict[str, Callable[[DictEntry], object]] = {
+    "org": lambda item: item['org'],
+    "length": lambda item: len(item['org']),
+    "nfkc": lambda item: fold_key(item['org']),
+    "locale": _locale_key,
+}
+
+DEDUPE_KEYS: Dict[str, Callable[[DictEntry], object]] = {
+    DEDUPE_EXACT: lambda item: item['org'],
+    DEDUPE_FOLDED: lambda item: fold_key(item['org']),
+    DEDUPE_KANA: lambda item: normalize_key(item['org'], kana=True),
+}
+
+
+class TransformOptions:
+    """
+    条目变换选项。
+
+    Attributes:
+        sort: 排序规则名称（见 SORT_KEYS）、自定义的排序键函数，或 None 表示保持原顺序。
+            外部排序时排序键需要可以被 pickle 序列化。
+        reverse: 是否降序排列。
+        dedupe: 去重方式 DEDUPE_EXACT / DEDUPE_FOLDED / DEDUPE_KANA，或 None 表示不去重。去重时保留首次出现的条目。
+        trim: 是否去除 org/rep/note 首尾的空白字符。
+    """
+    def __init__(self, sort=None, reverse: bool = False, dedupe: Optional[str] = None, trim: bool = False):
+        if isinstance(sort, str) and sort not in SORT_KEYS:
+            raise ValueError(f"不支持的排序规则: {sort}")
+        if dedupe is not None and dedupe not in DEDUPE_KEYS:
+            raise ValueError(f"不支持的去重方式: {dedupe}")
+        self.sort = sort
+        self.reverse = reverse
+        self.dedupe = dedupe
+        self.trim = trim
+
+    @property
+    def sort_key(self) -> Optional[Callable[[DictEntry], object]]:
+        return SORT_KEYS[self.sort] if isinstance(self.sort, str) else self.sort
+
+    @property
+    def is_identity(self) -> bool:
+        return self.sort is None and self.dedupe is None and not self.trim
+
+
+def _trimmed(entries: Iterable[DictEntry]) -> Iterator[DictEntry]:
+    for item in entries:
+        yield {'org': item['org'].strip(), 'rep': item['rep'].strip(), 'note': item['note'].strip()}
+
+
+# -------------------------------------------------------------
+# 内存中的变换
+# -------------------------------------------------------------
+def transform_entries(entries: Iterable[DictEntry], options: TransformOptions) -> DictData:
+    """
+    在内存中对条目执行变换。
+
+    Args:
+        entries: 字典条目的可迭代对象。
+        options: 变换选项。
+
+    Returns:
+        变换后的新条目列表。
+    """
+    if options.trim:
+        entries = _trimmed(entries)
+    if options.dedupe:
+        dedupe_key = DEDUPE_KEYS[options.dedupe]
+        seen = set()
+        unique = []
+        for item in entries:
+            key = dedupe_key(item)
+            if key not in seen:
+                seen.add(key)
+                unique.append(item)
+        entries = unique
+    result = list(entries)
+    sort_key = options.sort_key
+    if sort_key is not None:
+        # list.sort 对每个条目只计算一次排序键（装饰-排序-去装饰），且为稳定排序
+        result.sort(key=sort_key, reverse=options.reverse)
+    return result
+
+
+# -------------------------------------------------------------
+# 外部归并排序
+# -------------------------------------------------------------
+def _write_run(records: List[tuple], directory: str) -> str:
+    """将一批已排序的记录写入临时文件，返回文件路径。"""
+    fd, path = tempfile.mkstemp(suffix=".run", dir=directory)
+    with os.fdopen(fd, "wb") as f:
+        pickler = pickle.Pickler(f, protocol=pickle.HIGHEST_PROTOCOL)
+        for record in records:
+            pickler.dump(record)
+    return path
+
+
+def _read_run(path: str) -> Iterator[tuple]:
+    with open(path, "rb") as f:
+        unpickler = pickle.Unpickler(f)
+        while True:
+            try:
+                yield unpickler.load()
+            except EOFError:
+                return
+
+
+def external_sort(records: Iterable[tuple], run_size: int, directory: str, reverse: bool = False) -> Iterator[tuple]:
+    """
+    对 (排序键, 序号, 载荷) 形式的记录进行外部归并排序。
+
+    每读入 run_size 条记录就在内存中排序并写入一个临时文件，最后用 heapq.merge 归并所有文件。
+    序号保证了相同排序键的记录保持原有顺序（稳定排序）。
+
+    Args:
+        records: 记录的可迭代对象，序号必须唯一且递增。
+        run_size: 每个临时文件包含的记录数，即内存中最多同时保存的记录数。
+        directory: 存放临时文件的目录。
+        reverse: 是否按排序键降序排列（序号仍为升序）。
+    """
+    if reverse:
+        # 降序时对排序键取反不可行（键可能是字符串），因此用包装类反转比较
+        records = ((_Reversed(key), seq, payload) for key, seq, payload in records)
+
+    iterator = iter(records)
+    runs = []
+    while True:
+        batch = list(islice(iterator, run_size))
+        if not batch:
+            break
+        batch.sort(key=_record_order)
+        runs.append(_write_run(batch, directory))
+        del batch
+
+    merged = heapq.merge(*(_read_run(path) for path in runs), key=_record_order)
+    try:
+        for key, seq, payload in merged:
+            yield (key.value if reverse else key), seq, payload
+    finally:
+        for path in runs:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+def _record_order(record: tuple) -> tuple:
+    return record[0], record[1]
+
+
+class _Reversed:
+    """反转比较结果的包装类，用于在外部排序中实现降序。"""
+    __slots__ = ("value",)
+
+    def __init__(self, value):
+        self.value = value
+
+    def __lt__(self, other):
+        return other.value < self.value
+
+    def __eq__(self, other):
+        return self.value == other.value
+
+    def __reduce__(self):
+        return (_Reversed, (self.value,))
+
+
+def iter_transform(entries: Iterable[DictEntry], options: TransformOptions,
+                   run_size: int = DEFAULT_RUN_SIZE, temp_dir: Optional[str] = None) -> Iterator[DictEntry]:
+    """
+    以有界内存对条目流执行变换，逐条产出结果。
+
+    条目数不超过 run_size 时直接在内存中处理；否则：
+    1. 去重时先按 (去重键, 序号) 外部排序，相邻且去重键相同的条目只保留序号最小的一个；
+    2. 再按 (排序键, 序号) 外部排序；不排序时按序号排序以恢复原有顺序。
+
+    Args:
+        entries: 字典条目的可迭代对象，可以是逐行解析文件的生成器。
+        options: 变换选项。
+        run_size: 内存中最多同时保存的条目数。
+        temp_dir: 临时文件目录，默认使用系统临时目录。
+
+    Yields:
+        变换后的条目。
+    """
+    if options.trim:
+        entries = _trimmed(entries)
+    iterator = iter(entries)
+    head = list(islice(iterator, run_size + 1))
+    if len(head) <= run_size:
+        yield from transform_entries(head, TransformOptions(options.sort, options.reverse, options.dedupe))
+        return
+    if options.sort is None and options.dedupe is None:
+        yield from head
+        yield from iterator
+        return
+
+    def chained() -> Iterator[Tuple[int, DictEntry]]:
+        seq = 0
+        for source in (head, iterator):
+            for item in source:
+                yield seq, item
+                seq += 1
+
+    with tempfile.TemporaryDirectory(prefix="gptdict_sort_", dir=temp_dir) as directory:
+        numbered = chained()
+        if options.dedupe:
+            dedupe_key = DEDUPE_KEYS[options.dedupe]
+            by_dedupe_key = external_sort(((dedupe_key(item), seq, item) for seq, item in numbered), run_size, directory)
+
+            def unique() -> Iterator[Tuple[int, DictEntry]]:
+                previous = object()
+                for key, seq, item in by_dedupe_key:
+                    if key != previous:
+                        previous = key
+                        yield seq, item
+            numbered = unique()
+
+        sort_key = options.sort_key
+        if sort_key is None:
+            ordered = external_sort(((seq, seq, item) for seq, item in numbered), run_size, directory)
+        else:
+            ordered = external_sort(((sort_key(item), seq, item) for seq, item in numbered),
+                                    run_size, directory, reverse=options.reverse)
+        for _, _, item in ordered:
+            yield item
+
+
+# -------------------------------------------------------------
+# 文件处理
+# -------------------------------------------------------------
+def iter_read_entries(path: str, format_key: str) -> Iterator[DictEntry]:
+    """
+    读取字典文件中的条目。TSV 文件逐行流式读取，其他格式整体解析。
+
+    Args:
+        path: 字典文件路径。
+        format_key: 文件的格式键名。
+    """
+    if conversion.is_binary_format(format_key):
+        with open(path, 'rb') as f:
+            yield from conversion.parse_binary(f.read(), format_key)
+    elif format_key == "GalTransl_TSV":
+        with open(path, 'r', encoding='utf-8-sig') as f:
+            yield from conversion.iter_parse_tsv(f)
+    else:
+        with open(path, 'r', encoding='utf-8-sig') as f:
+            yield from conversion.parse_input(f.read(), format_key)
+
+
+def transform_file(input_path: str, output_path: str, input_key: str, output_key: str,
+                   options: TransformOptions, run_size: int = DEFAULT_RUN_SIZE) -> int:
+    """
+    读取字典文件，执行变换后写入另一个文件。TSV 输入与文本输出均以流式方式处理。
+
+    Args:
+        input_path: 输入文件路径。
+        output_path: 输出文件路径，可以与输入文件相同（先写入临时文件再替换）。
+        input_key: 输入格式的键名。
+        output_key: 输出格式的键名。
+        options: 变换选项。
+        run_size: 内存中最多同时保存的条目数。
+
+    Returns:
+        写入的条目数。
+    """
+    written = 0
+
+    def counted(entries):
+        nonlocal written
+        for item in entries:
+            written += 1
+            yield item
+
+    results = counted(iter_transform(iter_read_entries(input_path, input_key), options, run_size))
+    tmp_path = output_path + ".tmp"
+    try:
+        if conversion.is_binary_format(output_key):
+            # 二进制格式需要构建完整的排序索引，无法流式写入
+            data = list(results)
+            with open(tmp_path, 'wb') as f:
+                f.write(conversion.serialize_binary(data, output_key))
+        else:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                for chunk in conversion.iter_format_output(results, output_key):
+                    f.write(chunk)
+        os.replace(tmp_path, output_path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+    return written
@@ -1,13 +1,19 @@
 # #####################################################################
 # 1. 依赖检查与导入
 # #####################################################################
+import time
+# 尽早记录启动时刻，用于统计到主窗口首次绘制的耗时
+_STARTUP_T0 = time.perf_counter()
+
 import sys
+import multiprocessing
 import ttkbootstrap as ttk
 from tkinter import messagebox
 from tkinterdnd2 import TkinterDnD
 
 # 从其他模块导入主应用程序类
 from app import GPTDictConverter
+from core.transform import use_system_collation
 
 # #####################################################################
 # 2. 主函数
@@ -20,12 +26,24 @@ def main():
     - 启动Tkinter事件循环。
     """
     try:
+        # "按区域设置排序" 使用系统的排序规则
+        use_system_collation()
+
         # 使用 TkinterDnD.Tk() 作为根窗口以启用拖放功能
         root = TkinterDnD.Tk()
         
         # 实例化主应用程序
         style = ttk.Style()
         app = GPTDictConverter(root)
+
+        # 主窗口首次映射并完成空闲绘制后，统计启动耗时
+        def on_first_map(event):
+            # 子控件的 <Map> 事件也会传递到根窗口的绑定上，只处理根窗口本身
+            if event.widget is not root:
+                return
+            root.unbind("<Map>", map_binding)
+            root.after_idle(lambda: app.report_startup_time((time.perf_counter() - _STARTUP_T0) * 1000))
+        map_binding = root.bind("<Map>", on_first_map, add="+")
         
         # 启动UI事件循环
         root.mainloop()
@@ -39,4 +57,6 @@ def main():
 # 3. 脚本执行入口
 # #####################################################################
 if __name__ == "__main__":
+    # 打包为可执行文件后，多进程的子进程同样从这里启动，需要先交给 multiprocessing 处理
+    multiprocessing.freeze_support()
     main()
\ No newline at end of file
@@ -0,0 +1,124 @@
+"""core.api 的单元测试。"""
+
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+import core
+from constants import FORMAT_DEFINITIONS
+from core import api
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+ENTRIES = [
+    {'org': 'アリス', 'rep': '爱丽丝', 'note': '角色名'},
+    {'org': "it's", 'rep': 'a "quote"', 'note': ''},
+    {'org': 'ボブ', 'rep': '鲍勃', 'note': 'tab\\t'},
+]
+
+# 在新的解释器中导入 core.api，输出已加载的 GUI 模块
+_GUI_PROBE = """
+import sys
+import core.api
+print(" ".join(sorted(m for m in sys.modules
+                      if m.split(".")[0] in ("tkinter", "_tkinter", "ttkbootstrap", "tkinterdnd2"))))
+"""
+
+
+class ImportTest(unittest.TestCase):
+    def test_does_not_import_gui_modules(self):
+        result = subprocess.run([sys.executable, "-c", _GUI_PROBE], cwd=ROOT, capture_output=True,
+                                text=True, timeout=60)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(result.stdout.strip(), "")
+
+    def test_package_exports(self):
+        for name in api.__all__:
+            self.assertIs(getattr(core, name), getattr(api, name))
+
+
+class RoundTripTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def path(self, name):
+        return os.path.join(self._tmp.name, name)
+
+    def test_dumps_loads(self):
+        for fmt in ("GalTransl_TSV", "GPPGUI_TOML", "GPPCLI_TOML", "AiNiee_JSON"):
+            with self.subTest(fmt=fmt):
+                text = api.dumps(ENTRIES, fmt)
+                self.assertEqual(api.loads(text, fmt), ENTRIES)
+                # 自动检测格式
+                self.assertEqual(api.detect_text(text), fmt)
+                self.assertEqual(api.loads(text), ENTRIES)
+
+    def test_display_names(self):
+        for key in api.formats():
+            self.assertEqual(api.resolve_format(key), key)
+            name = FORMAT_DEFINITIONS[key]["name"]
+            self.assertEqual(api.resolve_format(name), key)
+        with self.assertRaises(ValueError):
+            api.resolve_format("no-such-format")
+
+    def test_dump_load(self):
+        for fmt in api.formats():
+            with self.subTest(fmt=fmt):
+                path = self.path(f"dict-{fmt}")
+                api.dump(ENTRIES, path, fmt)
+                self.assertEqual(api.detect(path), fmt)
+                self.assertEqual(api.load(path), ENTRIES)
+                self.assertEqual(api.load(path, fmt), ENTRIES)
+                self.assertEqual(list(api.iter_entries(path)), ENTRIES)
+                self.assertFalse(os.path.exists(path + ".tmp"))
+
+    def test_dump_chooses_format_by_extension(self):
+        for ext, fmt in ((".json", "AiNiee_JSON"), (".toml", "GPPGUI_TOML"), (".txt", "GalTransl_TSV"),
+                         (".gdx", "GDX_Binary")):
+            with self.subTest(ext=ext):
+                path = self.path("dict" + ext)
+                api.dump(ENTRIES, path)
+                self.assertEqual(api.detect(path), fmt)
+                self.assertEqual(api.load(path), ENTRIES)
+        with self.assertRaises(ValueError):
+            api.dump(ENTRIES, self.path("dict.unknown"))
+
+    def test_parallel_load(self):
+        path = self.path("dict.txt")
+        entries = ENTRIES * 200
+        api.dump(entries, path)
+        self.assertEqual(api.load(path, parallel=True), entries)
+        json_path = self.path("dict.json")
+        api.dump(entries, json_path)
+        self.assertEqual(api.load(json_path, parallel=True), entries)
+
+    def test_errors(self):
+        with self.assertRaises(ValueError):
+            api.loads("这不是字典")
+        self.assertIsNone(api.detect_text(""))
+        path = self.path("unknown.txt")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("这不是字典")
+        with self.assertRaises(ValueError):
+            api.detect(path)
+        with self.assertRaises(OSError):
+            api.load(self.path("missing.json"))
+        with self.assertRaises(ValueError):
+            api.dumps(ENTRIES, "GDX_Binary")
+
+    def test_failed_dump_keeps_original(self):
+        path = self.path("dict.json")
+        api.dump(ENTRIES, path)
+        with self.assertRaises(Exception):
+            api.dump([{'org': 'x'}], path)
+        self.assertEqual(api.load(path), ENTRIES)
+        self.assertFalse(os.path.exists(path + ".tmp"))
+
+
+if __name__ == "__main__":
+    unittest.main()
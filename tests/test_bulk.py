@@ -0,0 +1,45 @@
+"""core.bulk 输出路径规划的单元测试。"""
+
+import os
+import tempfile
+import unittest
+
+from core.bulk import LAYOUT_BESIDE, LAYOUT_MIRROR, plan_jobs
+
+
+class PlanJobsTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = self._tmp.name
+        os.makedirs(os.path.join(self.root, "sub"))
+        for name in ("a.txt", "b.json", os.path.join("sub", "c.txt")):
+            with open(os.path.join(self.root, name), "w", encoding="utf-8") as f:
+                f.write("x\ty\n")
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def sources(self, jobs):
+        return sorted(os.path.relpath(job.source, self.root) for job in jobs)
+
+    def test_beside_skips_files_already_in_output_format(self):
+        jobs = plan_jobs([self.root], "AiNiee_JSON", layout=LAYOUT_BESIDE)
+        self.assertEqual(self.sources(jobs), ["a.txt", os.path.join("sub", "c.txt")])
+        self.assertTrue(all(job.source != job.target for job in jobs))
+
+    def test_beside_can_run_again_over_its_own_output(self):
+        for job in plan_jobs([self.root], "GPPGUI_TOML", layout=LAYOUT_BESIDE):
+            open(job.target, "w").close()
+        jobs = plan_jobs([self.root], "GPPGUI_TOML", layout=LAYOUT_BESIDE)
+        self.assertEqual(self.sources(jobs), ["a.txt", "b.json", os.path.join("sub", "c.txt")])
+
+    def test_mirror_does_not_scan_output_dir_inside_input(self):
+        output_dir = os.path.join(self.root, "out")
+        os.makedirs(output_dir)
+        open(os.path.join(output_dir, "a.json"), "w").close()
+        jobs = plan_jobs([self.root], "AiNiee_JSON", output_dir, LAYOUT_MIRROR)
+        self.assertEqual(self.sources(jobs), ["a.txt", "b.json", os.path.join("sub", "c.txt")])
+
+
+if __name__ == "__main__":
+    unittest.main()
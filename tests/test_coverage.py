@@ -0,0 +1,103 @@
+"""core.coverage 的单元测试。"""
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from core import coverage
+from core.coverage import annotate_entries, count_coverage
+
+
+def _failing_init(orgs):
+    raise RuntimeError("初始化失败")
+
+
+class CoverageTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.paths = []
+        for name, text in (("a.txt", "アリスとアリスのボブ"), ("b.txt", "ボブ"), ("c.txt", "なし")):
+            path = os.path.join(self._tmp.name, name)
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(text)
+            self.paths.append(path)
+        self.entries = [
+            {'org': 'アリス', 'rep': '爱丽丝', 'note': ''},
+            {'org': 'ボブ', 'rep': '鲍勃', 'note': ''},
+            {'org': 'アリス', 'rep': '爱丽丝2', 'note': '重复'},
+            {'org': 'イヴ', 'rep': '伊芙', 'note': ''},
+        ]
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def check_counts(self, result):
+        self.assertEqual(result.counts, [2, 2, 2, 0])
+        self.assertEqual(result.file_counts, [1, 2, 1, 0])
+        self.assertEqual(result.hit_entries, 3)
+        self.assertEqual(result.files_scanned, 3)
+        self.assertEqual(result.chars_scanned, 10 + 2 + 2)
+
+    def test_counts_in_process(self):
+        self.check_counts(count_coverage(self.entries, self.paths, workers=1))
+
+    def test_counts_with_process_pool(self):
+        self.check_counts(count_coverage(self.entries, self.paths, workers=2))
+
+    def test_missing_file_is_reported(self):
+        missing = os.path.join(self._tmp.name, "missing.txt")
+        result = count_coverage(self.entries, self.paths + [missing], workers=1)
+        self.assertEqual(result.files_scanned, 3)
+        self.assertEqual([path for path, _ in result.errors], [missing])
+
+    def test_counting_failure_is_reported_per_file(self):
+        real_count_all = coverage.KeywordTrie.count_all
+
+        def count_all(trie, text):
+            if text == "ボブ":
+                raise MemoryError("模拟内存不足")
+            return real_count_all(trie, text)
+
+        with mock.patch.object(coverage.KeywordTrie, "count_all", count_all):
+            result = count_coverage(self.entries, self.paths, workers=1)
+        self.assertEqual(result.files_scanned, 2)
+        self.assertEqual(result.errors, [(self.paths[1], "MemoryError: 模拟内存不足")])
+        self.assertEqual(result.counts, [2, 1, 2, 0])
+
+    def test_broken_pool_is_reported_per_file(self):
+        with mock.patch.object(coverage, "_init_worker", _failing_init):
+            result = count_coverage(self.entries, self.paths, workers=2)
+        self.assertEqual(result.files_scanned, 0)
+        self.assertEqual(sorted(path for path, _ in result.errors), sorted(self.paths))
+
+    def test_very_long_org(self):
+        long_org = "あ" * 5000
+        path = os.path.join(self._tmp.name, "long.txt")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(long_org + "い")
+        entries = [{'org': long_org, 'rep': 'x', 'note': ''}]
+        for workers in (1, 2):
+            result = count_coverage(entries, [path, self.paths[0]], workers=workers)
+            self.assertEqual(result.counts, [1])
+            self.assertEqual(result.errors, [])
+
+
+class AnnotateEntriesTest(unittest.TestCase):
+    def test_count_is_prepended_to_note(self):
+        entries = [{'org': 'a', 'rep': 'b', 'note': ''}, {'org': 'c', 'rep': 'd', 'note': '角色名'}]
+        annotated = annotate_entries(entries, [3, 0])
+        self.assertEqual(annotated, [
+            {'org': 'a', 'rep': 'b', 'note': '出现 3 次'},
+            {'org': 'c', 'rep': 'd', 'note': '出现 0 次 角色名'},
+        ])
+        # 原列表不会被修改
+        self.assertEqual(entries[0]['note'], '')
+
+    def test_custom_template(self):
+        annotated = annotate_entries([{'org': 'a', 'rep': 'b', 'note': 'x'}], [5], template="[{count}]")
+        self.assertEqual(annotated[0]['note'], "[5] x")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+"""utils.file_watcher 的单元测试，使用假的调度器代替 Tk，直接调用 poll。"""
+
+import os
+import tempfile
+import unittest
+
+from utils.file_watcher import FileWatcher
+
+
+class FakeRoot:
+    """只记录定时任务而不执行，测试中手动调用 poll。"""
+
+    def after(self, ms, func):
+        return object()
+
+    def after_cancel(self, job):
+        pass
+
+
+class FileWatcherTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self._tmp.name, "dict.txt")
+        self.write("a\tb\n", 1)
+        self.changes = []
+        self.watcher = FileWatcher(FakeRoot(), self.changes.append)
+        self.watcher.watch(self.path)
+
+    def tearDown(self):
+        self.watcher.stop()
+        self._tmp.cleanup()
+
+    def write(self, content: str, mtime_s: int):
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write(content)
+        # 显式设置修改时间，不依赖文件系统的时间精度
+        os.utime(self.path, ns=(mtime_s * 10**9, mtime_s * 10**9))
+
+    def test_unchanged_file_does_not_notify(self):
+        self.assertFalse(self.watcher.poll())
+        self.assertEqual(self.changes, [])
+
+    def test_change_is_reported_after_signature_is_stable(self):
+        self.write("a\tc\n", 2)
+        self.assertFalse(self.watcher.poll())
+        self.assertTrue(self.watcher.poll())
+        self.assertEqual(self.changes, [self.path])
+        # 已通知的签名成为新的基准
+        self.assertFalse(self.watcher.poll())
+
+    def test_file_still_being_written_waits_for_stable_signature(self):
+        self.write("a\tc\n", 2)
+        self.assertFalse(self.watcher.poll())
+        self.write("a\tc\nd\te\n", 3)
+        self.assertFalse(self.watcher.poll())
+        self.assertTrue(self.watcher.poll())
+        self.assertEqual(len(self.changes), 1)
+
+    def test_missing_file_does_not_notify(self):
+        os.remove(self.path)
+        self.assertFalse(self.watcher.poll())
+        self.assertFalse(self.watcher.poll())
+        self.assertEqual(self.changes, [])
+
+    def test_acknowledge_accepts_own_save(self):
+        self.write("saved\n", 2)
+        self.watcher.acknowledge()
+        self.assertFalse(self.watcher.poll())
+        self.assertFalse(self.watcher.poll())
+        self.assertEqual(self.changes, [])
+
+    def test_stopped_watcher_does_not_poll(self):
+        self.watcher.stop()
+        self.write("a\tc\n", 2)
+        self.assertFalse(self.watcher.poll())
+        self.assertFalse(self.watcher.poll())
+
+
+if __name__ == "__main__":
+    unittest.main()
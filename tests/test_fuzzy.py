@@ -0,0 +1,122 @@
+"""core.fuzzy 的单元测试。"""
+
+import random
+import unittest
+
+from core import conversion
+from core.fuzzy import FuzzyIndex
+
+
+def tsv_lines(entries):
+    return conversion.format_output(entries, "GalTransl_TSV").split("\n")
+
+
+def results(index, query, limit=50):
+    return [(m.line, m.org, m.rep, m.note) for m in index.search(query, limit)]
+
+
+class FuzzySearchTest(unittest.TestCase):
+    def setUp(self):
+        self.entries = [
+            {'org': 'アリスの剣', 'rep': '爱丽丝之剑', 'note': ''},
+            {'org': 'アリス', 'rep': '爱丽丝', 'note': '主角'},
+            {'org': 'ボブ', 'rep': '鲍勃', 'note': 'アリスの兄'},
+            {'org': 'マリス', 'rep': '玛丽丝', 'note': ''},
+            {'org': 'ＡＬＩＣＥ', 'rep': 'Alice', 'note': ''},
+        ]
+        self.index = FuzzyIndex()
+        self.index.update(tsv_lines(self.entries), "GalTransl_TSV")
+
+    def test_ranking(self):
+        orgs = [m[1] for m in results(self.index, "アリス")]
+        # 完全相等 > 前缀匹配 > 备注中的匹配；マリス 只包含一半的二元组，不算匹配
+        self.assertEqual(orgs, ['アリス', 'アリスの剣', 'ボブ'])
+        self.assertEqual(results(self.index, "アリス", limit=1), [(2, 'アリス', '爱丽丝', '主角')])
+
+    def test_fuzzy_match_tolerates_typo(self):
+        matches = self.index.search("アリスの刀")
+        # ボブ 的备注 アリスの兄 同样包含四个二元组中的三个，但备注的权重最低
+        self.assertEqual([m.org for m in matches], ['アリスの剣', 'ボブ'])
+        self.assertLess(matches[0].score, self.index.search("アリスの剣")[0].score)
+
+    def test_folding_and_multiple_terms(self):
+        self.assertEqual([m[1] for m in results(self.index, "alice")], ['ＡＬＩＣＥ'])
+        self.assertEqual([m[1] for m in results(self.index, "アリス 剣")], ['アリスの剣'])
+        self.assertEqual([m[1] for m in results(self.index, "剣")], ['アリスの剣'])
+        self.assertEqual(results(self.index, "不存在"), [])
+        self.assertEqual(results(self.index, "   "), [])
+
+    def test_fields_containing_separator_characters(self):
+        entries = [{'org': 'a\x01b', 'rep': 'c\x01\x01d', 'note': '\x01'}, {'org': 'xy', 'rep': 'z', 'note': ''}]
+        index = FuzzyIndex()
+        index.update(conversion.format_output(entries, "AiNiee_JSON").split("\n"), "AiNiee_JSON")
+        match = index.search("a\x01b")[0]
+        self.assertEqual((match.org, match.rep, match.note), ('a\x01b', 'c\x01\x01d', '\x01'))
+        index._compact()
+        self.assertEqual(results(index, "xy"), [(7, 'xy', 'z', '')])
+        self.assertEqual(results(index, "c\x01\x01d")[0][1:], ('a\x01b', 'c\x01\x01d', '\x01'))
+
+    def test_unsupported_format(self):
+        with self.assertRaises(ValueError):
+            FuzzyIndex().update(["x"], "GDX_Binary")
+
+
+class FuzzyIncrementalTest(unittest.TestCase):
+    def snapshot(self, index, queries):
+        return {q: results(index, q) for q in queries}
+
+    def test_incremental_update_matches_fresh_build(self):
+        rng = random.Random(3)
+        words = ["アリス", "ボブ", "剣", "魔法", "ありす", "alice", "Bob", "城", "王"]
+
+        def random_entry():
+            return {'org': "".join(rng.choice(words) for _ in range(rng.randint(1, 3))),
+                    'rep': rng.choice(words), 'note': rng.choice(["", "备注", "アリス"])}
+
+        lines = tsv_lines([random_entry() for _ in range(60)])
+        index = FuzzyIndex()
+        index.update(lines, "GalTransl_TSV")
+        queries = ["アリス", "ボブ 剣", "魔法", "alice", "王城", "ス"]
+        for step in range(150):
+            lines = list(lines)
+            start = rng.randrange(len(lines) + 1)
+            end = min(len(lines), start + rng.randint(0, 3))
+            lines[start:end] = tsv_lines([random_entry() for _ in range(rng.randint(0, 3))])
+            if rng.random() < 0.1:
+                # 编辑到一半、无法解析的行
+                lines.insert(start, "未完成")
+            index.update(lines, "GalTransl_TSV")
+            fresh = FuzzyIndex()
+            fresh.update(lines, "GalTransl_TSV")
+            with self.subTest(step=step):
+                self.assertEqual(len(index), len(fresh))
+                self.assertEqual(self.snapshot(index, queries), self.snapshot(fresh, queries))
+
+    def test_compaction_keeps_results(self):
+        # 每轮修改都会使一条条目失效，这里在最后手动压缩
+        entries = [{'org': f'アリス{i}', 'rep': str(i), 'note': ''} for i in range(50)]
+        lines = tsv_lines(entries)
+        index = FuzzyIndex()
+        index.update(lines, "GalTransl_TSV")
+        expected = results(index, "アリス")
+        for i in range(30):
+            edited = list(lines)
+            edited[i % len(lines)] = f"アリス{i % len(lines)}x\t{i}"
+            index.update(edited, "GalTransl_TSV")
+            index.update(lines, "GalTransl_TSV")
+        index._compact()
+        self.assertEqual(len(index._texts), len(entries))
+        self.assertEqual(results(index, "アリス"), expected)
+
+    def test_format_change_resets_index(self):
+        index = FuzzyIndex()
+        index.update(tsv_lines([{'org': 'アリス', 'rep': '爱丽丝', 'note': ''}]), "GalTransl_TSV")
+        json_lines = conversion.format_output([{'org': 'ボブ', 'rep': '鲍勃', 'note': ''}], "AiNiee_JSON").split("\n")
+        index.update(json_lines, "AiNiee_JSON")
+        self.assertEqual(len(index), 1)
+        self.assertEqual(results(index, "アリス"), [])
+        self.assertEqual(results(index, "ボブ")[0][1], 'ボブ')
+
+
+if __name__ == "__main__":
+    unittest.main()
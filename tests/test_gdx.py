@@ -0,0 +1,107 @@
+"""core.gdx 的单元测试。"""
+
+import os
+import struct
+import tempfile
+import unittest
+
+from core import conversion, gdx
+from core.gdx import GdxReader
+
+ENTRIES = [
+    {'org': 'ボブ', 'rep': '鲍勃', 'note': ''},
+    {'org': 'アリス', 'rep': '爱丽丝', 'note': '角色名'},
+    {'org': 'アリス', 'rep': '爱丽丝2', 'note': '重复原文'},
+    {'org': 'Alice', 'rep': '爱丽丝', 'note': '😀'},
+]
+
+
+class GdxRoundTripTest(unittest.TestCase):
+    def test_round_trip(self):
+        for entries in (ENTRIES, [], [{'org': '', 'rep': '', 'note': ''}]):
+            with self.subTest(count=len(entries)):
+                self.assertEqual(gdx.loads(gdx.dumps(entries)), entries)
+
+    def test_binary_format_registration(self):
+        data = conversion.serialize_binary(ENTRIES, "GDX_Binary")
+        self.assertTrue(gdx.is_gdx(data))
+        self.assertEqual(conversion.parse_binary(data, "GDX_Binary"), ENTRIES)
+
+    def test_sorted_iteration_and_lookup(self):
+        with GdxReader(gdx.dumps(ENTRIES)) as reader:
+            self.assertEqual(len(reader), 4)
+            self.assertEqual([item['org'] for item in reader.iter_sorted()], ['Alice', 'アリス', 'アリス', 'ボブ'])
+            self.assertEqual(reader.lookup('アリス'), ENTRIES[1:3])
+            self.assertEqual(reader.lookup('ボブ'), ENTRIES[:1])
+            self.assertEqual(reader.lookup('イヴ'), [])
+            self.assertEqual(reader.entry(3), ENTRIES[3])
+
+    def test_open_file(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "dict.gdx")
+            gdx.write(ENTRIES, path)
+            with GdxReader.open(path) as reader:
+                self.assertEqual(list(reader), ENTRIES)
+                self.assertEqual(reader.lookup('Alice'), ENTRIES[3:])
+
+            empty = os.path.join(tmp, "empty.gdx")
+            open(empty, "wb").close()
+            with self.assertRaises(ValueError):
+                GdxReader.open(empty)
+
+    def test_strings_are_deduplicated(self):
+        once = len(gdx.dumps(ENTRIES[:2]))
+        self.assertEqual(len(gdx.dumps(ENTRIES[:2] + ENTRIES[:2])), once + 2 * (6 + 1) * 4)
+
+
+class GdxCorruptDataTest(unittest.TestCase):
+    def test_every_truncation_is_rejected(self):
+        data = gdx.dumps(ENTRIES)
+        for size in range(len(data)):
+            with self.subTest(size=size):
+                with self.assertRaises(ValueError):
+                    gdx.loads(data[:size])
+
+    def test_truncated_file(self):
+        data = gdx.dumps(ENTRIES)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "dict.gdx")
+            with open(path, "wb") as f:
+                f.write(data[:gdx._HEADER.size + 10])
+            with self.assertRaises(ValueError):
+                GdxReader.open(path)
+
+    def rewrite_header(self, **fields):
+        data = bytearray(gdx.dumps(ENTRIES))
+        names = ("magic", "version", "reserved", "count", "records_off", "index_off", "strings_off")
+        values = dict(zip(names, gdx._HEADER.unpack_from(data, 0)))
+        values.update(fields)
+        gdx._HEADER.pack_into(data, 0, *(values[name] for name in names))
+        return bytes(data)
+
+    def test_table_offsets_out_of_range(self):
+        size = len(gdx.dumps(ENTRIES))
+        for fields in ({"count": 1000}, {"records_off": size}, {"index_off": size - 4},
+                       {"strings_off": size + 1}, {"records_off": 0}, {"index_off": 2 ** 63}):
+            with self.subTest(**fields):
+                with self.assertRaises(ValueError):
+                    GdxReader(self.rewrite_header(**fields))
+
+    def test_bad_magic_and_version(self):
+        with self.assertRaises(ValueError):
+            GdxReader(self.rewrite_header(magic=b"XXXX"))
+        with self.assertRaises(ValueError):
+            GdxReader(self.rewrite_header(version=99))
+
+    def test_field_outside_string_table(self):
+        data = bytearray(gdx.dumps(ENTRIES))
+        records_off = gdx._HEADER.unpack_from(data, 0)[4]
+        # 把第一条记录的 org 长度改得超出字符串表
+        struct.pack_into("<I", data, records_off + 4, len(data))
+        with GdxReader(bytes(data)) as reader:
+            with self.assertRaises(ValueError):
+                reader.entry(0)
+
+
+if __name__ == "__main__":
+    unittest.main()
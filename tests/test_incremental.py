@@ -0,0 +1,87 @@
+"""core.incremental 的差分测试：增量转换的结果必须与完整解析 (conversion.parse_input) 一致。"""
+
+import random
+import unittest
+
+from core import conversion
+from core.incremental import RECORD_FORMATS, IncrementalConverter
+
+# 容易破坏按行切分记录的字符与片段
+PIECES = list("ab'\"\\\t #=,{}[]ア　\x7f") + ["\n", "[[gptDict]]", "'''", '"""', "},", "\\u0041"]
+
+
+def random_text(rng: random.Random) -> str:
+    return "".join(rng.choice(PIECES) for _ in range(rng.randint(0, 5)))
+
+
+def random_edit(rng: random.Random, lines: list) -> list:
+    """对行列表做一次随机修改：删除、复制、插入一行，或修改一行中的一个字符。"""
+    lines = list(lines)
+    i = rng.randrange(len(lines) + 1)
+    op = rng.random()
+    if op < 0.2 and i < len(lines):
+        del lines[i]
+    elif op < 0.4 and i < len(lines):
+        lines.insert(i, lines[i])
+    elif op < 0.6:
+        entry = {'org': random_text(rng), 'rep': random_text(rng), 'note': random_text(rng)}
+        lines.insert(i, conversion.format_entry(entry, rng.choice(list(RECORD_FORMATS))))
+    elif i < len(lines):
+        line = lines[i]
+        pos = rng.randrange(len(line) + 1)
+        lines[i] = line[:pos] + rng.choice(PIECES) + line[pos + 1:]
+    return lines
+
+
+# 完整解析遇到不合要求的内容（如数组中的元素不是对象）时可能抛出的异常
+PARSE_ERRORS = (ValueError, TypeError, AttributeError)
+
+
+def full_parse(content: str, key: str):
+    try:
+        return conversion.parse_input(content, key)
+    except PARSE_ERRORS:
+        return None
+
+
+class IncrementalDifferentialTest(unittest.TestCase):
+    def check_format(self, key: str, documents: int, edits: int):
+        rng = random.Random(key)
+        for _ in range(documents):
+            converter = IncrementalConverter()
+            data = [{'org': random_text(rng), 'rep': random_text(rng), 'note': random_text(rng)}
+                    for _ in range(rng.randint(0, 6))]
+            lines = conversion.format_output(data, key).split("\n")
+            output = ""
+            for _ in range(edits):
+                content = "\n".join(lines)
+                expected = full_parse(content, key)
+                try:
+                    update = converter.update(content, key, "AiNiee_JSON", output)
+                    entries, output = update.entries, update.output
+                except PARSE_ERRORS:
+                    entries = None
+                self.assertEqual(entries, expected, f"{key}:\n{content}")
+                lines = random_edit(rng, lines)
+
+    def test_gpp_gui_toml(self):
+        self.check_format("GPPGUI_TOML", 150, 10)
+
+    def test_gpp_cli_toml(self):
+        self.check_format("GPPCLI_TOML", 150, 10)
+
+    def test_ainiee_json(self):
+        self.check_format("AiNiee_JSON", 150, 10)
+
+    def test_galtransl_tsv(self):
+        self.check_format("GalTransl_TSV", 150, 10)
+
+    def test_mixed_quote_gui_toml_line(self):
+        line = "\t{ org = \"\\\"'\", rep = 'baa', note = '' },"
+        content = f"gptDict = [\n{line}\n]"
+        update = IncrementalConverter().update(content, "GPPGUI_TOML", "AiNiee_JSON", "")
+        self.assertEqual(update.entries, conversion.parse_input(content, "GPPGUI_TOML"))
+
+
+if __name__ == "__main__":
+    unittest.main()
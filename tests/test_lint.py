@@ -0,0 +1,185 @@
+"""core.lint 的单元测试。"""
+
+import random
+import unittest
+
+from core import conversion
+from core.lint import (ERROR, WARNING, IncrementalLinter, JsonLinter, LineLinter, TomlLinter, TsvLinter,
+                       get_line_linter)
+
+SAMPLE = [
+    {'org': 'アリス', 'rep': '爱丽丝', 'note': '角色名'},
+    {'org': "it's", 'rep': 'a "quote"', 'note': ''},
+    {'org': 'ボブ', 'rep': '鲍勃', 'note': ''},
+]
+
+
+def lint_text(linter: LineLinter, text: str):
+    """逐行校验整段文本，返回 [(行号, 严重程度, 信息)]。"""
+    state = linter.initial_state
+    results = []
+    lines = text.split("\n")
+    for i, line in enumerate(lines):
+        diagnostics, state = linter.lint_line(line, state)
+        results.extend((i, d.severity, d.message) for d in diagnostics)
+    results.extend((len(lines) - 1, d.severity, d.message) for d in linter.finish(state, lines[-1]))
+    return results
+
+
+class LineLinterTest(unittest.TestCase):
+    def test_formatted_output_is_clean(self):
+        for format_key in ("GalTransl_TSV", "GPPGUI_TOML", "GPPCLI_TOML", "AiNiee_JSON"):
+            with self.subTest(format_key=format_key):
+                text = conversion.format_output(SAMPLE, format_key)
+                self.assertEqual(lint_text(get_line_linter(format_key), text), [])
+
+    def test_unknown_format_reports_nothing(self):
+        self.assertEqual(lint_text(get_line_linter(None), "{{{ 任意内容"), [])
+
+
+class TsvLinterTest(unittest.TestCase):
+    def lint(self, line):
+        diagnostics, _ = TsvLinter().lint_line(line, None)
+        return [(d.start, d.end, d.severity, d.message) for d in diagnostics]
+
+    def test_comments_and_blank_lines(self):
+        for line in ("", "   ", "// 注释", "# 注释"):
+            self.assertEqual(self.lint(line), [])
+
+    def test_missing_delimiter(self):
+        self.assertEqual(self.lint("  原文"), [(2, 4, ERROR, "缺少分隔符（制表符或四个空格），该行会被忽略")])
+
+    def test_empty_org(self):
+        self.assertEqual([d[3] for d in self.lint("\t译文")], ["原文为空"])
+
+    def test_mixed_delimiters(self):
+        self.assertEqual([d[2] for d in self.lint("原文\t译文    备注")], [WARNING])
+
+    def test_extra_delimiter_in_note(self):
+        diagnostics = self.lint("原文\t译文\t备注\t更多")
+        self.assertEqual(len(diagnostics), 1)
+        self.assertEqual(diagnostics[0][:3], (8, 9, WARNING))
+
+
+class TomlLinterTest(unittest.TestCase):
+    def messages(self, text, org_key="org"):
+        return [(line, message) for line, _, message in lint_text(TomlLinter(org_key), text)]
+
+    def test_dotted_and_quoted_keys(self):
+        text = "\n".join([
+            "a.b = 'x'",
+            'site."google.com" = true',
+            "a . 'b c' . d = 1",
+            '"quoted" = "value"',
+            "pi = 3.14",
+        ])
+        self.assertEqual(self.messages(text), [])
+
+    def test_empty_org(self):
+        text = "gptDict = [\n\t{ org = '', rep = 'b' },\n\t{ \"org\" = \"\", rep = 'b' },\n\t{ a = true, org = \"\" },\n]"
+        self.assertEqual(self.messages(text), [(1, "原文为空"), (2, "原文为空"), (3, "原文为空")])
+        # 只有整个键与原文键相同时才检查
+        self.assertEqual(self.messages("x.org = ''\n"), [])
+        self.assertEqual(self.messages("[[gptDict]]\nsearchStr = ''", org_key="searchStr"), [(1, "原文为空")])
+
+    def test_string_value_is_not_a_key(self):
+        self.assertEqual(self.messages('x = "a".b'), [(0, "无法识别的字符 '.'")])
+        self.assertEqual(self.messages(". = 1"), [(0, "无法识别的字符 '.'")])
+
+    def test_strings(self):
+        self.assertEqual(self.messages("a = 'abc"), [(0, "字符串未闭合")])
+        self.assertEqual(self.messages('a = "a\\"b'), [(0, "字符串未闭合")])
+        self.assertEqual(self.messages("a = 'it''s'"), [(0, "单引号字符串中不能包含单引号，请改用双引号字符串")])
+        self.assertEqual(self.messages("a = '''第一行\n第二行'''\nb = 1"), [])
+        self.assertEqual(self.messages("a = '''第一行\n第二行"), [(1, "多行字符串 ''' 未闭合")])
+
+    def test_brackets(self):
+        self.assertEqual(self.messages("gptDict = [\n\t{ org = 'a' },\n"), [(2, "括号未闭合")])
+        self.assertEqual(self.messages("a = 1 ]"), [(0, "多余的右括号")])
+
+    def test_comment(self):
+        self.assertEqual(self.messages("a = 1 # 注释 !@"), [])
+
+
+class JsonLinterTest(unittest.TestCase):
+    def messages(self, text):
+        return [(line, message) for line, _, message in lint_text(JsonLinter(), text)]
+
+    def test_empty_src(self):
+        self.assertEqual(self.messages('[{"src": "", "dst": "a"}]'), [(0, "原文 (src) 为空")])
+
+    def test_missing_and_extra_commas(self):
+        self.assertEqual(self.messages('[\n  {"src": "a"}\n  {"src": "b"}\n]'), [(2, "缺少逗号")])
+        self.assertEqual(self.messages('[{"src": "a"},\n]'), [(1, "右括号前多余的逗号")])
+        self.assertEqual(self.messages('[, 1]'), [(0, "多余的逗号")])
+
+    def test_brackets(self):
+        self.assertEqual(self.messages('[{"src": "a"}]]'), [(0, "括号不匹配")])
+        self.assertEqual(self.messages('[{"src": "a"}'), [(0, "括号未闭合")])
+
+    def test_other_errors(self):
+        self.assertEqual(self.messages('["abc'), [(0, "字符串未闭合（JSON 字符串不能跨行）"), (0, "括号未闭合")])
+        self.assertEqual(self.messages('[{: 1}]'), [(0, "冒号前缺少键名")])
+        self.assertEqual(self.messages('[tru]')[0], (0, "无法识别的字符 't'"))
+        self.assertEqual(self.messages('[1, -2.5e3, true, false, null]'), [])
+
+
+class IncrementalLinterTest(unittest.TestCase):
+    def check_matches_full_lint(self, linter):
+        fresh = IncrementalLinter(linter.format_key)
+        fresh.reset("\n".join(linter.lines))
+        self.assertEqual(linter.diagnostics, fresh.diagnostics)
+        self.assertEqual(linter.states, fresh.states)
+        self.assertEqual(linter.totals(), fresh.totals())
+
+    def test_edit_stops_when_state_matches(self):
+        text = conversion.format_output(SAMPLE * 100, "AiNiee_JSON")
+        linter = IncrementalLinter("AiNiee_JSON")
+        linter.reset(text)
+        self.assertEqual(linter.totals(), (0, 0))
+
+        # 修改一个值不影响后续行的行首状态，只重新校验被修改的行
+        line = linter.lines.index('    "dst": "爱丽丝",')
+        self.assertEqual(linter.update(line, 1, ['    "dst": "新译文",']), (line, line + 1))
+        self.check_matches_full_lint(linter)
+
+        # 删除一个逗号后，下一行的状态改变，需要继续校验
+        start, end = linter.update(line, 1, ['    "dst": "新译文"'])
+        self.assertEqual(start, line)
+        self.assertGreater(end, line + 1)
+        self.assertLess(end, len(linter.lines))
+        self.assertEqual(linter.totals(), (1, 0))
+        self.check_matches_full_lint(linter)
+
+    def test_unclosed_multiline_string_propagates(self):
+        text = conversion.format_output(SAMPLE * 20, "GPPCLI_TOML")
+        linter = IncrementalLinter("GPPCLI_TOML")
+        linter.reset(text)
+        # 打开一个多行字符串后，直到文档结尾的所有行都需要重新校验
+        start, end = linter.update(1, 1, ["note = '''"])
+        self.assertEqual((start, end), (1, len(linter.lines)))
+        self.assertEqual(linter.totals(), (1, 0))
+        self.check_matches_full_lint(linter)
+        # 关闭之后恢复
+        linter.update(1, 1, ["note = ''"])
+        self.assertEqual(linter.totals(), (0, 0))
+        self.check_matches_full_lint(linter)
+
+    def test_random_edits_match_full_lint(self):
+        rng = random.Random(7)
+        pieces = ["{", "}", "[", "]", '"a"', '"src": ""', ",", ":", "'''", "'x'", "org = ", "1", "\t", "    ", "#"]
+        for format_key in ("GalTransl_TSV", "GPPGUI_TOML", "GPPCLI_TOML", "AiNiee_JSON"):
+            linter = IncrementalLinter(format_key)
+            linter.reset(conversion.format_output(SAMPLE * 5, format_key))
+            for _ in range(200):
+                start = rng.randrange(len(linter.lines))
+                old_count = rng.randint(0, min(3, len(linter.lines) - start))
+                new_lines = ["".join(rng.choice(pieces) for _ in range(rng.randint(0, 4)))
+                             for _ in range(rng.randint(0 if old_count else 1, 3))]
+                linter.update(start, old_count, new_lines)
+            with self.subTest(format_key=format_key):
+                self.check_matches_full_lint(linter)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+"""core.matcher 的单元测试。"""
+
+import random
+import unittest
+from unittest import mock
+
+from core import matcher
+from core.matcher import KeywordTrie, apply_entries, apply_entries_parallel
+
+
+def force_scan(trie: KeywordTrie) -> KeywordTrie:
+    """让字典树跳过正则表达式，改用逐字符扫描。"""
+    trie._regex = trie._overlap_regex = False
+    return trie
+
+
+class KeywordTrieTest(unittest.TestCase):
+    def test_leftmost_longest(self):
+        trie = KeywordTrie(["ab", "abc", "b", "cd"])
+        self.assertEqual(list(trie.finditer("abcd bcd")), [(0, 3, 1), (5, 6, 2), (6, 8, 3)])
+
+    def test_iter_all_includes_overlaps(self):
+        trie = KeywordTrie(["ab", "abc", "bc"])
+        self.assertEqual(sorted(trie.iter_all("abc")), [(0, 2, 0), (0, 3, 1), (1, 3, 2)])
+        self.assertEqual(trie.count_all("abcabc"), {0: 2, 1: 2, 2: 2})
+
+    def test_very_long_key(self):
+        key = "あ" * 6000
+        trie = KeywordTrie([key, "い"])
+        text = "い" + key + "あい"
+        self.assertEqual(list(trie.finditer(text)), [(0, 1, 1), (1, 6001, 0), (6002, 6003, 1)])
+        output, hits = apply_entries(text, [{'org': key, 'rep': "X", 'note': ''}])
+        self.assertEqual(output, "いXあい")
+        self.assertEqual(hits, [(1, 2, 0)])
+
+    def test_deeply_nested_prefixes_fall_back_to_scan(self):
+        keys = ["a" * n + "b" for n in range(1, 2000)]
+        trie = KeywordTrie(keys)
+        self.assertIsNone(trie.regex)
+        text = "x" + "a" * 10 + "b" + "a" * 2500 + "b"
+        self.assertEqual(list(trie.finditer(text)), [(1, 12, 9), (513, 2513, 1998)])
+        self.assertEqual(trie.count_all("aaab"), {2: 1, 1: 1, 0: 1})
+
+    def test_scan_matches_regex(self):
+        rng = random.Random(0)
+        for _ in range(300):
+            keys = ["".join(rng.choice("abc") for _ in range(rng.randint(0, 4))) for _ in range(rng.randint(0, 8))]
+            text = "".join(rng.choice("abcd") for _ in range(rng.randint(0, 30)))
+            regex_trie, scan_trie = KeywordTrie(keys), force_scan(KeywordTrie(keys))
+            self.assertEqual(list(scan_trie.finditer(text)), list(regex_trie.finditer(text)))
+            self.assertEqual(sorted(scan_trie.iter_all(text)), sorted(regex_trie.iter_all(text)))
+
+
+def _failing_init(entries):
+    raise RuntimeError("初始化失败")
+
+
+class ApplyEntriesParallelTest(unittest.TestCase):
+    entries = [{'org': "あ" * 5000, 'rep': "X", 'note': ''}, {'org': "い", 'rep': "Y", 'note': ''}]
+    text = ("い" + "あ" * 5000 + "\n") * 6
+
+    def test_matches_serial_result(self):
+        expected = apply_entries(self.text, self.entries)
+        self.assertEqual(apply_entries_parallel(self.text, self.entries, workers=2, chunk_chars=5000), expected)
+
+    def test_broken_pool_falls_back_to_serial(self):
+        expected = apply_entries(self.text, self.entries)
+        with mock.patch.object(matcher, "_init_apply_worker", _failing_init):
+            result = apply_entries_parallel(self.text, self.entries, workers=2, chunk_chars=5000)
+        self.assertEqual(result, expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+"""utils.memprof 的单元测试。"""
+
+import tracemalloc
+import unittest
+from unittest import mock
+
+from utils import memprof
+from utils.memprof import MemoryProfiler
+
+
+def _allocate():
+    return [bytearray(1000) for _ in range(200)]
+
+
+class TopSitesTest(unittest.TestCase):
+    def setUp(self):
+        if tracemalloc.is_tracing():
+            self.skipTest("tracemalloc 已在运行")
+        self.profiler = MemoryProfiler()
+        self.profiler.start()
+        self.blocks = _allocate()
+        self.line = f"{__file__}:{_allocate.__code__.co_firstlineno + 1}"
+
+    def tearDown(self):
+        self.profiler.stop()
+
+    def check_sites(self, sites):
+        site = next(s for s in sites if s.location == self.line)
+        self.assertGreaterEqual(site.count, 200)
+        self.assertGreaterEqual(site.size, 200 * 1000)
+        self.assertEqual(sites, sorted(sites, key=lambda s: s.size, reverse=True))
+        self.assertFalse(any(s.location.startswith(memprof.__file__ + ":") for s in sites))
+
+    def test_fast_path(self):
+        snapshot = tracemalloc.take_snapshot()
+        if memprof._group_raw_traces(snapshot, ()) is None:
+            self.skipTest("当前 Python 的快照没有原始记录")
+        self.check_sites(self.profiler.top_sites(limit=1000))
+
+    def test_public_api_fallback(self):
+        with mock.patch.object(memprof, "_group_raw_traces", return_value=None):
+            self.check_sites(self.profiler.top_sites(limit=1000))
+
+    def test_unexpected_raw_layout_falls_back(self):
+        snapshot = mock.Mock()
+        snapshot.traces._traces = [("不是", "预期的结构")]
+        self.assertIsNone(memprof._group_raw_traces(snapshot, ()))
+        del snapshot.traces._traces
+        self.assertIsNone(memprof._group_raw_traces(snapshot, ()))
+
+    def test_both_paths_agree(self):
+        snapshot = tracemalloc.take_snapshot()
+        ignored = (tracemalloc.__file__, memprof.__file__)
+        fast = memprof._group_raw_traces(snapshot, ignored)
+        if fast is None:
+            self.skipTest("当前 Python 的快照没有原始记录")
+        public = memprof._group_statistics(snapshot, ignored)
+        self.assertEqual(sorted(fast), sorted(public))
+
+    def test_disabled_returns_empty(self):
+        self.profiler.stop()
+        self.assertEqual(self.profiler.top_sites(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+"""core.normalize 的单元测试。"""
+
+import unittest
+
+from core import transform
+from core.normalize import NormalizedKeyIndex, VariantGroup, normalize_key
+from core.transform import DEDUPE_FOLDED, DEDUPE_KANA, TransformOptions, transform_entries
+
+
+def entries_of(*orgs):
+    return [{'org': org, 'rep': str(i), 'note': ''} for i, org in enumerate(orgs)]
+
+
+class NormalizeKeyTest(unittest.TestCase):
+    def test_width_folding(self):
+        self.assertEqual(normalize_key("ＡＢＣ１２３"), "abc123")
+        self.assertEqual(normalize_key("ｱﾘｽ"), "アリス")
+        self.assertEqual(normalize_key("ｶﾞｰﾙ"), "ガール")
+        self.assertEqual(normalize_key("㈱"), "(株)")
+
+    def test_case_folding(self):
+        self.assertEqual(normalize_key("Alice"), "alice")
+        self.assertEqual(normalize_key("Straße"), "strasse")
+        self.assertEqual(normalize_key("ÀLICE"), "àlice")
+
+    def test_kana_folding(self):
+        self.assertEqual(normalize_key("ありす"), "ありす")
+        self.assertEqual(normalize_key("ありす", kana=True), "アリス")
+        self.assertEqual(normalize_key("ゝゞ", kana=True), "ヽヾ")
+        self.assertEqual(normalize_key("ｱﾘｽとありす", kana=True), "アリストアリス")
+        # 片假名不会被转换为平假名，长音等符号保持不变
+        self.assertEqual(normalize_key("ラーメン", kana=True), "ラーメン")
+
+    def test_unchanged_text_is_shared(self):
+        for text in ("アリス", "abc", "爱丽丝"):
+            self.assertIs(normalize_key(text, kana=True), text)
+
+
+class NormalizedKeyIndexTest(unittest.TestCase):
+    def setUp(self):
+        self.entries = entries_of("アリス", "ｱﾘｽ", "ボブ", "ありす", "アリス", "ボブ", "Bob", "BOB")
+
+    def test_lookup(self):
+        index = NormalizedKeyIndex(self.entries)
+        self.assertEqual(index.lookup("アリス"), [0, 1, 4])
+        self.assertEqual(index.lookup("ありす"), [3])
+        self.assertEqual(index.lookup("bob"), [6, 7])
+        self.assertEqual(index.lookup("イヴ"), [])
+        self.assertEqual(NormalizedKeyIndex(self.entries, kana=True).lookup("ありす"), [0, 1, 3, 4])
+
+    def test_duplicate_groups(self):
+        index = NormalizedKeyIndex(self.entries)
+        self.assertEqual(index.duplicate_groups(), [
+            VariantGroup("アリス", [0, 1, 4], True),
+            VariantGroup("ボブ", [2, 5], False),
+            VariantGroup("bob", [6, 7], True),
+        ])
+        self.assertEqual([g.key for g in index.duplicate_groups(variants_only=True)], ["アリス", "bob"])
+
+    def test_duplicate_groups_with_kana(self):
+        index = NormalizedKeyIndex(self.entries, kana=True)
+        groups = index.duplicate_groups(variants_only=True)
+        self.assertEqual(groups[0], VariantGroup("アリス", [0, 1, 3, 4], True))
+        # 完全相同的重复条目只在 variants_only=False 时返回
+        exact = NormalizedKeyIndex(entries_of("ボブ", "x", "ボブ"), kana=True)
+        self.assertEqual(exact.duplicate_groups(variants_only=True), [])
+        self.assertEqual(exact.duplicate_groups(), [VariantGroup("ボブ", [0, 2], False)])
+
+    def test_add_and_extend(self):
+        index = NormalizedKeyIndex()
+        self.assertEqual(index.add({'org': 'Ａ', 'rep': '', 'note': ''}), 0)
+        index.extend(entries_of("a", "b"))
+        self.assertEqual(len(index), 3)
+        self.assertEqual(index.lookup("A"), [0, 1])
+        self.assertEqual(index.keys, ["a", "a", "b"])
+
+    def test_search(self):
+        index = NormalizedKeyIndex(self.entries, kana=True)
+        self.assertEqual(index.search("りす"), [0, 1, 3, 4])
+        self.assertEqual(index.search("ﾘｽ", limit=2), [0, 1])
+        self.assertEqual(index.search("o"), [6, 7])
+        self.assertEqual(index.search(""), [])
+
+
+class DedupeKeyConsistencyTest(unittest.TestCase):
+    """transform 的去重方式必须与 NormalizedKeyIndex 使用相同的键，否则变体面板与去重的结果会不一致。"""
+    SAMPLES = ["アリス", "ｱﾘｽ", "ありす", "ＡＢＣ", "abc", "Straße", "STRASSE", "ゝ", "ヽ", "ラーメン", "らーめん", ""]
+
+    def test_fold_key_matches_index(self):
+        index = NormalizedKeyIndex(entries_of(*self.SAMPLES))
+        self.assertEqual([transform.fold_key(org) for org in self.SAMPLES], index.keys)
+        self.assertEqual([transform.DEDUPE_KEYS[DEDUPE_FOLDED](item) for item in entries_of(*self.SAMPLES)],
+                         index.keys)
+
+    def test_kana_dedupe_matches_index(self):
+        entries = entries_of(*self.SAMPLES)
+        index = NormalizedKeyIndex(entries, kana=True)
+        self.assertEqual([transform.DEDUPE_KEYS[DEDUPE_KANA](item) for item in entries], index.keys)
+
+        # 去重后保留的正是每组中的第一个条目
+        kept = transform_entries(entries, TransformOptions(dedupe=DEDUPE_KANA))
+        duplicates = {i for group in index.duplicate_groups() for i in group.indices[1:]}
+        self.assertEqual([item['rep'] for item in kept],
+                         [str(i) for i in range(len(entries)) if i not in duplicates])
+
+
+if __name__ == "__main__":
+    unittest.main()
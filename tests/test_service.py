@@ -0,0 +1,100 @@
+"""core.service 的测试：在本进程中启动转换服务，并通过 ServiceClient 调用。"""
+
+import asyncio
+import base64
+import json
+import unittest
+
+from core import conversion, service
+from core.service import ConversionService, ServiceClient, ServiceError
+
+SAMPLE = [
+    {'org': 'アリス', 'rep': '爱丽丝', 'note': '角色名'},
+    {'org': 'ボブ', 'rep': '鲍勃', 'note': ''},
+]
+TSV = conversion.format_output(SAMPLE, "GalTransl_TSV")
+
+
+class ServiceTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        # 不使用进程池，所有请求在本进程中处理
+        self.service = ConversionService(workers=0)
+        await self.service.start(service.DEFAULT_HOST, 0)
+        self.client = ServiceClient(*self.service.address)
+        await self.client.connect()
+
+    async def asyncTearDown(self):
+        await self.client.close()
+        await self.service.close()
+
+    async def test_convert(self):
+        result = await self.client.call("convert", content=TSV, to="AiNiee_JSON")
+        self.assertEqual(result["format"], "GalTransl_TSV")
+        self.assertEqual(result["count"], 2)
+        self.assertEqual(conversion.parse_input(result["output"], "AiNiee_JSON"), SAMPLE)
+
+    async def test_convert_to_binary_format_returns_base64(self):
+        result = await self.client.call("convert", content=TSV, **{"from": "GalTransl_TSV", "to": "GDX_Binary"})
+        data = base64.b64decode(result["output"])
+        self.assertEqual(conversion.parse_binary(data, "GDX_Binary"), SAMPLE)
+
+    async def test_detect(self):
+        self.assertEqual(await self.client.call("detect", content=TSV), {"format": "GalTransl_TSV"})
+        self.assertEqual(await self.client.call("detect", content=""), {"format": None})
+
+    async def test_validate(self):
+        result = await self.client.call("validate", content=TSV)
+        self.assertEqual((result["errors"], result["count"], result["parse_error"]), (0, 2, None))
+
+        broken = '[\n  {"src": "a", "dst": "b"\n]'
+        result = await self.client.call("validate", content=broken, **{"from": "AiNiee_JSON"})
+        self.assertGreater(result["errors"], 0)
+        self.assertIsNone(result["count"])
+        self.assertTrue(result["parse_error"])
+        self.assertTrue(all(len(d) == 4 for d in result["diagnostics"]))
+
+    async def test_batch_keeps_order_and_reports_errors_per_request(self):
+        results = await self.client.batch([
+            {"op": "detect", "content": TSV},
+            {"op": "convert", "content": TSV, "to": "no-such-format"},
+            {"op": "convert", "content": TSV, "to": "GPPGUI_TOML"},
+        ])
+        self.assertEqual([r["ok"] for r in results], [True, False, True])
+        self.assertEqual(results[0]["result"]["format"], "GalTransl_TSV")
+        self.assertEqual(results[2]["result"]["count"], 2)
+
+    async def test_unknown_op(self):
+        with self.assertRaises(ServiceError):
+            await self.client.call("explode", content=TSV)
+        with self.assertRaises(ServiceError):
+            await self.client.call("convert", to="AiNiee_JSON")
+
+    async def test_invalid_json_keeps_connection_open(self):
+        reader, writer = await asyncio.open_connection(*self.service.address)
+        try:
+            for line in (b"not json\n", b"[1, 2]\n"):
+                writer.write(line)
+                await writer.drain()
+                response = json.loads(await reader.readline())
+                self.assertFalse(response["ok"])
+                self.assertIn("无效的请求", response["error"])
+            writer.write(b'{"op": "ping"}\n')
+            await writer.drain()
+            self.assertTrue(json.loads(await reader.readline())["result"]["pong"])
+        finally:
+            writer.close()
+            await writer.wait_closed()
+
+    async def test_repeated_request_hits_cache(self):
+        first = await self.client.call("convert", content=TSV, to="AiNiee_JSON")
+        second = await self.client.call("convert", content=TSV, to="AiNiee_JSON")
+        self.assertEqual(first, second)
+        # 目标格式不同时不能使用缓存
+        await self.client.call("convert", content=TSV, to="GPPCLI_TOML")
+        stats = (await self.client.call("ping"))["stats"]
+        self.assertEqual(stats["cache_hits"], 1)
+        self.assertEqual(stats["pooled"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,140 @@
+"""utils.snapshot_cache 的单元测试。"""
+
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from utils import snapshot_cache
+from utils.snapshot_cache import INDEX_FILE, SnapshotCache, _decode_snapshot, _encode_snapshot
+
+ENTRIES = [
+    {'org': 'アリス', 'rep': '爱丽丝', 'note': '角色名'},
+    {'org': 'ボブ', 'rep': '', 'note': ''},
+    {'org': '😀', 'rep': 'emoji', 'note': '多字节字符'},
+]
+
+
+class SnapshotCacheTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        self.cache = SnapshotCache(self.root / "cache")
+        self.path = self.write_dict("a.txt", "アリス\t爱丽丝\n")
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def write_dict(self, name, text):
+        path = str(self.root / name)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+        return path
+
+    def read_index(self):
+        with open(self.root / "cache" / INDEX_FILE, encoding="utf-8") as f:
+            return json.load(f)
+
+    def snapshot_file(self, path):
+        return self.root / "cache" / f"{SnapshotCache._cache_key(path)}.bin"
+
+    def test_encode_decode_round_trip(self):
+        self.assertEqual(_decode_snapshot(_encode_snapshot("GalTransl_TSV", ENTRIES)), ("GalTransl_TSV", ENTRIES))
+        self.assertEqual(_decode_snapshot(_encode_snapshot("AiNiee_JSON", [])), ("AiNiee_JSON", []))
+
+    def test_hit(self):
+        self.cache.store(self.path, "GalTransl_TSV", ENTRIES)
+        self.assertEqual(self.cache.lookup(self.path), ("GalTransl_TSV", ENTRIES))
+        # 新的实例从磁盘读取索引
+        self.assertEqual(SnapshotCache(self.root / "cache").lookup(self.path), ("GalTransl_TSV", ENTRIES))
+
+    def test_miss_for_unknown_or_missing_file(self):
+        self.assertIsNone(self.cache.lookup(self.path))
+        self.assertIsNone(self.cache.lookup(str(self.root / "missing.txt")))
+
+    def test_stale_when_mtime_changes(self):
+        self.cache.store(self.path, "GalTransl_TSV", ENTRIES)
+        stat = os.stat(self.path)
+        os.utime(self.path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        self.assertIsNone(self.cache.lookup(self.path))
+
+    def test_stale_when_size_changes(self):
+        self.cache.store(self.path, "GalTransl_TSV", ENTRIES)
+        stat = os.stat(self.path)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write("ボブ\t鲍勃\n")
+        os.utime(self.path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        self.assertIsNone(self.cache.lookup(self.path))
+
+    def test_corrupt_snapshot_is_dropped(self):
+        for damage in (lambda data: data[:len(data) // 2], lambda data: b"XXXX" + data[4:], lambda data: b""):
+            with self.subTest():
+                self.cache.store(self.path, "GalTransl_TSV", ENTRIES)
+                snapshot = self.snapshot_file(self.path)
+                snapshot.write_bytes(damage(snapshot.read_bytes()))
+                self.assertIsNone(self.cache.lookup(self.path))
+                self.assertFalse(snapshot.exists())
+                self.assertEqual(self.read_index(), {})
+
+    def test_missing_snapshot_is_dropped(self):
+        self.cache.store(self.path, "GalTransl_TSV", ENTRIES)
+        os.remove(self.snapshot_file(self.path))
+        self.assertIsNone(self.cache.lookup(self.path))
+        self.assertEqual(self.read_index(), {})
+
+    def test_eviction_keeps_recently_used(self):
+        size = len(_encode_snapshot("GalTransl_TSV", ENTRIES))
+        cache = SnapshotCache(self.root / "cache", max_bytes=2 * size)
+        paths = [self.write_dict(f"{name}.txt", name) for name in ("a", "b", "c")]
+        with mock.patch.object(snapshot_cache.time, "time", side_effect=[1.0, 2.0, 3.0, 4.0]):
+            cache.store(paths[0], "GalTransl_TSV", ENTRIES)
+            cache.store(paths[1], "GalTransl_TSV", ENTRIES)
+            # 访问 a 之后，b 成为最久未使用的快照
+            self.assertIsNotNone(cache.lookup(paths[0]))
+            cache.store(paths[2], "GalTransl_TSV", ENTRIES)
+        self.assertIsNotNone(cache.lookup(paths[0]))
+        self.assertIsNone(cache.lookup(paths[1]))
+        self.assertIsNotNone(cache.lookup(paths[2]))
+        self.assertFalse(self.snapshot_file(paths[1]).exists())
+        self.assertEqual(len(self.read_index()), 2)
+
+    def test_oversized_snapshot_is_not_stored(self):
+        cache = SnapshotCache(self.root / "cache", max_bytes=10)
+        cache.store(self.path, "GalTransl_TSV", ENTRIES)
+        self.assertIsNone(cache.lookup(self.path))
+
+    def test_hit_does_not_write_index(self):
+        self.cache.store(self.path, "GalTransl_TSV", ENTRIES)
+        with mock.patch.object(SnapshotCache, "_save_index") as save:
+            for _ in range(5):
+                self.assertIsNotNone(self.cache.lookup(self.path))
+            save.assert_not_called()
+
+    def test_flush_writes_access_time(self):
+        self.cache.store(self.path, "GalTransl_TSV", ENTRIES)
+        key = SnapshotCache._cache_key(self.path)
+        stored = self.read_index()[key]["atime"]
+        with mock.patch.object(snapshot_cache.time, "time", return_value=stored + 100):
+            self.cache.lookup(self.path)
+        self.assertEqual(self.read_index()[key]["atime"], stored)
+        self.cache.flush()
+        self.assertEqual(self.read_index()[key]["atime"], stored + 100)
+
+    def test_hit_writes_index_after_interval(self):
+        self.cache.store(self.path, "GalTransl_TSV", ENTRIES)
+        self.cache._saved_at -= snapshot_cache.ATIME_FLUSH_INTERVAL
+        with mock.patch.object(SnapshotCache, "_save_index") as save:
+            self.cache.lookup(self.path)
+            save.assert_called_once()
+
+    def test_clear(self):
+        self.cache.store(self.path, "GalTransl_TSV", ENTRIES)
+        self.cache.clear()
+        self.assertIsNone(self.cache.lookup(self.path))
+        self.assertEqual(list((self.root / "cache").glob("*.bin")), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
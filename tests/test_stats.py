@@ -0,0 +1,166 @@
+"""core.stats 的单元测试。"""
+
+import random
+import unittest
+from collections import Counter
+from unittest import mock
+
+from core import conversion, stats
+from core.stats import MAX_LENGTH_BUCKET, NUMPY_BATCH_MIN, DictionaryStats, _Histogram
+
+
+class _FakeVector(list):
+    """只实现 _Histogram 用到的运算的一维整数数组。"""
+    def __iadd__(self, other):
+        for i, value in enumerate(other):
+            self[i] += value
+        return self
+
+    def __rmul__(self, factor):
+        return _FakeVector(factor * value for value in self)
+
+
+class _FakeNumpy:
+    """代替 NumPy 的最小实现，用于在未安装 NumPy 时测试批量计数的分支。"""
+    int64 = int
+
+    def __init__(self):
+        self.bincount_calls = 0
+
+    @staticmethod
+    def zeros(size, dtype=None):
+        return _FakeVector([0] * size)
+
+    @staticmethod
+    def asarray(values, dtype=None):
+        return list(values)
+
+    @staticmethod
+    def minimum(values, limit):
+        return [min(v, limit) for v in values]
+
+    def bincount(self, values, minlength=0):
+        self.bincount_calls += 1
+        counts = _FakeVector([0] * minlength)
+        for v in values:
+            counts[v] += 1
+        return counts
+
+
+def expected_histogram(lengths):
+    counts = [0] * MAX_LENGTH_BUCKET
+    for n in lengths:
+        counts[min(n, MAX_LENGTH_BUCKET - 1)] += 1
+    return counts
+
+
+class HistogramTest(unittest.TestCase):
+    def check(self, histogram):
+        rng = random.Random(1)
+        small = [rng.randrange(50) for _ in range(10)]
+        large = [rng.randrange(100) for _ in range(NUMPY_BATCH_MIN * 2)]
+        histogram.add(small, 1)
+        histogram.add(large, 1)
+        self.assertEqual(histogram.to_list(), expected_histogram(small + large))
+        histogram.add(large, -1)
+        self.assertEqual(histogram.to_list(), expected_histogram(small))
+        histogram.add(small, -1)
+        self.assertEqual(histogram.to_list(), [0] * MAX_LENGTH_BUCKET)
+        self.assertTrue(all(type(c) is int for c in histogram.to_list()))
+
+    def test_without_numpy(self):
+        with mock.patch.object(stats, "np", None):
+            histogram = _Histogram()
+            self.assertEqual(histogram.counts.typecode, 'q')
+            self.check(histogram)
+
+    def test_batch_path_with_fake_numpy(self):
+        fake = _FakeNumpy()
+        with mock.patch.object(stats, "np", fake):
+            self.check(_Histogram())
+        # 只有达到 NUMPY_BATCH_MIN 的两次增减使用批量计数
+        self.assertEqual(fake.bincount_calls, 2)
+
+    @unittest.skipIf(stats.np is None, "未安装 NumPy")
+    def test_with_numpy(self):
+        self.check(_Histogram())
+
+
+class DictionaryStatsTest(unittest.TestCase):
+    def expected_summary(self, lines, format_key):
+        """不使用增量更新，直接由完整解析的结果计算统计。"""
+        entries = conversion.parse_input("\n".join(lines), format_key)
+        counts = Counter(item['org'] for item in entries)
+        return stats.StatsSummary(
+            len(entries),
+            sum(c - 1 for c in counts.values()),
+            sum(c > 1 for c in counts.values()),
+            sum(not item['note'] for item in entries),
+            sum(len(item['org']) for item in entries),
+            sum(len(item['rep']) for item in entries),
+            expected_histogram(len(item['org']) for item in entries),
+            expected_histogram(len(item['rep']) for item in entries),
+        )
+
+    def test_summary(self):
+        entries = [
+            {'org': 'アリス', 'rep': '爱丽丝', 'note': ''},
+            {'org': 'アリス', 'rep': '爱丽丝2', 'note': '重复'},
+            {'org': 'ボブ', 'rep': '鲍勃', 'note': ''},
+            {'org': 'アリス', 'rep': 'x' * 40, 'note': ''},
+        ]
+        dictionary_stats = DictionaryStats()
+        dictionary_stats.update(conversion.format_output(entries, "GalTransl_TSV").split("\n"), "GalTransl_TSV")
+        summary = dictionary_stats.summary()
+        self.assertEqual((summary.entries, summary.duplicates, summary.duplicate_orgs, summary.empty_notes),
+                         (4, 2, 1, 3))
+        self.assertEqual(summary.empty_note_ratio, 0.75)
+        self.assertEqual(summary.mean_org_length, 11 / 4)
+        self.assertEqual(summary.rep_lengths[MAX_LENGTH_BUCKET - 1], 1)
+        self.assertEqual(DictionaryStats().summary().mean_rep_length, 0.0)
+
+    def random_edits_match_fresh_build(self, format_key, initial=40):
+        rng = random.Random(format_key)
+        orgs = ["アリス", "ボブ", "イヴ", "a", "b" * 40]
+
+        def random_lines(count):
+            entries = [{'org': rng.choice(orgs), 'rep': rng.choice(["", "译文", "x" * 35]),
+                        'note': rng.choice(["", "备注"])} for _ in range(count)]
+            return conversion.format_output(entries, format_key).split("\n") if entries else []
+
+        lines = random_lines(initial)
+        incremental = DictionaryStats()
+        incremental.update(lines, format_key)
+        for step in range(150):
+            lines = list(lines)
+            start = rng.randrange(len(lines) + 1)
+            end = min(len(lines), start + rng.randint(0, 4))
+            if format_key == "GalTransl_TSV" or rng.random() < 0.5:
+                lines[start:end] = random_lines(rng.randint(0, 2))
+            else:
+                # 随机修改某一行，可能产生无法解析的记录
+                lines[start:end] = [rng.choice(['{', '}', '  "src": "アリス",', '', 'org = "a"'])]
+            incremental.update(lines, format_key)
+            fresh = DictionaryStats()
+            fresh.update(lines, format_key)
+            with self.subTest(format_key=format_key, step=step):
+                self.assertEqual(incremental.summary(), fresh.summary())
+                if format_key == "GalTransl_TSV":
+                    self.assertEqual(incremental.summary(), self.expected_summary(lines, format_key))
+
+    def test_random_edits_match_fresh_build(self):
+        for format_key in ("GalTransl_TSV", "GPPGUI_TOML", "AiNiee_JSON"):
+            self.random_edits_match_fresh_build(format_key)
+
+    def test_random_edits_with_fake_numpy(self):
+        with mock.patch.object(stats, "np", _FakeNumpy()):
+            # 首次统计与每次重新统计都达到批量计数的条目数
+            self.random_edits_match_fresh_build("GalTransl_TSV", initial=NUMPY_BATCH_MIN + 50)
+
+    def test_unsupported_format(self):
+        with self.assertRaises(ValueError):
+            DictionaryStats().update(["x"], "GDX_Binary")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,207 @@
+"""core.textdiff 的单元测试。"""
+
+import random
+import re
+import unittest
+
+from core.textdiff import (
+    LineHunk, SpanEdit, apply_hunks, coalesce_edits, diff_lines, edit_line_range, map_line,
+)
+
+
+class FakeText:
+    """按 Tk 的规则解析 "行.列"、"end" 与 "+1c"/"-1c" 形式的索引，代替真实的 Text 控件。"""
+
+    def __init__(self, content: str, insert: str = "1.0"):
+        # Text 控件的内容总是以一个换行符结束
+        self.lines = (content + "\n").split("\n")[:-1]
+        self.marks = {"insert": insert}
+
+    def _offset(self, line: int, col: int) -> int:
+        line = max(1, min(line, len(self.lines)))
+        return sum(len(l) + 1 for l in self.lines[:line - 1]) + min(col, len(self.lines[line - 1]))
+
+    def _position(self, offset: int):
+        offset = max(0, min(offset, self._offset(len(self.lines), 0) + len(self.lines[-1])))
+        for i, line in enumerate(self.lines, 1):
+            if offset <= len(line):
+                return i, offset
+            offset -= len(line) + 1
+        return len(self.lines), len(self.lines[-1])
+
+    def line_of(self, index: str) -> int:
+        base, *mods = re.findall(r"[^\s+-]+|[+-]\d+c", index)
+        base = self.marks.get(base, base)
+        if base == "end":
+            # "end" 位于最后一个换行符之后，即行数 + 1 的行首
+            line, offset = len(self.lines) + 1, self._offset(len(self.lines), 0) + len(self.lines[-1]) + 1
+        else:
+            line, col = map(int, base.split("."))
+            offset = self._offset(line, col)
+        for mod in mods:
+            offset += int(mod[:-1])
+            line = None
+        if line is not None:
+            return min(line, len(self.lines) + 1)
+        end = self._offset(len(self.lines), 0) + len(self.lines[-1]) + 1
+        return len(self.lines) + 1 if offset >= end else self._position(offset)[0]
+
+    def range_of(self, *args):
+        return edit_line_range(args, self.line_of, self.line_of("end-1c"))
+
+
+class EditLineRangeTest(unittest.TestCase):
+    def test_insert_touches_one_line(self):
+        text = FakeText("a\nb\nc")
+        self.assertEqual(text.range_of("insert", "2.1", "x\ny"), (2, 2))
+
+    def test_backspace_at_line_start_joins_two_lines(self):
+        text = FakeText("a\nb\nc", insert="2.0")
+        self.assertEqual(text.range_of("delete", "insert-1c"), (1, 2))
+
+    def test_delete_at_line_end_joins_two_lines(self):
+        text = FakeText("abc\ndef")
+        self.assertEqual(text.range_of("delete", "1.3"), (1, 2))
+
+    def test_delete_inside_line_touches_one_line(self):
+        text = FakeText("abc\ndef")
+        self.assertEqual(text.range_of("delete", "2.1"), (2, 2))
+
+    def test_delete_final_newline_is_clamped(self):
+        text = FakeText("abc\ndef")
+        self.assertEqual(text.range_of("delete", "end-1c"), (2, 2))
+
+    def test_delete_range(self):
+        text = FakeText("a\nb\nc\nd")
+        self.assertEqual(text.range_of("delete", "1.0", "3.1"), (1, 3))
+        self.assertEqual(text.range_of("delete", "2.0", "end"), (2, 4))
+
+    def test_replace(self):
+        text = FakeText("a\nb\nc")
+        self.assertEqual(text.range_of("replace", "1.0", "2.1", "x"), (1, 2))
+
+    def test_delete_several_ranges_is_unknown(self):
+        text = FakeText("a\nb\nc")
+        self.assertIsNone(text.range_of("delete", "1.0", "1.1", "3.0", "3.1"))
+
+
+class DiffLinesTest(unittest.TestCase):
+    def test_identical_content_has_no_hunks(self):
+        self.assertEqual(diff_lines(["a", "b"], ["a", "b"]), [])
+
+    def test_changed_inserted_and_deleted_lines(self):
+        old = ["a", "b", "c", "d", "e"]
+        new = ["a", "B", "c", "x", "y", "e"]
+        hunks = diff_lines(old, new)
+        self.assertEqual(hunks, [LineHunk(1, 1, ["B"]), LineHunk(3, 1, ["x", "y"])])
+        self.assertEqual(apply_hunks(old, hunks), new)
+
+    def test_pure_insertion_and_deletion(self):
+        self.assertEqual(diff_lines(["a", "c"], ["a", "b", "c"]), [LineHunk(1, 0, ["b"])])
+        self.assertEqual(diff_lines(["a", "b", "c"], ["a", "c"]), [LineHunk(1, 1, [])])
+
+    def test_apply_hunks_matches_new_content(self):
+        old = [f"line {i}" for i in range(50)]
+        new = old[:10] + ["new"] + old[12:30] + old[31:] + ["tail"]
+        self.assertEqual(apply_hunks(old, diff_lines(old, new)), new)
+
+
+class MapLineTest(unittest.TestCase):
+    def test_lines_before_and_after_hunks(self):
+        hunks = [LineHunk(2, 1, ["x", "y", "z"])]
+        self.assertEqual(map_line(1, hunks), 1)
+        self.assertEqual(map_line(3, hunks), 5)
+
+    def test_line_inside_hunk_stays_inside_new_lines(self):
+        hunks = [LineHunk(2, 3, ["x"])]
+        self.assertEqual(map_line(2, hunks), 2)
+        self.assertEqual(map_line(4, hunks), 2)
+        self.assertEqual(map_line(5, hunks), 3)
+
+    def test_deleted_region_maps_to_its_start(self):
+        hunks = [LineHunk(1, 2, []), LineHunk(5, 0, ["a", "b"])]
+        self.assertEqual(map_line(2, hunks), 1)
+        self.assertEqual(map_line(4, hunks), 2)
+        self.assertEqual(map_line(5, hunks), 5)
+
+
+class LargeDiffTest(unittest.TestCase):
+    def test_same_line_count_is_compared_line_by_line(self):
+        old = ["  {", "a", "  },"] * 10
+        new = ["  {", "b", "  },"] * 10
+        hunks = diff_lines(old, new, max_matcher_lines=5)
+        self.assertEqual(len(hunks), 10)
+        self.assertEqual(hunks[0], LineHunk(1, 1, ["b"]))
+        self.assertEqual(apply_hunks(old, hunks), new)
+
+    def test_different_line_count_becomes_one_hunk(self):
+        old = [str(i) for i in range(20)]
+        new = old[:5] + ["x"] + old[6:10] + old[12:]
+        hunks = diff_lines(old, new, max_matcher_lines=5)
+        self.assertEqual(hunks, [LineHunk(5, 7, new[5:10])])
+        self.assertEqual(apply_hunks(old, hunks), new)
+
+
+def apply_span_edits(content: str, edits) -> str:
+    parts, pos = [], 0
+    for edit in edits:
+        parts += (content[pos:edit.start], edit.text)
+        pos = edit.end
+    parts.append(content[pos:])
+    return "".join(parts)
+
+
+def change_size(edits) -> int:
+    return sum(edit.end - edit.start + len(edit.text) for edit in edits)
+
+
+def merged_extra(edits, merged) -> int:
+    """合并后多保存的间隔字符数（删除与插入的文本中各一份）。"""
+    return change_size(merged) - change_size(edits)
+
+
+class CoalesceEditsTest(unittest.TestCase):
+    def test_nearby_edits_are_merged(self):
+        content = "a-b-c" + "x" * 100 + "d"
+        edits = [SpanEdit(0, 1, "A"), SpanEdit(2, 3, "B"), SpanEdit(105, 106, "D")]
+        merged = coalesce_edits(content, edits, max_gap=4)
+        self.assertEqual(merged, [SpanEdit(0, 3, "A-B"), SpanEdit(105, 106, "D")])
+        self.assertEqual(apply_span_edits(content, merged), apply_span_edits(content, edits))
+
+    def test_result_matches_individual_edits(self):
+        rng = random.Random(0)
+        for _ in range(200):
+            content = "".join(rng.choice("ab\n") for _ in range(rng.randint(0, 200)))
+            edits, pos = [], 0
+            while pos < len(content):
+                start = pos + rng.randint(0, 20)
+                end = min(start + rng.randint(0, 3), len(content))
+                if start > len(content):
+                    break
+                edits.append(SpanEdit(start, end, "x" * rng.randint(0, 3)))
+                pos = end + 1
+            merged = coalesce_edits(content, edits, max_gap=rng.randint(0, 10), max_edits=rng.randint(1, 5))
+            self.assertEqual(apply_span_edits(content, merged), apply_span_edits(content, edits))
+
+    def test_dense_replace_all_keeps_merged_spans_small(self):
+        # 大文档中每隔约 1000 字符替换一个字符，且匹配处远多于 max_edits
+        content = ("x" * 999 + "a") * 5000
+        edits = [SpanEdit(i * 1000 + 999, i * 1000 + 1000, "b") for i in range(5000)]
+        merged = coalesce_edits(content, edits, max_edits=100)
+        self.assertEqual(apply_span_edits(content, merged), apply_span_edits(content, edits))
+        self.assertLessEqual(merged_extra(edits, merged), change_size(edits))
+        self.assertLess(sum(edit.end - edit.start for edit in merged), len(content) // 100)
+
+    def test_extra_merging_stops_within_budget(self):
+        content = "x" * 10_000
+        # 间隔各不相同：合并时应优先合并间隔最小的
+        starts = [0, 10, 30, 1000, 5000, 9000]
+        edits = [SpanEdit(s, s + 5, "yyyyy") for s in starts]
+        merged = coalesce_edits(content, edits, max_gap=0, max_edits=1)
+        self.assertEqual(merged[0], SpanEdit(0, 35, "yyyyy" + "x" * 5 + "yyyyy" + "x" * 15 + "yyyyy"))
+        self.assertLessEqual(merged_extra(edits, merged), change_size(edits))
+        self.assertEqual(apply_span_edits(content, merged), apply_span_edits(content, edits))
+
+
+if __name__ == "__main__":
+    unittest.main()
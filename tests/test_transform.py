@@ -0,0 +1,95 @@
+"""core.transform 的单元测试。"""
+
+import locale
+import os
+import random
+import tempfile
+import unittest
+
+from core import transform
+from core.transform import (DEDUPE_EXACT, DEDUPE_FOLDED, DEDUPE_KANA, SORT_KEYS, TransformOptions,
+                            iter_transform, transform_entries)
+
+
+def random_entries(count, seed):
+    rng = random.Random(seed)
+    words = ["アリス", "ありす", "ｱﾘｽ", "Alice", "ALICE", "ボブ", "ぼぶ", "b", "B", "", " 空白 ", "ＡＢＣ", "abc"]
+    return [
+        {'org': rng.choice(words) + rng.choice(["", "x", "ス"]), 'rep': str(i), 'note': rng.choice(["", " 备注 "])}
+        for i in range(count)
+    ]
+
+
+class IterTransformTest(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def check(self, entries, options, run_sizes=(1, 2, 3, 7, 50)):
+        expected = transform_entries(entries, options)
+        for run_size in run_sizes:
+            with self.subTest(run_size=run_size):
+                result = list(iter_transform(iter(entries), options, run_size=run_size, temp_dir=self._tmp.name))
+                self.assertEqual(result, expected)
+
+    def test_matches_in_memory_transform(self):
+        entries = random_entries(40, seed=1)
+        for sort in [None, *SORT_KEYS]:
+            for dedupe in (None, DEDUPE_EXACT, DEDUPE_FOLDED, DEDUPE_KANA):
+                for reverse in (False, True):
+                    options = TransformOptions(sort=sort, reverse=reverse, dedupe=dedupe, trim=True)
+                    with self.subTest(sort=sort, dedupe=dedupe, reverse=reverse):
+                        self.check(entries, options)
+
+    def test_sort_is_stable(self):
+        entries = [{'org': org, 'rep': str(i), 'note': ''} for i, org in enumerate("bab a ab".split(" "))]
+        for reverse in (False, True):
+            result = list(iter_transform(entries, TransformOptions(sort="length", reverse=reverse),
+                                         run_size=2, temp_dir=self._tmp.name))
+            lengths = [len(item['org']) for item in result]
+            self.assertEqual(lengths, sorted(lengths, reverse=reverse))
+            for length in set(lengths):
+                reps = [item['rep'] for item in result if len(item['org']) == length]
+                self.assertEqual(reps, sorted(reps, key=int))
+
+    def test_dedupe_keeps_first_occurrence(self):
+        entries = [{'org': "ｱﾘｽ", 'rep': "1", 'note': ''}, {'org': "アリス", 'rep': "2", 'note': ''},
+                   {'org': "ありす", 'rep': "3", 'note': ''}]
+        self.check(entries, TransformOptions(dedupe=DEDUPE_FOLDED), run_sizes=(1, 2))
+        self.assertEqual([item['rep'] for item in transform_entries(entries, TransformOptions(dedupe=DEDUPE_KANA))],
+                         ["1"])
+
+    def test_identity_streams_without_temp_files(self):
+        entries = random_entries(10, seed=2)
+        self.assertEqual(list(iter_transform(entries, TransformOptions(), run_size=1)), entries)
+
+    def test_temp_files_are_removed(self):
+        entries = random_entries(30, seed=3)
+        list(iter_transform(entries, TransformOptions(sort="org", dedupe=DEDUPE_EXACT), run_size=4,
+                            temp_dir=self._tmp.name))
+        self.assertEqual(os.listdir(self._tmp.name), [])
+
+
+class LocaleSortTest(unittest.TestCase):
+    def test_sort_key_does_not_change_process_locale(self):
+        before = locale.setlocale(locale.LC_COLLATE)
+        entries = random_entries(20, seed=4)
+        transform_entries(entries, TransformOptions(sort="locale"))
+        list(iter_transform(entries, TransformOptions(sort="locale"), run_size=3))
+        self.assertEqual(locale.setlocale(locale.LC_COLLATE), before)
+
+    def test_use_system_collation(self):
+        before = locale.setlocale(locale.LC_COLLATE)
+        try:
+            transform.use_system_collation()
+            entries = random_entries(20, seed=5)
+            options = TransformOptions(sort="locale")
+            self.assertEqual(list(iter_transform(entries, options, run_size=3)), transform_entries(entries, options))
+        finally:
+            locale.setlocale(locale.LC_COLLATE, before)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -4,9 +4,87 @@
 """
 
 import tkinter as tk
+from array import array
+from bisect import bisect_right
+from typing import List, Optional
+
 import ttkbootstrap as ttk
 from ttkbootstrap.constants import *
 
+from core import conversion
+from core.textdiff import diff_lines, edit_line_range, map_line
+
+
+def line_start_offsets(text: str) -> array:
+    """返回 text 中每一行第一个字符的偏移，第 i 个元素对应第 i + 1 行。"""
+    starts = array('q', [0])
+    pos = text.find("\n")
+    while pos != -1:
+        starts.append(pos + 1)
+        pos = text.find("\n", pos + 1)
+    return starts
+
+
+class DocumentModel:
+    """
+    编辑器内容的缓存模型。
+
+    每次修改内容时版本号加一；内容字符串、按行拆分的列表、行首偏移表和自动检测的格式
+    都按版本缓存，同一版本内多次读取只需从 Tk 复制一次全文。
+    """
+    def __init__(self, editor: "EditorWithLineNumbers"):
+        self.editor = editor
+        self.version = 0
+        self._content_version = -1
+        self._content = ""
+        # 其余缓存项: 名称 -> (版本号, 值)
+        self._derived = {}
+
+    def invalidate(self, *args):
+        """内容已改变，使所有缓存失效。可直接作为内容变化监听器注册。"""
+        self.version += 1
+
+    @property
+    def content(self) -> str:
+        """编辑器的全部内容。"""
+        if self._content_version != self.version:
+            self._content = self.editor.text.get("1.0", "end-1c")
+            self._content_version = self.version
+        return self._content
+
+    def _cached(self, name: str, compute):
+        cached = self._derived.get(name)
+        if cached is not None and cached[0] == self.version:
+            return cached[1]
+        value = compute()
+        self._derived[name] = (self.version, value)
+        return value
+
+    @property
+    def lines(self) -> List[str]:
+        """按换行符拆分的各行内容（不可修改）。"""
+        return self._cached("lines", lambda: self.content.split("\n"))
+
+    @property
+    def line_starts(self) -> array:
+        """每一行第一个字符在 content 中的偏移，第 i 个元素对应第 i + 1 行。"""
+        return self._cached("line_starts", lambda: line_start_offsets(self.content))
+
+    def offset_to_index(self, offset: int) -> str:
+        """将 content 中的字符偏移转换为 Tk 的 "行.列" 索引。"""
+        line = bisect_right(self.line_starts, offset)
+        return f"{line}.{offset - self.line_starts[line - 1]}"
+
+    def index_to_offset(self, line: int, col: int = 0) -> int:
+        """将行号（从 1 开始）与列号转换为 content 中的字符偏移。"""
+        return self.line_starts[line - 1] + col
+
+    @property
+    def detected_format(self) -> Optional[str]:
+        """自动检测到的内容格式的显示名称，无法识别时为 None。"""
+        return self._cached("format", lambda: conversion.detect_format(self.content))
+
+
 class EditorWithLineNumbers(tk.Frame):
     """
     一个组合了文本框、行号画布和滚动条的自定义Tkinter控件。
@@ -55,6 +133,14 @@ class EditorWithLineNumbers(tk.Frame):
         self._redraw_job = None
         self.is_modified_flag = False
 
+        # 内容变化监听器，见 add_change_listener
+        self._change_listeners = []
+        self._orig_command = None
+
+        # 内容缓存须最先得知修改，其他监听器读取内容时才不会拿到旧版本
+        self.model = DocumentModel(self)
+        self.add_change_listener(self.model.invalidate)
+
     def on_text_scroll(self, first, last):
         """当文本框滚动时，同步滚动条和行号。"""
         self.vbar.set(first, last)
@@ -75,6 +161,7 @@ class EditorWithLineNumbers(tk.Frame):
         """
         if self.text.edit_modified():
             self.is_modified_flag = True
+            self.model.invalidate()
             # 必须重置标记，否则<<Modified>>事件不会再次触发
             self.text.edit_modified(False)
 
@@ -115,9 +202,72 @@ class EditorWithLineNumbers(tk.Frame):
             # 在某些边缘情况下（如文本框被清空时），可能会发生TclError，安全地忽略它
             pass
 
+    # -------------------------------------------------------------
+    # 内容变化通知
+    # -------------------------------------------------------------
+    def add_change_listener(self, callback):
+        """
+        注册内容变化监听器。每次插入、删除或替换文本后调用
+        callback(起始行, 原行数, 新行数)：表示从起始行（从 1 开始）起的原行数行被替换为新行数行。
+        撤销/重做无法得知具体范围，此时调用 callback(None, None, None)，表示需要整体刷新。
+
+        首次注册时，会将内部 Text 控件的 Tcl 命令替换为一个代理，
+        从而捕获所有来源（键盘输入、粘贴、程序调用）的修改。
+        """
+        if self._orig_command is None:
+            widget_command = self.text._w
+            self._orig_command = widget_command + "_orig"
+            self.tk.call("rename", widget_command, self._orig_command)
+            self.tk.createcommand(widget_command, self._dispatch_widget_command)
+            self.text.bind("<Destroy>", self._remove_proxy, add="+")
+        self._change_listeners.append(callback)
+
+    def remove_change_listener(self, callback):
+        """注销 add_change_listener 注册的监听器；未注册时忽略。"""
+        if callback in self._change_listeners:
+            self._change_listeners.remove(callback)
+
+    def _remove_proxy(self, event=None):
+        if event is not None and event.widget is not self.text:
+            return
+        try:
+            self.tk.deletecommand(self.text._w)
+        except tk.TclError:
+            pass
+
+    def _dispatch_widget_command(self, *args):
+        """Text 控件命令的代理：先执行原命令，再把修改的行范围通知监听器。"""
+        orig = self._orig_command
+        operation = args[0] if args else ""
+        if operation not in ("insert", "delete", "replace"):
+            result = self.tk.call((orig,) + args)
+            if operation == "edit" and len(args) > 1 and args[1] in ("undo", "redo"):
+                self._notify_change(None, None, None)
+            return result
+
+        def line_of(index):
+            return int(self.tk.call(orig, "index", index).split(".")[0])
+
+        lines_before = line_of("end-1c")
+        line_range = edit_line_range(args, line_of, lines_before)
+
+        result = self.tk.call((orig,) + args)
+        if line_range is None:
+            # 一次删除多个范围，直接整体刷新
+            self._notify_change(None, None, None)
+        else:
+            first, last = line_range
+            old_count = last - first + 1
+            self._notify_change(first, old_count, old_count + line_of("end-1c") - lines_before)
+        return result
+
+    def _notify_change(self, start_line, old_count, new_count):
+        for callback in self._change_listeners:
+            callback(start_line, old_count, new_count)
+
     def get_content(self) -> str:
-        """获取文本框的全部内容。"""
-        return self.text.get("1.0", "end-1c")
+        """获取文本框的全部内容。内容未修改时直接返回缓存，不再从 Tk 复制。"""
+        return self.model.content
 
     def set_content(self, content: str, reset_modified_flag: bool = True):
         """
@@ -139,6 +289,131 @@ class EditorWithLineNumbers(tk.Frame):
             
         if is_disabled: self.text.config(state=tk.DISABLED)
 
+    def patch_content(self, content: str, reset_modified_flag: bool = True) -> list:
+        """
+        将文本框的内容修改为 content，但只替换发生变化的行。
+        与 set_content 不同，未变化部分的标签、光标与滚动位置都保持不变，
+        Tk 也无需重建整个文本；适合新旧内容大部分相同的情况。
+
+        Args:
+            content: 新的文本内容。
+            reset_modified_flag: 如果为True，则清除撤销历史和修改标记。
+
+        Returns:
+            受影响的 (起始行, 结束行) 列表，行号从 1 开始且包含结束行。
+        """
+        hunks = diff_lines(self.model.lines, content.split("\n"))
+        changed_ranges = self.apply_line_hunks(hunks)
+        if reset_modified_flag:
+            self.text.edit_reset()
+            self.is_modified_flag = False
+        return changed_ranges
+
+    def apply_line_hunks(self, hunks) -> list:
+        """
+        按行替换块修改内容，而不是整体替换。
+        未变化部分的标签、光标位置与滚动位置都保持不变。
+
+        Args:
+            hunks: core.textdiff.diff_lines 返回的替换块列表（行号从 0 开始）。
+
+        Returns:
+            修改后内容中受影响的 (起始行, 结束行) 列表，行号从 1 开始且包含结束行。
+        """
+        if not hunks:
+            return []
+        is_disabled = self.text.cget("state") == tk.DISABLED
+        if is_disabled: self.text.config(state=tk.NORMAL)
+
+        top_line = int(self.text.index("@0,0").split(".")[0]) - 1
+        xview = self.text.xview()[0]
+
+        # 从后往前修改，前面替换块的行号不受影响；所有修改作为一步撤销
+        self._begin_undo_group()
+        for hunk in reversed(hunks):
+            first = hunk.start + 1
+            line_count = int(self.text.index("end-1c").split(".")[0])
+            new_text = "\n".join(hunk.new_lines)
+            if hunk.old_count and hunk.new_lines:
+                self.text.replace(f"{first}.0", f"{first + hunk.old_count - 1}.end", new_text)
+            elif hunk.new_lines:
+                if first <= line_count:
+                    self.text.insert(f"{first}.0", new_text + "\n")
+                else:
+                    self.text.insert("end-1c", "\n" + new_text)
+            elif first + hunk.old_count <= line_count:
+                self.text.delete(f"{first}.0", f"{first + hunk.old_count}.0")
+            else:
+                # 删除到末尾时连同前一行的换行符一起删除
+                self.text.delete(f"{first - 1}.end", "end-1c")
+        self._end_undo_group()
+
+        self.text.yview(f"{map_line(top_line, hunks) + 1}.0")
+        self.text.xview_moveto(xview)
+        if is_disabled: self.text.config(state=tk.DISABLED)
+
+        ranges = []
+        offset = 0
+        for hunk in hunks:
+            start = hunk.start + offset + 1
+            ranges.append((start, start + max(len(hunk.new_lines), 1) - 1))
+            offset += len(hunk.new_lines) - hunk.old_count
+        return ranges
+
+    def apply_span_edits(self, edits, content: str | None = None) -> list:
+        """
+        按字符区间替换文本，所有替换作为一步撤销。
+        撤销记录中只保存每个区间被删除和插入的文本，内存占用与修改量成正比，而与文档大小无关。
+
+        Args:
+            edits: core.textdiff.SpanEdit 的列表，按 start 升序排列且互不重叠，偏移相对于当前内容。
+            content: 编辑时所依据的内容，默认为文本框的当前内容。
+
+        Returns:
+            修改后内容中受影响的 (起始行, 结束行) 列表，行号从 1 开始且包含结束行。
+        """
+        if not edits:
+            return []
+        if content is None or content is self.model.content:
+            # 行首偏移表按版本缓存，换算索引时无需扫描原文
+            line_starts = self.model.line_starts
+        else:
+            line_starts = line_start_offsets(content)
+
+        spans = []
+        for edit in edits:
+            index_pair = []
+            for offset in (edit.start, edit.end):
+                line = bisect_right(line_starts, offset)
+                index_pair.append((line, offset - line_starts[line - 1]))
+            spans.append((index_pair[0], index_pair[1], edit.text))
+
+        is_disabled = self.text.cget("state") == tk.DISABLED
+        if is_disabled: self.text.config(state=tk.NORMAL)
+        self._begin_undo_group()
+        for (start_line, start_col), (end_line, end_col), text in reversed(spans):
+            self.text.replace(f"{start_line}.{start_col}", f"{end_line}.{end_col}", text)
+        self._end_undo_group()
+        if is_disabled: self.text.config(state=tk.DISABLED)
+
+        ranges = []
+        offset = 0
+        for (start_line, _), (end_line, _), text in spans:
+            first = start_line + offset
+            ranges.append((first, first + text.count("\n")))
+            offset += text.count("\n") - (end_line - start_line)
+        return ranges
+
+    def _begin_undo_group(self):
+        # 关闭自动分隔，使接下来的多次修改在撤销栈中合并为一步
+        self._autoseparators = self.text.cget("autoseparators")
+        self.text.config(autoseparators=False)
+        self.text.edit_separator()
+
+    def _end_undo_group(self):
+        self.text.edit_separator()
+        self.text.config(autoseparators=self._autoseparators)
+
     def clear(self):
         """清空文本框内容并重置修改状态。"""
         self.set_content("", reset_modified_flag=True)
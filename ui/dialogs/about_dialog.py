@@ -1,9 +1,13 @@
 import tkinter as tk
 import tkinter.font as tkFont
-import webbrowser
 import ttkbootstrap as ttk
 from ttkbootstrap.constants import *
 
+def _open_url(url):
+    """在默认浏览器中打开链接。webbrowser 仅在点击时才导入。"""
+    import webbrowser
+    webbrowser.open_new(url)
+
 def show_about_dialog(parent, app_version):
     """显示“关于”对话框。"""
     about_win = ttk.Toplevel(parent)
@@ -25,18 +29,18 @@ def show_about_dialog(parent, app_version):
     ttk.Label(author_frame, text="作者: ").pack(side=LEFT)
     author_link = ttk.Label(author_frame, text="natsumerinchan", foreground="blue", cursor="hand2", font=link_font)
     author_link.pack(side=LEFT)
-    author_link.bind("<Button-1>", lambda e: webbrowser.open_new("https://github.com/natsumerinchan"))
+    author_link.bind("<Button-1>", lambda e: _open_url("https://github.com/natsumerinchan"))
     
     license_frame = ttk.Frame(main_frame)
     license_frame.pack(pady=2)
     ttk.Label(license_frame, text="开源许可证: ").pack(side=LEFT)
     license_link = ttk.Label(license_frame, text="MIT License", foreground="blue", cursor="hand2", font=link_font)
     license_link.pack(side=LEFT)
-    license_link.bind("<Button-1>", lambda e: webbrowser.open_new("https://github.com/natsumerinchan/GPTDictEditor/blob/master/LICENSE"))
+    license_link.bind("<Button-1>", lambda e: _open_url("https://github.com/natsumerinchan/GPTDictEditor/blob/master/LICENSE"))
     
     repo_link = ttk.Label(main_frame, text="https://github.com/natsumerinchan/GPTDictEditor", foreground="blue", cursor="hand2", font=link_font)
     repo_link.pack(pady=10)
-    repo_link.bind("<Button-1>", lambda e: webbrowser.open_new("https://github.com/natsumerinchan/GPTDictEditor"))
+    repo_link.bind("<Button-1>", lambda e: _open_url("https://github.com/natsumerinchan/GPTDictEditor"))
     
     ttk.Button(main_frame, text="确定", command=about_win.destroy, bootstyle="primary").pack(pady=15)
     
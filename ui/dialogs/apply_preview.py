@@ -0,0 +1,259 @@
+"""
+该模块定义了 ApplyPreviewDialog 类，
+提供一个将当前字典作为 org→rep 替换规则应用到示例脚本文本上、并预览替换结果的对话框。
+"""
+
+import threading
+import time
+import tkinter as tk
+import ttkbootstrap as ttk
+from ttkbootstrap.constants import *
+from bisect import bisect_right
+from tkinter import filedialog, messagebox
+from pathlib import Path
+
+from core import matcher
+from core.scripts import read_script_file
+from utils.tracing import span
+
+# 结果框中最多显示的字符数与命中标记数，超出部分只参与统计和保存
+RESULT_PREVIEW_CHARS = 2_000_000
+MAX_HIT_MARKERS = 20_000
+# 载入的脚本文件超过该长度时，左侧只显示开头部分
+SCRIPT_PREVIEW_CHARS = 1_000_000
+# 脚本超过该长度时使用多进程并行处理
+PARALLEL_THRESHOLD_CHARS = 8_000_000
+
+
+class ApplyPreviewDialog(ttk.Toplevel):
+    """
+    应用字典预览窗口。
+    左侧为脚本文本（可直接粘贴或从文件载入），右侧为替换后的结果，命中处以背景色标记。
+    """
+    def __init__(self, master, app_instance):
+        """
+        初始化应用字典预览对话框。
+
+        Args:
+            master: 父控件 (主窗口)。
+            app_instance: 主应用程序的实例。
+        """
+        super().__init__(master)
+        self.app = app_instance
+
+        self.transient(master)
+        self.title("应用字典预览")
+        self.geometry("1000x600")
+
+        # 从文件载入的完整脚本；左侧文本被编辑后以编辑后的内容为准
+        self.loaded_script = None
+        self.loaded_path = None
+        # 完整的替换结果，用于保存
+        self.result_text = None
+        # 由条目列表构建的字典树，条目列表未变时复用
+        self._trie_source = None
+        self._trie = None
+        self._running = False
+        self._job_result = None
+        self._started = 0.0
+
+        self.create_widgets()
+        self.protocol("WM_DELETE_WINDOW", self.destroy)
+
+    def create_widgets(self):
+        """创建并布局对话框中的所有UI组件。"""
+        main_frame = ttk.Frame(self, padding="10")
+        main_frame.pack(expand=True, fill=BOTH)
+
+        btn_frame = ttk.Frame(main_frame)
+        btn_frame.pack(fill=X, pady=(0, 5))
+        ttk.Button(btn_frame, text="载入脚本文件...", command=self.load_script, bootstyle="secondary").pack(side=LEFT)
+        self.apply_button = ttk.Button(btn_frame, text="应用字典", command=self.run_apply, bootstyle="primary")
+        self.apply_button.pack(side=LEFT, padx=5)
+        ttk.Button(btn_frame, text="保存结果...", command=self.save_result, bootstyle="success").pack(side=LEFT)
+        self.stats_label = ttk.Label(btn_frame, text="粘贴或载入脚本文本后点击“应用字典”")
+        self.stats_label.pack(side=LEFT, padx=10)
+
+        panes = ttk.PanedWindow(main_frame, orient=HORIZONTAL)
+        panes.pack(expand=True, fill=BOTH)
+        self.script_box = self._create_text_pane(panes, "脚本文本")
+        self.result_box = self._create_text_pane(panes, "替换结果")
+        self.result_box.tag_configure("hit", background="#fff2a8")
+        self.result_box.config(state=DISABLED)
+
+
+    def _create_text_pane(self, panes, title: str) -> tk.Text:
+        frame = ttk.Labelframe(panes, text=title, padding=5)
+        panes.add(frame, weight=1)
+        text = tk.Text(frame, wrap=NONE, undo=True, font=("黑体", 10))
+        vbar = ttk.Scrollbar(frame, orient=VERTICAL, command=text.yview)
+        hbar = ttk.Scrollbar(frame, orient=HORIZONTAL, command=text.xview)
+        text.config(yscrollcommand=vbar.set, xscrollcommand=hbar.set)
+        vbar.pack(side=RIGHT, fill=Y)
+        hbar.pack(side=BOTTOM, fill=X)
+        text.pack(expand=True, fill=BOTH)
+        return text
+
+    # -------------------------------------------------------------
+    # 载入与应用
+    # -------------------------------------------------------------
+    def load_script(self):
+        """从文件载入脚本文本。大文件只在左侧显示开头部分，但会完整参与替换。"""
+        path = filedialog.askopenfilename(
+            parent=self,
+            title="选择脚本文件",
+            initialdir=self.app.last_directory,
+            filetypes=[("文本文件", "*.txt;*.ks;*.json;*.scn;*.csv"), ("所有文件", "*.*")]
+        )
+        if not path:
+            return
+        try:
+            script = read_script_file(path)
+        except OSError as e:
+            messagebox.showerror("载入失败", str(e), parent=self)
+            return
+
+        self.script_box.delete("1.0", END)
+        self.script_box.insert("1.0", script[:SCRIPT_PREVIEW_CHARS])
+        self.script_box.edit_reset()
+
+        self.loaded_script = script
+        self.loaded_path = path
+        truncated = "（左侧仅显示开头部分，编辑后将以显示内容为准）" if len(script) > SCRIPT_PREVIEW_CHARS else ""
+        self.stats_label.config(text=f"已载入 {Path(path).name}，{len(script):,} 字符{truncated}")
+
+    def _get_trie(self, entries) -> matcher.KeywordTrie:
+        # 输入内容未变时 parse_input_entries 返回同一个列表对象，此时无需重建字典树
+        if self._trie_source is not entries:
+            with span("构建字典树"):
+                self._trie = matcher.KeywordTrie(item['org'] for item in entries)
+            self._trie_source = entries
+        return self._trie
+
+    def run_apply(self):
+        """解析当前输入框中的字典，并在后台线程中将其应用到脚本文本上。"""
+        if self._running:
+            return
+        content = self.app.input_text.get_content()
+        format_key = self.app.resolve_input_format_key()
+        if not content.strip() or not format_key:
+            messagebox.showwarning("警告", "输入框中没有字典，或无法识别其格式。", parent=self)
+            return
+        try:
+            entries = self.app.parse_input_entries(content, format_key)
+        except Exception as e:
+            messagebox.showerror("解析失败", str(e), parent=self)
+            return
+
+        script = self.script_box.get("1.0", "end-1c")
+        # 左侧显示的内容未被编辑时，使用载入的完整脚本
+        if self.loaded_script is not None and script == self.loaded_script[:SCRIPT_PREVIEW_CHARS]:
+            script = self.loaded_script
+        if not script:
+            messagebox.showwarning("警告", "脚本文本为空。", parent=self)
+            return
+
+        parallel = len(script) >= PARALLEL_THRESHOLD_CHARS
+        trie = None if parallel else self._get_trie(entries)
+
+        def worker():
+            try:
+                with span("应用字典"):
+                    if parallel:
+                        result = matcher.apply_entries_parallel(script, entries)
+                    else:
+                        result = matcher.apply_entries(script, entries, trie)
+                self._job_result = (result, None)
+            except Exception as e:
+                self._job_result = (None, e)
+
+        self._running = True
+        self._job_result = None
+        self.apply_button.config(state=DISABLED)
+        self.stats_label.config(text=f"正在应用 {len(entries):,} 个条目...")
+        self._started = time.perf_counter()
+        threading.Thread(target=worker, daemon=True).start()
+        self.after(50, lambda: self._poll_job(entries, len(script)))
+
+    def _poll_job(self, entries, script_len: int):
+        """等待后台任务完成后在主线程中显示结果。"""
+        if not self.winfo_exists():
+            return
+        if self._job_result is None:
+            self.after(50, lambda: self._poll_job(entries, script_len))
+            return
+        self._running = False
+        self.apply_button.config(state=NORMAL)
+        result, error = self._job_result
+        self._job_result = None
+        if error is not None:
+            messagebox.showerror("应用失败", str(error), parent=self)
+            self.stats_label.config(text="应用失败")
+            return
+
+        elapsed = time.perf_counter() - self._started
+        new_text, hits = result
+        self.result_text = new_text
+        with span("写入控件"):
+            self._show_result(new_text, hits)
+
+        matched_entries = len({i for _, _, i in hits})
+        truncated = "，结果框仅显示开头部分" if len(new_text) > RESULT_PREVIEW_CHARS else ""
+        self.stats_label.config(
+            text=f"脚本 {script_len:,} 字符，命中 {len(hits):,} 处，涉及 {matched_entries:,}/{len(entries):,} 个条目，"
+                 f"用时 {elapsed:.2f} 秒{truncated}"
+        )
+
+    def _show_result(self, new_text: str, hits):
+        """将结果写入右侧文本框并标记命中位置。"""
+        shown = new_text[:RESULT_PREVIEW_CHARS]
+        box = self.result_box
+        box.config(state=NORMAL)
+        box.delete("1.0", END)
+        box.insert("1.0", shown)
+
+        # 将字符偏移换算为 “行.列” 索引，避免 Tk 从文本开头逐字符计数
+        line_starts = [0]
+        pos = shown.find("\n")
+        while pos != -1:
+            line_starts.append(pos + 1)
+            pos = shown.find("\n", pos + 1)
+
+        def to_index(offset: int) -> str:
+            line = bisect_right(line_starts, offset)
+            return f"{line}.{offset - line_starts[line - 1]}"
+
+        ranges = []
+        for start, end, _ in hits:
+            if end > len(shown) or len(ranges) >= 2 * MAX_HIT_MARKERS:
+                break
+            if end > start:
+                ranges.append(to_index(start))
+                ranges.append(to_index(end))
+        if ranges:
+            box.tag_add("hit", *ranges)
+        box.config(state=DISABLED)
+
+    def save_result(self):
+        """将完整的替换结果保存为 UTF-8 文本文件。"""
+        if self.result_text is None:
+            messagebox.showinfo("提示", "请先应用字典。", parent=self)
+            return
+        initialfile = f"{Path(self.loaded_path).stem}_applied.txt" if self.loaded_path else "applied.txt"
+        path = filedialog.asksaveasfilename(
+            parent=self,
+            title="保存替换结果",
+            initialdir=self.app.last_directory,
+            initialfile=initialfile,
+            defaultextension=".txt",
+            filetypes=[("文本文件", "*.txt"), ("所有文件", "*.*")]
+        )
+        if not path:
+            return
+        try:
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(self.result_text)
+        except OSError as e:
+            messagebox.showerror("保存失败", str(e), parent=self)
+            return
+        self.app.status_var.set(f"替换结果已保存: {Path(path).name}")
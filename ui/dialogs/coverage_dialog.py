@@ -0,0 +1,294 @@
+"""
+该模块定义了 CoverageDialog 类，
+提供统计字典条目在游戏脚本目录中出现次数的对话框，结果可排序、筛选和导出。
+"""
+
+import threading
+import time
+import tkinter as tk
+import ttkbootstrap as ttk
+from ttkbootstrap.constants import *
+from tkinter import filedialog, messagebox
+from pathlib import Path
+
+from constants import FORMAT_DEFINITIONS
+from core import conversion, coverage
+from core.scripts import DEFAULT_SCRIPT_EXTENSIONS, iter_script_files, parse_extensions
+from utils.tracing import span
+
+# 表格中最多显示的行数，超出部分只参与排序、筛选和导出
+MAX_TABLE_ROWS = 5000
+FILTER_OPTIONS = ("全部条目", "仅已出现", "仅未出现")
+
+
+class CoverageDialog(ttk.Toplevel):
+    """
+    覆盖率统计窗口。
+    在后台统计当前输入字典的每个条目在所选目录脚本中的出现次数与出现文件数。
+    """
+    def __init__(self, master, app_instance):
+        """
+        初始化覆盖率统计对话框。
+
+        Args:
+            master: 父控件 (主窗口)。
+            app_instance: 主应用程序的实例。
+        """
+        super().__init__(master)
+        self.app = app_instance
+
+        self.transient(master)
+        self.title("覆盖率统计")
+        self.geometry("900x600")
+
+        self.entries = None
+        self.result = None
+        # 当前排序方式 (列名, 是否降序)
+        self.sort_key = ("count", True)
+        self._running = False
+        self._cancel_requested = False
+        self._progress = (0, 0)
+        self._job_result = None
+        self._started = 0.0
+        self._elapsed = 0.0
+
+        self.create_widgets()
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
+
+    def create_widgets(self):
+        """创建并布局对话框中的所有UI组件。"""
+        main_frame = ttk.Frame(self, padding="10")
+        main_frame.pack(expand=True, fill=BOTH)
+
+        dir_frame = ttk.Frame(main_frame)
+        dir_frame.pack(fill=X)
+        ttk.Label(dir_frame, text="脚本目录:").pack(side=LEFT)
+        self.dir_entry = ttk.Entry(dir_frame)
+        self.dir_entry.pack(side=LEFT, expand=True, fill=X, padx=5)
+        ttk.Button(dir_frame, text="浏览...", command=self.choose_directory, bootstyle="secondary").pack(side=LEFT)
+
+        ext_frame = ttk.Frame(main_frame)
+        ext_frame.pack(fill=X, pady=5)
+        ttk.Label(ext_frame, text="扩展名:").pack(side=LEFT)
+        self.ext_entry = ttk.Entry(ext_frame)
+        self.ext_entry.insert(0, "; ".join(DEFAULT_SCRIPT_EXTENSIONS))
+        self.ext_entry.pack(side=LEFT, expand=True, fill=X, padx=5)
+        self.run_button = ttk.Button(ext_frame, text="开始统计", command=self.run, bootstyle="primary")
+        self.run_button.pack(side=LEFT)
+
+        self.progress = ttk.Progressbar(main_frame, mode="determinate")
+        self.progress.pack(fill=X, pady=(0, 5))
+
+        filter_frame = ttk.Frame(main_frame)
+        filter_frame.pack(fill=X)
+        ttk.Label(filter_frame, text="显示:").pack(side=LEFT)
+        self.filter_var = tk.StringVar(value=FILTER_OPTIONS[0])
+        filter_box = ttk.Combobox(filter_frame, textvariable=self.filter_var, values=FILTER_OPTIONS, state="readonly", width=10)
+        filter_box.pack(side=LEFT, padx=5)
+        filter_box.bind("<<ComboboxSelected>>", lambda e: self.refresh_table())
+        self.stats_label = ttk.Label(filter_frame, text="")
+        self.stats_label.pack(side=LEFT, padx=10)
+
+        table_frame = ttk.Frame(main_frame)
+        table_frame.pack(expand=True, fill=BOTH, pady=5)
+        columns = (("org", "原文", 220), ("rep", "译文", 220), ("count", "出现次数", 90), ("files", "出现文件数", 90), ("note", "备注", 200))
+        self.tree = ttk.Treeview(table_frame, columns=[c[0] for c in columns], show="headings")
+        for col, title, width in columns:
+            self.tree.heading(col, text=title, command=lambda c=col: self.sort_by(c))
+            self.tree.column(col, width=width, anchor=E if col in ("count", "files") else W)
+        vbar = ttk.Scrollbar(table_frame, orient=VERTICAL, command=self.tree.yview)
+        self.tree.configure(yscrollcommand=vbar.set)
+        self.tree.pack(side=LEFT, expand=True, fill=BOTH)
+        vbar.pack(side=RIGHT, fill=Y)
+
+        btn_frame = ttk.Frame(main_frame)
+        btn_frame.pack(fill=X)
+        ttk.Button(btn_frame, text="导出（次数写入备注）...", command=self.export, bootstyle="success").pack(side=LEFT)
+        ttk.Button(btn_frame, text="将筛选结果载入输入框", command=self.load_filtered_to_input, bootstyle="warning").pack(side=RIGHT)
+
+    def choose_directory(self):
+        directory = filedialog.askdirectory(parent=self, title="选择脚本目录", initialdir=self.app.last_directory)
+        if directory:
+            self.dir_entry.delete(0, END)
+            self.dir_entry.insert(0, directory)
+
+    def on_close(self):
+        # 后台任务在处理完当前文件后停止
+        self._cancel_requested = True
+        self.destroy()
+
+    # -------------------------------------------------------------
+    # 统计
+    # -------------------------------------------------------------
+    def run(self):
+        """解析当前输入字典，并在后台线程中统计所选目录下脚本的覆盖率。"""
+        if self._running:
+            self._cancel_requested = True
+            return
+        directory = self.dir_entry.get().strip()
+        if not directory or not Path(directory).is_dir():
+            messagebox.showwarning("警告", "请选择有效的脚本目录。", parent=self)
+            return
+        content = self.app.input_text.get_content()
+        format_key = self.app.resolve_input_format_key()
+        if not content.strip() or not format_key:
+            messagebox.showwarning("警告", "输入框中没有字典，或无法识别其格式。", parent=self)
+            return
+        try:
+            entries = self.app.parse_input_entries(content, format_key)
+        except Exception as e:
+            messagebox.showerror("解析失败", str(e), parent=self)
+            return
+
+        paths = list(iter_script_files(directory, parse_extensions(self.ext_entry.get())))
+        if not paths:
+            messagebox.showinfo("提示", "所选目录中没有匹配的脚本文件。", parent=self)
+            return
+
+        def report(done, total):
+            self._progress = (done, total)
+
+        def worker():
+            try:
+                with span("覆盖率统计"):
+                    result = coverage.count_coverage(entries, paths, progress=report,
+                                                     cancelled=lambda: self._cancel_requested)
+                self._job_result = (result, None)
+            except Exception as e:
+                self._job_result = (None, e)
+
+        self.entries = entries
+        self._running = True
+        self._cancel_requested = False
+        self._progress = (0, len(paths))
+        self._job_result = None
+        self._started = time.perf_counter()
+        self.app.last_directory = directory
+        self.run_button.config(text="停止")
+        self.progress.config(maximum=len(paths), value=0)
+        threading.Thread(target=worker, daemon=True).start()
+        self.after(100, self._poll_job)
+
+    def _poll_job(self):
+        """在主线程中刷新进度，任务完成后显示结果。"""
+        if not self.winfo_exists():
+            return
+        done, total = self._progress
+        self.progress.config(value=done)
+        if self._job_result is None:
+            self.stats_label.config(text=f"正在扫描 {done}/{total} 个文件...")
+            self.after(100, self._poll_job)
+            return
+
+        self._running = False
+        self.run_button.config(text="开始统计")
+        result, error = self._job_result
+        self._job_result = None
+        if error is not None:
+            messagebox.showerror("统计失败", str(error), parent=self)
+            self.stats_label.config(text="统计失败")
+            return
+
+        self.result = result
+        self._elapsed = time.perf_counter() - self._started
+        self.refresh_table()
+        if result.errors:
+            details = "\n".join(f"{Path(p).name}: {msg}" for p, msg in result.errors[:20])
+            messagebox.showwarning("部分文件读取失败", details, parent=self)
+
+    # -------------------------------------------------------------
+    # 表格
+    # -------------------------------------------------------------
+    def _filtered_indices(self) -> list:
+        """返回按当前筛选条件和排序方式排列的条目位置列表。"""
+        counts = self.result.counts
+        mode = self.filter_var.get()
+        if mode == "仅已出现":
+            indices = [i for i, c in enumerate(counts) if c]
+        elif mode == "仅未出现":
+            indices = [i for i, c in enumerate(counts) if not c]
+        else:
+            indices = list(range(len(counts)))
+
+        column, descending = self.sort_key
+        if column == "count":
+            key = counts.__getitem__
+        elif column == "files":
+            key = self.result.file_counts.__getitem__
+        else:
+            key = lambda i: self.entries[i][column]
+        indices.sort(key=key, reverse=descending)
+        return indices
+
+    def sort_by(self, column: str):
+        """点击表头时按该列排序；再次点击同一列时切换升降序。"""
+        current, descending = self.sort_key
+        self.sort_key = (column, not descending if column == current else column in ("count", "files"))
+        if self.result is not None:
+            self.refresh_table()
+
+    def refresh_table(self):
+        if self.result is None:
+            return
+        indices = self._filtered_indices()
+        self.tree.delete(*self.tree.get_children())
+        for i in indices[:MAX_TABLE_ROWS]:
+            item = self.entries[i]
+            self.tree.insert("", END, values=(item['org'], item['rep'], self.result.counts[i],
+                                              self.result.file_counts[i], item['note']))
+
+        result = self.result
+        cancelled = "（已中止）" if self._cancel_requested else ""
+        shown = f"，表格显示前 {MAX_TABLE_ROWS} 条" if len(indices) > MAX_TABLE_ROWS else ""
+        self.stats_label.config(
+            text=f"扫描 {result.files_scanned} 个文件 / {result.chars_scanned:,} 字符{cancelled}，"
+                 f"{result.hit_entries}/{len(self.entries)} 个条目出现过，筛选结果 {len(indices)} 条{shown}，用时 {self._elapsed:.1f} 秒"
+        )
+
+    # -------------------------------------------------------------
+    # 导出
+    # -------------------------------------------------------------
+    def export(self):
+        """将筛选结果按当前输出格式导出，出现次数写入备注开头。"""
+        if self.result is None:
+            messagebox.showinfo("提示", "请先进行统计。", parent=self)
+            return
+        indices = self._filtered_indices()
+        entries = coverage.annotate_entries([self.entries[i] for i in indices], [self.result.counts[i] for i in indices])
+
+        format_display_name = self.app.output_format.get()
+        format_key = conversion.get_format_key(format_display_name, display_name=True)
+        default_ext = FORMAT_DEFINITIONS[format_key]["ext"]
+        path = filedialog.asksaveasfilename(
+            parent=self,
+            title=f"导出覆盖率 ({format_display_name})",
+            initialdir=self.app.last_directory,
+            defaultextension=default_ext,
+            filetypes=[(format_display_name, f"*{default_ext}"), ("所有文件", "*.*")]
+        )
+        if not path:
+            return
+        try:
+            if conversion.is_binary_format(format_key):
+                with open(path, 'wb') as f:
+                    f.write(conversion.serialize_binary(entries, format_key))
+            else:
+                with open(path, 'w', encoding='utf-8') as f:
+                    for chunk in conversion.iter_format_output(entries, format_key):
+                        f.write(chunk)
+        except Exception as e:
+            messagebox.showerror("导出失败", str(e), parent=self)
+            return
+        self.app.status_var.set(f"已导出 {len(entries)} 条覆盖率结果: {Path(path).name}")
+
+    def load_filtered_to_input(self):
+        """将筛选结果（保持原始顺序）写入输入框，例如只保留实际出现过的条目。"""
+        if self.result is None:
+            return
+        mode = self.filter_var.get()
+        counts = self.result.counts
+        keep = [item for item, c in zip(self.entries, counts)
+                if mode == "全部条目" or (mode == "仅已出现") == bool(c)]
+        format_key = self.app.resolve_input_format_key() or "AiNiee_JSON"
+        self.app.load_entries_to_input(keep, format_key)
+        self.app.status_var.set(f"已将 {len(keep)} 条筛选结果载入输入框")
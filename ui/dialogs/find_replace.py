@@ -9,6 +9,9 @@ import ttkbootstrap as ttk
 from ttkbootstrap.constants import *
 from tkinter import messagebox
 
+from core.textdiff import SpanEdit, coalesce_edits
+from utils.tracing import span
+
 class FindReplaceDialog(ttk.Toplevel):
     """
     一个用于查找和替换文本的 Toplevel 窗口。
@@ -104,6 +107,10 @@ class FindReplaceDialog(ttk.Toplevel):
 
     def _highlight_all_matches(self, focus_index: int | None = None):
         """根据查找结果更新文本控件中的高亮标签。"""
+        with span("查找"):
+            self._update_match_highlights(focus_index)
+
+    def _update_match_highlights(self, focus_index: int | None = None):
         self.target.tag_remove('found', '1.0', tk.END)
         self.target.tag_remove('found_current', '1.0', tk.END)
 
@@ -224,6 +231,10 @@ class FindReplaceDialog(ttk.Toplevel):
 
     def replace(self):
         """替换当前选中的匹配项，并自动查找下一个。"""
+        with span("替换"):
+            self._replace_current()
+
+    def _replace_current(self):
         find_term = self.find_entry.get()
         if find_term and find_term not in self.app.find_history:
             self.app.find_history.insert(0, find_term)
@@ -270,6 +281,19 @@ class FindReplaceDialog(ttk.Toplevel):
 
     def replace_all(self):
         """替换所有匹配项。"""
+        with span("全部替换"):
+            total_count = self._replace_all()
+        if total_count is None:
+            return
+
+        # 弹窗放在计时区段之外，避免把用户确认的时间计入耗时
+        if total_count > 0:
+            messagebox.showinfo("成功", f"已完成 {total_count} 处替换。", parent=self)
+        else:
+            messagebox.showinfo("提示", "未找到可替换的内容。", parent=self)
+
+    def _replace_all(self) -> int | None:
+        """执行全部替换，返回替换次数；未执行替换时返回 None。"""
         find_text = self.find_entry.get()
         if find_text and find_text not in self.app.find_history:
             self.app.find_history.insert(0, find_text)
@@ -281,44 +305,47 @@ class FindReplaceDialog(ttk.Toplevel):
             self.replace_entry['values'] = self.app.replace_history
             
         if not find_text:
-            return
+            return None
         
-        content = self.target.get('1.0', tk.END)
+        content = self.target.get_content()
         case = self.case_var.get()
         regex = self.regex_var.get()
         
+        # 逐个匹配生成区间替换，而不是整体替换文档：
+        # 撤销栈中只记录被替换的片段，多次全部替换也不会使内存随文档大小成倍增长
         try:
-            if regex:
-                # [修正] 添加 re.MULTILINE 标志
-                flags = re.MULTILINE
-                if not case:
-                    flags |= re.IGNORECASE
-                
-                # 获取Python风格的替换字符串
-                py_replace_str = self._python_style_repl(replace_text)
-                new_content, total_count = re.subn(find_text, py_replace_str, content, flags=flags)
-            else:
-                if not case:
-                    flags = re.IGNORECASE
-                    new_content, total_count = re.subn(re.escape(find_text), replace_text, content, flags=flags)
+            with span("查找匹配"):
+                if regex:
+                    # [修正] 添加 re.MULTILINE 标志
+                    flags = re.MULTILINE
+                    if not case:
+                        flags |= re.IGNORECASE
+                    
+                    # 获取Python风格的替换字符串，与 re.sub 的展开规则相同
+                    py_replace_str = self._python_style_repl(replace_text)
+                    edits = [SpanEdit(m.start(), m.end(), m.expand(py_replace_str))
+                             for m in re.finditer(find_text, content, flags=flags)]
                 else:
-                    total_count = content.count(find_text)
-                    new_content = content.replace(find_text, replace_text)
+                    # 普通模式下替换文本按原样插入
+                    flags = 0 if case else re.IGNORECASE
+                    edits = [SpanEdit(m.start(), m.end(), replace_text)
+                             for m in re.finditer(re.escape(find_text), content, flags=flags)]
         except re.error as e:
             self.status_label.config(text=f"正则表达式错误: {e}")
             messagebox.showerror("正则表达式错误", str(e), parent=self)
-            return
+            return None
 
+        total_count = len(edits)
         if total_count > 0:
-            self.target.edit_separator()
-            self.target.set_content(new_content, reset_modified_flag=False)
-            self.target.edit_separator()
+            with span("写入控件"):
+                changed_ranges = self.target.apply_span_edits(coalesce_edits(content, edits), content)
+            with span("语法高亮"):
+                self.app.syntax_handler.highlight_line_ranges(self.target, changed_ranges)
             self._highlight_all_matches()
             self.status_label.config(text=f"已完成 {total_count} 处替换。")
-            messagebox.showinfo("成功", f"已完成 {total_count} 处替换。", parent=self)
         else:
             self.status_label.config(text="未找到可替换的内容。")
-            messagebox.showinfo("提示", "未找到可替换的内容。", parent=self)
+        return total_count
 
     def close_dialog(self):
         """关闭对话框时，清除所有高亮标记。"""
@@ -0,0 +1,194 @@
+"""
+该模块定义了 GlossaryStoreDialog 类，
+提供一个浏览、检索、导入和导出 SQLite 词库数据库的对话框。
+"""
+
+import ttkbootstrap as ttk
+from ttkbootstrap.constants import *
+from tkinter import filedialog, messagebox
+from pathlib import Path
+
+from constants import FORMAT_DEFINITIONS
+from core import conversion
+
+# 表格每页显示的条目数
+PAGE_SIZE = 200
+
+
+class GlossaryStoreDialog(ttk.Toplevel):
+    """
+    词库数据库窗口。
+    以分页表格显示数据库中的条目，并可将当前页载入输入框进行编辑。
+    """
+    def __init__(self, master, app_instance):
+        """
+        初始化词库数据库对话框。
+
+        Args:
+            master: 父控件 (主窗口)。
+            app_instance: 主应用程序的实例。
+        """
+        super().__init__(master)
+        self.app = app_instance
+        self.store = app_instance.get_glossary_store()
+
+        self.transient(master)
+        self.title("词库数据库")
+        self.geometry("800x520")
+
+        # 键集分页：记录每一页起始位置之前的条目 id
+        self.page_starts = [0]
+        self.current_rows = []
+        self.query = ""
+
+        self.create_widgets()
+        self.protocol("WM_DELETE_WINDOW", self.destroy)
+        self.refresh(reset=True)
+
+    def create_widgets(self):
+        """创建并布局对话框中的所有UI组件。"""
+        main_frame = ttk.Frame(self, padding="10")
+        main_frame.pack(expand=True, fill=BOTH)
+
+        ttk.Label(main_frame, text=f"数据库: {Path(self.store.db_path).resolve()}").pack(anchor=W)
+
+        btn_frame = ttk.Frame(main_frame)
+        btn_frame.pack(fill=X, pady=5)
+        ttk.Button(btn_frame, text="导入文件...", command=self.import_files, bootstyle="primary").pack(side=LEFT, padx=(0, 5))
+        ttk.Button(btn_frame, text="导入当前输入", command=self.import_current_input, bootstyle="primary").pack(side=LEFT, padx=5)
+        ttk.Button(btn_frame, text="导出...", command=self.export, bootstyle="success").pack(side=LEFT, padx=5)
+        ttk.Button(btn_frame, text="清空数据库", command=self.clear_store, bootstyle="danger").pack(side=LEFT, padx=5)
+
+        search_frame = ttk.Frame(main_frame)
+        search_frame.pack(fill=X, pady=5)
+        ttk.Label(search_frame, text="检索:").pack(side=LEFT)
+        self.search_entry = ttk.Entry(search_frame)
+        self.search_entry.pack(side=LEFT, expand=True, fill=X, padx=5)
+        self.search_entry.bind("<Return>", lambda e: self.search())
+        ttk.Button(search_frame, text="搜索", command=self.search, bootstyle="secondary").pack(side=LEFT)
+
+        table_frame = ttk.Frame(main_frame)
+        table_frame.pack(expand=True, fill=BOTH, pady=5)
+        self.tree = ttk.Treeview(table_frame, columns=("org", "rep", "note"), show="headings")
+        for col, title, width in (("org", "原文", 220), ("rep", "译文", 220), ("note", "备注", 300)):
+            self.tree.heading(col, text=title)
+            self.tree.column(col, width=width)
+        vbar = ttk.Scrollbar(table_frame, orient=VERTICAL, command=self.tree.yview)
+        self.tree.configure(yscrollcommand=vbar.set)
+        self.tree.pack(side=LEFT, expand=True, fill=BOTH)
+        vbar.pack(side=RIGHT, fill=Y)
+
+        nav_frame = ttk.Frame(main_frame)
+        nav_frame.pack(fill=X)
+        ttk.Button(nav_frame, text="上一页", command=self.prev_page, bootstyle="secondary").pack(side=LEFT)
+        ttk.Button(nav_frame, text="下一页", command=self.next_page, bootstyle="secondary").pack(side=LEFT, padx=5)
+        self.page_label = ttk.Label(nav_frame, text="")
+        self.page_label.pack(side=LEFT, padx=10)
+        ttk.Button(nav_frame, text="载入本页到输入框", command=self.load_page_to_input, bootstyle="warning").pack(side=RIGHT)
+
+    # -------------------------------------------------------------
+    # 查询与翻页
+    # -------------------------------------------------------------
+    def refresh(self, reset: bool = False):
+        """重新查询当前页并刷新表格。"""
+        if reset:
+            self.page_starts = [0]
+            self.total = self.store.count(self.query)
+        self.current_rows = self.store.page(self.query, self.page_starts[-1], PAGE_SIZE)
+
+        self.tree.delete(*self.tree.get_children())
+        for row in self.current_rows:
+            self.tree.insert("", END, values=(row['org'], row['rep'], row['note']))
+
+        page_num = len(self.page_starts)
+        total_pages = max(1, (self.total + PAGE_SIZE - 1) // PAGE_SIZE)
+        self.page_label.config(text=f"第 {page_num} / {total_pages} 页，共 {self.total} 条")
+
+    def search(self):
+        self.query = self.search_entry.get().strip()
+        self.refresh(reset=True)
+
+    def next_page(self):
+        if len(self.current_rows) < PAGE_SIZE:
+            return
+        self.page_starts.append(self.current_rows[-1]['id'])
+        self.refresh()
+
+    def prev_page(self):
+        if len(self.page_starts) > 1:
+            self.page_starts.pop()
+            self.refresh()
+
+    # -------------------------------------------------------------
+    # 导入与导出
+    # -------------------------------------------------------------
+    def import_files(self):
+        """选择一个或多个字典文件并导入数据库。"""
+        paths = filedialog.askopenfilenames(
+            parent=self,
+            title="选择要导入的字典文件",
+            initialdir=self.app.last_directory,
+            filetypes=[("所有支持格式", "*.json;*.toml;*.txt;*.gdx"), ("所有文件", "*.*")]
+        )
+        if not paths:
+            return
+        total = 0
+        for path in paths:
+            try:
+                total += self.store.import_file(path)
+            except Exception as e:
+                messagebox.showerror("导入失败", f"{Path(path).name}: {e}", parent=self)
+        self.app.last_directory = str(Path(paths[0]).parent)
+        self.app.status_var.set(f"已向词库导入 {total} 条")
+        self.refresh(reset=True)
+
+    def import_current_input(self):
+        """将输入框中的字典导入数据库。"""
+        content = self.app.input_text.get_content()
+        format_key = self.app.resolve_input_format_key()
+        if not content.strip() or not format_key:
+            messagebox.showwarning("警告", "输入内容为空或无法识别其格式。", parent=self)
+            return
+        try:
+            entries = self.app.parse_input_entries(content, format_key)
+        except Exception as e:
+            messagebox.showerror("导入失败", str(e), parent=self)
+            return
+        count = self.store.import_entries(entries, source=self.app.current_file_path or "")
+        self.app.status_var.set(f"已向词库导入 {count} 条")
+        self.refresh(reset=True)
+
+    def export(self):
+        """将当前检索结果（未检索时为全部条目）导出为指定格式的文件。"""
+        format_display_name = self.app.output_format.get()
+        format_key = conversion.get_format_key(format_display_name, display_name=True)
+        default_ext = FORMAT_DEFINITIONS[format_key]["ext"]
+        path = filedialog.asksaveasfilename(
+            parent=self,
+            title=f"导出词库 ({format_display_name})",
+            initialdir=self.app.last_directory,
+            defaultextension=default_ext,
+            filetypes=[(format_display_name, f"*{default_ext}"), ("所有文件", "*.*")]
+        )
+        if not path:
+            return
+        try:
+            count = self.store.export(path, format_key, self.query or None)
+        except Exception as e:
+            messagebox.showerror("导出失败", str(e), parent=self)
+            return
+        self.app.status_var.set(f"已从词库导出 {count} 条: {Path(path).name}")
+
+    def clear_store(self):
+        if messagebox.askyesno("确认", "确定要删除数据库中的所有条目吗？", parent=self):
+            self.store.clear()
+            self.refresh(reset=True)
+
+    def load_page_to_input(self):
+        """将当前页的条目按输入格式写入输入框，便于编辑。"""
+        if not self.current_rows:
+            return
+        format_key = self.app.resolve_input_format_key() or "AiNiee_JSON"
+        entries = [{'org': r['org'], 'rep': r['rep'], 'note': r['note']} for r in self.current_rows]
+        self.app.load_entries_to_input(entries, format_key)
+        self.app.status_var.set(f"已载入词库第 {len(self.page_starts)} 页 ({len(entries)} 条)")
@@ -1,17 +1,23 @@
 import tkinter as tk
 from tkinter import ttk
+from functools import lru_cache
 from pathlib import Path
 
-import markdown
-from tkhtmlview import HTMLScrolledText
+@lru_cache(maxsize=1)
+def _render_markdown(help_text_md: str) -> str:
+    """
+    将 Markdown 渲染为 HTML。
+    结果按文本缓存，再次打开帮助窗口时无需重新解析 Markdown。
+    """
+    # markdown 只在首次打开帮助时才需要，延迟导入以加快启动
+    import markdown
+    return markdown.markdown(help_text_md, extensions=['fenced_code', 'tables'])
 
-def show_help_dialog(parent):
-    """显示“帮助”对话框。"""
-    help_win = tk.Toplevel(parent)
-    help_win.title("使用教程")
-    help_win.transient(parent)
-    help_win.geometry("700x600")
-    
+def _render_help_html() -> str:
+    """
+    读取 help.md 并渲染为 HTML。
+    每次都重新读取文件（开销很小），读取失败时显示的错误页面不会被缓存，下次打开帮助时会再次尝试。
+    """
     try:
         # 使用 pathlib 定位 help.md
         base_dir = Path(__file__).resolve().parent
@@ -19,12 +25,23 @@ def show_help_dialog(parent):
         with open(help_md_path, "r", encoding="utf-8") as f:
             help_text_md = f.read()
     except Exception as e:
-        help_text_md = f"# 帮助文档加载失败\n\n无法读取 help.md 文件：{e}"
-        
+        # 错误页面很短，直接渲染，不占用缓存
+        return _render_markdown.__wrapped__(f"# 帮助文档加载失败\n\n无法读取 help.md 文件：{e}")
+    return _render_markdown(help_text_md)
+
+def show_help_dialog(parent):
+    """显示“帮助”对话框。"""
+    from tkhtmlview import HTMLScrolledText
+
+    help_win = tk.Toplevel(parent)
+    help_win.title("使用教程")
+    help_win.transient(parent)
+    help_win.geometry("700x600")
+    
     main_frame = ttk.Frame(help_win, padding=10)
     main_frame.pack(expand=True, fill=tk.BOTH)
     
-    html_content = markdown.markdown(help_text_md, extensions=['fenced_code', 'tables'])
+    html_content = _render_help_html()
     
     html_text = HTMLScrolledText(main_frame, background="white")
     html_text.pack(expand=True, fill=tk.BOTH)
@@ -0,0 +1,109 @@
+"""
+该模块定义了 MemoryReportDialog 类，
+显示内存分析记录的各操作分阶段内存报告，并可按需统计占用内存最多的分配位置。
+"""
+
+import time
+import tkinter as tk
+import ttkbootstrap as ttk
+from ttkbootstrap.constants import *
+
+from utils.memprof import profiler
+
+
+class MemoryReportDialog(ttk.Toplevel):
+    """
+    内存报告窗口。
+    报告按时间顺序排列，最新的在最后；统计分配位置需要拍摄快照，条目很多时需要数秒。
+    """
+    def __init__(self, master, app_instance):
+        """
+        初始化内存报告对话框。
+
+        Args:
+            master: 父控件 (主窗口)。
+            app_instance: 主应用程序的实例。
+        """
+        super().__init__(master)
+        self.app = app_instance
+
+        self.transient(master)
+        self.title("内存报告")
+        self.geometry("760x480")
+
+        self.create_widgets()
+        self.protocol("WM_DELETE_WINDOW", self.destroy)
+        self.refresh()
+
+    def create_widgets(self):
+        """创建并布局对话框中的所有UI组件。"""
+        main_frame = ttk.Frame(self, padding="10")
+        main_frame.pack(expand=True, fill=BOTH)
+
+        text_frame = ttk.Frame(main_frame)
+        text_frame.pack(expand=True, fill=BOTH)
+        self.text = tk.Text(text_frame, wrap=NONE, font=("黑体", 10))
+        vbar = ttk.Scrollbar(text_frame, orient=VERTICAL, command=self.text.yview)
+        hbar = ttk.Scrollbar(text_frame, orient=HORIZONTAL, command=self.text.xview)
+        self.text.configure(yscrollcommand=vbar.set, xscrollcommand=hbar.set)
+        vbar.pack(side=RIGHT, fill=Y)
+        hbar.pack(side=BOTTOM, fill=X)
+        self.text.pack(side=LEFT, expand=True, fill=BOTH)
+
+        btn_frame = ttk.Frame(main_frame)
+        btn_frame.pack(fill=X, pady=(10, 0))
+        ttk.Button(btn_frame, text="刷新", command=self.refresh, bootstyle="primary").pack(side=LEFT)
+        ttk.Button(btn_frame, text="统计分配位置", command=self.show_sites, bootstyle="secondary").pack(side=LEFT, padx=5)
+        ttk.Button(btn_frame, text="复制", command=self.copy_report, bootstyle="secondary").pack(side=LEFT)
+        ttk.Button(btn_frame, text="清空报告", command=self.clear_reports, bootstyle="secondary-outline").pack(side=LEFT, padx=5)
+        ttk.Button(btn_frame, text="关闭", command=self.destroy, bootstyle="secondary-outline").pack(side=RIGHT)
+        self.status_label = ttk.Label(main_frame, text="")
+        self.status_label.pack(anchor=W, pady=(5, 0))
+
+    def _set_text(self, content: str):
+        self.text.config(state=NORMAL)
+        self.text.delete("1.0", END)
+        self.text.insert("1.0", content)
+        self.text.config(state=DISABLED)
+        self.text.see(END)
+
+    def refresh(self):
+        """显示所有已记录的报告。"""
+        if not profiler.reports:
+            hint = "" if profiler.enabled else "请先在“调试”菜单中勾选“记录内存分析”，再打开文件或执行转换。"
+            self._set_text(f"暂无内存报告。{hint}")
+        else:
+            self._set_text("\n\n".join(profiler.format_report(r) for r in profiler.reports))
+        state = "记录中" if profiler.enabled else "未开启"
+        self.status_label.config(text=f"内存分析{state}，共 {len(profiler.reports)} 个报告")
+
+    def show_sites(self):
+        """拍摄快照并在报告之后列出占用内存最多的分配位置。"""
+        if not profiler.enabled:
+            self.status_label.config(text="内存分析未开启，无法统计分配位置")
+            return
+        self.status_label.config(text="正在统计分配位置...")
+        self.config(cursor="watch")
+        self.update_idletasks()
+        try:
+            start = time.perf_counter()
+            sites = profiler.top_sites(20)
+            elapsed = time.perf_counter() - start
+        finally:
+            self.config(cursor="")
+        self.refresh()
+        self.text.config(state=NORMAL)
+        self.text.insert(END, "\n\n" + profiler.format_sites(sites))
+        self.text.config(state=DISABLED)
+        self.text.see(END)
+        self.status_label.config(text=f"已统计开启内存分析以来仍未释放的内存 ({elapsed:.1f}s)")
+
+    def copy_report(self):
+        """将窗口中的全部文本复制到剪贴板。"""
+        self.clipboard_clear()
+        self.clipboard_append(self.text.get("1.0", "end-1c"))
+        self.status_label.config(text="已复制到剪贴板")
+
+    def clear_reports(self):
+        profiler.reports.clear()
+        self.refresh()
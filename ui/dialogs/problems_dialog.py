@@ -0,0 +1,105 @@
+"""
+该模块定义了 ProblemsDialog 类，
+以列表形式显示输入框内容的校验问题，双击即可跳转到对应位置。
+"""
+
+import tkinter as tk
+import ttkbootstrap as ttk
+from ttkbootstrap.constants import *
+
+from core import lint
+
+# 列表中最多显示的问题数
+MAX_PROBLEM_ROWS = 5000
+SEVERITY_NAMES = {lint.ERROR: "错误", lint.WARNING: "警告"}
+
+
+class ProblemsDialog(ttk.Toplevel):
+    """
+    问题列表窗口。
+    校验结果更新时自动刷新，不会阻止在主窗口中继续编辑。
+    """
+    def __init__(self, master, app_instance):
+        """
+        初始化问题列表对话框。
+
+        Args:
+            master: 父控件 (主窗口)。
+            app_instance: 主应用程序的实例。
+        """
+        super().__init__(master)
+        self.app = app_instance
+        self.syntax_handler = app_instance.syntax_handler
+
+        self.transient(master)
+        self.title("问题列表")
+        self.geometry("700x300")
+
+        self.create_widgets()
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
+        self.syntax_handler.lint_listeners.append(self.refresh)
+        self.refresh()
+
+    def create_widgets(self):
+        """创建并布局对话框中的所有UI组件。"""
+        main_frame = ttk.Frame(self, padding="10")
+        main_frame.pack(expand=True, fill=BOTH)
+
+        self.summary_label = ttk.Label(main_frame, text="")
+        self.summary_label.pack(anchor=W, pady=(0, 5))
+
+        table_frame = ttk.Frame(main_frame)
+        table_frame.pack(expand=True, fill=BOTH)
+        columns = (("line", "行", 60), ("col", "列", 50), ("severity", "级别", 60), ("message", "描述", 480))
+        self.tree = ttk.Treeview(table_frame, columns=[c[0] for c in columns], show="headings")
+        for col, title, width in columns:
+            self.tree.heading(col, text=title)
+            self.tree.column(col, width=width, anchor=E if col in ("line", "col") else W)
+        self.tree.tag_configure(lint.ERROR, foreground="#c0392b")
+        self.tree.tag_configure(lint.WARNING, foreground="#b7791f")
+        vbar = ttk.Scrollbar(table_frame, orient=VERTICAL, command=self.tree.yview)
+        self.tree.configure(yscrollcommand=vbar.set)
+        self.tree.pack(side=LEFT, expand=True, fill=BOTH)
+        vbar.pack(side=RIGHT, fill=Y)
+        self.tree.bind("<Double-1>", self.jump_to_selected)
+        self.tree.bind("<Return>", self.jump_to_selected)
+
+    def on_close(self):
+        if self.refresh in self.syntax_handler.lint_listeners:
+            self.syntax_handler.lint_listeners.remove(self.refresh)
+        self.destroy()
+
+    def refresh(self):
+        """重新填充问题列表。"""
+        self.tree.delete(*self.tree.get_children())
+        linter = self.syntax_handler.linter
+        shown = 0
+        for line, d in linter.iter_diagnostics():
+            if shown >= MAX_PROBLEM_ROWS:
+                break
+            self.tree.insert("", END, values=(line + 1, d.start + 1, SEVERITY_NAMES[d.severity], d.message),
+                             tags=(d.severity,))
+            shown += 1
+
+        errors, warnings = linter.totals()
+        if linter.format_key is None:
+            text = "未识别输入格式，暂不校验。"
+        else:
+            text = f"错误 {errors} 个，警告 {warnings} 个"
+            if errors + warnings > MAX_PROBLEM_ROWS:
+                text += f"（仅显示前 {MAX_PROBLEM_ROWS} 个）"
+        self.summary_label.config(text=text)
+
+    def jump_to_selected(self, event=None):
+        """跳转到选中问题所在的位置。"""
+        selection = self.tree.selection()
+        if not selection:
+            return
+        line, col = self.tree.item(selection[0], "values")[:2]
+        widget = self.app.input_text
+        index = f"{line}.{int(col) - 1}"
+        widget.tag_remove("goto_line", "1.0", tk.END)
+        widget.tag_add("goto_line", f"{line}.0", f"{line}.end")
+        widget.mark_set(tk.INSERT, index)
+        widget.see(index)
+        widget.focus_set()
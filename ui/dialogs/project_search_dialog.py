@@ -0,0 +1,349 @@
+"""
+该模块定义了 ProjectSearchDialog 类，
+提供在一个目录下所有字典文件中查找与替换的对话框，结果按文件分组，双击即可打开文件并跳转到匹配处。
+"""
+
+import os
+import queue
+import re
+import threading
+import time
+import tkinter as tk
+import ttkbootstrap as ttk
+from ttkbootstrap.constants import *
+from tkinter import filedialog, messagebox
+from pathlib import Path
+
+from core import search
+from core.scripts import iter_script_files, parse_extensions
+from utils.tracing import span
+
+# 列表中最多显示的匹配位置数，超出部分只计入各文件的次数
+MAX_RESULT_ROWS = 20000
+# 每次刷新最多插入列表的文件数，避免结果很多时界面卡顿
+ROWS_PER_POLL = 200
+
+
+def _same_path(a: str, b: str) -> bool:
+    return os.path.normcase(os.path.abspath(a)) == os.path.normcase(os.path.abspath(b))
+
+
+class ProjectSearchDialog(ttk.Toplevel):
+    """
+    目录查找与替换窗口。
+    查找选项与“查找与替换”对话框相同；文件在多个进程中并行处理，每处理完一个文件就显示其结果。
+    全部替换前会先统计每个文件的替换次数，确认后才写入文件。
+    """
+    def __init__(self, master, app_instance):
+        """
+        初始化目录查找与替换对话框。
+
+        Args:
+            master: 父控件 (主窗口)。
+            app_instance: 主应用程序的实例。
+        """
+        super().__init__(master)
+        self.app = app_instance
+
+        self.transient(master)
+        self.title("在目录中查找与替换")
+        self.geometry("900x600")
+
+        # 当前任务: "search" / "dry_run" / "replace"，空闲时为 None
+        self._mode = None
+        self._cancel_requested = False
+        self._results = queue.Queue()
+        self._job_error = None
+        self._job_done = False
+        self._total_files = 0
+        self._done_files = 0
+        self._started = 0.0
+        # 本次任务的统计：匹配次数、有匹配的文件、失败的文件及错误信息
+        self._hits = 0
+        self._hit_files = []
+        self._errors = []
+        self._shown_rows = 0
+        self._options = None
+        self._paths = []
+
+        self.create_widgets()
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
+        self.find_entry.focus_set()
+
+    def create_widgets(self):
+        """创建并布局对话框中的所有UI组件。"""
+        main_frame = ttk.Frame(self, padding="10")
+        main_frame.pack(expand=True, fill=BOTH)
+
+        form = ttk.Frame(main_frame)
+        form.pack(fill=X)
+        form.columnconfigure(1, weight=1)
+        ttk.Label(form, text="目录:").grid(row=0, column=0, sticky=W, pady=2)
+        self.dir_entry = ttk.Entry(form)
+        self.dir_entry.insert(0, self.app.last_directory or "")
+        self.dir_entry.grid(row=0, column=1, sticky=(W, E), padx=5, pady=2)
+        ttk.Button(form, text="浏览...", command=self.choose_directory, bootstyle="secondary").grid(row=0, column=2, pady=2)
+
+        ttk.Label(form, text="扩展名:").grid(row=1, column=0, sticky=W, pady=2)
+        self.ext_entry = ttk.Entry(form)
+        self.ext_entry.insert(0, "; ".join(search.DICTIONARY_EXTENSIONS))
+        self.ext_entry.grid(row=1, column=1, sticky=(W, E), padx=5, pady=2)
+
+        ttk.Label(form, text="查找:").grid(row=2, column=0, sticky=W, pady=2)
+        self.find_entry = ttk.Combobox(form, values=self.app.find_history)
+        self.find_entry.grid(row=2, column=1, sticky=(W, E), padx=5, pady=2)
+
+        ttk.Label(form, text="替换:").grid(row=3, column=0, sticky=W, pady=2)
+        self.replace_entry = ttk.Combobox(form, values=self.app.replace_history)
+        self.replace_entry.grid(row=3, column=1, sticky=(W, E), padx=5, pady=2)
+
+        option_frame = ttk.Frame(main_frame)
+        option_frame.pack(fill=X, pady=5)
+        self.case_var = tk.BooleanVar()
+        ttk.Checkbutton(option_frame, text="区分大小写", variable=self.case_var, bootstyle="primary").pack(side=LEFT, padx=5)
+        self.regex_var = tk.BooleanVar()
+        ttk.Checkbutton(option_frame, text="正则表达式", variable=self.regex_var, bootstyle="primary").pack(side=LEFT, padx=5)
+        self.replace_button = ttk.Button(option_frame, text="全部替换...", command=self.replace_all, bootstyle="danger")
+        self.replace_button.pack(side=RIGHT)
+        self.search_button = ttk.Button(option_frame, text="查找", command=self.run_search, bootstyle="primary")
+        self.search_button.pack(side=RIGHT, padx=5)
+
+        self.progress = ttk.Progressbar(main_frame, mode="determinate")
+        self.progress.pack(fill=X, pady=(0, 5))
+        self.status_label = ttk.Label(main_frame, text="")
+        self.status_label.pack(anchor=W)
+
+        table_frame = ttk.Frame(main_frame)
+        table_frame.pack(expand=True, fill=BOTH, pady=5)
+        self.tree = ttk.Treeview(table_frame, columns=("location", "count"), show="tree headings")
+        self.tree.heading("#0", text="文件 / 匹配行")
+        self.tree.heading("location", text="行:列")
+        self.tree.heading("count", text="次数")
+        self.tree.column("#0", width=620)
+        self.tree.column("location", width=90, anchor=E)
+        self.tree.column("count", width=70, anchor=E)
+        self.tree.tag_configure("error", foreground="#c0392b")
+        vbar = ttk.Scrollbar(table_frame, orient=VERTICAL, command=self.tree.yview)
+        self.tree.configure(yscrollcommand=vbar.set)
+        self.tree.pack(side=LEFT, expand=True, fill=BOTH)
+        vbar.pack(side=RIGHT, fill=Y)
+        self.tree.bind("<Double-1>", self.open_selected)
+        self.tree.bind("<Return>", self.open_selected)
+
+    def choose_directory(self):
+        directory = filedialog.askdirectory(parent=self, title="选择字典目录", initialdir=self.app.last_directory)
+        if directory:
+            self.dir_entry.delete(0, END)
+            self.dir_entry.insert(0, directory)
+
+    def on_close(self):
+        # 后台任务在处理完当前文件后停止
+        self._cancel_requested = True
+        self.destroy()
+
+    def _remember_history(self):
+        """与“查找与替换”对话框共享查找和替换历史。"""
+        for entry, history in ((self.find_entry, self.app.find_history), (self.replace_entry, self.app.replace_history)):
+            text = entry.get()
+            if text and text not in history:
+                history.insert(0, text)
+                entry['values'] = history
+
+    # -------------------------------------------------------------
+    # 后台任务
+    # -------------------------------------------------------------
+    def _collect_job(self) -> bool:
+        """读取界面上的目录与选项，成功时保存到 self._paths 与 self._options。"""
+        directory = self.dir_entry.get().strip()
+        if not directory or not Path(directory).is_dir():
+            messagebox.showwarning("警告", "请选择有效的目录。", parent=self)
+            return False
+        find_text = self.find_entry.get()
+        if not find_text:
+            messagebox.showwarning("警告", "请输入查找内容。", parent=self)
+            return False
+        self._remember_history()
+        self._options = search.SearchOptions(find_text, self.replace_entry.get(),
+                                             self.regex_var.get(), self.case_var.get())
+        self._paths = list(iter_script_files(directory, parse_extensions(self.ext_entry.get())))
+        if not self._paths:
+            messagebox.showinfo("提示", "所选目录中没有匹配的文件。", parent=self)
+            return False
+        self.app.last_directory = directory
+        return True
+
+    def _start(self, mode: str, paths: list):
+        """在后台线程中处理 paths，结果逐个放入队列，由 _poll_job 在主线程中显示。"""
+        options = self._options
+        try:
+            if mode == "search":
+                results = search.iter_search(paths, options, cancelled=lambda: self._cancel_requested)
+            else:
+                results = search.iter_replace(paths, options, dry_run=(mode == "dry_run"),
+                                              cancelled=lambda: self._cancel_requested)
+        except re.error as e:
+            messagebox.showerror("正则表达式错误", str(e), parent=self)
+            return
+
+        def worker():
+            try:
+                with span("目录查找" if mode == "search" else "目录替换"):
+                    for result in results:
+                        self._results.put(result)
+            except Exception as e:
+                self._job_error = e
+            finally:
+                self._job_done = True
+
+        self.tree.delete(*self.tree.get_children())
+        self._mode = mode
+        self._cancel_requested = False
+        self._results = queue.Queue()
+        self._job_error = None
+        self._job_done = False
+        self._total_files = len(paths)
+        self._done_files = 0
+        self._hits = 0
+        self._hit_files = []
+        self._errors = []
+        self._shown_rows = 0
+        self._started = time.perf_counter()
+        self.progress.config(maximum=len(paths), value=0)
+        self.search_button.config(text="停止", command=self.stop)
+        self.replace_button.config(state=DISABLED)
+        threading.Thread(target=worker, daemon=True).start()
+        self.after(100, self._poll_job)
+
+    def stop(self):
+        self._cancel_requested = True
+
+    def _poll_job(self):
+        """在主线程中把新完成的文件加入列表，任务结束后进入下一步。"""
+        if not self.winfo_exists():
+            return
+        for _ in range(ROWS_PER_POLL):
+            try:
+                result = self._results.get_nowait()
+            except queue.Empty:
+                break
+            self._add_result(result)
+        self.progress.config(value=self._done_files)
+
+        if not (self._job_done and self._results.empty()):
+            self.status_label.config(text=f"已处理 {self._done_files}/{self._total_files} 个文件，"
+                                          f"{len(self._hit_files)} 个文件中共 {self._hits} 处匹配...")
+            self.after(100, self._poll_job)
+            return
+        self._finish()
+
+    def _add_result(self, result: search.FileResult):
+        """将一个文件的结果加入列表。"""
+        self._done_files += 1
+        if result.error is not None:
+            self._errors.append((result.path, result.error))
+            self.tree.insert("", END, text=result.path, values=("", "失败"), tags=("error",))
+            return
+        if not result.count:
+            return
+        self._hits += result.count
+        self._hit_files.append(result.path)
+        parent = self.tree.insert("", END, text=result.path, values=("", result.count), open=True)
+        for match in result.matches:
+            if self._shown_rows >= MAX_RESULT_ROWS:
+                break
+            self.tree.insert(parent, END, text=match.preview, values=(f"{match.line}:{match.col}", ""))
+            self._shown_rows += 1
+
+    def _finish(self):
+        mode = self._mode
+        self._mode = None
+        self.search_button.config(text="查找", command=self.run_search)
+        self.replace_button.config(state=NORMAL)
+        if self._job_error is not None:
+            messagebox.showerror("处理失败", str(self._job_error), parent=self)
+            self.status_label.config(text="处理失败")
+            return
+
+        elapsed = time.perf_counter() - self._started
+        cancelled = "（已中止）" if self._cancel_requested else ""
+        failed = f"，{len(self._errors)} 个文件失败" if self._errors else ""
+        if mode == "search":
+            shown = f"，列表显示前 {MAX_RESULT_ROWS} 处" if self._shown_rows >= MAX_RESULT_ROWS else ""
+            summary = (f"在 {self._done_files} 个文件中找到 {self._hits} 处匹配（{len(self._hit_files)} 个文件）"
+                       f"{cancelled}{failed}{shown}，用时 {elapsed:.1f} 秒")
+        elif mode == "dry_run":
+            summary = f"预计在 {len(self._hit_files)} 个文件中替换 {self._hits} 处{cancelled}{failed}"
+        else:
+            summary = f"已在 {len(self._hit_files)} 个文件中完成 {self._hits} 处替换{cancelled}{failed}，用时 {elapsed:.1f} 秒"
+        self.status_label.config(text=summary)
+
+        if self._errors:
+            details = "\n".join(f"{Path(p).name}: {msg}" for p, msg in self._errors[:20])
+            messagebox.showwarning("部分文件处理失败", details, parent=self)
+        if mode == "dry_run":
+            self._confirm_replace()
+        elif mode == "replace":
+            self._reload_current_file()
+            self.app.status_var.set(summary)
+
+    # -------------------------------------------------------------
+    # 查找与替换
+    # -------------------------------------------------------------
+    def run_search(self):
+        """在后台查找所选目录下的所有字典文件。"""
+        if self._mode is None and self._collect_job():
+            self._start("search", self._paths)
+
+    def replace_all(self):
+        """先统计每个文件的替换次数（不写入文件），确认后再执行替换。"""
+        if self._mode is None and self._collect_job():
+            self._start("dry_run", self._paths)
+
+    def _confirm_replace(self):
+        if self._cancel_requested or not self._hits:
+            if not self._hits:
+                messagebox.showinfo("提示", "未找到可替换的内容。", parent=self)
+            return
+        if not messagebox.askyesno(
+            "确认替换",
+            f"将在 {len(self._hit_files)} 个文件中替换 {self._hits} 处，各文件的次数见列表。\n"
+            "替换会直接写入文件且无法撤销，是否继续？",
+            parent=self
+        ):
+            return
+        self._start("replace", list(self._hit_files))
+
+    def _reload_current_file(self):
+        """输入框中打开的文件被替换后，将其更新到输入框中。"""
+        current = self.app.current_file_path
+        if current and any(_same_path(current, p) for p in self._hit_files):
+            file_handler = self.app.file_handler
+            file_handler.on_watched_file_changed(current)
+            # 已经手动重新加载，不需要文件监视再次报告这次修改
+            file_handler.watcher.acknowledge()
+
+    def open_selected(self, event=None):
+        """打开选中结果所在的文件，并跳转到匹配位置。"""
+        selection = self.tree.selection()
+        if not selection:
+            return
+        item = selection[0]
+        parent = self.tree.parent(item)
+        path = self.tree.item(parent or item, "text")
+        location = self.tree.item(item, "values")[0]
+        line, col = map(int, location.split(":")) if location else (1, 1)
+
+        current = self.app.current_file_path
+        if not current or not _same_path(current, path):
+            # 在新的标签页中打开，或切换到已打开该文件的标签页
+            self.app.file_handler._open_file_path(path)
+            if not self.app.current_file_path or not _same_path(self.app.current_file_path, path):
+                return
+
+        widget = self.app.input_text
+        index = f"{line}.{col - 1}"
+        widget.tag_remove("goto_line", "1.0", tk.END)
+        widget.tag_add("goto_line", f"{line}.0", f"{line}.end")
+        widget.mark_set(tk.INSERT, index)
+        widget.see(index)
+        widget.focus_set()
@@ -0,0 +1,138 @@
+"""
+该模块定义了 QuickOpenDialog 类，
+按原文、译文或备注模糊查找输入框中的条目，并跳转到条目所在的行。
+"""
+
+import time
+import tkinter as tk
+import ttkbootstrap as ttk
+from ttkbootstrap.constants import *
+
+# 列表中最多显示的结果数
+MAX_RESULT_ROWS = 100
+
+
+class QuickOpenDialog(ttk.Toplevel):
+    """
+    快速跳转面板。
+    输入时实时显示匹配程度最高的条目，上下方向键选择，回车跳转，Esc 关闭。
+    """
+    def __init__(self, master, app_instance):
+        """
+        初始化快速跳转面板。
+
+        Args:
+            master: 父控件 (主窗口)。
+            app_instance: 主应用程序的实例。
+        """
+        super().__init__(master)
+        self.app = app_instance
+        self.index = app_instance.get_quick_open_index()
+
+        self.transient(master)
+        self.title("转到条目")
+        self.geometry("640x360")
+
+        self.create_widgets()
+        self.protocol("WM_DELETE_WINDOW", self.destroy)
+        self.bind("<Escape>", lambda e: self.destroy())
+
+        if self.index.ready:
+            self.status_label.config(text=f"共 {len(self.index.index)} 个条目")
+        else:
+            self.status_label.config(text="正在建立索引...")
+            self.query_entry.config(state=DISABLED)
+        self.index.refresh(self._on_index_ready)
+
+    def create_widgets(self):
+        """创建并布局对话框中的所有UI组件。"""
+        main_frame = ttk.Frame(self, padding="10")
+        main_frame.pack(expand=True, fill=BOTH)
+
+        self.query_entry = ttk.Entry(main_frame)
+        self.query_entry.pack(fill=X)
+        self.query_entry.focus_set()
+        self.query_entry.bind("<KeyRelease>", self.on_query_change)
+        self.query_entry.bind("<Return>", self.jump_to_selected)
+        self.query_entry.bind("<Down>", lambda e: self.move_selection(1))
+        self.query_entry.bind("<Up>", lambda e: self.move_selection(-1))
+
+        table_frame = ttk.Frame(main_frame)
+        table_frame.pack(expand=True, fill=BOTH, pady=5)
+        columns = (("line", "行", 60), ("org", "原文", 200), ("rep", "译文", 200), ("note", "备注", 140))
+        self.tree = ttk.Treeview(table_frame, columns=[c[0] for c in columns], show="headings", selectmode=BROWSE)
+        for col, title, width in columns:
+            self.tree.heading(col, text=title)
+            self.tree.column(col, width=width, anchor=E if col == "line" else W)
+        vbar = ttk.Scrollbar(table_frame, orient=VERTICAL, command=self.tree.yview)
+        self.tree.configure(yscrollcommand=vbar.set)
+        self.tree.pack(side=LEFT, expand=True, fill=BOTH)
+        vbar.pack(side=RIGHT, fill=Y)
+        self.tree.bind("<Double-1>", self.jump_to_selected)
+        self.tree.bind("<Return>", self.jump_to_selected)
+
+        self.status_label = ttk.Label(main_frame, text="")
+        self.status_label.pack(anchor=W)
+
+    def _on_index_ready(self, error):
+        if not self.winfo_exists():
+            return
+        self.query_entry.config(state=NORMAL)
+        self.query_entry.focus_set()
+        if error:
+            self.status_label.config(text=error)
+            return
+        self.status_label.config(text=f"共 {len(self.index.index)} 个条目")
+        if self.query_entry.get().strip():
+            self.on_query_change()
+
+    def on_query_change(self, event=None):
+        """查询内容改变后重新查找。"""
+        if event is not None and event.keysym in ("Up", "Down", "Return", "Escape"):
+            return
+        query = self.query_entry.get()
+        self.tree.delete(*self.tree.get_children())
+        if not query.strip():
+            self.status_label.config(text=f"共 {len(self.index.index)} 个条目")
+            return
+        if not self.index.ready:
+            # 输入内容在面板打开期间被修改，先更新索引
+            self.status_label.config(text="正在更新索引...")
+            self.index.refresh(self._on_index_ready)
+            return
+
+        start = time.perf_counter()
+        matches = self.index.search(query, MAX_RESULT_ROWS)
+        elapsed = (time.perf_counter() - start) * 1000
+        for match in matches:
+            self.tree.insert("", END, values=(match.line, match.org, match.rep, match.note))
+        children = self.tree.get_children()
+        if children:
+            self.tree.selection_set(children[0])
+        self.status_label.config(text=f"找到 {len(matches)} 个结果 ({elapsed:.1f}ms)")
+
+    def move_selection(self, step: int):
+        """在结果列表中上下移动选中项，焦点仍留在查询框中。"""
+        children = self.tree.get_children()
+        if not children:
+            return "break"
+        selection = self.tree.selection()
+        position = children.index(selection[0]) + step if selection else 0
+        item = children[max(0, min(position, len(children) - 1))]
+        self.tree.selection_set(item)
+        self.tree.see(item)
+        return "break"
+
+    def jump_to_selected(self, event=None):
+        """跳转到选中条目所在的行并关闭面板。"""
+        selection = self.tree.selection()
+        if not selection:
+            return
+        line = self.tree.item(selection[0], "values")[0]
+        widget = self.app.input_text
+        widget.tag_remove("goto_line", "1.0", tk.END)
+        widget.tag_add("goto_line", f"{line}.0", f"{line}.end")
+        widget.mark_set(tk.INSERT, f"{line}.0")
+        widget.see(f"{line}.0")
+        self.destroy()
+        widget.focus_set()
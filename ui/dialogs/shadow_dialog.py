@@ -0,0 +1,124 @@
+"""
+该模块定义了 ShadowAnalysisDialog 类，
+列出原文互相包含的条目对，并可一键按原文长度重新排列输入框中的条目。
+"""
+
+import tkinter as tk
+import ttkbootstrap as ttk
+from ttkbootstrap.constants import *
+from tkinter import messagebox
+
+from core import analysis
+from utils.tracing import span
+
+# 表格中最多显示的行数
+MAX_TABLE_ROWS = 5000
+
+
+class ShadowAnalysisDialog(ttk.Toplevel):
+    """
+    遮蔽分析窗口。
+    当短原文排在包含它的长原文之前时，按顺序替换的工具会使长原文失效，这类条目对会被标记出来。
+    """
+    def __init__(self, master, app_instance):
+        """
+        初始化遮蔽分析对话框。
+
+        Args:
+            master: 父控件 (主窗口)。
+            app_instance: 主应用程序的实例。
+        """
+        super().__init__(master)
+        self.app = app_instance
+
+        self.transient(master)
+        self.title("遮蔽分析")
+        self.geometry("850x500")
+
+        self.entries = None
+        self.pairs = []
+
+        self.create_widgets()
+        self.protocol("WM_DELETE_WINDOW", self.destroy)
+        self.analyze()
+
+    def create_widgets(self):
+        """创建并布局对话框中的所有UI组件。"""
+        main_frame = ttk.Frame(self, padding="10")
+        main_frame.pack(expand=True, fill=BOTH)
+
+        top_frame = ttk.Frame(main_frame)
+        top_frame.pack(fill=X)
+        ttk.Button(top_frame, text="重新分析", command=self.analyze, bootstyle="primary").pack(side=LEFT)
+        self.only_shadowed_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(top_frame, text="仅显示会被遮蔽的条目对", variable=self.only_shadowed_var,
+                        command=self.refresh_table, bootstyle="primary").pack(side=LEFT, padx=10)
+        self.stats_label = ttk.Label(top_frame, text="")
+        self.stats_label.pack(side=LEFT, padx=10)
+
+        table_frame = ttk.Frame(main_frame)
+        table_frame.pack(expand=True, fill=BOTH, pady=5)
+        columns = (("outer_no", "序号", 60), ("outer", "长原文", 250), ("inner_no", "序号", 60),
+                   ("inner", "被包含的短原文", 250), ("state", "状态", 120))
+        self.tree = ttk.Treeview(table_frame, columns=[c[0] for c in columns], show="headings")
+        for col, title, width in columns:
+            self.tree.heading(col, text=title)
+            self.tree.column(col, width=width, anchor=E if col.endswith("_no") else W)
+        self.tree.tag_configure("shadowed", foreground="#c0392b")
+        vbar = ttk.Scrollbar(table_frame, orient=VERTICAL, command=self.tree.yview)
+        self.tree.configure(yscrollcommand=vbar.set)
+        self.tree.pack(side=LEFT, expand=True, fill=BOTH)
+        vbar.pack(side=RIGHT, fill=Y)
+
+        btn_frame = ttk.Frame(main_frame)
+        btn_frame.pack(fill=X)
+        ttk.Label(btn_frame, text="序号为条目在字典中的位置（从 1 开始）").pack(side=LEFT)
+        ttk.Button(btn_frame, text="按原文长度排序（长的优先）", command=self.reorder_by_length, bootstyle="warning").pack(side=RIGHT)
+
+    def _parse_input(self):
+        """解析输入框中的字典，失败时提示并返回 None。"""
+        content = self.app.input_text.get_content()
+        format_key = self.app.resolve_input_format_key()
+        if not content.strip() or not format_key:
+            messagebox.showwarning("警告", "输入框中没有字典，或无法识别其格式。", parent=self)
+            return None, None
+        try:
+            return self.app.parse_input_entries(content, format_key), format_key
+        except Exception as e:
+            messagebox.showerror("解析失败", str(e), parent=self)
+            return None, None
+
+    def analyze(self):
+        """分析输入框中字典的原文包含关系。"""
+        entries, _ = self._parse_input()
+        if entries is None:
+            return
+        with span("遮蔽分析"):
+            self.pairs = analysis.find_shadow_pairs(entries)
+        self.entries = entries
+        self.refresh_table()
+
+    def refresh_table(self):
+        if self.entries is None:
+            return
+        pairs = [p for p in self.pairs if p.shadowed] if self.only_shadowed_var.get() else self.pairs
+        self.tree.delete(*self.tree.get_children())
+        for pair in pairs[:MAX_TABLE_ROWS]:
+            self.tree.insert("", END, values=(
+                pair.outer + 1, self.entries[pair.outer]['org'],
+                pair.inner + 1, self.entries[pair.inner]['org'],
+                "会被遮蔽" if pair.shadowed else "顺序正确",
+            ), tags=("shadowed",) if pair.shadowed else ())
+
+        shadowed_count = sum(1 for p in self.pairs if p.shadowed)
+        shown = f"，表格显示前 {MAX_TABLE_ROWS} 对" if len(pairs) > MAX_TABLE_ROWS else ""
+        self.stats_label.config(text=f"共 {len(self.pairs)} 对包含关系，其中 {shadowed_count} 对会被遮蔽{shown}")
+
+    def reorder_by_length(self):
+        """将输入框中的条目按原文长度从长到短稳定排序，使长原文总是先被替换。"""
+        entries, format_key = self._parse_input()
+        if entries is None:
+            return
+        self.app.replace_input_entries(analysis.sort_by_org_length(entries), format_key)
+        self.app.status_var.set(f"已按原文长度重新排列 {len(entries)} 个条目")
+        self.analyze()
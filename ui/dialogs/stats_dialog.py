@@ -0,0 +1,171 @@
+"""
+该模块定义了 StatsDialog 类，
+实时显示输入框中字典的条目数、重复原文、空备注比例以及原文/译文的长度分布。
+"""
+
+import threading
+import time
+import tkinter as tk
+import ttkbootstrap as ttk
+from ttkbootstrap.constants import *
+
+from constants import HIGHLIGHT_DELAY_MS
+from core.incremental import RECORD_FORMATS
+from core.stats import MAX_LENGTH_BUCKET, DictionaryStats, StatsSummary
+
+# 直方图的尺寸与颜色
+CHART_WIDTH = 560
+CHART_HEIGHT = 120
+CHART_COLORS = {"org": "#4a7ab8", "rep": "#5a9e6f"}
+
+
+class StatsDialog(ttk.Toplevel):
+    """
+    字典统计面板。
+    输入内容修改后，只重新解析被修改的记录并增减各项计数，不会阻止在主窗口中继续编辑。
+    """
+    def __init__(self, master, app_instance):
+        """
+        初始化字典统计面板。
+
+        Args:
+            master: 父控件 (主窗口)。
+            app_instance: 主应用程序的实例。
+        """
+        super().__init__(master)
+        self.app = app_instance
+        self.stats = DictionaryStats()
+        # 统计对应的输入框内容版本，-1 表示尚未统计
+        self.version = -1
+        self._running = False
+        self._job = None
+
+        self.transient(master)
+        self.title("字典统计")
+        self.resizable(False, False)
+
+        self.create_widgets()
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
+        self.app.input_text.add_change_listener(self._on_input_edited)
+        self.refresh()
+
+    def create_widgets(self):
+        """创建并布局对话框中的所有UI组件。"""
+        main_frame = ttk.Frame(self, padding="10")
+        main_frame.pack(expand=True, fill=BOTH)
+
+        grid = ttk.Frame(main_frame)
+        grid.pack(fill=X)
+        self.value_labels = {}
+        rows = (("entries", "条目数"), ("duplicates", "重复原文"), ("empty_notes", "空备注"), ("lengths", "平均长度"))
+        for row, (key, title) in enumerate(rows):
+            ttk.Label(grid, text=f"{title}:").grid(row=row, column=0, sticky=W, pady=1)
+            label = ttk.Label(grid, text="-")
+            label.grid(row=row, column=1, sticky=W, padx=10)
+            self.value_labels[key] = label
+
+        self.charts = {}
+        for key, title in (("org", "原文长度分布"), ("rep", "译文长度分布")):
+            ttk.Label(main_frame, text=title).pack(anchor=W, pady=(10, 2))
+            canvas = tk.Canvas(main_frame, width=CHART_WIDTH, height=CHART_HEIGHT, background="white",
+                               highlightthickness=1, highlightbackground="#cccccc")
+            canvas.pack()
+            self.charts[key] = canvas
+
+        self.status_label = ttk.Label(main_frame, text="")
+        self.status_label.pack(anchor=W, pady=(10, 0))
+
+    def on_close(self):
+        if self._job:
+            self.after_cancel(self._job)
+        self.app.input_text.remove_change_listener(self._on_input_edited)
+        self.destroy()
+
+    # -------------------------------------------------------------
+    # 统计更新
+    # -------------------------------------------------------------
+    def _on_input_edited(self, start_line, old_count, new_count):
+        """输入内容被修改后，停止输入一段时间再更新统计。"""
+        if self._job:
+            self.after_cancel(self._job)
+        self._job = self.after(HIGHLIGHT_DELAY_MS, self.refresh)
+
+    def refresh(self):
+        """在后台线程中把统计更新到输入框的当前内容；首次统计大字典时不会卡住界面。"""
+        self._job = None
+        if self._running:
+            # 当前更新完成后会检查内容版本，必要时再次更新
+            return
+        model = self.app.input_text.model
+        if self.version == model.version:
+            return
+        format_key = self.app.resolve_input_format_key()
+        if format_key not in RECORD_FORMATS:
+            self.status_label.config(text="无法识别输入内容的格式" if format_key is None else "该格式不支持统计")
+            return
+
+        # 行列表按版本缓存且不会被修改，后台线程可以安全地读取
+        lines, version = model.lines, model.version
+        job = {}
+
+        def worker():
+            try:
+                start = time.perf_counter()
+                job["reparsed"] = self.stats.update(lines, format_key)
+                job["elapsed"] = (time.perf_counter() - start) * 1000
+                job["summary"] = self.stats.summary()
+            except Exception as e:
+                job["error"] = e
+
+        self._running = True
+        threading.Thread(target=worker, daemon=True).start()
+        self.after(50, lambda: self._poll(job, version))
+
+    def _poll(self, job: dict, version: int):
+        if not self.winfo_exists():
+            return
+        if not job:
+            self.after(50, lambda: self._poll(job, version))
+            return
+        self._running = False
+        if "error" in job:
+            self.version = -1
+            self.stats.reset()
+            self.status_label.config(text=f"统计失败: {job['error']}")
+            return
+        self.version = version
+        self.show_summary(job["summary"])
+        self.status_label.config(text=f"重新解析 {job['reparsed']} 条记录，耗时 {job['elapsed']:.1f}ms")
+        if version != self.app.input_text.model.version:
+            self.refresh()
+
+    # -------------------------------------------------------------
+    # 显示
+    # -------------------------------------------------------------
+    def show_summary(self, summary: StatsSummary):
+        labels = self.value_labels
+        labels["entries"].config(text=f"{summary.entries}")
+        labels["duplicates"].config(text=f"{summary.duplicates} 个条目（{summary.duplicate_orgs} 个原文出现不止一次）")
+        labels["empty_notes"].config(text=f"{summary.empty_notes} 个条目（{summary.empty_note_ratio:.1%}）")
+        labels["lengths"].config(text=f"原文 {summary.mean_org_length:.1f} 字，译文 {summary.mean_rep_length:.1f} 字")
+        self._draw_histogram(self.charts["org"], summary.org_lengths, CHART_COLORS["org"])
+        self._draw_histogram(self.charts["rep"], summary.rep_lengths, CHART_COLORS["rep"])
+
+    @staticmethod
+    def _draw_histogram(canvas: tk.Canvas, counts, color: str):
+        """绘制长度分布的柱状图，横轴为长度，最后一根柱子包括所有更长的条目。"""
+        canvas.delete("all")
+        top = max(counts) or 1
+        margin_bottom = 16
+        bar_width = CHART_WIDTH / MAX_LENGTH_BUCKET
+        usable = CHART_HEIGHT - margin_bottom - 12
+        for i, count in enumerate(counts):
+            x0 = i * bar_width + 1
+            height = usable * count / top
+            if count:
+                canvas.create_rectangle(x0, CHART_HEIGHT - margin_bottom - height, x0 + bar_width - 2,
+                                        CHART_HEIGHT - margin_bottom, fill=color, outline="")
+            if i % 4 == 0 or i == MAX_LENGTH_BUCKET - 1:
+                label = f"{i}+" if i == MAX_LENGTH_BUCKET - 1 else str(i)
+                canvas.create_text(x0 + bar_width / 2, CHART_HEIGHT - margin_bottom / 2, text=label, font=("黑体", 8))
+        canvas.create_text(4, 2, text=f"最多 {top}", anchor=NW, font=("黑体", 8), fill="#666666")
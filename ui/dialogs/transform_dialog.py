@@ -0,0 +1,176 @@
+"""
+该模块定义了 TransformDialog 类，
+提供对输入框中的字典或大型字典文件进行排序、去重和去除空白的对话框。
+"""
+
+import threading
+import tkinter as tk
+import ttkbootstrap as ttk
+from ttkbootstrap.constants import *
+from tkinter import filedialog, messagebox
+from pathlib import Path
+
+from constants import FORMAT_DEFINITIONS
+from core import conversion, transform
+from utils.tracing import span
+
+# 下拉框显示名称 -> 选项值
+SORT_CHOICES = {
+    "不排序": None,
+    "按原文": "org",
+    "按原文长度": "length",
+    "按规范化原文 (忽略全半角与大小写)": "nfkc",
+    "按系统区域设置": "locale",
+}
+DEDUPE_CHOICES = {
+    "不去重": None,
+    "原文完全相同": transform.DEDUPE_EXACT,
+    "原文规范化后相同 (NFKC/全半角/大小写)": transform.DEDUPE_FOLDED,
+    "原文规范化后相同 (另忽略平假名/片假名)": transform.DEDUPE_KANA,
+}
+
+
+class TransformDialog(ttk.Toplevel):
+    """
+    排序与去重窗口。
+    变换可以直接应用到输入框（可撤销），也可以对磁盘上的大文件以有界内存流式处理。
+    """
+    def __init__(self, master, app_instance):
+        """
+        初始化排序与去重对话框。
+
+        Args:
+            master: 父控件 (主窗口)。
+            app_instance: 主应用程序的实例。
+        """
+        super().__init__(master)
+        self.app = app_instance
+
+        self.transient(master)
+        self.title("排序与去重")
+        self.resizable(False, False)
+        self._running = False
+        self._job_result = None
+
+        self.create_widgets()
+        self.protocol("WM_DELETE_WINDOW", self.destroy)
+
+    def create_widgets(self):
+        """创建并布局对话框中的所有UI组件。"""
+        main_frame = ttk.Frame(self, padding="10")
+        main_frame.pack(expand=True, fill=BOTH)
+        main_frame.grid_columnconfigure(1, weight=1)
+
+        ttk.Label(main_frame, text="排序:").grid(row=0, column=0, sticky=W, pady=5)
+        self.sort_var = tk.StringVar(value="不排序")
+        ttk.Combobox(main_frame, textvariable=self.sort_var, values=list(SORT_CHOICES), state="readonly", width=36).grid(row=0, column=1, sticky=EW, padx=5)
+        self.reverse_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(main_frame, text="降序", variable=self.reverse_var, bootstyle="primary").grid(row=0, column=2, sticky=W)
+
+        ttk.Label(main_frame, text="去重:").grid(row=1, column=0, sticky=W, pady=5)
+        self.dedupe_var = tk.StringVar(value="不去重")
+        ttk.Combobox(main_frame, textvariable=self.dedupe_var, values=list(DEDUPE_CHOICES), state="readonly", width=36).grid(row=1, column=1, sticky=EW, padx=5)
+        ttk.Label(main_frame, text="(保留首个)").grid(row=1, column=2, sticky=W)
+
+        self.trim_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(main_frame, text="去除各字段首尾的空白字符", variable=self.trim_var, bootstyle="primary").grid(row=2, column=1, sticky=W, pady=5)
+
+        btn_frame = ttk.Frame(main_frame)
+        btn_frame.grid(row=3, column=0, columnspan=3, sticky=EW, pady=(10, 0))
+        ttk.Button(btn_frame, text="应用到输入框", command=self.apply_to_input, bootstyle="primary").pack(side=LEFT)
+        self.file_button = ttk.Button(btn_frame, text="处理大文件...", command=self.transform_file, bootstyle="secondary")
+        self.file_button.pack(side=LEFT, padx=5)
+        ttk.Button(btn_frame, text="关闭", command=self.destroy, bootstyle="secondary-outline").pack(side=RIGHT)
+
+    def _options(self) -> transform.TransformOptions:
+        return transform.TransformOptions(
+            sort=SORT_CHOICES[self.sort_var.get()],
+            reverse=self.reverse_var.get(),
+            dedupe=DEDUPE_CHOICES[self.dedupe_var.get()],
+            trim=self.trim_var.get(),
+        )
+
+    def apply_to_input(self):
+        """对输入框中的字典执行变换，并以可撤销的方式写回输入框。"""
+        content = self.app.input_text.get_content()
+        format_key = self.app.resolve_input_format_key()
+        if not content.strip() or not format_key:
+            messagebox.showwarning("警告", "输入框中没有字典，或无法识别其格式。", parent=self)
+            return
+        try:
+            entries = self.app.parse_input_entries(content, format_key)
+            with span("排序与去重"):
+                result = transform.transform_entries(entries, self._options())
+        except Exception as e:
+            messagebox.showerror("处理失败", str(e), parent=self)
+            return
+        self.app.replace_input_entries(result, format_key)
+        removed = len(entries) - len(result)
+        self.app.status_var.set(f"已处理 {len(entries)} 个条目，删除重复 {removed} 个")
+
+    def transform_file(self):
+        """选择输入和输出文件，在后台以有界内存流式处理，适合无法载入编辑器的大文件。"""
+        if self._running:
+            return
+        input_path = filedialog.askopenfilename(
+            parent=self,
+            title="选择要处理的字典文件",
+            initialdir=self.app.last_directory,
+            filetypes=[("所有支持格式", "*.json;*.toml;*.txt;*.gdx"), ("所有文件", "*.*")]
+        )
+        if not input_path:
+            return
+        try:
+            input_key = conversion.detect_file_format(input_path)
+        except (OSError, ValueError) as e:
+            messagebox.showerror("处理失败", str(e), parent=self)
+            return
+
+        output_display = self.app.output_format.get()
+        output_key = conversion.get_format_key(output_display, display_name=True)
+        default_ext = FORMAT_DEFINITIONS[output_key]["ext"]
+        output_path = filedialog.asksaveasfilename(
+            parent=self,
+            title=f"保存处理结果 ({output_display})",
+            initialdir=str(Path(input_path).parent),
+            initialfile=f"{Path(input_path).stem}_sorted{default_ext}",
+            defaultextension=default_ext,
+            filetypes=[(output_display, f"*{default_ext}"), ("所有文件", "*.*")]
+        )
+        if not output_path:
+            return
+
+        options = self._options()
+
+        def worker():
+            try:
+                with span("排序与去重"):
+                    count = transform.transform_file(input_path, output_path, input_key, output_key, options)
+                self._job_result = (count, None)
+            except Exception as e:
+                self._job_result = (None, e)
+
+        self._running = True
+        self._job_result = None
+        self.file_button.config(state=DISABLED)
+        self.app.last_directory = str(Path(input_path).parent)
+        self.app.status_var.set(f"正在处理 {Path(input_path).name}...")
+        threading.Thread(target=worker, daemon=True).start()
+        # 对话框关闭后仍需报告结果，因此在主窗口上轮询
+        self.app.root.after(100, lambda: self._poll_job(output_path))
+
+    def _poll_job(self, output_path: str):
+        """等待后台任务完成后在主线程中报告结果。"""
+        if self._job_result is None:
+            self.app.root.after(100, lambda: self._poll_job(output_path))
+            return
+        self._running = False
+        count, error = self._job_result
+        self._job_result = None
+        if self.winfo_exists():
+            self.file_button.config(state=NORMAL)
+        if error is not None:
+            messagebox.showerror("处理失败", str(error), parent=self.app.root)
+            self.app.status_var.set("处理失败")
+            return
+        self.app.status_var.set(f"已写入 {count} 个条目: {Path(output_path).name}")
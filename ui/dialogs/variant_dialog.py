@@ -0,0 +1,165 @@
+"""
+该模块定义了 VariantDialog 类，
+列出原文写法不同（全角/半角、大小写、平假名/片假名）但规范化后相同的条目，
+并支持忽略这些差异查找条目。
+"""
+
+import tkinter as tk
+import ttkbootstrap as ttk
+from ttkbootstrap.constants import *
+from tkinter import messagebox
+
+from core import transform
+from core.normalize import NormalizedKeyIndex
+from utils.tracing import span
+
+# 表格中最多显示的组数 / 查找结果数
+MAX_TABLE_GROUPS = 2000
+MAX_SEARCH_ROWS = 500
+
+
+class VariantDialog(ttk.Toplevel):
+    """
+    变体重复检查窗口。
+    写法不同的重复原文会让按顺序替换的工具只使用其中一条，这类条目按组列出。
+    """
+    def __init__(self, master, app_instance):
+        """
+        初始化变体重复检查对话框。
+
+        Args:
+            master: 父控件 (主窗口)。
+            app_instance: 主应用程序的实例。
+        """
+        super().__init__(master)
+        self.app = app_instance
+
+        self.transient(master)
+        self.title("变体重复检查")
+        self.geometry("800x500")
+
+        self.entries = None
+        self.index = None
+        self.groups = []
+
+        self.create_widgets()
+        self.protocol("WM_DELETE_WINDOW", self.destroy)
+        self.analyze()
+
+    def create_widgets(self):
+        """创建并布局对话框中的所有UI组件。"""
+        main_frame = ttk.Frame(self, padding="10")
+        main_frame.pack(expand=True, fill=BOTH)
+
+        top_frame = ttk.Frame(main_frame)
+        top_frame.pack(fill=X)
+        ttk.Button(top_frame, text="重新分析", command=self.analyze, bootstyle="primary").pack(side=LEFT)
+        self.kana_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(top_frame, text="忽略平假名与片假名的差异", variable=self.kana_var,
+                        command=self.analyze, bootstyle="primary").pack(side=LEFT, padx=10)
+        self.variants_only_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(top_frame, text="仅显示写法不同的组", variable=self.variants_only_var,
+                        command=self.refresh_table, bootstyle="primary").pack(side=LEFT)
+
+        search_frame = ttk.Frame(main_frame)
+        search_frame.pack(fill=X, pady=(5, 0))
+        ttk.Label(search_frame, text="查找原文:").pack(side=LEFT)
+        self.search_entry = ttk.Entry(search_frame)
+        self.search_entry.pack(side=LEFT, expand=True, fill=X, padx=5)
+        self.search_entry.bind("<Return>", self.search)
+        ttk.Button(search_frame, text="查找", command=self.search, bootstyle="secondary").pack(side=LEFT)
+        ttk.Button(search_frame, text="显示重复组", command=self.refresh_table, bootstyle="secondary-outline").pack(side=LEFT, padx=(5, 0))
+
+        table_frame = ttk.Frame(main_frame)
+        table_frame.pack(expand=True, fill=BOTH, pady=5)
+        columns = (("no", "序号", 70), ("org", "原文", 300), ("rep", "译文", 300))
+        self.tree = ttk.Treeview(table_frame, columns=[c[0] for c in columns], show="tree headings")
+        self.tree.column("#0", width=30, stretch=False)
+        for col, title, width in columns:
+            self.tree.heading(col, text=title)
+            self.tree.column(col, width=width, anchor=E if col == "no" else W)
+        self.tree.tag_configure("group", foreground="#c0392b")
+        vbar = ttk.Scrollbar(table_frame, orient=VERTICAL, command=self.tree.yview)
+        self.tree.configure(yscrollcommand=vbar.set)
+        self.tree.pack(side=LEFT, expand=True, fill=BOTH)
+        vbar.pack(side=RIGHT, fill=Y)
+
+        btn_frame = ttk.Frame(main_frame)
+        btn_frame.pack(fill=X)
+        self.stats_label = ttk.Label(btn_frame, text="")
+        self.stats_label.pack(side=LEFT)
+        ttk.Button(btn_frame, text="删除变体重复（保留首个）", command=self.remove_duplicates, bootstyle="warning").pack(side=RIGHT)
+
+    def _parse_input(self):
+        """解析输入框中的字典，失败时提示并返回 None。"""
+        content = self.app.input_text.get_content()
+        format_key = self.app.resolve_input_format_key()
+        if not content.strip() or not format_key:
+            messagebox.showwarning("警告", "输入框中没有字典，或无法识别其格式。", parent=self)
+            return None, None
+        try:
+            return self.app.parse_input_entries(content, format_key), format_key
+        except Exception as e:
+            messagebox.showerror("解析失败", str(e), parent=self)
+            return None, None
+
+    def analyze(self):
+        """为输入框中的字典建立规范化键索引并查找重复组。"""
+        entries, _ = self._parse_input()
+        if entries is None:
+            return
+        with span("变体重复检查"):
+            self.index = NormalizedKeyIndex(entries, kana=self.kana_var.get())
+            self.groups = self.index.duplicate_groups()
+        self.entries = entries
+        self.refresh_table()
+
+    def _insert_entry(self, parent: str, i: int):
+        item = self.entries[i]
+        self.tree.insert(parent, END, values=(i + 1, item['org'], item['rep']))
+
+    def refresh_table(self):
+        if self.entries is None:
+            return
+        groups = [g for g in self.groups if g.variant] if self.variants_only_var.get() else self.groups
+        self.tree.delete(*self.tree.get_children())
+        for group in groups[:MAX_TABLE_GROUPS]:
+            node = self.tree.insert("", END, open=True, tags=("group",),
+                                    values=("", group.key, f"{len(group.indices)} 个条目"))
+            for i in group.indices:
+                self._insert_entry(node, i)
+
+        variant_count = sum(1 for g in self.groups if g.variant)
+        shown = f"，表格显示前 {MAX_TABLE_GROUPS} 组" if len(groups) > MAX_TABLE_GROUPS else ""
+        self.stats_label.config(
+            text=f"共 {len(self.entries)} 个条目，{len(self.groups)} 组重复，其中 {variant_count} 组写法不同{shown}")
+
+    def search(self, event=None):
+        """忽略变体差异查找原文包含查询内容的条目。"""
+        if self.index is None:
+            return
+        query = self.search_entry.get()
+        if not query.strip():
+            self.refresh_table()
+            return
+        matches = self.index.search(query, MAX_SEARCH_ROWS)
+        self.tree.delete(*self.tree.get_children())
+        for i in matches:
+            self._insert_entry("", i)
+        more = f"（仅显示前 {MAX_SEARCH_ROWS} 个）" if len(matches) >= MAX_SEARCH_ROWS else ""
+        self.stats_label.config(text=f"找到 {len(matches)} 个条目{more}")
+
+    def remove_duplicates(self):
+        """删除规范化后原文重复的条目，保留每组中的第一个。"""
+        entries, format_key = self._parse_input()
+        if entries is None:
+            return
+        dedupe = transform.DEDUPE_KANA if self.kana_var.get() else transform.DEDUPE_FOLDED
+        result = transform.transform_entries(entries, transform.TransformOptions(dedupe=dedupe))
+        removed = len(entries) - len(result)
+        if not removed:
+            self.app.status_var.set("没有需要删除的重复条目")
+            return
+        self.app.replace_input_entries(result, format_key)
+        self.app.status_var.set(f"已删除 {removed} 个变体重复条目")
+        self.analyze()
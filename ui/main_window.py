@@ -5,6 +5,7 @@ from ttkbootstrap.constants import *
 
 from .custom_widgets import EditorWithLineNumbers
 from constants import EDITOR_STYLE
+from core import conversion
 
 class MainWindowUI:
     """负责主窗口UI的创建和布局。"""
@@ -24,7 +25,7 @@ class MainWindowUI:
         self.root.rowconfigure(0, weight=1)
         main_frame.columnconfigure(0, weight=1)
         main_frame.columnconfigure(1, weight=1)
-        main_frame.rowconfigure(1, weight=1)
+        main_frame.rowconfigure(2, weight=1)
         
         # --- 顶部控制区 ---
         top_control_frame = ttk.Frame(main_frame)
@@ -35,7 +36,9 @@ class MainWindowUI:
         
         # --- 输入格式 ---
         ttk.Label(format_frame, text="输入格式:").pack(anchor=W)
-        self.app.input_format = ttk.Combobox(format_frame, values=["自动检测"] + list(self.app.format_names.values()), state="readonly", width=25)
+        # 二进制格式无法在输入框中编辑，只作为输出格式提供
+        input_format_names = ["自动检测"] + conversion.text_format_names()
+        self.app.input_format = ttk.Combobox(format_frame, values=input_format_names, state="readonly", width=25)
         self.app.input_format.set("自动检测")
         self.app.input_format.pack(pady=2)
         
@@ -59,11 +62,16 @@ class MainWindowUI:
         ttk.Button(btn_grid, text="清空", command=self.app.clear, bootstyle="danger").grid(row=1, column=1, padx=5, pady=2)
         
         self.app.auto_convert_var = tk.BooleanVar(value=True)
-        ttk.Checkbutton(button_frame, text="打开文件时自动转换", variable=self.app.auto_convert_var, bootstyle="primary").pack(pady=5)
+        ttk.Checkbutton(button_frame, text="自动转换", variable=self.app.auto_convert_var, bootstyle="primary").pack(pady=5)
         
+        # --- 标签栏 ---
+        # 每个标签页只对应一个空的 Frame，编辑器由所有标签页共用
+        self.app.tab_bar = ttk.Notebook(main_frame)
+        self.app.tab_bar.grid(row=1, column=0, columnspan=2, sticky="ew")
+
         # --- 内容编辑区 ---
         content_frame = ttk.PanedWindow(main_frame, orient=HORIZONTAL)
-        content_frame.grid(row=1, column=0, columnspan=2, sticky="nsew")
+        content_frame.grid(row=2, column=0, columnspan=2, sticky="nsew")
 
         input_pane = ttk.Frame(content_frame)
         input_header = ttk.Frame(input_pane)
@@ -86,8 +94,18 @@ class MainWindowUI:
         content_frame.add(output_pane, weight=1)
         
         # --- 状态栏 ---
+        status_frame = ttk.Frame(main_frame)
+        status_frame.grid(row=3, column=0, columnspan=2, sticky="ew", pady=(5, 0))
         self.app.status_var = tk.StringVar(value="就绪")
-        ttk.Label(main_frame, textvariable=self.app.status_var, relief=SUNKEN).grid(row=2, column=0, columnspan=2, sticky="ew", pady=(5, 0))
+        ttk.Label(status_frame, textvariable=self.app.status_var, relief=SUNKEN).pack(side=LEFT, expand=True, fill=X)
+        # 最近一次操作的分阶段耗时
+        self.app.perf_var = tk.StringVar(value="")
+        ttk.Label(status_frame, textvariable=self.app.perf_var, relief=SUNKEN).pack(side=RIGHT, padx=(5, 0))
+        # 输入内容的校验问题数量，点击打开问题列表
+        self.app.lint_var = tk.StringVar(value="")
+        lint_label = ttk.Label(status_frame, textvariable=self.app.lint_var, relief=SUNKEN, cursor="hand2")
+        lint_label.pack(side=RIGHT, padx=(5, 0))
+        lint_label.bind("<Button-1>", lambda e: self.app.show_problems_dialog())
 
         # --- 编辑器共享样式 ---
         self.app.input_text.config(**EDITOR_STYLE)
@@ -103,8 +121,38 @@ class MainWindowUI:
         
         edit_menu = tk.Menu(self.app.menu_bar, tearoff=0)
         self.app.menu_bar.add_cascade(label="编辑", menu=edit_menu)
+        edit_menu.add_command(label="新建标签页 (Ctrl+T)", command=self.app.new_tab)
+        edit_menu.add_command(label="关闭标签页 (Ctrl+W)", command=self.app.close_tab)
+        edit_menu.add_separator()
         edit_menu.add_command(label="查找与替换 (Ctrl+F)", command=self.app._show_find_replace_dialog)
+        edit_menu.add_command(label="在目录中查找与替换...", command=self.app.show_project_search_dialog)
         edit_menu.add_command(label="跳转到行... (Ctrl+G)", command=self.app._show_goto_line_dialog)
+        edit_menu.add_command(label="转到条目... (Ctrl+P)", command=self.app.show_quick_open_dialog)
+        edit_menu.add_command(label="问题列表...", command=self.app.show_problems_dialog)
+        edit_menu.add_separator()
+        self.app.watch_file_var = tk.BooleanVar(value=self.app.settings.get("watch_file", False))
+        edit_menu.add_checkbutton(label="监视文件变化", variable=self.app.watch_file_var, command=self.app.file_handler.watch_current_file)
+        
+        tools_menu = tk.Menu(self.app.menu_bar, tearoff=0)
+        self.app.menu_bar.add_cascade(label="工具", menu=tools_menu)
+        tools_menu.add_command(label="排序与去重...", command=self.app.show_transform_dialog)
+        tools_menu.add_command(label="词库数据库...", command=self.app.show_glossary_store_dialog)
+        tools_menu.add_command(label="应用字典预览...", command=self.app.show_apply_preview_dialog)
+        tools_menu.add_command(label="覆盖率统计...", command=self.app.show_coverage_dialog)
+        tools_menu.add_command(label="遮蔽分析...", command=self.app.show_shadow_analysis_dialog)
+        tools_menu.add_command(label="变体重复检查...", command=self.app.show_variant_dialog)
+        tools_menu.add_command(label="字典统计...", command=self.app.show_stats_dialog)
+        
+        debug_menu = tk.Menu(self.app.menu_bar, tearoff=0)
+        self.app.menu_bar.add_cascade(label="调试", menu=debug_menu)
+        self.app.trace_var = tk.BooleanVar(value=False)
+        debug_menu.add_checkbutton(label="记录性能追踪", variable=self.app.trace_var, command=self.app.toggle_trace)
+        debug_menu.add_command(label="导出追踪 (Chrome JSON)...", command=self.app.export_trace)
+        debug_menu.add_command(label="清空追踪记录", command=self.app.clear_trace)
+        debug_menu.add_separator()
+        self.app.memory_profile_var = tk.BooleanVar(value=False)
+        debug_menu.add_checkbutton(label="记录内存分析", variable=self.app.memory_profile_var, command=self.app.toggle_memory_profile)
+        debug_menu.add_command(label="内存报告...", command=self.app.show_memory_report_dialog)
         
         help_menu = tk.Menu(self.app.menu_bar, tearoff=0)
         self.app.menu_bar.add_cascade(label="帮助", menu=help_menu)
@@ -116,3 +164,6 @@ class MainWindowUI:
         
         self.root.bind_all("<Control-f>", self.app._show_find_replace_dialog)
         self.root.bind_all("<Control-g>", self.app._show_goto_line_dialog)
+        self.root.bind_all("<Control-p>", self.app.show_quick_open_dialog)
+        self.root.bind_all("<Control-t>", self.app.new_tab)
+        self.root.bind_all("<Control-w>", self.app.close_tab)
@@ -0,0 +1,354 @@
+"""
+该模块实现了多文档标签页。
+
+输入框和输出框只有一组，切换标签页时先把当前文档的状态（内容、格式、文件关联、解析结果、光标位置）
+保存下来，再把目标文档载入编辑器；所有标签页共用快照缓存、语法高亮与校验。
+未激活文档占用的内存超出预算时，按最久未使用的顺序逐级压缩：
+先丢弃解析结果，再用 zlib 压缩内容，最后对未修改的文件只保留路径，激活时从磁盘（及快照缓存）重新加载。
+"""
+
+import sys
+import tkinter as tk
+import zlib
+from pathlib import Path
+from tkinter import messagebox
+from typing import List, Optional
+
+import ttkbootstrap as ttk
+
+from utils.file_watcher import file_signature
+
+# 估算解析结果大小时抽样的条目数
+MEMORY_SAMPLE_ENTRIES = 1000
+
+
+def _estimate_entries_bytes(entries: list) -> int:
+    """抽样估算条目列表占用的内存（字节）。"""
+    if not entries:
+        return 0
+    sample = entries[::max(len(entries) // MEMORY_SAMPLE_ENTRIES, 1)]
+    per_entry = sum(sys.getsizeof(item) + sum(sys.getsizeof(v) for v in item.values()) for item in sample) / len(sample)
+    return int(per_entry * len(entries)) + sys.getsizeof(entries)
+
+
+class Document:
+    """
+    一个标签页对应的文档。
+    激活时其状态保存在编辑器和主程序中，以下属性只在未激活时有效。
+
+    Attributes:
+        untitled_name: 未关联文件时标签页显示的名称。
+        path: 关联的文件路径，未关联文件时为 None。
+        input_format: 输入格式下拉框的显示名称。
+        modified: 是否有未保存的修改。
+        text: 未压缩的内容。
+        compressed: zlib 压缩后的内容，与 text 二者最多有一个。
+        snapshot: 解析结果 (内容, 格式键, 条目列表)。
+        loaded_stat: 打开或保存文件时的 os.stat 结果。
+        loaded_text: 打开或保存时的文件内容，仅在与当前内容不同（即已修改）时保存。
+        insert: 光标位置。
+        yview: 垂直滚动位置。
+    """
+    def __init__(self, frame, untitled_name: str):
+        self.frame = frame
+        self.untitled_name = untitled_name
+        self.path: Optional[str] = None
+        self.input_format = "自动检测"
+        self.modified = False
+        self.text: Optional[str] = ""
+        self.compressed: Optional[bytes] = None
+        self.snapshot: Optional[tuple] = None
+        self.loaded_stat = None
+        self.loaded_text: Optional[str] = None
+        self.insert = "1.0"
+        self.yview = 0.0
+        self.last_used = 0
+        self.memory = 0
+
+    def content(self) -> Optional[str]:
+        """返回文档内容；内容已释放、需要从磁盘重新加载时返回 None。"""
+        if self.compressed is not None:
+            return zlib.decompress(self.compressed).decode("utf-8", errors="surrogatepass")
+        return self.text
+
+    def measure(self):
+        """重新估算文档占用的内存。"""
+        memory = 0
+        if self.text is not None:
+            memory += sys.getsizeof(self.text)
+        if self.compressed is not None:
+            memory += len(self.compressed)
+        if self.snapshot is not None:
+            memory += _estimate_entries_bytes(self.snapshot[2])
+        if self.loaded_text is not None:
+            memory += sys.getsizeof(self.loaded_text)
+        self.memory = memory
+
+    # -------------------------------------------------------------
+    # 逐级释放内存
+    # -------------------------------------------------------------
+    def drop_caches(self):
+        """丢弃解析结果和打开时的原始内容，它们都可以重新得到。"""
+        self.snapshot = None
+        self.loaded_text = None
+        self.measure()
+
+    def compress(self):
+        """用 zlib 压缩内容。"""
+        if self.text:
+            self.compressed = zlib.compress(self.text.encode("utf-8", errors="surrogatepass"), 1)
+            self.text = None
+            self.measure()
+
+    def release(self):
+        """未修改且磁盘上的文件没有变化时，只保留路径，激活时重新加载。"""
+        if self.path is None or self.modified or self.loaded_stat is None:
+            return
+        if file_signature(self.path) != (self.loaded_stat.st_mtime_ns, self.loaded_stat.st_size):
+            return
+        self.text = None
+        self.compressed = None
+        self.snapshot = None
+        self.measure()
+
+
+class DocumentManager:
+    """
+    管理所有标签页，负责切换时保存与恢复文档状态，并按内存预算压缩未激活的文档。
+    """
+    def __init__(self, app_instance, notebook: ttk.Notebook, budget_mb: int):
+        """
+        初始化文档管理器，并创建第一个空白标签页。
+
+        Args:
+            app_instance: 主应用程序 GPTDictConverter 的实例。
+            notebook: 仅用作标签栏的 Notebook 控件，每个标签页对应一个空的 Frame。
+            budget_mb: 未激活文档可占用的内存预算（MB）。
+        """
+        self.app = app_instance
+        self.notebook = notebook
+        self.budget_bytes = budget_mb * 1024 * 1024
+        self.documents: List[Document] = []
+        self.active: Optional[Document] = None
+        self._clock = 0
+        self._untitled = 0
+        self._label_job = None
+
+        self.notebook.bind("<<NotebookTabChanged>>", self.on_tab_changed)
+        # 鼠标中键关闭标签页
+        self.notebook.bind("<Button-2>", self.on_middle_click)
+        self.app.input_text.add_change_listener(self._on_input_edited)
+
+        self.active = self._add_document()
+        self.update_active_label()
+
+    def _add_document(self) -> Document:
+        frame = ttk.Frame(self.notebook, height=0)
+        self._untitled += 1
+        doc = Document(frame, f"未命名 {self._untitled}")
+        self.documents.append(doc)
+        self.notebook.add(frame, text=doc.untitled_name)
+        return doc
+
+    def _document_of(self, frame_name: str) -> Optional[Document]:
+        for doc in self.documents:
+            if str(doc.frame) == frame_name:
+                return doc
+        return None
+
+    # -------------------------------------------------------------
+    # 标签页操作
+    # -------------------------------------------------------------
+    def new_document(self):
+        """新建一个空白标签页并切换过去。"""
+        self.activate(self._add_document())
+
+    def close_active(self):
+        """关闭当前标签页。"""
+        self.close(self.active)
+
+    def close(self, doc: Document):
+        """
+        关闭标签页，有未保存的修改时先确认。关闭最后一个标签页时会留下一个空白标签页。
+        """
+        modified = self.app.input_text.is_modified_flag if doc is self.active else doc.modified
+        if modified and not messagebox.askyesno("关闭标签页", f"{self.label_of(doc)} 的内容已被修改但未保存，确定要关闭吗？"):
+            return
+        if len(self.documents) == 1:
+            self._add_document()
+        index = self.documents.index(doc)
+        if doc is self.active:
+            neighbor = self.documents[index + 1] if index + 1 < len(self.documents) else self.documents[index - 1]
+            self.activate(neighbor, store_active=False)
+        self.documents.remove(doc)
+        self.notebook.forget(doc.frame)
+        doc.frame.destroy()
+
+    def select_tab_for_file(self, path: str) -> bool:
+        """
+        为打开文件选择标签页：文件已在某个标签页中打开时切换过去；
+        否则当前标签页为空白时直接使用，不是空白时新建一个标签页。
+
+        Returns:
+            文件是否已在某个标签页中打开（此时无需再加载）。
+        """
+        target = Path(path).resolve()
+        for doc in self.documents:
+            doc_path = self.app.current_file_path if doc is self.active else doc.path
+            if doc_path and Path(doc_path).resolve() == target:
+                self.activate(doc)
+                return True
+        editor = self.app.input_text
+        if self.app.current_file_path or editor.is_modified_flag or editor.get_content():
+            self.new_document()
+        return False
+
+    def modified_documents(self) -> List[Document]:
+        """返回所有有未保存修改的文档。"""
+        return [doc for doc in self.documents
+                if (self.app.input_text.is_modified_flag if doc is self.active else doc.modified)]
+
+    def on_tab_changed(self, event=None):
+        doc = self._document_of(self.notebook.select())
+        if doc is not None and doc is not self.active:
+            self.activate(doc)
+
+    def on_middle_click(self, event):
+        try:
+            index = self.notebook.index(f"@{event.x},{event.y}")
+        except tk.TclError:
+            return
+        self.close(self.documents[index])
+
+    # -------------------------------------------------------------
+    # 标签文本
+    # -------------------------------------------------------------
+    def label_of(self, doc: Document) -> str:
+        if doc is self.active:
+            path, modified = self.app.current_file_path, self.app.input_text.is_modified_flag
+        else:
+            path, modified = doc.path, doc.modified
+        name = Path(path).name if path else doc.untitled_name
+        return f"{name} *" if modified else name
+
+    def update_active_label(self):
+        """刷新当前标签页的标题（文件名与修改标记）。"""
+        self._label_job = None
+        if self.active is not None:
+            self.notebook.tab(self.active.frame, text=self.label_of(self.active))
+
+    def _on_input_edited(self, start_line, old_count, new_count):
+        # 修改标记在 <<Modified>> 事件中才更新，等空闲时再刷新标题
+        if self._label_job is None:
+            self._label_job = self.app.root.after_idle(self.update_active_label)
+
+    # -------------------------------------------------------------
+    # 切换
+    # -------------------------------------------------------------
+    def activate(self, doc: Document, store_active: bool = True):
+        """
+        切换到 doc：保存当前文档的状态，将 doc 载入编辑器，再按预算压缩未激活的文档。
+
+        Args:
+            doc: 目标文档。
+            store_active: 是否保存当前文档的状态（关闭当前标签页时不需要）。
+        """
+        if doc is self.active:
+            return
+        if store_active and self.active is not None:
+            self._store_active()
+        self.active = doc
+        self._clock += 1
+        doc.last_used = self._clock
+        if str(doc.frame) != self.notebook.select():
+            self.notebook.select(doc.frame)
+        self._restore(doc)
+        self._enforce_budget()
+
+    def _store_active(self):
+        """将编辑器中的当前文档状态保存到 Document 对象。"""
+        app, doc = self.app, self.active
+        editor = app.input_text
+        content = editor.get_content()
+        doc.path = app.current_file_path
+        doc.input_format = app.input_format.get()
+        doc.modified = editor.is_modified_flag
+        doc.insert = editor.index(tk.INSERT)
+        doc.yview = editor.text.yview()[0]
+
+        # 解析结果与打开时的内容通常与当前内容相同，共用同一个字符串对象
+        snapshot = app._parsed_snapshot
+        if snapshot and snapshot[0] == content:
+            content = snapshot[0]
+            doc.snapshot = snapshot
+        else:
+            doc.snapshot = None
+        loaded = app.file_handler._loaded_file
+        if loaded and doc.path and loaded[0] == doc.path:
+            doc.loaded_stat = loaded[1]
+            doc.loaded_text = None if loaded[2] == content else loaded[2]
+        else:
+            doc.loaded_stat = doc.loaded_text = None
+        doc.text, doc.compressed = content, None
+        doc.measure()
+
+    def _restore(self, doc: Document):
+        """将文档载入编辑器。"""
+        app = self.app
+        editor = app.input_text
+        content = doc.content()
+        app.output_binary = None
+        app.output_text.clear()
+
+        if content is None:
+            # 内容已释放：重新打开文件，解析结果可从快照缓存中取得
+            editor.clear()
+            app.current_file_path = None
+            app.file_handler._load_file(doc.path)
+        else:
+            editor.set_content(content, reset_modified_flag=True)
+            editor.is_modified_flag = doc.modified
+            app.input_format.set(doc.input_format)
+            app.current_file_path = doc.path
+            if doc.snapshot is not None:
+                app.set_parsed_snapshot(*doc.snapshot)
+            if doc.loaded_stat is not None:
+                loaded_text = content if doc.loaded_text is None and not doc.modified else doc.loaded_text
+                app.file_handler._loaded_file = (doc.path, doc.loaded_stat, loaded_text) if loaded_text is not None else None
+            else:
+                app.file_handler._loaded_file = None
+            app.file_handler.watch_current_file()
+            if doc.path:
+                app.root.title(f"GPT字典编辑转换器   {app.APP_VERSION}   [已打开 {doc.path} ]")
+            else:
+                app.root.title(f"GPT字典编辑转换器   {app.APP_VERSION}")
+            app.syntax_handler.update_all_highlights(editor)
+            app.auto_convert()
+            # 未激活期间文件被外部程序修改时，与监视文件变化一样只更新变化的行
+            stat = doc.loaded_stat
+            if doc.path and stat is not None and app.watch_file_var.get() \
+                    and file_signature(doc.path) not in (None, (stat.st_mtime_ns, stat.st_size)):
+                app.file_handler.on_watched_file_changed(doc.path)
+
+        editor.mark_set(tk.INSERT, doc.insert)
+        editor.text.yview_moveto(doc.yview)
+        # 激活后状态保存在编辑器中
+        doc.text, doc.compressed, doc.snapshot, doc.loaded_text = "", None, None, None
+        doc.memory = 0
+        self.update_active_label()
+
+    def _enforce_budget(self):
+        """未激活文档的总内存超出预算时，按最久未使用的顺序逐级释放。"""
+        inactive = sorted((d for d in self.documents if d is not self.active), key=lambda d: d.last_used)
+        total = sum(d.memory for d in inactive)
+        for level in (Document.drop_caches, Document.compress, Document.release):
+            for doc in inactive:
+                if total <= self.budget_bytes:
+                    return
+                before = doc.memory
+                level(doc)
+                total += doc.memory - before
+
+    def inactive_memory(self) -> int:
+        """未激活文档估计占用的总内存（字节）。"""
+        return sum(d.memory for d in self.documents if d is not self.active)
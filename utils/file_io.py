@@ -10,7 +10,10 @@ from tkinterdnd2 import DND_FILES
 
 # 从项目模块导入
 from constants import FORMAT_DEFINITIONS
-from core import conversion
+from core import conversion, textdiff
+from utils.file_watcher import FileWatcher
+from utils.memprof import note_entries
+from utils.tracing import span
 
 class FileHandler:
     """
@@ -24,6 +27,10 @@ class FileHandler:
             app_instance: 主应用程序 GPTDictConverter 的实例。
         """
         self.app = app_instance
+        # 当前打开文件的 (路径, os.stat 结果, 读取到的内容)，用于写入快照缓存
+        self._loaded_file: tuple | None = None
+        # 监视当前打开的文件，被外部程序修改后自动重新加载
+        self.watcher = FileWatcher(app_instance.root, self.on_watched_file_changed)
 
     def setup_dnd(self):
         """设置输入文本框的拖放功能。"""
@@ -52,10 +59,11 @@ class FileHandler:
             title="选择文件",
             initialdir=self.app.last_directory,
             filetypes=[
-                ("所有支持格式", "*.json;*.toml;*.txt"),
+                ("所有支持格式", "*.json;*.toml;*.txt;*.gdx"),
                 ("JSON 文件", "*.json"),
                 ("TOML 文件", "*.toml"),
                 ("文本文件", "*.txt"),
+                ("GDX 二进制字典", "*.gdx"),
                 ("所有文件", "*.*")
             ]
         )
@@ -72,21 +80,51 @@ class FileHandler:
         """
         if not file_path: return
         
+        with span("打开文件"):
+            # 文件已在某个标签页中打开时直接切换过去，否则在空白或新建的标签页中打开
+            if self.app.documents.select_tab_for_file(file_path):
+                return
+            self._load_file(file_path)
+
+    def _load_file(self, file_path: str):
         try:
+            with open(file_path, 'rb') as f:
+                binary_key = conversion.detect_binary_format(f.read(16))
+            if binary_key:
+                self._import_binary_file(file_path, binary_key)
+                return
+
             # 使用 'utf-8-sig' 编码来自动处理可能存在的BOM头
-            with open(file_path, 'r', encoding='utf-8-sig') as f:
-                content = f.read()
+            with span("读取文件"):
+                stat = os.stat(file_path)
+                with open(file_path, 'r', encoding='utf-8-sig') as f:
+                    content = f.read()
             
-            self.app.input_text.set_content(content, reset_modified_flag=True)
+            with span("写入控件"):
+                self.app.input_text.set_content(content, reset_modified_flag=True)
             self.app.current_file_path = file_path
+            self._loaded_file = (file_path, stat, content)
+            self.watch_current_file()
             
-            # 自动检测格式并更新UI
-            detected_format_name = conversion.detect_format(content)
+            # 文件未修改时直接使用快照缓存中的格式和条目，跳过格式检测与解析
+            with span("读取缓存"):
+                cached = self.app.snapshot_cache.lookup(file_path, stat)
+            if cached:
+                format_key, entries = cached
+                note_entries(len(entries))
+                self.app.set_parsed_snapshot(content, format_key, entries)
+                detected_format_name = FORMAT_DEFINITIONS[format_key]["name"]
+            else:
+                # 自动检测格式并更新UI
+                with span("检测格式"):
+                    detected_format_name = self.app.input_text.model.detected_format
             self.app.input_format.set(detected_format_name if detected_format_name else "自动检测")
             
             # 更新状态栏和窗口标题
-            self.app.status_var.set(f"已打开: {Path(file_path).name}")
+            cache_note = " (已使用缓存)" if cached else ""
+            self.app.status_var.set(f"已打开: {Path(file_path).name}{cache_note}")
             self.app.root.title(f"GPT字典编辑转换器   {self.app.APP_VERSION}   [已打开 {file_path} ]")
+            self.app.documents.update_active_label()
             
             # 触发语法高亮和自动转换
             self.app.syntax_handler.update_all_highlights(self.app.input_text)
@@ -97,6 +135,106 @@ class FileHandler:
             self.app.status_var.set(f"打开失败: {e}")
             self.app.root.title(f"GPT字典编辑转换器   {self.app.APP_VERSION}")
 
+    def _import_binary_file(self, file_path: str, format_key: str):
+        """
+        导入二进制格式的字典文件。
+        二进制内容无法直接编辑，因此以无损的 JSON 格式显示在输入框中，并且不关联原文件。
+
+        Args:
+            file_path: 二进制字典文件的路径。
+            format_key: 检测到的二进制格式键名。
+        """
+        with span("读取文件"):
+            with open(file_path, 'rb') as f:
+                data = conversion.parse_binary(f.read(), format_key)
+        with span("序列化"):
+            content = conversion.format_output(data, "AiNiee_JSON")
+        with span("写入控件"):
+            self.app.input_text.set_content(content, reset_modified_flag=True)
+        self.app.current_file_path = None
+        self._loaded_file = None
+        self.watcher.stop()
+        self.app.set_parsed_snapshot(content, "AiNiee_JSON", data)
+        self.app.input_format.set(FORMAT_DEFINITIONS["AiNiee_JSON"]["name"])
+
+        self.app.status_var.set(f"已导入 {FORMAT_DEFINITIONS[format_key]['name']}: {Path(file_path).name} ({len(data)} 条)，以JSON格式显示")
+        self.app.root.title(f"GPT字典编辑转换器   {self.app.APP_VERSION}")
+
+        self.app.syntax_handler.update_all_highlights(self.app.input_text)
+        self.app.auto_convert()
+
+    def cache_parsed_file(self, content: str, format_key: str, entries: conversion.DictData):
+        """
+        如果给定内容正是当前打开文件的原始内容，则将解析结果写入快照缓存。
+
+        Args:
+            content: 被解析的输入内容。
+            format_key: 内容的格式键名。
+            entries: 解析得到的条目列表。
+        """
+        if not self._loaded_file or not self.app.current_file_path:
+            return
+        file_path, stat, loaded_content = self._loaded_file
+        if file_path == self.app.current_file_path and content == loaded_content:
+            self.app.snapshot_cache.store(file_path, format_key, entries, stat)
+
+    def watch_current_file(self):
+        """根据“监视文件变化”选项开始或停止监视当前打开的文件。"""
+        if self.app.watch_file_var.get() and self.app.current_file_path:
+            self.watcher.watch(self.app.current_file_path)
+        else:
+            self.watcher.stop()
+
+    def on_watched_file_changed(self, file_path: str):
+        """
+        当前打开的文件被外部程序修改后，只把发生变化的行更新到输入框中，
+        光标、滚动位置以及未变化部分的高亮都保持不变。
+
+        Args:
+            file_path: 被修改的文件路径。
+        """
+        if file_path != self.app.current_file_path:
+            # 输入框已不再关联该文件
+            self.watcher.stop()
+            return
+        try:
+            stat = os.stat(file_path)
+            with open(file_path, 'r', encoding='utf-8-sig') as f:
+                content = f.read()
+        except (OSError, UnicodeDecodeError) as e:
+            self.app.status_var.set(f"重新加载失败: {e}")
+            return
+
+        name = Path(file_path).name
+        current = self.app.input_text.get_content()
+        loaded = self._loaded_file[2] if self._loaded_file and self._loaded_file[0] == file_path else None
+        if content == current:
+            self._loaded_file = (file_path, stat, content)
+            return
+        if current != loaded and not messagebox.askyesno(
+            "文件已更改", f"{name} 已被其他程序修改。\n输入框中有未保存的修改，是否重新加载并放弃这些修改？"
+        ):
+            self.app.status_var.set(f"{name} 已被其他程序修改，未重新加载")
+            return
+
+        with span("重新加载"):
+            with span("比较差异"):
+                hunks = textdiff.diff_lines(self.app.input_text.model.lines, content.split("\n"))
+            with span("写入控件"):
+                editor = self.app.input_text
+                editor.edit_separator()
+                changed_ranges = editor.apply_line_hunks(hunks)
+                editor.edit_separator()
+                # 内容已与磁盘一致
+                editor.edit_modified(False)
+                editor.is_modified_flag = False
+            self._loaded_file = (file_path, stat, content)
+            with span("语法高亮"):
+                self.app.syntax_handler.highlight_line_ranges(editor, changed_ranges)
+
+        self.app.status_var.set(f"已重新加载: {name} ({len(hunks)} 处修改)")
+        self.app.auto_convert()
+
     def save_input_file(self):
         """保存输入框中的内容到文件。"""
         content = self.app.input_text.get_content()
@@ -121,10 +259,14 @@ class FileHandler:
             
             self.app.last_directory = str(save_path.parent)
             self.app.current_file_path = str(save_path)
+            self._loaded_file = (str(save_path), os.stat(save_path), content)
+            # 以保存后的文件为新的监视基准，避免把自身的写入当作外部修改
+            self.watch_current_file()
             self.app.input_text.edit_reset() # 清除撤销历史
             self.app.input_text.is_modified_flag = False
             
             # 更新UI
+            self.app.documents.update_active_label()
             self.app.status_var.set(f"文件已保存: {save_path}")
             self.app.root.title(f"GPT字典编辑转换器   {self.app.APP_VERSION} [已打开 {save_path} ]")
             
@@ -146,8 +288,13 @@ class FileHandler:
 
         try:
             save_path = Path(save_path_str)
-            with open(save_path, 'w', encoding='utf-8') as f:
-                f.write(output_content)
+            if self.app.output_binary is not None:
+                # 二进制格式的输出框仅为预览，实际写入转换得到的字节数据
+                with open(save_path, 'wb') as f:
+                    f.write(self.app.output_binary)
+            else:
+                with open(save_path, 'w', encoding='utf-8') as f:
+                    f.write(output_content)
             self.app.last_directory = str(save_path.parent)
             self.app.status_var.set(f"已保存输出: {save_path.name}")
         except Exception as e:
@@ -165,10 +312,9 @@ class FileHandler:
         """
         if is_input:
             title = "保存输入内容"
-            content = self.app.input_text.get_content()
             format_display_name = self.app.input_format.get()
             if format_display_name == "自动检测":
-                detected = conversion.detect_format(content)
+                detected = self.app.input_text.model.detected_format
                 if detected: format_display_name = detected
         else:
             title = "保存输出内容"
@@ -0,0 +1,100 @@
+"""
+该模块实现了对单个文件的修改监视。
+通过定时比较文件的修改时间和大小（stat 轮询）发现外部程序对文件的修改，
+不依赖任何平台特定的文件系统通知接口。
+"""
+
+import os
+from typing import Callable, Optional, Tuple
+
+from constants import FILE_WATCH_INTERVAL_MS
+
+
+def file_signature(path: str) -> Optional[Tuple[int, int]]:
+    """返回文件的 (修改时间纳秒, 大小)，文件不存在或无法访问时返回 None。"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class FileWatcher:
+    """
+    轮询监视一个文件。
+
+    文件签名发生变化后，要等到连续两次检查得到相同的签名才会回调，
+    避免在外部程序尚未写完文件时读到不完整的内容。
+    文件暂时不存在（如外部程序先删除再重新写入）时不会回调。
+    """
+    def __init__(self, root, on_change: Callable[[str], None], interval_ms: int = FILE_WATCH_INTERVAL_MS):
+        """
+        初始化文件监视器。
+
+        Args:
+            root: 用于调度定时检查的 Tk 控件。
+            on_change: 文件被修改后调用的函数，参数为文件路径。
+            interval_ms: 检查间隔（毫秒）。
+        """
+        self.root = root
+        self.on_change = on_change
+        self.interval_ms = interval_ms
+        self.path: Optional[str] = None
+        self._signature = None
+        self._pending = None
+        self._job = None
+
+    def watch(self, path: Optional[str]):
+        """开始监视 path，以文件当前的状态为基准；path 为 None 时停止监视。"""
+        self.stop()
+        self.path = path
+        if path is None:
+            return
+        self.acknowledge()
+        self._job = self.root.after(self.interval_ms, self._tick)
+
+    def acknowledge(self):
+        """以文件当前的状态为新的基准，如程序自身保存文件之后。"""
+        if self.path is not None:
+            self._signature = file_signature(self.path)
+        self._pending = None
+
+    def stop(self):
+        """停止监视。"""
+        if self._job is not None:
+            self.root.after_cancel(self._job)
+            self._job = None
+        self.path = None
+        self._pending = None
+
+    def poll(self) -> bool:
+        """
+        检查一次文件是否被修改。
+
+        Returns:
+            本次检查是否调用了 on_change。
+        """
+        if self.path is None:
+            return False
+        signature = file_signature(self.path)
+        if signature is None or signature == self._signature:
+            self._pending = None
+            return False
+        if signature != self._pending:
+            # 刚发现变化，等下一次检查确认文件已经写完
+            self._pending = signature
+            return False
+        self._signature = signature
+        self._pending = None
+        self.on_change(self.path)
+        return True
+
+    def _tick(self):
+        self._job = None
+        path = self.path
+        try:
+            self.poll()
+        finally:
+            # on_change 中可能已经停止或切换了监视的文件
+            if self.path is not None and self.path == path and self._job is None:
+                self._job = self.root.after(self.interval_ms, self._tick)
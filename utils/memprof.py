@@ -0,0 +1,280 @@
+"""
+该模块提供可选的内存分析，用于估计处理某个字典需要多少内存。
+
+开启后，utils.tracing 中的每个计时区段（打开文件、解析、序列化、高亮等）同时会用 tracemalloc
+记录该阶段的峰值内存与结束后仍保留的内存；记录了条目数的阶段还会换算为每个条目的字节数。
+每个阶段只读取两次计数器，开销很小。
+
+分配位置的统计需要拍摄快照，耗时与存活的内存块数成正比（约 200 万块时需要数秒），
+因此不在每次操作后自动进行，而是按需调用 top_sites，列出开启以来分配且仍未释放的内存最多的代码行。
+
+tracemalloc 会使 Python 的内存分配变慢数倍，因此只应在排查内存问题时开启。
+tracemalloc 统计的是整个进程的分配，只记录主线程中的区段，后台线程中的区段会被忽略。
+本模块不依赖任何 GUI 库。
+"""
+
+import threading
+import tracemalloc
+from collections import defaultdict, deque
+from typing import Callable, List, NamedTuple, Optional
+
+from utils.tracing import tracer
+
+# 保留的最近报告数
+MAX_REPORTS = 50
+# 报告中列出的分配位置数
+DEFAULT_TOP_SITES = 10
+
+
+class StageMemory(NamedTuple):
+    """
+    一个阶段的内存统计，字节数均相对于阶段开始时的已分配内存。
+
+    Attributes:
+        name: 阶段名称。
+        depth: 嵌套深度，最外层操作为 0。
+        peak: 阶段内的峰值内存增量。
+        retained: 阶段结束后仍保留的内存增量，可能为负。
+        entries: 阶段处理的条目数，未记录时为 None。
+    """
+    name: str
+    depth: int
+    peak: int
+    retained: int
+    entries: Optional[int]
+
+    @property
+    def bytes_per_entry(self) -> Optional[float]:
+        """每个条目平均保留的字节数。"""
+        return self.retained / self.entries if self.entries else None
+
+
+class AllocationSite(NamedTuple):
+    """一个分配位置（代码行）当前占用的内存。"""
+    location: str
+    size: int
+    count: int
+
+
+class MemoryReport(NamedTuple):
+    """
+    一个最外层操作的内存报告。
+
+    Attributes:
+        stages: 各阶段的统计，按开始顺序排列，第一项是操作本身。
+    """
+    stages: List[StageMemory]
+
+    @property
+    def operation(self) -> StageMemory:
+        return self.stages[0]
+
+
+def format_size(size: int) -> str:
+    """将字节数格式化为带符号的易读文本，如 "+12.3MB"。"""
+    sign = "-" if size < 0 else "+"
+    size = abs(size)
+    for unit in ("B", "KB", "MB"):
+        if size < 1024:
+            return f"{sign}{size:.0f}{unit}" if unit == "B" else f"{sign}{size:.1f}{unit}"
+        size /= 1024
+    return f"{sign}{size:.2f}GB"
+
+
+class _Frame:
+    """正在进行的阶段。"""
+    __slots__ = ("name", "depth", "base", "peak", "entries", "children")
+
+    def __init__(self, name: str, depth: int, base: int):
+        self.name = name
+        self.depth = depth
+        self.base = base
+        # 子阶段开始前（会重置峰值）已观察到的峰值
+        self.peak = base
+        self.entries: Optional[int] = None
+        self.children: List[StageMemory] = []
+
+
+def _group_raw_traces(snapshot: tracemalloc.Snapshot, ignored) -> Optional[List[AllocationSite]]:
+    """
+    直接遍历快照的原始记录 (域, 大小, 调用栈, 总帧数)，按最内层的一帧分组。
+
+    Snapshot.statistics 为每个内存块创建 Trace 对象，数百万块时需要数十秒，这里只需约 1 秒。
+    原始记录不是公开接口，结构不符时返回 None，由调用方改用 _group_statistics。
+    """
+    traces = getattr(snapshot.traces, "_traces", None)
+    if traces is None:
+        return None
+    # 分配时 tracemalloc 仍在记录，用列表收集大小可以避免在循环中不断创建新的整数对象
+    groups = defaultdict(list)
+    try:
+        for trace in traces:
+            groups[trace[2][0]].append(trace[1])
+        return [
+            AllocationSite(f"{filename}:{lineno}", sum(sizes), len(sizes))
+            for (filename, lineno), sizes in groups.items() if filename not in ignored
+        ]
+    except (TypeError, IndexError, ValueError):
+        return None
+
+
+def _group_statistics(snapshot: tracemalloc.Snapshot, ignored) -> List[AllocationSite]:
+    """使用公开的 Snapshot.statistics 按代码行分组，较慢但不依赖快照的内部结构。"""
+    filters = [tracemalloc.Filter(False, filename) for filename in ignored]
+    sites = []
+    for stat in snapshot.filter_traces(filters).statistics("lineno"):
+        frame = stat.traceback[0]
+        sites.append(AllocationSite(f"{frame.filename}:{frame.lineno}", stat.size, stat.count))
+    return sites
+
+
+class MemoryProfiler:
+    """
+    按计时区段记录内存的分析器，开启时挂接到 utils.tracing.tracer。
+
+    用法:
+        profiler.start()
+        with span("转换"):
+            ...
+            profiler.note_entries(len(data))
+        print(profiler.format_report(profiler.last_report))
+        print(profiler.format_sites(profiler.top_sites()))
+    """
+    def __init__(self):
+        self.reports = deque(maxlen=MAX_REPORTS)
+        self._stack: List[_Frame] = []
+        self._listeners: List[Callable[[MemoryReport], None]] = []
+        self._started_tracing = False
+
+    @property
+    def enabled(self) -> bool:
+        return tracer.stage_hook is self and tracemalloc.is_tracing()
+
+    def start(self, nframes: int = 1):
+        """
+        开始记录内存。只统计开始之后的分配。
+
+        Args:
+            nframes: 每次分配记录的调用栈深度；分配位置按最内层的一帧归类。
+        """
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(nframes)
+            self._started_tracing = True
+        tracer.stage_hook = self
+
+    def stop(self):
+        """停止记录内存，已生成的报告仍然保留。"""
+        tracer.stage_hook = None
+        self._stack.clear()
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def add_listener(self, callback: Callable[[MemoryReport], None]):
+        """注册一个回调，在每个最外层操作的报告生成后调用。"""
+        self._listeners.append(callback)
+
+    @property
+    def last_report(self) -> Optional[MemoryReport]:
+        return self.reports[-1] if self.reports else None
+
+    def note_entries(self, count: int):
+        """记录当前阶段处理的条目数，用于计算每个条目的字节数。未开启时不做任何事。"""
+        if self._stack and threading.current_thread() is threading.main_thread():
+            self._stack[-1].entries = count
+
+    # -------------------------------------------------------------
+    # 区段挂钩（由 Tracer.span 调用）
+    # -------------------------------------------------------------
+    def enter(self, name: str) -> Optional[_Frame]:
+        if not tracemalloc.is_tracing() or threading.current_thread() is not threading.main_thread():
+            return None
+        current, peak = tracemalloc.get_traced_memory()
+        if self._stack:
+            parent = self._stack[-1]
+            parent.peak = max(parent.peak, peak)
+        frame = _Frame(name, len(self._stack), current)
+        # 重置后的峰值只反映本阶段，父阶段此前的峰值已保存在 parent.peak 中
+        tracemalloc.reset_peak()
+        self._stack.append(frame)
+        return frame
+
+    def exit(self, frame: Optional[_Frame]):
+        if frame is None or not self._stack or self._stack[-1] is not frame:
+            return
+        self._stack.pop()
+        current, peak = tracemalloc.get_traced_memory()
+        peak = max(peak, frame.peak)
+        stage = StageMemory(frame.name, frame.depth, peak - frame.base, current - frame.base, frame.entries)
+        if self._stack:
+            parent = self._stack[-1]
+            parent.peak = max(parent.peak, peak)
+            if parent.entries is None:
+                parent.entries = frame.entries
+            parent.children.append(stage)
+            parent.children.extend(frame.children)
+            frame.children = []
+            return
+
+        report = MemoryReport([stage] + frame.children)
+        self.reports.append(report)
+        for listener in self._listeners:
+            listener(report)
+
+    # -------------------------------------------------------------
+    # 分配位置
+    # -------------------------------------------------------------
+    def top_sites(self, limit: int = DEFAULT_TOP_SITES) -> List[AllocationSite]:
+        """
+        按代码行统计开启以来分配且仍未释放的内存，返回占用最多的 limit 个位置。
+
+        Returns:
+            分配位置列表，按占用从多到少排列；未开启时返回空列表。
+        """
+        if not tracemalloc.is_tracing():
+            return []
+        snapshot = tracemalloc.take_snapshot()
+        ignored = (tracemalloc.__file__, __file__)
+        sites = _group_raw_traces(snapshot, ignored)
+        if sites is None:
+            sites = _group_statistics(snapshot, ignored)
+        sites.sort(key=lambda s: s.size, reverse=True)
+        return sites[:limit]
+
+    # -------------------------------------------------------------
+    # 报告
+    # -------------------------------------------------------------
+    @staticmethod
+    def format_summary(report: MemoryReport) -> str:
+        """将报告格式化为单行文本，如 "内存 转换: 峰值 +80.1MB | 保留 +35.2MB | 36 B/条目"。"""
+        op = report.operation
+        text = f"内存 {op.name}: 峰值 {format_size(op.peak)} | 保留 {format_size(op.retained)}"
+        if op.bytes_per_entry is not None:
+            text += f" | {op.bytes_per_entry:.0f} B/条目"
+        return text
+
+    @staticmethod
+    def format_report(report: MemoryReport) -> str:
+        """将报告格式化为多行文本，各阶段按嵌套深度缩进。"""
+        lines = []
+        for stage in report.stages:
+            line = f"{'  ' * stage.depth}{stage.name}: 峰值 {format_size(stage.peak)}，保留 {format_size(stage.retained)}"
+            if stage.entries is not None:
+                line += f"，{stage.entries} 个条目"
+                if stage.bytes_per_entry is not None:
+                    line += f"（{stage.bytes_per_entry:.0f} B/条目）"
+            lines.append(line)
+        return "\n".join(lines)
+
+    @staticmethod
+    def format_sites(sites: List[AllocationSite]) -> str:
+        """将分配位置格式化为多行文本。"""
+        lines = ["占用内存最多的分配位置:"]
+        for site in sites:
+            lines.append(f"  {format_size(site.size)[1:]:>9}  {site.count:>9} 块  {site.location}")
+        return "\n".join(lines)
+
+
+# 全局共享的内存分析器实例
+profiler = MemoryProfiler()
+note_entries = profiler.note_entries
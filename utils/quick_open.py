@@ -0,0 +1,116 @@
+"""
+该模块负责维护快速跳转面板使用的条目索引。
+
+索引在第一次打开快速跳转面板时于后台线程中建立，此后每次输入内容被修改，
+都会在停止输入一段时间后于后台增量更新，只重新解析被修改的记录。
+"""
+
+import threading
+from typing import Callable, List, Optional
+
+from constants import LIVE_CONVERT_DELAY_MS
+from core.fuzzy import FuzzyIndex, FuzzyMatch
+from core.incremental import RECORD_FORMATS
+from utils.tracing import span
+
+
+class QuickOpenIndex:
+    """
+    输入框内容的模糊查找索引，由主窗口持有。
+    后台更新期间不能查找，调用 refresh 并在回调中查找即可。
+    """
+    def __init__(self, app):
+        """
+        Args:
+            app: 主应用程序 GPTDictConverter 的实例。
+        """
+        self.app = app
+        self.index = FuzzyIndex()
+        # 索引对应的输入框内容版本，-1 表示尚未建立
+        self.version = -1
+        self._running = False
+        self._waiters: List[Callable[[Optional[str]], None]] = []
+        self._job = None
+        app.input_text.add_change_listener(self._on_input_edited)
+
+    @property
+    def ready(self) -> bool:
+        """索引是否与输入框的当前内容一致，可以直接查找。"""
+        return not self._running and self.version == self.app.input_text.model.version
+
+    def search(self, query: str, limit: int = 100) -> List[FuzzyMatch]:
+        """查找条目；索引正在更新时返回空列表。"""
+        if self._running:
+            return []
+        return self.index.search(query, limit)
+
+    def refresh(self, on_done: Optional[Callable[[Optional[str]], None]] = None):
+        """
+        在后台线程中把索引更新到输入框的当前内容。
+
+        Args:
+            on_done: 更新完成后在主线程中调用，参数为错误信息，成功时为 None。
+        """
+        if on_done:
+            self._waiters.append(on_done)
+        if self._running:
+            # 当前更新完成后会检查内容版本，必要时再次更新
+            return
+
+        model = self.app.input_text.model
+        format_key = self.app.resolve_input_format_key()
+        if format_key not in RECORD_FORMATS:
+            self._finish("无法识别输入内容的格式" if format_key is None else "该格式不支持快速跳转")
+            return
+        if self.version == model.version and format_key == self.index.input_key:
+            self._finish(None)
+            return
+
+        # 行列表按版本缓存且不会被修改，后台线程可以安全地读取
+        lines, version = model.lines, model.version
+        job = {}
+
+        def worker():
+            try:
+                with span("更新条目索引"):
+                    job["reparsed"] = self.index.update(lines, format_key)
+            except Exception as e:
+                job["error"] = e
+
+        self._running = True
+        threading.Thread(target=worker, daemon=True).start()
+        self.app.root.after(50, lambda: self._poll(job, version))
+
+    def _poll(self, job: dict, version: int):
+        if not job:
+            self.app.root.after(50, lambda: self._poll(job, version))
+            return
+        self._running = False
+        if "error" in job:
+            self.version = -1
+            self.index.reset()
+            self._finish(f"建立索引失败: {job['error']}")
+            return
+        self.version = version
+        if self._waiters and version != self.app.input_text.model.version:
+            # 更新期间内容又被修改，等待者需要最新的结果
+            self.refresh()
+        else:
+            self._finish(None)
+
+    def _finish(self, error: Optional[str]):
+        waiters, self._waiters = self._waiters, []
+        for callback in waiters:
+            callback(error)
+
+    def _on_input_edited(self, start_line, old_count, new_count):
+        """输入内容被修改后，停止输入一段时间再更新索引，使每次更新只涉及少数记录。"""
+        if self.version < 0:
+            return
+        if self._job:
+            self.app.root.after_cancel(self._job)
+        self._job = self.app.root.after(LIVE_CONVERT_DELAY_MS, self._scheduled_refresh)
+
+    def _scheduled_refresh(self):
+        self._job = None
+        self.refresh()
@@ -7,6 +7,12 @@ DEFAULT_SETTINGS = {
     "geometry": "1000x600",
     "last_directory": str(Path.home()),
     "auto_convert": True,
+    "cache_max_mb": 256,
+    "watch_file": False,
+    # 未激活的标签页可占用的内存预算，超出时压缩或释放最久未使用的文档
+    "tab_memory_mb": 128,
+    # 词库数据库与 settings.json 位于同一目录
+    "glossary_db": str(Path(SETTINGS_FILE).parent / "glossary.db"),
 }
 
 def load_settings():
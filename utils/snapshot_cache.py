@@ -0,0 +1,247 @@
+"""
+该模块实现了已解析字典的磁盘快照缓存。
+缓存按文件路径、修改时间和文件大小建立索引，重新打开未修改的文件时，
+可以直接读取缓存中的格式和条目，跳过格式检测与解析。
+"""
+
+import json
+import mmap
+import os
+import struct
+import sys
+import time
+from array import array
+from hashlib import sha1
+from pathlib import Path
+from typing import Optional, Tuple
+
+from core.conversion import DictData
+from utils.settings import SETTINGS_FILE
+
+# 缓存目录与 settings.json 位于同一目录
+CACHE_DIR = Path(SETTINGS_FILE).parent / "dict_cache"
+INDEX_FILE = "index.json"
+DEFAULT_CACHE_MAX_BYTES = 256 * 1024 * 1024
+# 命中时只在内存中更新访问时间，距上次写入索引超过该秒数才写回磁盘
+ATIME_FLUSH_INTERVAL = 300
+
+# 快照文件布局 (小端序):
+#   头部:   magic(4s) version(H) format_key_len(H) reserved(I) count(I)
+#   格式键: format_key_len 字节的 UTF-8
+#   偏移表: (3 * count + 1) 个 uint32，依次为每个条目 org/rep/note 在字符串区中的字符偏移
+#   字符串区: 所有字段首尾相连的 UTF-8 文本
+_MAGIC = b"GDSC"
+_VERSION = 1
+_HEADER = struct.Struct("<4sHHII")
+
+
+def _encode_snapshot(format_key: str, entries: DictData) -> bytes:
+    """将格式键和条目列表编码为二进制快照。"""
+    fields = []
+    for item in entries:
+        fields.append(item['org'])
+        fields.append(item['rep'])
+        fields.append(item['note'])
+
+    offsets = array('I', [0])
+    pos = 0
+    for field in fields:
+        pos += len(field)
+        offsets.append(pos)
+    if sys.byteorder != "little":
+        offsets.byteswap()
+
+    key_bytes = format_key.encode("utf-8")
+    header = _HEADER.pack(_MAGIC, _VERSION, len(key_bytes), 0, len(entries))
+    return b"".join([header, key_bytes, offsets.tobytes(), "".join(fields).encode("utf-8")])
+
+
+def _decode_snapshot(buf) -> Tuple[str, DictData]:
+    """从二进制快照（bytes 或 mmap）中解码出格式键和条目列表。"""
+    magic, version, key_len, _, count = _HEADER.unpack_from(buf, 0)
+    if magic != _MAGIC or version != _VERSION:
+        raise ValueError("缓存文件格式不匹配")
+
+    pos = _HEADER.size
+    format_key = bytes(buf[pos:pos + key_len]).decode("utf-8")
+    pos += key_len
+
+    offsets = array('I')
+    offsets.frombytes(buf[pos:pos + (3 * count + 1) * offsets.itemsize])
+    if len(offsets) != 3 * count + 1:
+        raise ValueError("缓存文件已截断")
+    if sys.byteorder != "little":
+        offsets.byteswap()
+    pos += len(offsets) * offsets.itemsize
+
+    # 字符串区一次性解码，再按字符偏移切片，避免逐字段解码的开销；
+    # 偏移表的最后一项是字符串区的总字符数，不一致说明文件已损坏
+    text = bytes(buf[pos:]).decode("utf-8")
+    if offsets[0] != 0 or offsets[-1] != len(text):
+        raise ValueError("缓存文件已损坏")
+    entries = []
+    for i in range(count):
+        base = 3 * i
+        entries.append({
+            'org': text[offsets[base]:offsets[base + 1]],
+            'rep': text[offsets[base + 1]:offsets[base + 2]],
+            'note': text[offsets[base + 2]:offsets[base + 3]],
+        })
+    return format_key, entries
+
+
+class SnapshotCache:
+    """
+    一个按总大小执行 LRU 淘汰的快照缓存。
+    索引保存在缓存目录下的 index.json 中，每个快照单独存为一个 .bin 文件。
+    """
+    def __init__(self, cache_dir: Path = CACHE_DIR, max_bytes: int = DEFAULT_CACHE_MAX_BYTES):
+        """
+        初始化快照缓存。
+
+        Args:
+            cache_dir: 缓存目录。
+            max_bytes: 所有快照文件的总大小上限，超出后淘汰最久未使用的快照。
+        """
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self._index: Optional[dict] = None
+        # 内存中的索引是否有尚未写回磁盘的访问时间，以及上次写入索引的时间
+        self._dirty = False
+        self._saved_at = time.monotonic()
+
+    # -------------------------------------------------------------
+    # 索引管理
+    # -------------------------------------------------------------
+    def _load_index(self) -> dict:
+        if self._index is None:
+            try:
+                with open(self.cache_dir / INDEX_FILE, "r", encoding="utf-8") as f:
+                    self._index = json.load(f)
+            except (OSError, json.JSONDecodeError):
+                self._index = {}
+        return self._index
+
+    def _save_index(self):
+        tmp_path = self.cache_dir / (INDEX_FILE + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._index, f, ensure_ascii=False)
+        os.replace(tmp_path, self.cache_dir / INDEX_FILE)
+        self._dirty = False
+        self._saved_at = time.monotonic()
+
+    @staticmethod
+    def _cache_key(path: str) -> str:
+        normalized = os.path.normcase(os.path.abspath(path))
+        return sha1(normalized.encode("utf-8")).hexdigest()
+
+    def _remove(self, key: str):
+        self._load_index().pop(key, None)
+        try:
+            os.remove(self.cache_dir / f"{key}.bin")
+        except OSError:
+            pass
+
+    # -------------------------------------------------------------
+    # 公共接口
+    # -------------------------------------------------------------
+    def lookup(self, path: str, stat: Optional[os.stat_result] = None) -> Optional[Tuple[str, DictData]]:
+        """
+        查找文件对应的快照。仅当文件的修改时间和大小都与缓存一致时才算命中。
+
+        Args:
+            path: 字典文件路径。
+            stat: 可选的 os.stat 结果，未提供时会重新获取。
+
+        Returns:
+            命中时返回 (格式键, 条目列表)，否则返回 None。
+        """
+        try:
+            stat = stat or os.stat(path)
+        except OSError:
+            return None
+
+        index = self._load_index()
+        key = self._cache_key(path)
+        record = index.get(key)
+        if not record or record["mtime_ns"] != stat.st_mtime_ns or record["size"] != stat.st_size:
+            return None
+
+        try:
+            with open(self.cache_dir / f"{key}.bin", "rb") as f:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    result = _decode_snapshot(mm)
+        except (OSError, ValueError, struct.error):
+            # 快照文件丢失或已损坏，丢弃该记录
+            self._remove(key)
+            self._save_index()
+            return None
+
+        # 访问时间只影响淘汰顺序，先记在内存中，随下次 store 或 flush 一起写入，避免每次命中都写一次磁盘
+        record["atime"] = time.time()
+        self._dirty = True
+        if time.monotonic() - self._saved_at >= ATIME_FLUSH_INTERVAL:
+            self.flush()
+        return result
+
+    def flush(self):
+        """将内存中尚未保存的访问时间写入索引文件。应在程序退出前调用。"""
+        if not self._dirty:
+            return
+        try:
+            self._save_index()
+        except OSError as e:
+            print(f"警告: 无法写入字典缓存 {self.cache_dir}。错误: {e}")
+
+    def store(self, path: str, format_key: str, entries: DictData, stat: Optional[os.stat_result] = None):
+        """
+        保存文件的解析结果，并在超出总大小上限时淘汰最久未使用的快照。
+
+        Args:
+            path: 字典文件路径。
+            format_key: 文件的格式键名。
+            entries: 解析得到的条目列表。
+            stat: 读取文件时获取的 os.stat 结果，用于保证快照与读取的内容一致。
+        """
+        try:
+            stat = stat or os.stat(path)
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            data = _encode_snapshot(format_key, entries)
+            if len(data) > self.max_bytes:
+                return
+
+            key = self._cache_key(path)
+            with open(self.cache_dir / f"{key}.bin", "wb") as f:
+                f.write(data)
+
+            index = self._load_index()
+            index[key] = {
+                "path": os.path.abspath(path),
+                "mtime_ns": stat.st_mtime_ns,
+                "size": stat.st_size,
+                "bytes": len(data),
+                "atime": time.time(),
+            }
+            self._evict(keep=key)
+            self._save_index()
+        except OSError as e:
+            print(f"警告: 无法写入字典缓存 {self.cache_dir}。错误: {e}")
+
+    def _evict(self, keep: str):
+        """按最近访问时间淘汰快照，直到总大小不超过上限。"""
+        index = self._load_index()
+        total = sum(record["bytes"] for record in index.values())
+        for key in sorted(index, key=lambda k: index[k]["atime"]):
+            if total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            total -= index[key]["bytes"]
+            self._remove(key)
+
+    def clear(self):
+        """删除所有快照。"""
+        for key in list(self._load_index()):
+            self._remove(key)
+        if self.cache_dir.exists():
+            self._save_index()